@@ -4,15 +4,20 @@ APP.PY - Kütüphane Yönetim Sistemi
 SQL Server Trigger ve Stored Procedure kullanır:
 - sp_BorrowBook: Kitap ödünç alma
 - sp_ReturnBook: Kitap iade etme
+- sp_ReturnBooks: Toplu iade etme
 - sp_PayPenalty: Ceza ödeme
 - trg_CalculatePenalty: Otomatik ceza hesaplama
 
 Ceza: 5 TL/dakika, İade süresi: 1 dakika
 """
 
-from flask import Flask, send_from_directory
+from flask import Flask, abort, g, request
 from flask_cors import CORS
-from config import DatabaseConfig
+from config import CompressionConfig, DatabaseConfig, MetricsConfig, OverdueConfig, StaticConfig
+from compression import compress_response
+from metrics import metrics
+from static_assets import AssetStore
+import structured_log
 
 from controllers.auth_controller import auth_bp
 from controllers.user_controller import user_bp
@@ -23,8 +28,13 @@ from controllers.transaction_controller import transaction_bp
 from controllers.penalty_controller import penalty_bp
 from controllers.member_controller import member_bp
 from controllers.stats_controller import stats_bp
+from controllers.events_controller import events_bp
+from services.overdue_scheduler import overdue_scheduler
 
-app = Flask(__name__, static_folder='frontend')
+# Loglar kuyruğa bırakılır, ayrı thread yazar (LogConfig)
+structured_log.configure()
+
+app = Flask(__name__, static_folder=None)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 
 # Blueprint'leri kaydet
@@ -37,35 +47,69 @@ app.register_blueprint(transaction_bp)
 app.register_blueprint(penalty_bp)
 app.register_blueprint(member_bp)
 app.register_blueprint(stats_bp)
+app.register_blueprint(events_bp)
 
-@app.route('/')
-def index():
-    return send_from_directory('frontend', 'index.html')
+if MetricsConfig.ENABLED:
+    # Route başına süre, durum kodu ve veritabanı kullanımı (/api/admin/metrics)
+    @app.before_request
+    def start_request_metrics():
+        g.metrics = metrics.start_request()
+
+    @app.after_request
+    def record_request_metrics(response):
+        state = g.pop('metrics', None)
+        if state is not None:
+            rule = request.url_rule
+            metrics.finish_request(state, request.blueprint or '', rule.rule if rule else 'unmatched',
+                                   request.method, response.status_code)
+        return response
 
-@app.route('/styles.css')
-def styles():
-    return send_from_directory('frontend', 'styles.css')
+if CompressionConfig.ENABLED:
+    # Büyük JSON / MessagePack yanıtları Accept-Encoding'e göre br veya gzip ile sıkıştırılır
+    app.after_request(compress_response)
 
-@app.route('/app.js')
-def scripts():
-    return send_from_directory('frontend', 'app.js')
+if OverdueConfig.ENABLED:
+    # Süreç başına ilk istekte başlar (pre-fork sunucularda fork sonrası)
+    @app.before_request
+    def start_overdue_scheduler():
+        overdue_scheduler.ensure_started()
+
+# Frontend açılışta bir kez işlenir: hash'li adlar, gzip/br varyantları (static_assets.py)
+assets = AssetStore(StaticConfig.SOURCE_DIR)
+
+@app.route('/')
+@app.route('/<name>')                                  # hash'siz eski adlar (styles.css, app.js)
+@app.route(f'{StaticConfig.URL_PREFIX}/<name>')        # hash'li, değişmez
+def static_asset(name=''):
+    asset = assets.get(request.path)
+    if asset is None:
+        abort(404)
+    return asset.response()
 
 if __name__ == '__main__':
     print("=" * 60)
     print("KÜTÜPHANE YÖNETİM SİSTEMİ")
     print("=" * 60)
     print()
-    print("🔧 SQL Server Bileşenleri:")
-    print("   - sp_BorrowBook    : Kitap ödünç alma")
-    print("   - sp_ReturnBook    : Kitap iade etme")
-    print("   - sp_PayPenalty    : Ceza ödeme")
-    print("   - trg_CalculatePenalty : Otomatik ceza (TRIGGER)")
+    if DatabaseConfig.BACKEND == 'sqlite':
+        print(f"🗄️ SQLite: {DatabaseConfig.SQLITE_PATH}")
+        print("   - Procedure'ler repositories/sqlite içinde, trigger'lar db_setup_sqlite.sql'de")
+    else:
+        print("🔧 SQL Server Bileşenleri:")
+        print("   - sp_BorrowBook    : Kitap ödünç alma")
+        print("   - sp_ReturnBook    : Kitap iade etme")
+        print("   - sp_ReturnBooks   : Toplu iade etme")
+        print("   - sp_PayPenalty    : Ceza ödeme")
+        print("   - trg_CalculatePenalty : Otomatik ceza (TRIGGER)")
     print()
     print("⏱️ Ceza: 5 TL/dakika | İade süresi: 1 dakika")
     print()
     
     success, message = DatabaseConfig.test_connection()
     print(f"{'✅' if success else '❌'} Veritabanı: {message}")
+    if success:
+        opened = DatabaseConfig.get_pool().prefill()
+        print(f"🔌 Bağlantı havuzu: {opened} bağlantı hazır (maks. {DatabaseConfig.POOL_MAX_SIZE})")
     
     print()
     print("🔑 Giriş: admin@kutuphane.com / 123456")
@@ -0,0 +1,15 @@
+"""
+BENCHMARKS - Performans Ölçümleri
+
+backend/ dizininden modül olarak çalıştırılır:
+    python -m benchmarks.validate_input
+    python -m benchmarks.stream_memory
+    python -m benchmarks.session_store
+    python -m benchmarks.search_index
+    python -m benchmarks.conformance
+    python -m benchmarks.row_json
+    python -m benchmarks.response_formats
+    python -m benchmarks.index_report
+    python -m benchmarks.event_fanout
+    python -m benchmarks.suite          (sonuçlar benchmarks/results/<commit>.json)
+"""
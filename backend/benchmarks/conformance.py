@@ -0,0 +1,235 @@
+"""
+CONFORMANCE.PY - Depolama Sürücüsü Uyumluluk Kontrolü
+
+Aynı senaryo her sürücüde repository katmanı üzerinden çalıştırılır ve
+sonuçlar (başarı bayrakları, mesajlar, cezalar, sayaçlar) aynı
+beklentilerle karşılaştırılır:
+
+- sqlite: geçici dosyada boş şema (örnek verilerle)
+- sqlserver: DatabaseConfig bağlantısı; bağlanılamazsa atlanır. Senaryo
+  benzersiz adlı kendi kayıtlarını oluşturur ve sonunda siler.
+
+Gecikme cezası için ödünç kaydının ReturnDate'i geçmişe çekilir.
+Herhangi bir kontrol başarısızsa çıkış kodu 1'dir.
+
+    python -m benchmarks.conformance
+    python -m benchmarks.conformance sqlite
+"""
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+from config import DatabaseConfig
+from repositories import (UserRepository, AuthorRepository, CategoryRepository, BookRepository,
+                          TransactionRepository, PenaltyRepository, StatsRepository)
+from repositories.factory import repository_for
+
+MISSING_ID = 2147483000
+
+
+class Scenario:
+
+    def __init__(self, backend: str):
+        self.backend = backend
+        self.failures = []
+        self.checks = 0
+        self.users = repository_for(UserRepository)
+        self.authors = repository_for(AuthorRepository)
+        self.categories = repository_for(CategoryRepository)
+        self.books = repository_for(BookRepository)
+        self.txs = repository_for(TransactionRepository)
+        self.penalties = repository_for(PenaltyRepository)
+        self.stats = repository_for(StatsRepository)
+
+    def check(self, name: str, condition: bool, detail=None):
+        self.checks += 1
+        if not condition:
+            self.failures.append(f"{name}: {detail!r}")
+
+    def expect_message(self, name: str, result, success: bool, message: str):
+        self.check(name, result[0] == success and result[1] == message, result[:2])
+
+    def make_overdue(self, tx_id: int, minutes: int):
+        """Ödünç kaydının son iade tarihini `minutes` dakika geçmişe çeker"""
+        conn = self.books.get_connection()
+        try:
+            conn.cursor().execute("UPDATE BorrowTransactions SET ReturnDate = ? WHERE Id = ?",
+                                  (datetime.now() - timedelta(minutes=minutes), tx_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def available(self, book_id: int) -> int:
+        return self.books.get_by_id(book_id).Available
+
+    def run(self):
+        tag = uuid.uuid4().hex[:8]
+        author = self.authors.add("Uyum", f"Yazar {tag}", "Türkiye")
+        category = self.categories.add(f"Uyum {tag}")
+        book = self.books.add(f"Uyum Kitabı {tag}", author.Id, category.Id, 2, 2024)
+        members = [self.users.add(f"Uyum Üye {i} {tag}", f"uyum{i}.{tag}@test.com", "0" * 64)
+                   for i in range(3)]
+        try:
+            self._scenario(book, *members)
+        finally:
+            for user in members:
+                if user: self.users.delete(user.Id)
+            if book: self.books.delete(book.Id)
+            if author: self.authors.delete(author.Id)
+            if category: self.categories.delete(category.Id)
+
+    def _scenario(self, book, user, other, third):
+        self.check("kayıtlar oluşturuldu", all([book, user, other, third]) and book.Id > 0 and user.Id > 0)
+        title = book.Title
+
+        # Ödünç alma
+        ok, message, tx = self.txs.borrow_book_sp(book.Id, user.Id)
+        self.check("ödünç alındı", ok and tx is not None and tx.BookTitle == title, message)
+        if not ok:
+            return
+        self.check("ödünç mesajı", message == f"'{title}' kitabı ödünç alındı. Son iade: "
+                                             f"{tx.ReturnDate:%d.%m.%Y %H:%M:%S}", message)
+        self.check("ödünç sayacı arttı", self.available(book.Id) == 1)
+        self.expect_message("mükerrer ödünç", self.txs.borrow_book_sp(book.Id, user.Id),
+                            False, "Bu kitabı zaten ödünç almışsınız")
+        self.expect_message("olmayan kitap", self.txs.borrow_book_sp(MISSING_ID, user.Id),
+                            False, "Kitap bulunamadı")
+
+        # Gecikmeli iade -> trigger cezası
+        self.make_overdue(tx.Id, 3)
+        self.expect_message("başkasının işlemi", self.txs.return_book_sp(tx.Id, other.Id),
+                            False, "Bu işlem size ait değil")
+        self.expect_message("olmayan işlem", self.txs.return_book_sp(MISSING_ID, user.Id),
+                            False, "İşlem bulunamadı")
+        ok, message, returned = self.txs.return_book_sp(tx.Id, user.Id)
+        penalties = self.penalties.get_by_user_id(user.Id)
+        self.check("iade edildi", ok and returned.RealReturnDate is not None, message)
+        self.check("tek ceza yazıldı", len(penalties) == 1, penalties)
+        if penalties:
+            penalty = penalties[0]
+            minutes = penalty.NumberOfDay
+            self.check("ceza süresi", 3 <= minutes <= 4, minutes)
+            self.check("ceza tutarı", penalty.Amount == minutes * 5.0, penalty.Amount)
+            self.check("iade mesajı", message == f"'{title}' iade edildi. {minutes} dakika gecikme için "
+                                                 f"{minutes * 5} TL ceza kesildi!", message)
+        self.check("ödünç sayacı azaldı", self.available(book.Id) == 2)
+        self.expect_message("tekrar iade", self.txs.return_book_sp(tx.Id, user.Id),
+                            False, "Kitap zaten iade edilmiş")
+        self.expect_message("cezalıyken ödünç", self.txs.borrow_book_sp(book.Id, user.Id),
+                            False, "Ödenmemiş cezanız var. Önce cezanızı ödeyin.")
+
+        # Ceza ödeme
+        if penalties:
+            self.expect_message("başkasının cezası", self.penalties.pay_penalty_sp(penalty.Id, other.Id),
+                                False, "Bu ceza size ait değil")
+            self.expect_message("ceza ödendi", self.penalties.pay_penalty_sp(penalty.Id, user.Id),
+                                True, f"{penalty.Amount:.2f} TL ceza başarıyla ödendi")
+            self.expect_message("ödenmiş ceza", self.penalties.pay_penalty_sp(penalty.Id, user.Id),
+                                False, "Ceza zaten ödenmiş")
+            ledger = self.penalties.get_ledger_page(10, user_id=user.Id)
+            self.check("defter kayıtları", [(e.EntryType, e.Amount) for e in ledger] ==
+                       [("payment", -penalty.Amount), ("charge", penalty.Amount)], ledger)
+        self.check("ceza kalmadı", self.penalties.get_balance(user.Id) == (0.0, 0)
+                   and not self.penalties.get_by_user_id(user.Id))
+
+        # Toplu iade: her satır için ayrı ceza
+        first = self.txs.borrow_book_sp(book.Id, user.Id)[2]
+        second = self.txs.borrow_book_sp(book.Id, other.Id)[2]
+        self.check("toplu iade ödünçleri", first is not None and second is not None)
+        if first is None or second is None:
+            return
+        self.expect_message("stok tükendi", self.txs.borrow_book_sp(book.Id, third.Id),
+                            False, "Kitap stokta yok")
+        self.make_overdue(first.Id, 2)
+        self.make_overdue(second.Id, 5)
+        batch = self.txs.return_books_sp([first.Id, second.Id, first.Id, MISSING_ID])
+        self.check("toplu iade sonuç sayısı", len(batch) == 3, batch.keys())
+        for tx_id, minutes in ((first.Id, 2), (second.Id, 5)):
+            ok, message, amount, item = batch.get(tx_id, (False, None, 0.0, None))
+            self.check("toplu iade başarılı", ok and item is not None and item.RealReturnDate is not None, message)
+            self.check("toplu iade cezası", amount in (minutes * 5.0, (minutes + 1) * 5.0), amount)
+            self.check("toplu iade mesajı", message == f"'{title}' iade edildi. {int(amount) // 5} dakika "
+                                                       f"gecikme için {int(amount)} TL ceza kesildi!", message)
+        self.check("toplu iade olmayan işlem", batch.get(MISSING_ID, (None, None))[:2] == (False, "İşlem bulunamadı"))
+        self.check("toplu iade cezaları", len(self.penalties.get_by_user_id(user.Id)) == 1
+                   and len(self.penalties.get_by_user_id(other.Id)) == 1)
+        self.check("toplu iade sayacı", self.available(book.Id) == 2)
+        other_penalty = self.penalties.get_by_user_id(other.Id)
+        if other_penalty:
+            self.check("ceza silindi", self.penalties.delete(other_penalty[0].Id))
+            ledger = self.penalties.get_ledger_page(1, user_id=other.Id)
+            self.check("iptal kaydı", [(e.EntryType, e.Amount) for e in ledger] ==
+                       [("cancel", -other_penalty[0].Amount)], ledger)
+            self.check("iptalde bakiye", self.penalties.get_balance(other.Id) == (0.0, 0))
+        again = self.txs.return_books_sp([first.Id], user_id=other.Id)
+        self.check("toplu iade sahiplik", again[first.Id][:2] == (False, "Bu işlem size ait değil"), again)
+        again = self.txs.return_books_sp([first.Id])
+        self.check("toplu tekrar iade", again[first.Id][:2] == (False, "Kitap zaten iade edilmiş"), again)
+
+        # Zamanında iade
+        ok, message, on_time = self.txs.borrow_book_sp(book.Id, third.Id)
+        self.check("üçüncü ödünç", ok, message)
+        if on_time:
+            results = self.txs.return_books_sp([on_time.Id], user_id=third.Id)
+            self.check("zamanında toplu iade", results[on_time.Id][:3] ==
+                       (True, f"'{title}' başarıyla iade edildi. Teşekkürler!", 0.0), results)
+
+        # Panolar ve sayfalama
+        dashboard = self.stats.get_user_dashboard(user.Id, recent_limit=1)
+        self.check("üye panosu", dashboard is not None and dashboard["totalLoans"] == 2
+                   and dashboard["activeLoans"] == 0 and dashboard["nextDueDate"] is None
+                   and dashboard["outstandingPenalties"] == batch[first.Id][2]
+                   and len(dashboard["recentTransactions"]) == 1, dashboard)
+        summary = self.stats.get_summary()
+        self.check("yönetici özeti", summary is not None and summary["books"] >= 1, summary)
+        page = self.txs.get_page(2)
+        self.check("işlem sayfası", len(page) == 2, page)
+        if len(page) == 2:
+            rest = self.txs.get_page(2, after=(page[-1].BorrowDate, page[-1].Id))
+            self.check("keyset sonraki sayfa", all((t.BorrowDate, t.Id) < (page[-1].BorrowDate, page[-1].Id)
+                                                   for t in rest), rest)
+
+        # Açık ödüncü olan üyeyi silmek sayacı geri verir
+        ok, message, _ = self.txs.borrow_book_sp(book.Id, third.Id)
+        self.check("silme öncesi ödünç", ok and self.available(book.Id) == 1, message)
+        self.check("üye silindi", self.users.delete(third.Id))
+        self.check("silmede sayaç geri alındı", self.available(book.Id) == 2)
+
+
+def run_backend(backend: str) -> bool:
+    DatabaseConfig.BACKEND = backend
+    DatabaseConfig.reset_pool()
+    if backend == 'sqlserver':
+        try:
+            DatabaseConfig.get_connection().close()
+        except Exception as e:
+            print(f"[{backend}] ATLANDI: bağlantı kurulamadı ({e})")
+            return True
+    scenario = Scenario(backend)
+    scenario.run()
+    DatabaseConfig.reset_pool()
+    status = "BAŞARILI" if not scenario.failures else "BAŞARISIZ"
+    print(f"[{backend}] {status}: {scenario.checks - len(scenario.failures)}/{scenario.checks} kontrol")
+    for failure in scenario.failures:
+        print(f"    - {failure}")
+    return not scenario.failures
+
+
+def main(backends):
+    original = DatabaseConfig.BACKEND, DatabaseConfig.SQLITE_PATH
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        DatabaseConfig.SQLITE_PATH = os.path.join(tmp, 'conformance.db')
+        try:
+            for backend in backends:
+                ok = run_backend(backend) and ok
+        finally:
+            DatabaseConfig.BACKEND, DatabaseConfig.SQLITE_PATH = original
+            DatabaseConfig.reset_pool()
+    return ok
+
+
+if __name__ == '__main__':
+    sys.exit(0 if main(sys.argv[1:] or ['sqlite', 'sqlserver']) else 1)
@@ -0,0 +1,114 @@
+"""
+EVENT_FANOUT.PY - Canlı Akış Dağıtım Maliyeti
+
+services/event_hub.EventHub ölçülür:
+
+- Abone belleği: SUBSCRIBERS adet boşta abonenin hub tarafındaki maliyeti
+  (Subscription nesneleri; kuyruk yoktur, tracemalloc ile)
+- Yayın: SUBSCRIBERS abone beklerken EVENTS olay INTERVAL aralıkla yayınlanır; yayın süresi
+  (serileştirme + tampon + notify_all) ve yayından abonenin okumasına kadar
+  geçen gecikme (p50 / p99). Aboneler burada thread'dir; gevent worker'ında
+  aynı bekleme greenlet'lerle yapılır
+- Hedef kitle: olayların yarısı tek üyeye aittir, diğer üyelere gitmez
+
+    python -m benchmarks.event_fanout
+    python -m benchmarks.event_fanout 2000
+"""
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+
+from services.event_hub import EventHub
+
+SUBSCRIBERS = 1000
+EVENTS = 200
+INTERVAL = 0.02                 # Olaylar arası (saniyede 50 yazma)
+IDLE_SUBSCRIBERS = 10_000
+
+
+def subscriber_memory(count: int) -> float:
+    """Boşta abone başına bayt (hub tarafı)"""
+    hub = EventHub(max_subscribers=count)
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    subscriptions = [hub.subscribe(user_id=i, admin=False) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    for subscription in subscriptions:
+        subscription.close()
+    return size / count
+
+
+def fanout(subscribers: int, events: int) -> dict:
+    hub = EventHub(history=events * 2, heartbeat_seconds=60, max_subscribers=subscribers)
+    published_at = {}
+    latencies = []
+    received = [0] * subscribers
+    lock = threading.Lock()
+    ready = threading.Barrier(subscribers + 1)
+
+    def consume(index: int):
+        subscription = hub.subscribe(user_id=index, admin=index == 0)
+        next(subscription)                  # retry / bağlandı çerçevesi
+        ready.wait()
+        local = []
+        while received[index] < events:
+            chunk = next(subscription)
+            now = time.perf_counter()
+            for frame in chunk.split('\n\n'):
+                if frame.startswith('id: '):
+                    seq = int(frame[4:frame.index('\n')].rsplit('-', 1)[1])
+                    local.append(now - published_at[seq])
+                    received[index] += 1
+            # Üyeler sadece herkese açık olayları alır (tek üyeye ait olanlar 0 Id'li aboneye)
+            if index != 0 and received[index] >= events // 2:
+                break
+        subscription.close()
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=consume, args=(i,), daemon=True) for i in range(subscribers)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+
+    publish_seconds = []
+    for i in range(events):
+        user_id = 0 if i % 2 else None
+        started = time.perf_counter()
+        published_at[i + 1] = started
+        hub.publish('book.availability', {"id": i, "available": i % 5, "stockNumber": 5}, user_id=user_id)
+        publish_seconds.append(time.perf_counter() - started)
+        time.sleep(INTERVAL)
+    for thread in threads:
+        thread.join(timeout=30)
+
+    latencies.sort()
+    return {
+        "publish_us": statistics.median(publish_seconds) * 1e6,
+        "p50_ms": latencies[len(latencies) // 2] * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000,
+        "delivered": len(latencies),
+        "expected": events + (subscribers - 1) * (events // 2),
+        "admin_received": received[0],
+        "member_received": received[1] if subscribers > 1 else 0,
+    }
+
+
+def main(argv) -> int:
+    subscribers = int(argv[0]) if argv else SUBSCRIBERS
+    print(f"Boşta abone belleği ({IDLE_SUBSCRIBERS}): {subscriber_memory(IDLE_SUBSCRIBERS):.0f} bayt/abone")
+    result = fanout(subscribers, EVENTS)
+    print(f"{subscribers} abone, {EVENTS} olay:")
+    print(f"  yayın (medyan)     {result['publish_us']:8.1f} µs")
+    print(f"  teslim gecikmesi   p50 {result['p50_ms']:.2f} ms, p99 {result['p99_ms']:.2f} ms")
+    print(f"  teslim edilen      {result['delivered']} / {result['expected']}")
+    print(f"  yönetici / üye     {result['admin_received']} / {result['member_received']} olay")
+    return 0 if result['delivered'] == result['expected'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
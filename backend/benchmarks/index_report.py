@@ -0,0 +1,295 @@
+"""
+INDEX_REPORT.PY - Bekleyen Migration'lar: Önce / Sonra Sorgu Maliyeti
+
+Veritabanına üye, kitap, ROWS ödünç işlemi ve gecikme cezaları yazılır;
+sık çalışan sorgular bekleyen migration'lar uygulanmadan önce ve sonra
+ölçülür:
+
+- sqlite:    geçici dosyada başlangıç şeması (db_setup_sqlite.sql); süre
+             (en iyi ROUNDS tur) ve EXPLAIN QUERY PLAN (SCAN / SEARCH)
+- sqlserver: DatabaseConfig bağlantısı; tohum veri, migration'lar ve
+             ölçümler tek transaction'dadır ve sonunda geri alınır
+             (veritabanı değişmez, ama tablolar ölçüm boyunca kilitlidir:
+             canlı sunucuda değil, kopyasında çalıştırın). Tahmini plan
+             maliyeti (StatementSubTreeCost), süre ve erişilen index'ler.
+             Bağlanılamazsa atlanır
+
+Silme ifadeleri (cascade'li) savepoint'e geri alınarak ölçülür. Şemayı
+değiştiren migration'larda (ceza defteri: SQL Server 0003, SQLite 0002)
+"önce" ölçümü sorgunun başlangıç şemasındaki eşdeğeriyle yapılır (BASELINE).
+
+    python -m benchmarks.index_report
+    python -m benchmarks.index_report sqlite 200000
+    python -m benchmarks.index_report sqlserver
+"""
+import os
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+import migrate
+from config import DatabaseConfig
+from repositories import queries
+from repositories.query_catalog import SQLITE, SQLSERVER
+from repositories.sqlite import queries as sqlite_queries
+
+ROWS = 100_000
+USERS = 2_000
+BOOKS = 5_000
+AUTHORS = 500
+ROUNDS = 5
+
+SHOWPLAN_COLUMN = 'Microsoft SQL Server 2005 XML Showplan'
+SHOWPLAN_NS = '{http://schemas.microsoft.com/sqlserver/2004/07/showplan}'
+ACCESS_OPS = ('Index Seek', 'Index Scan', 'Clustered Index Seek', 'Clustered Index Scan', 'Table Scan')
+
+# (sorgu, parametreler: tohum Id'lerinden) - kullanıcı / kitap / yazar tohumun ortasından
+HOT_QUERIES = [
+    (queries.TRANSACTIONS_ACTIVE_COUNT, lambda ids: (ids['user'],)),
+    (sqlite_queries.BORROW_DUPLICATE, lambda ids: (ids['user'], ids['book'])),
+    (queries.PENALTY_BALANCE, lambda ids: (ids['user'],)),
+    (queries.PENALTIES_BY_USER, lambda ids: (ids['user'],)),
+    (queries.TRANSACTIONS_BY_USER, lambda ids: (ids['user'],)),
+    (queries.TRANSACTIONS_OPEN, lambda ids: ()),
+    (queries.ADMIN_SUMMARY, lambda ids: ()),
+    (queries.BOOK_DELETE, lambda ids: (ids['book'],)),
+    (queries.AUTHOR_DELETE, lambda ids: (ids['author'],)),
+]
+
+# Sorgu adı -> başlangıç şemasındaki eşdeğeri (PaidDate / UserPenaltyBalances yok)
+BASELINE = {
+    queries.PENALTY_BALANCE.name: """
+        SELECT COALESCE(SUM(p.Amount), 0), COUNT(*)
+        FROM Penalties p
+        INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
+        WHERE bt.UserId = ?
+    """,
+    queries.PENALTIES_BY_USER.name: queries.PENALTY_SELECT.format(top="") + """
+        WHERE bt.UserId = ?
+        ORDER BY p.Id DESC
+    """,
+    queries.ADMIN_SUMMARY.name: queries.ADMIN_SUMMARY.sql.replace(
+        "(SELECT COALESCE(SUM(Balance), 0) FROM UserPenaltyBalances)",
+        "(SELECT COALESCE(SUM(Amount), 0) FROM Penalties)"),
+}
+
+
+def _insert(conn, dialect: str, sql: str, rows):
+    cursor = conn.cursor()
+    if dialect == SQLSERVER:
+        cursor.fast_executemany = True
+    cursor.executemany(sql, rows)
+
+
+def _new_ids(conn, table: str, after: int) -> list:
+    return [row[0] for row in conn.cursor().execute(f"SELECT Id FROM {table} WHERE Id > ? ORDER BY Id", (after,))]
+
+
+def _max_id(conn, table: str) -> int:
+    return conn.cursor().execute(f"SELECT COALESCE(MAX(Id), 0) FROM {table}").fetchone()[0]
+
+
+def seed(conn, dialect: str, rows: int) -> dict:
+    """
+    Açık transaction'da tohum veri yazar (commit çağırana ait).
+    İşlemlerin beşte biri açık, iade edilenlerin onda biri gecikmeli (cezalı).
+
+    Returns:
+        Ölçümde kullanılacak kullanıcı / kitap / yazar Id'leri
+    """
+    tag = datetime.now().strftime('%H%M%S%f')
+    category = conn.cursor().execute("SELECT MIN(Id) FROM Categories").fetchone()[0]
+
+    last = _max_id(conn, 'Authors')
+    _insert(conn, dialect, "INSERT INTO Authors (Name, LastName, Country) VALUES (?, ?, ?)",
+            [(f"Yazar {i}", f"Rapor {tag}", "Türkiye") for i in range(AUTHORS)])
+    authors = _new_ids(conn, 'Authors', last)
+
+    last = _max_id(conn, 'Users')
+    _insert(conn, dialect, "INSERT INTO Users (FullName, Email, PasswordHash, Role) VALUES (?, ?, ?, 'user')",
+            [(f"Rapor Üye {i}", f"rapor{i}.{tag}@test.com", "0" * 64) for i in range(USERS)])
+    users = _new_ids(conn, 'Users', last)
+
+    # İşlemler önce üretilir: kitapların ActiveLoans sayacı açık ödünçlerle tutarlı olsun
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    transactions, open_loans = [], [0] * BOOKS
+    for i in range(rows):
+        book = (i * 7919) % BOOKS
+        borrowed = start + timedelta(minutes=i)
+        due = borrowed + timedelta(days=14)
+        if i % 5 == 0:
+            returned = None
+            open_loans[book] += 1
+        else:
+            returned = due + timedelta(minutes=30) if i % 10 == 1 else borrowed + timedelta(days=3)
+        transactions.append((book, (i * 104729) % USERS, borrowed, due, returned))
+
+    last = _max_id(conn, 'Books')
+    _insert(conn, dialect,
+            "INSERT INTO Books (Title, AuthorId, CategoryId, StockNumber, YearOfpublication, ActiveLoans) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(f"Rapor Kitabı {i} {tag}", authors[i % AUTHORS], category, open_loans[i] + 1, 1900 + i % 120,
+              open_loans[i]) for i in range(BOOKS)])
+    books = _new_ids(conn, 'Books', last)
+
+    last = _max_id(conn, 'BorrowTransactions')
+    _insert(conn, dialect,
+            "INSERT INTO BorrowTransactions (BookId, UserId, BorrowDate, ReturnDate, RealReturnDate) "
+            "VALUES (?, ?, ?, ?, ?)",
+            [(books[book], users[user], borrowed, due, returned)
+             for book, user, borrowed, due, returned in transactions])
+    # Trigger sadece UPDATE'te çalışır: gecikmeli iadelerin cezası doğrudan yazılır
+    conn.cursor().execute("""
+        INSERT INTO Penalties (BorrowTransactionsId, NumberOfDay, Amount, CreatedDate)
+        SELECT Id, 30, 150.00, RealReturnDate FROM BorrowTransactions
+        WHERE Id > ? AND RealReturnDate > ReturnDate
+    """, (last,))
+    return {'user': users[USERS // 2], 'book': books[BOOKS // 2], 'author': authors[AUTHORS // 2]}
+
+
+def _sqlite_plan(conn, text: str, params) -> str:
+    details = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + text, params)]
+    return " | ".join(detail for detail in details if detail.startswith(('SCAN', 'SEARCH')))
+
+
+def _sqlserver_plan(conn, text: str, params) -> tuple:
+    """Gerçek plan (STATISTICS XML): (toplam tahmini maliyet, erişilen index'ler)"""
+    cursor = conn.cursor()
+    cursor.execute("SET STATISTICS XML ON")
+    plans = []
+    try:
+        cursor.execute(text, params)
+        while True:
+            if cursor.description and cursor.description[0][0] == SHOWPLAN_COLUMN:
+                plans.append(cursor.fetchone()[0])
+            elif cursor.description:
+                cursor.fetchall()
+            if not cursor.nextset():
+                break
+    finally:
+        cursor.execute("SET STATISTICS XML OFF")
+    cost, access = 0.0, []
+    for plan in plans:
+        root = ET.fromstring(plan)
+        for statement in root.iter(SHOWPLAN_NS + 'StmtSimple'):
+            cost += float(statement.get('StatementSubTreeCost') or 0)
+        for relop in root.iter(SHOWPLAN_NS + 'RelOp'):
+            target = relop.find(f'*/{SHOWPLAN_NS}Object')
+            if relop.get('PhysicalOp') in ACCESS_OPS and target is not None:
+                name = (target.get('Index') or target.get('Table') or '').strip('[]')
+                entry = f"{relop.get('PhysicalOp')} {name}"
+                if entry not in access:
+                    access.append(entry)
+    return cost, " | ".join(access)
+
+
+def measure(conn, dialect: str, ids: dict, baseline: bool = False) -> dict:
+    """
+    sorgu adı -> (en iyi süre ms, maliyet veya None, plan özeti)
+
+    baseline: şema başlangıç sürümünde, BASELINE metinleri kullanılır
+    """
+    savepoint = {SQLITE: ("SAVEPOINT measure", "ROLLBACK TO measure", "RELEASE measure"),
+                 SQLSERVER: ("SAVE TRANSACTION measure", "ROLLBACK TRANSACTION measure", None)}[dialect]
+    results = {}
+    for query, make_params in HOT_QUERIES:
+        text, params = query.text(dialect), make_params(ids)
+        if baseline and query.name in BASELINE:
+            text = BASELINE[query.name]
+        best = float('inf')
+        for _ in range(ROUNDS):
+            cursor = conn.cursor()
+            cursor.execute(savepoint[0])
+            started = time.perf_counter()
+            cursor.execute(text, params)
+            while True:
+                if cursor.description:
+                    cursor.fetchall()
+                if dialect == SQLITE or not cursor.nextset():
+                    break
+            best = min(best, time.perf_counter() - started)
+            cursor.execute(savepoint[1])
+            if savepoint[2]:
+                cursor.execute(savepoint[2])
+        if dialect == SQLITE:
+            cost, plan = None, _sqlite_plan(conn, text, params)
+        else:
+            cursor = conn.cursor()
+            cursor.execute(savepoint[0])
+            cost, plan = _sqlserver_plan(conn, text, params)
+            cursor.execute(savepoint[1])
+        results[query.name] = (best * 1000, cost, plan)
+    return results
+
+
+def report(before: dict, after: dict) -> int:
+    """Sonrası öncesinden belirgin yavaşsa (2 kat ve 1 ms üstü) çıkış kodu 1"""
+    ok = True
+    for name, (ms_before, cost_before, plan_before) in before.items():
+        ms_after, cost_after, plan_after = after[name]
+        slower = ms_after > ms_before * 2 and ms_after - ms_before > 1
+        ok = ok and not slower
+        print(f"\n{name}{'  YAVAŞLADI' if slower else ''}")
+        for label, ms, cost, plan in (("önce ", ms_before, cost_before, plan_before),
+                                      ("sonra", ms_after, cost_after, plan_after)):
+            cost_text = f"  maliyet {cost:10.4f}" if cost is not None else ""
+            print(f"  {label} {ms:10.3f} ms{cost_text}  {plan}")
+    total_before = sum(value[0] for value in before.values())
+    total_after = sum(value[0] for value in after.values())
+    print(f"\nToplam: {total_before:.1f} ms -> {total_after:.1f} ms "
+          f"({total_before / max(total_after, 1e-9):.1f}x)")
+    return 0 if ok else 1
+
+
+def run_sqlite(rows: int) -> int:
+    import sqlite_database
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite_database.connect(os.path.join(tmp, 'index_report.db'), upgrade=False)
+        conn.autocommit = True
+        try:
+            print(f"[sqlite] Geçici veritabanına {rows} işlem yazılıyor...")
+            conn.execute("BEGIN")
+            ids = seed(conn, SQLITE, rows)
+            conn.execute("COMMIT")
+            before = measure(conn, SQLITE, ids, baseline=True)
+            for migration in migrate.upgrade(conn, SQLITE):
+                print(f"[sqlite] uygulandı: {migration.version:04d}_{migration.name}")
+            return report(before, measure(conn, SQLITE, ids))
+        finally:
+            conn.close()
+
+
+def run_sqlserver(rows: int) -> int:
+    try:
+        conn = DatabaseConfig.create_connection()
+    except Exception as e:
+        print(f"[sqlserver] ATLANDI: bağlantı kurulamadı ({e})")
+        return 0
+    try:
+        pending = migrate.pending(conn, SQLSERVER)
+        if not pending:
+            print("[sqlserver] Bekleyen migration yok: önce ve sonra aynı şemayla ölçülür")
+        print(f"[sqlserver] {rows} işlem yazılıyor (transaction sonunda geri alınır)...")
+        ids = seed(conn, SQLSERVER, rows)
+        # BASELINE metinleri sadece ceza defteri (0003) henüz uygulanmamışsa (şema ona göre) kullanılır
+        before = measure(conn, SQLSERVER, ids, baseline=any(m.name == 'penalty_ledger' for m in pending))
+        for migration in pending:
+            migration.run(conn, SQLSERVER)
+            print(f"[sqlserver] uygulandı (geri alınacak): {migration.version:04d}_{migration.name}")
+        return report(before, measure(conn, SQLSERVER, ids))
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def main(argv) -> int:
+    backend = argv[0] if argv and not argv[0].isdigit() else SQLITE
+    numbers = [arg for arg in argv if arg.isdigit()]
+    rows = int(numbers[0]) if numbers else ROWS
+    return (run_sqlite if backend == SQLITE else run_sqlserver)(rows)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
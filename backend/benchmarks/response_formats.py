@@ -0,0 +1,105 @@
+"""
+RESPONSE_FORMATS.PY - /api/transactions Biçim ve Sıkıştırma Ölçümü
+
+Geçici SQLite veritabanına ROWS ödünç işlemi yazılır; tam liste
+GET /api/transactions her biçim (json / columns / msgpack) ve kodlama
+(yok / gzip / br) için Flask test istemcisiyle istenir:
+
+- bayt:  yanıt gövdesi (kablodaki boyut, başlıklar hariç)
+- oran:  sıkıştırmasız json'a göre
+- süre:  istek süresi, en iyi ROUNDS tur (okuma + serileştirme + sıkıştırma)
+
+Her satırın gövdesi açılıp (gzip / br) çözülür ve aynı satır sayısı
+kontrol edilir; tutmazsa çıkış kodu 1 olur. Kurulu olmayan biçim /
+kodlama (msgpack, brotli paketleri) atlanır.
+
+    python -m benchmarks.response_formats
+    python -m benchmarks.response_formats 10000
+"""
+import gzip
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from config import DatabaseConfig, OverdueConfig
+
+ROWS = 100_000
+ROUNDS = 3
+
+
+def seed(rows: int) -> int:
+    """İade edilmiş / ödünçte karışık işlemler (trigger'lar çalışmaz: INSERT); toplam işlem sayısı"""
+    import sqlite_database
+    conn = sqlite_database.connect(DatabaseConfig.SQLITE_PATH)
+    books = [row[0] for row in conn.execute("SELECT Id FROM Books")]
+    users = [row[0] for row in conn.execute("SELECT Id FROM Users")]
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    conn.executemany(
+        "INSERT INTO BorrowTransactions (BookId, UserId, BorrowDate, ReturnDate, RealReturnDate) VALUES (?, ?, ?, ?, ?)",
+        ((books[i % len(books)], users[i % len(users)],
+          start + timedelta(minutes=i), start + timedelta(minutes=i + 1),
+          start + timedelta(minutes=i, seconds=40) if i % 4 else None)
+         for i in range(rows))
+    )
+    conn.commit()
+    total = conn.execute("SELECT COUNT(*) FROM BorrowTransactions").fetchone()[0]
+    conn.close()
+    return total
+
+
+def decode(body: bytes, encoding: str, fmt: str) -> int:
+    """Gövdeyi açar, satır sayısını döndürür"""
+    if encoding == 'gzip':
+        body = gzip.decompress(body)
+    elif encoding == 'br':
+        import brotli
+        body = brotli.decompress(body)
+    if fmt == 'msgpack':
+        import msgpack
+        return len(msgpack.unpackb(body))
+    data = json.loads(body)
+    return data['count'] if fmt == 'columns' else len(data)
+
+
+def run(rows: int = ROWS) -> int:
+    with tempfile.TemporaryDirectory() as tmp:
+        DatabaseConfig.BACKEND = 'sqlite'
+        DatabaseConfig.SQLITE_PATH = os.path.join(tmp, 'formats.db')
+        DatabaseConfig.reset_pool()
+        OverdueConfig.ENABLED = False
+        print(f"Geçici veritabanına {rows} işlem yazılıyor...")
+        expected = seed(rows)
+
+        from app import app
+        from compression import ENCODINGS
+        from controllers.formats import FORMATS
+        client = app.test_client()
+
+        ok = True
+        baseline = None
+        print(f"\n{'biçim':<10}{'kodlama':<9}{'bayt':>14}{'oran':>8}{'süre (ms)':>12}")
+        for fmt in FORMATS:
+            for encoding in ('identity', *reversed(ENCODINGS)):
+                headers = {'Accept-Encoding': encoding}
+                best = float('inf')
+                for _ in range(ROUNDS):
+                    started = time.perf_counter()
+                    response = client.get(f'/api/transactions?format={fmt}', headers=headers)
+                    body = response.get_data()
+                    best = min(best, time.perf_counter() - started)
+                served = response.headers.get('Content-Encoding', 'identity')
+                count = decode(body, served, fmt)
+                baseline = baseline or len(body)
+                good = response.status_code == 200 and served == encoding and count == expected
+                ok = ok and good
+                print(f"{fmt:<10}{encoding:<9}{len(body):>14,}{len(body) / baseline:>8.1%}{best * 1000:>12.0f}"
+                      f"{'' if good else '  HATA'}")
+        DatabaseConfig.reset_pool()
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS))
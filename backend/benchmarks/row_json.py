@@ -0,0 +1,185 @@
+"""
+ROW_JSON.PY - Liste Yanıtı Serileştirme: Bellek ve Hız
+
+/api/transactions tam liste yanıtının üç yolunu yerel SQLite kopya
+veritabanında (benchmarks/stream_memory.py ile aynı tablo) ROWS satırla
+çalıştırır:
+
+- eski:   fetchall -> @dataclass (instance __dict__'li) -> to_dict -> jsonify
+- slots:  fetchall -> @dataclass(slots=True) entity -> to_dict -> jsonify
+- satır:  fetchmany parçaları -> controllers/row_json.py -> tek gövde
+- okuma:  sadece fetchmany (sürücü ve tarih dönüşümü payı, taban çizgisi)
+
+Her yol için süre (en iyi ROUNDS tur) ve tracemalloc tepe bellek artışı
+raporlanır; ayrıca ROWS entity'nin listede kapladığı bellek iki entity
+türü için ayrı ölçülür. Önce dört liste endpoint'inin satır
+serileştiricisi jsonify çıktısıyla bayt bayt karşılaştırılır; fark varsa
+çıkış kodu 1 olur.
+
+    python -m benchmarks.row_json
+    python -m benchmarks.row_json 1000000
+"""
+import gc
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import fields, make_dataclass
+from datetime import datetime, timedelta
+
+from flask import Flask, jsonify
+
+from benchmarks.stream_memory import build_database
+from controllers import row_json
+from controllers.streaming import json_array_chunks
+from entities.borrow_transaction import BorrowTransaction
+from repositories.base_repository import BaseRepository
+from repositories.book_repository import BookRepository
+from repositories.penalty_repository import PenaltyRepository
+from repositories.transaction_repository import TransactionRepository
+from entities.user import User
+
+ROWS = 100_000
+ROUNDS = 3
+
+app = Flask(__name__)
+
+# Değişiklik öncesi entity: aynı alanlar ve to_dict, instance __dict__'li
+DictBorrowTransaction = make_dataclass(
+    'DictBorrowTransaction',
+    [(f.name, f.type, f.default) for f in fields(BorrowTransaction)],
+    namespace={'to_dict': BorrowTransaction.to_dict}
+)
+
+
+def _jsonify(items) -> str:
+    with app.app_context():
+        return jsonify([item.to_dict() for item in items]).get_data(as_text=True)
+
+
+def _row_json(serialize, rows) -> str:
+    return ''.join(json_array_chunks([rows], serialize)) + '\n'
+
+
+# ---- Çıktı eşitliği ----
+
+def check_equality() -> bool:
+    start = datetime(2024, 1, 1, 12, 0, 0)
+    samples = {
+        'books': (row_json.books, BookRepository._row_to_book, [
+            (1, 'Çalıkuşu', 1, 2, 5, 1922, 'Reşat Nuri', 'Roman', 3),
+            (2, 'Kitap "tırnaklı"\n', 3, 4, 2, None, None, None, None),
+        ]),
+        'transactions': (row_json.transactions, TransactionRepository._row_to_transaction, [
+            (1, 2, 3, start, start + timedelta(minutes=1), None, 'Şeker Portakalı', 'Ümit Ö.'),
+            (2, 2, 3, start + timedelta(microseconds=999999), start, start + timedelta(seconds=90), None, None),
+        ]),
+        'penalties': (row_json.penalties, PenaltyRepository._row_to_penalty, [
+            (1, 15.5, 7, 3, 'İpek Ağa', 4),
+            (2, 0, 8, None, None, None),
+        ]),
+        'users': (row_json.users, lambda row: User(*row), [
+            (1, 'Gül Şen', 'gul@test.com', 'hash', 'admin'),
+        ]),
+    }
+    ok = True
+    for name, (serialize, to_entity, rows) in samples.items():
+        expected = _jsonify([to_entity(row) for row in rows])
+        actual = _row_json(serialize, rows)
+        if name == 'penalties':
+            # date alanı datetime.now(): saniye sınırında farklı olabilir
+            expected, actual = (re.sub(r'"date":"[^"]*"', '"date":""', body) for body in (expected, actual))
+        same = expected == actual
+        ok = ok and same
+        print(f"{name:<14}{'AYNI' if same else 'FARKLI'}")
+        if not same:
+            print(f"  jsonify: {expected!r}\n  satır:   {actual!r}")
+    return ok
+
+
+# ---- Bellek ve hız ----
+
+def _fetch_all(cursor, entity):
+    to_entity = lambda row: entity(*row)
+    cursor.execute("SELECT * FROM BorrowTransactions ORDER BY Id DESC")
+    return _jsonify([to_entity(row) for row in cursor.fetchall()])
+
+
+def _fetch_rows(cursor):
+    cursor.execute("SELECT * FROM BorrowTransactions ORDER BY Id DESC")
+    chunks = BaseRepository.iter_chunks(cursor, None, BaseRepository.STREAM_CHUNK_SIZE)
+    return ''.join(json_array_chunks(chunks, row_json.transactions)) + '\n'
+
+
+def _read_only(cursor):
+    cursor.execute("SELECT * FROM BorrowTransactions ORDER BY Id DESC")
+    return sum(len(chunk) for chunk in BaseRepository.iter_chunks(cursor, None, BaseRepository.STREAM_CHUNK_SIZE))
+
+
+def _measure(call):
+    """(en iyi süre, tepe bellek artışı MB, gövde)"""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        gc.collect()
+        started = time.perf_counter()
+        body = call()
+        best = min(best, time.perf_counter() - started)
+        del body
+    gc.collect()
+    tracemalloc.start()
+    body = call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return best, peak / 2**20, body
+
+
+def _entity_memory(cursor, entity) -> float:
+    """Listede tutulan entity'lerin kapladığı bellek (MB)"""
+    cursor.execute("SELECT * FROM BorrowTransactions")
+    rows = cursor.fetchall()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [entity(*row) for row in rows]
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del entities
+    return used / 2**20
+
+
+def run(rows: int = ROWS) -> int:
+    ok = check_equality()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'stand_in.db')
+        print(f"\nKopya veritabanı oluşturuluyor ({rows} satır)...")
+        build_database(path, rows)
+        conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES)
+        cursor = conn.cursor()
+
+        print(f"\nEntity listesi belleği ({rows} nesne, satır değerleri hariç)")
+        for name, entity in (('@dataclass', DictBorrowTransaction), ('@dataclass(slots=True)', BorrowTransaction)):
+            print(f"  {name:<24}{_entity_memory(cursor, entity):>8.1f} MB")
+
+        print(f"\n{'yol':<10}{'süre (s)':>10}{'satır/s':>12}{'tepe (MB)':>12}")
+        bodies = {}
+        for name, call in (
+            ('eski', lambda: _fetch_all(cursor, DictBorrowTransaction)),
+            ('slots', lambda: _fetch_all(cursor, BorrowTransaction)),
+            ('satır', lambda: _fetch_rows(cursor)),
+            ('okuma', lambda: _read_only(cursor)),
+        ):
+            seconds, peak, bodies[name] = _measure(call)
+            print(f"{name:<10}{seconds:>10.3f}{rows / seconds:>12,.0f}{peak:>12.1f}")
+        conn.close()
+
+    same = bodies['eski'] == bodies['slots'] == bodies['satır']
+    print(f"\n{rows} satırlık gövdeler {'aynı' if same else 'FARKLI'} ({len(bodies['satır']) / 2**20:.1f} MB)")
+    return 0 if ok and same else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run(int(sys.argv[1]) if len(sys.argv) > 1 else ROWS))
@@ -0,0 +1,144 @@
+"""
+SEARCH_INDEX.PY - Katalog Arama Hızı
+
+SearchIndex'e BOOKS adet sentetik kitap yüklenir (Zipf dağılımlı Türkçe
+benzeri kelimeler, AUTHORS yazar, CATEGORIES kategori) ve sorgu türlerine
+göre gecikme yüzdelikleri (mikrosaniye) raporlanır:
+
+- başlıktan 2 kelime: rastgele bir kitabın adından, büyük harf / aksansız yazılmış
+- orta sıklıkta tek kelime
+- yazar soyadı + başlık kelimesi
+- çok sık kelime
+- kategori adı: ilk çalıştırma ve tekrarında (pahalı sorgu önbelleği)
+
+Erken durmanın sonucu değiştirmediği, aynı sorguların tam taramasıyla
+karşılaştırılarak doğrulanır.
+
+Artımlı güncellemelerin (kitap ekleme/güncelleme, yazar adı değişikliği)
+süresi de ölçülür; hedef sorgu başına 1 ms altı.
+
+    python -m benchmarks.search_index
+"""
+import itertools
+import random
+import resource
+import time
+
+from entities.book import Book
+from services.search_index import SearchIndex, fold, tokenize
+
+BOOKS = 500_000
+AUTHORS = 20_000
+CATEGORIES = 40
+VOCABULARY = 30_000
+QUERIES = 2_000
+CHUNK = 10_000
+
+_SYLLABLES = ['ka', 'ra', 'de', 'niz', 'ğı', 'şe', 'çi', 'ör', 'gü', 'lı', 'su', 'yol', 'ev', 'öz',
+              'ba', 'tan', 'kı', 'ış', 'ül', 'me', 'can', 'dağ', 'gö', 'ay', 'bü', 'şı', 'ya', 'zı']
+
+
+def _words(rng, count):
+    words = set()
+    while len(words) < count:
+        words.add(''.join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words, key=lambda w: rng.random())
+
+
+def _catalog(rng):
+    vocab = _words(rng, VOCABULARY)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(VOCABULARY)))
+    first = [w.capitalize() for w in _words(rng, 800)]
+    last = [w.capitalize() for w in _words(rng, 4000)]
+    authors = [f"{rng.choice(first)} {rng.choice(last)}" for _ in range(AUTHORS)]
+    categories = [w.capitalize() for w in _words(rng, CATEGORIES)]
+
+    def chunks():
+        book_id = 0
+        for _ in range(BOOKS // CHUNK):
+            chunk = []
+            for _ in range(CHUNK):
+                book_id += 1
+                title = ' '.join(rng.choices(vocab, cum_weights=cum_weights, k=rng.randint(1, 5))).capitalize()
+                a, c = rng.randrange(AUTHORS), rng.randrange(CATEGORIES)
+                chunk.append(Book(book_id, title, a + 1, c + 1, 3, 2000, authors[a], categories[c]))
+            yield chunk
+
+    return vocab, authors, categories, chunks
+
+
+def _latency(index, queries):
+    times = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query)
+        times.append((time.perf_counter() - started) * 1e6)
+    times.sort()
+    pick = lambda q: times[min(len(times) - 1, int(len(times) * q))]
+    return pick(0.5), pick(0.95), pick(0.99), sum(times) / len(times)
+
+
+def run():
+    rng = random.Random(42)
+    vocab, authors, categories, chunks = _catalog(rng)
+    index = SearchIndex()
+    titles = []
+
+    def recording():
+        for chunk in chunks():
+            titles.extend(b.Title for b in chunk[::50])
+            yield chunk
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    index.load(recording())
+    load_seconds = time.perf_counter() - started
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    stats = index.stats()
+    print(f"{stats['books']:,} kitap, {stats['titleTerms']:,} terim: yükleme {load_seconds:.1f} sn, "
+          f"~{(rss_after - rss_before) / 1024:.0f} MB")
+
+    def two_words():
+        words = rng.choice([t for t in (rng.choice(titles) for _ in range(5)) if ' ' in t] or titles).split()
+        query = ' '.join(rng.sample(words, min(2, len(words))))
+        return query.upper() if rng.random() < 0.5 else fold(query)
+
+    workloads = [
+        ("başlıktan 2 kelime", [two_words() for _ in range(QUERIES)]),
+        ("orta sıklıkta kelime", [rng.choice(vocab[200:5000]) for _ in range(QUERIES)]),
+        ("yazar soyadı + kelime", [f"{rng.choice(authors).split()[-1]} {rng.choice(vocab[:2000])}"
+                                   for _ in range(QUERIES)]),
+        ("çok sık kelime", vocab[:20]),
+        ("kategori adı (ilk)", categories[:20]),
+        ("kategori adı (tekrar)", categories[:20]),
+    ]
+    print(f"{'sorgu':<26}{'p50 µs':>10}{'p95 µs':>10}{'p99 µs':>10}{'ort. µs':>10}")
+    for name, queries in workloads:
+        p50, p95, p99, mean = _latency(index, queries)
+        print(f"{name:<26}{p50:>10,.0f}{p95:>10,.0f}{p99:>10,.0f}{mean:>10,.0f}")
+
+    # Erken durma = tam tarama (need sınırsız verilince hiç durmaz)
+    for query in workloads[0][1][:200] + workloads[2][1][:100] + categories[:5]:
+        plans = sorted((index._plan(term) for term in dict.fromkeys(tokenize(query))), key=lambda p: p[0])
+        if plans[0][0]:
+            assert index.search(query) == index._top(plans, BOOKS)[0][:20], query
+
+    # Türkçe katlama: aynı sorgunun farklı yazımları aynı sonucu verir
+    sample = titles[0]
+    assert index.search(sample.upper()) == index.search(fold(sample)) == index.search(sample)
+    assert index.search(sample)
+
+    updates = 2_000
+    started = time.perf_counter()
+    for i in range(updates):
+        index.upsert_book(Book(BOOKS + i + 1, f"Yeni kitap {rng.choice(vocab)}", 1, 1, 1, 2024))
+    upsert_us = (time.perf_counter() - started) / updates * 1e6
+    started = time.perf_counter()
+    for i in range(updates):
+        index.set_author(i + 1, f"Yeni {rng.choice(vocab)}")
+    rename_us = (time.perf_counter() - started) / updates * 1e6
+    print(f"Artımlı güncelleme: kitap ekleme {upsert_us:,.0f} µs, yazar adı değişikliği {rename_us:,.0f} µs")
+
+
+if __name__ == '__main__':
+    run()
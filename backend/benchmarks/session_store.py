@@ -0,0 +1,103 @@
+"""
+SESSION_STORE.PY - Token Doğrulama Hızı
+
+AuthService'in token aramasını (SessionStore.get) ölçer:
+
+- dict:   eski AuthService.active_sessions (süresiz, süreç içi)
+- memory: MemorySessionStore (TTL + kayan süre)
+- sqlite: SqliteSessionStore, tek süreç ve WORKERS süreç aynı anda
+
+Depoda SESSIONS adet oturum varken rastgele geçerli / geçersiz token'lar
+aranır; saniyedeki doğrulama sayısı raporlanır. SQLite ölçümünde token'lar
+ana süreçte oluşturulur, worker'lar fork sonrası aynı dosyadan okur
+(süreçler arası görünürlük de doğrulanır).
+
+    python -m benchmarks.session_store
+"""
+import multiprocessing
+import os
+import random
+import secrets
+import tempfile
+import time
+
+from services.session_store import MemorySessionStore, SqliteSessionStore
+
+SESSIONS = 100_000
+LOOKUPS = 200_000
+WORKERS = 4
+TTL = 3600
+
+
+def _tokens(count: int):
+    return [secrets.token_hex(32) for _ in range(count)]
+
+
+def _lookup_keys(tokens, count: int, miss_ratio: float = 0.1):
+    rng = random.Random(42)
+    misses = _tokens(max(1, int(count * miss_ratio) // 100))
+    return [rng.choice(misses) if rng.random() < miss_ratio else rng.choice(tokens) for _ in range(count)]
+
+
+def _rate(get, keys) -> float:
+    started = time.perf_counter()
+    for key in keys:
+        get(key)
+    return len(keys) / (time.perf_counter() - started)
+
+
+def _worker(path, keys, queue):
+    store = SqliteSessionStore(path, ttl_seconds=TTL)
+    found = sum(1 for key in keys[:1000] if store.get(key) is not None)
+    queue.put((_rate(store.get, keys), found))
+
+
+def run():
+    tokens = _tokens(SESSIONS)
+    keys = _lookup_keys(tokens, LOOKUPS)
+    print(f"{SESSIONS} oturum, {LOOKUPS} arama (%10 geçersiz token)")
+    print(f"{'depo':<24}{'doğrulama/sn':>16}")
+
+    legacy = {token: i for i, token in enumerate(tokens)}
+    print(f"{'dict (eski)':<24}{_rate(legacy.get, keys):>16,.0f}")
+
+    memory = MemorySessionStore(ttl_seconds=TTL)
+    for i, token in enumerate(tokens):
+        memory.create(token, i + 1)
+    print(f"{'memory':<24}{_rate(memory.get, keys):>16,.0f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'sessions.db')
+        store = SqliteSessionStore(path, ttl_seconds=TTL)
+        conn = store._connection()
+        conn.execute("BEGIN")
+        for i, token in enumerate(tokens):
+            store.create(token, i + 1)
+        conn.execute("COMMIT")
+        print(f"{'sqlite / 1 süreç':<24}{_rate(store.get, keys):>16,.0f}")
+
+        ctx = multiprocessing.get_context('fork')
+        queue = ctx.Queue()
+        chunk = len(keys) // WORKERS
+        procs = [ctx.Process(target=_worker, args=(path, keys[i * chunk:(i + 1) * chunk], queue))
+                 for i in range(WORKERS)]
+        for p in procs:
+            p.start()
+        results = [queue.get() for _ in procs]
+        for p in procs:
+            p.join()
+        total = sum(rate for rate, _ in results)
+        print(f"{f'sqlite / {WORKERS} süreç':<24}{total:>16,.0f}")
+        assert all(found > 0 for _, found in results), "worker'lar ana süreçteki oturumları görmüyor"
+
+    # Süre dolumu: kısa TTL ile oluşturulan oturumlar aramada ve taramada düşer
+    short = MemorySessionStore(ttl_seconds=0.05)
+    for token in tokens[:1000]:
+        short.create(token, 1)
+    time.sleep(0.06)
+    assert short.get(tokens[0]) is None
+    print(f"Süresi dolan oturum taraması: {short.sweep() + 1} kayıt silindi")
+
+
+if __name__ == '__main__':
+    run()
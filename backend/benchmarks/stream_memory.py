@@ -0,0 +1,119 @@
+"""
+STREAM_MEMORY.PY - Akış Yanıtı Bellek Ölçümü
+
+/api/transactions yanıtının iki yolunu yerel SQLite kopya veritabanında
+(BorrowTransactions ile aynı sütunlar) 10k - 1M satırla çalıştırır:
+
+- liste: fetchall -> entity listesi -> dict listesi -> tek JSON metni
+- akış:  fetchmany parçaları -> parça parça JSON (controllers/streaming.py)
+
+Her ölçüm ayrı süreçte yapılır; tepe RSS artışı (ru_maxrss) raporlanır.
+Akış yolunda tepe bellek satır sayısından bağımsız kalmalıdır; en büyük
+ve en küçük ölçüm arasındaki fark STREAM_TOLERANCE_MB'ı aşarsa çıkış
+kodu 1 olur.
+
+    python -m benchmarks.stream_memory
+    python -m benchmarks.stream_memory 10000 100000 1000000
+"""
+import os
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ROW_COUNTS = (10_000, 100_000, 1_000_000)
+STREAM_TOLERANCE_MB = 8.0
+
+
+def build_database(path: str, rows: int):
+    """Yerel kopya veritabanını oluşturur (JOIN sonrası satır biçiminde)"""
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE BorrowTransactions (
+            Id INTEGER PRIMARY KEY, BookId INTEGER, UserId INTEGER,
+            BorrowDate TIMESTAMP, ReturnDate TIMESTAMP, RealReturnDate TIMESTAMP,
+            BookTitle TEXT, UserName TEXT
+        )
+    """)
+    start = datetime(2024, 1, 1)
+    conn.executemany(
+        "INSERT INTO BorrowTransactions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        ((i, i % 500 + 1, i % 200 + 1,
+          start + timedelta(minutes=i), start + timedelta(minutes=i + 1),
+          None if i % 3 else start + timedelta(minutes=i + 2),
+          f"Kitap {i % 500}", f"Üye {i % 200}")
+         for i in range(1, rows + 1))
+    )
+    conn.commit()
+    conn.close()
+
+
+def _rss_mb() -> float:
+    # Linux'ta ru_maxrss KB cinsindendir
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(path: str, rows: int, mode: str):
+    """Alt süreçte çalışır: tek yolu ölçer ve 'tepe_artış süre' yazar"""
+    from flask import json
+    from controllers.streaming import json_array_chunks
+    from repositories.base_repository import BaseRepository
+    from repositories.transaction_repository import TransactionRepository
+
+    to_entity = TransactionRepository._row_to_transaction
+    conn = sqlite3.connect(path, detect_types=sqlite3.PARSE_DECLTYPES)
+    cursor = conn.cursor()
+    baseline = _rss_mb()
+    started = time.perf_counter()
+
+    # Sıralama PK üzerinden: SQLite'ın kendi sıralama belleği ölçüme karışmasın
+    cursor.execute("SELECT * FROM BorrowTransactions WHERE Id <= ? ORDER BY Id DESC", (rows,))
+    with open(os.devnull, 'w') as sink:
+        if mode == 'stream':
+            chunks = BaseRepository.iter_chunks(cursor, to_entity, BaseRepository.STREAM_CHUNK_SIZE)
+            for part in json_array_chunks(chunks):
+                sink.write(part)
+        else:
+            transactions = [to_entity(row) for row in cursor.fetchall()]
+            sink.write(json.dumps([t.to_dict() for t in transactions]))
+
+    elapsed = time.perf_counter() - started
+    print(f"{_rss_mb() - baseline:.1f} {elapsed:.2f}")
+
+
+def run(row_counts=ROW_COUNTS) -> int:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'stand_in.db')
+        print(f"Kopya veritabanı oluşturuluyor ({max(row_counts)} satır)...")
+        build_database(path, max(row_counts))
+
+        print(f"{'satır':>10}{'liste (MB)':>14}{'akış (MB)':>14}{'liste (s)':>12}{'akış (s)':>12}")
+        for rows in row_counts:
+            line = {}
+            for mode in ('list', 'stream'):
+                out = subprocess.run(
+                    [sys.executable, '-m', 'benchmarks.stream_memory', '--measure', path, str(rows), mode],
+                    check=True, capture_output=True, text=True
+                ).stdout.split()
+                line[mode] = (float(out[0]), float(out[1]))
+            results[rows] = line
+            print(f"{rows:>10}{line['list'][0]:>14.1f}{line['stream'][0]:>14.1f}"
+                  f"{line['list'][1]:>12.2f}{line['stream'][1]:>12.2f}")
+
+    peaks = [line['stream'][0] for line in results.values()]
+    spread = max(peaks) - min(peaks)
+    ok = spread <= STREAM_TOLERANCE_MB
+    print(f"Akış tepe bellek farkı: {spread:.1f} MB ({'SABİT' if ok else 'BÜYÜYOR'})")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--measure':
+        measure(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+    else:
+        counts = tuple(int(a) for a in sys.argv[1:]) or ROW_COUNTS
+        sys.exit(run(counts))
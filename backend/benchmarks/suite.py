@@ -0,0 +1,291 @@
+"""
+SUITE.PY - Sıcak Yol Mikro Benchmark Paketi
+
+Her benchmark bir kurulum fonksiyonudur; ölçülecek çağrıyı (argümansız
+callable) döndürür. Çağrı başına süre, tur başına ~TARGET_ROUND_SECONDS
+sürecek kadar tekrarla ölçülür (pytest-benchmark gibi: min / medyan /
+ortalama / sapma / ops).
+
+Gruplar:
+- validation:    BaseRepository.validate_input / validate_email
+- hydration:     satır -> entity (BookRepository, TransactionRepository)
+- serialization: Book.to_dict / BorrowTransaction.to_dict, büyük listelerin jsonify'ı,
+                 satırdan doğrudan JSON (controllers/row_json.py)
+- service:       BorrowService ödünç al + iade (geçici SQLite veritabanında, gerçek SQL)
+
+Sonuçlar JSON olarak kaydedilir (varsayılan benchmarks/results/<commit>.json);
+--compare ile önceki bir kayıtla medyanlar karşılaştırılır, --fail-threshold
+aşılırsa çıkış kodu 1'dir.
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite -k serialization --save /tmp/yeni.json --compare benchmarks/results/abc1234.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from config import DatabaseConfig
+
+ROWS = 10_000
+ROUNDS = 7
+TARGET_ROUND_SECONDS = 0.05
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+BENCHMARKS = []
+
+
+def benchmark(group: str):
+    def register(setup):
+        BENCHMARKS.append((group, setup.__name__, setup))
+        return setup
+    return register
+
+
+def _book_rows(count: int = ROWS):
+    return [(i, f"Kitap {i}", i % 500 + 1, i % 40 + 1, 5, 1900 + i % 120,
+             f"Yazar {i % 500}", f"Kategori {i % 40}", i % 5) for i in range(1, count + 1)]
+
+
+def _transaction_rows(count: int = ROWS):
+    start = datetime(2024, 1, 1, 12, 0, 0)
+    rows = []
+    for i in range(1, count + 1):
+        borrowed = start + timedelta(minutes=i)
+        rows.append((i, i % 500 + 1, i % 1000 + 1, borrowed, borrowed + timedelta(minutes=1),
+                     borrowed + timedelta(seconds=90) if i % 3 else None, f"Kitap {i % 500}", f"Üye {i % 1000}"))
+    return rows
+
+
+# ---- validation ----
+
+@benchmark('validation')
+def validate_input_short():
+    from repositories.base_repository import BaseRepository
+    return lambda: BaseRepository.validate_input("Kürk Mantolu Madonna", "title")
+
+
+@benchmark('validation')
+def validate_input_1000_chars():
+    from repositories.base_repository import BaseRepository
+    value = ("Yüzyıllık Yalnızlık " * 50)[:1000]
+    return lambda: BaseRepository.validate_input(value, "title")
+
+
+@benchmark('validation')
+def validate_email():
+    from repositories.base_repository import BaseRepository
+    return lambda: BaseRepository.validate_email("test.kullanici@kutuphane.com.tr")
+
+
+# ---- hydration ----
+
+@benchmark('hydration')
+def book_rows_to_entities():
+    from repositories.book_repository import BookRepository
+    rows, to_entity = _book_rows(), BookRepository._row_to_book
+    return lambda: [to_entity(row) for row in rows]
+
+
+@benchmark('hydration')
+def transaction_rows_to_entities():
+    from repositories.transaction_repository import TransactionRepository
+    rows, to_entity = _transaction_rows(), TransactionRepository._row_to_transaction
+    return lambda: [to_entity(row) for row in rows]
+
+
+# ---- serialization ----
+
+@benchmark('serialization')
+def book_to_dict():
+    from repositories.book_repository import BookRepository
+    books = [BookRepository._row_to_book(row) for row in _book_rows()]
+    return lambda: [book.to_dict() for book in books]
+
+
+@benchmark('serialization')
+def transaction_to_dict():
+    from repositories.transaction_repository import TransactionRepository
+    txs = [TransactionRepository._row_to_transaction(row) for row in _transaction_rows()]
+    return lambda: [tx.to_dict() for tx in txs]
+
+
+def _jsonify(items):
+    from flask import Flask, jsonify
+    app = Flask(__name__)
+
+    def call():
+        with app.app_context():
+            return jsonify([item.to_dict() for item in items]).get_data()
+    return call
+
+
+@benchmark('serialization')
+def jsonify_books():
+    from repositories.book_repository import BookRepository
+    return _jsonify([BookRepository._row_to_book(row) for row in _book_rows()])
+
+
+@benchmark('serialization')
+def jsonify_transactions():
+    from repositories.transaction_repository import TransactionRepository
+    return _jsonify([TransactionRepository._row_to_transaction(row) for row in _transaction_rows()])
+
+
+@benchmark('serialization')
+def row_json_books():
+    from controllers import row_json
+    rows = _book_rows()
+    return lambda: row_json.books(rows)
+
+
+@benchmark('serialization')
+def row_json_transactions():
+    from controllers import row_json
+    rows = _transaction_rows()
+    return lambda: row_json.transactions(rows)
+
+
+# ---- service ----
+
+@benchmark('service')
+def borrow_and_return():
+    """Ödünç al + zamanında iade: iki UnitOfWork, procedure kontrolleri ve trigger"""
+    from services.borrow_service import BorrowService
+    from services.user_service import user_service
+    from services.book_service import book_service
+
+    service = BorrowService()
+    user = user_service.create("Benchmark Üye", f"bench.{time.time_ns()}@test.com", "123456")
+    book = book_service.create("Benchmark Kitabı", 1, 1, 1, 2024)
+
+    def call():
+        ok, message, tx = service.borrow_book(user.Id, book.Id)
+        assert ok, message
+        ok, message, _ = service.return_book(tx.Id, user.Id)
+        assert ok, message
+    return call
+
+
+# ---- ölçüm ----
+
+def measure(call) -> dict:
+    call()  # ısınma
+    iterations, elapsed = 1, 0.0
+    while True:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        elapsed = time.perf_counter() - started
+        if elapsed >= TARGET_ROUND_SECONDS / 5 or iterations >= 1 << 20:
+            break
+        iterations *= 10
+    iterations = max(1, int(iterations * TARGET_ROUND_SECONDS / max(elapsed, 1e-9)))
+
+    times = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            call()
+        times.append((time.perf_counter() - started) / iterations)
+    median = statistics.median(times)
+    return {
+        "min": min(times),
+        "max": max(times),
+        "mean": statistics.fmean(times),
+        "median": median,
+        "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+        "rounds": ROUNDS,
+        "iterations": iterations,
+        "ops": 1 / median if median else 0.0
+    }
+
+
+def _commit() -> dict:
+    try:
+        sha = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                             check=True).stdout.strip()
+        dirty = bool(subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                    capture_output=True, text=True).stdout.strip())
+        return {"id": sha, "dirty": dirty}
+    except (OSError, subprocess.CalledProcessError):
+        return {"id": "unknown", "dirty": None}
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e3), ("µs", 1e6)):
+        if seconds >= 1 / scale:
+            return f"{seconds * scale:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def compare(results: list, baseline_path: str, threshold: float) -> bool:
+    """Medyanları önceki kayıtla karşılaştırır; threshold üzeri yavaşlama varsa False"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {b["name"]: b for b in json.load(f)["benchmarks"]}
+    ok = True
+    print(f"\n{'karşılaştırma: ' + os.path.basename(baseline_path):<36}{'önce':>12}{'şimdi':>12}{'değişim':>10}")
+    for result in results:
+        before = baseline.get(result["name"])
+        if before is None:
+            continue
+        old, new = before["stats"]["median"], result["stats"]["median"]
+        change = new / old - 1
+        mark = " ▲" if change > threshold else (" ▼" if change < -threshold else "")
+        ok = ok and change <= threshold
+        print(f"{result['name']:<36}{_format_time(old):>12}{_format_time(new):>12}{change:>+9.1%}{mark}")
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    parser.add_argument('-k', dest='filter', help="Adında veya grubunda bu metin geçen benchmark'lar")
+    parser.add_argument('--save', help='Sonuç dosyası (varsayılan: benchmarks/results/<commit>.json)')
+    parser.add_argument('--compare', help='Karşılaştırılacak önceki sonuç dosyası')
+    parser.add_argument('--fail-threshold', type=float, default=0.10,
+                        help='İzin verilen medyan yavaşlaması (0.10 = %%10)')
+    args = parser.parse_args(argv)
+
+    selected = [(group, name, setup) for group, name, setup in BENCHMARKS
+                if not args.filter or args.filter in name or args.filter == group]
+    commit = _commit()
+    results = []
+
+    # Servis benchmark'ları geçici SQLite veritabanında çalışır (servisler import edilmeden önce seçilir)
+    with tempfile.TemporaryDirectory() as tmp:
+        DatabaseConfig.BACKEND = 'sqlite'
+        DatabaseConfig.SQLITE_PATH = os.path.join(tmp, 'suite.db')
+        DatabaseConfig.reset_pool()
+        print(f"{'benchmark':<36}{'medyan':>12}{'min':>12}{'sapma':>10}{'ops':>14}")
+        for group, name, setup in selected:
+            stats = measure(setup())
+            results.append({"name": name, "group": group, "stats": stats})
+            print(f"{name:<36}{_format_time(stats['median']):>12}{_format_time(stats['min']):>12}"
+                  f"{stats['stddev'] / stats['median']:>9.1%}{stats['ops']:>14,.0f}")
+        DatabaseConfig.reset_pool()
+
+    path = args.save or os.path.join(RESULTS_DIR, f"{commit['id']}{'-dirty' if commit['dirty'] else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            "datetime": datetime.now().isoformat(timespec='seconds'),
+            "commit": commit,
+            "machine": {"python": platform.python_version(), "implementation": platform.python_implementation(),
+                        "platform": platform.platform(), "cpus": os.cpu_count()},
+            "benchmarks": results
+        }, f, ensure_ascii=False, indent=2)
+    print(f"\nSonuçlar: {path}")
+
+    if args.compare:
+        return 0 if compare(results, args.compare, args.fail_threshold) else 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+VALIDATE_INPUT.PY - Girdi Doğrulama Mikro Benchmark'ı
+
+Eski döngü (her kalıp için ayrı re.search + IGNORECASE) ile derlenmiş
+tek geçişli InputValidator'ı kısa ve 1000 karakterlik girdilerde karşılaştırır.
+
+    python -m benchmarks.validate_input
+"""
+import logging
+import re
+import timeit
+
+from repositories.base_repository import BaseRepository
+from repositories.input_validator import InputValidator
+
+PATTERNS = BaseRepository.SQL_INJECTION_PATTERNS
+
+
+def legacy_validate(value) -> bool:
+    """Eski BaseRepository.validate_input döngüsü (print hariç)"""
+    if value is None or not isinstance(value, str):
+        return True
+    if len(value.strip()) == 0:
+        return True
+    if len(value) > 1000:
+        return False
+    for pattern in PATTERNS:
+        if re.search(pattern, value, re.IGNORECASE):
+            return False
+    return True
+
+
+CASES = {
+    "kısa / tek kelime": "Dostoyevski",
+    "kısa / boşluklu": "Kürk Mantolu Madonna",
+    "kısa / injection": "x' OR '1'='1",
+    "1000 / tek kelime": "a" * 1000,
+    "1000 / boşluklu": ("Yüzyıllık Yalnızlık " * 50)[:1000],
+    "1000 / sonda injection": ("Suç ve Ceza " * 90)[:990] + "; DROP x",
+}
+
+
+def run(number: int = 20000):
+    logging.disable(logging.WARNING)
+    validator = InputValidator(BaseRepository.SQL_INJECTION_RULES)
+    new_validate = validator.check
+
+    print(f"{'girdi':<26}{'eski (µs)':>12}{'yeni (µs)':>12}{'hızlanma':>10}")
+    for name, value in CASES.items():
+        assert legacy_validate(value) == (new_validate(value) is None), name
+        old = min(timeit.repeat(lambda: legacy_validate(value), number=number, repeat=3)) / number
+        new = min(timeit.repeat(lambda: new_validate(value), number=number, repeat=3)) / number
+        print(f"{name:<26}{old * 1e6:>12.2f}{new * 1e6:>12.2f}{old / new:>9.1f}x")
+
+    records = [{"title": v, "author": "Orhan Pamuk"} for v in CASES.values()] * 500
+    old = min(timeit.repeat(
+        lambda: [legacy_validate(v) for r in records for v in r.values()], number=5, repeat=3)) / 5
+    new = min(timeit.repeat(lambda: validator.validate_records(records), number=5, repeat=3)) / 5
+    print(f"{'toplu / ' + str(len(records)) + ' kayıt':<26}{old * 1e3:>10.2f}ms{new * 1e3:>10.2f}ms{old / new:>9.1f}x")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,100 @@
+"""
+COMPRESSION.PY - Yanıt Sıkıştırma (gzip / brotli)
+
+app.py'deki after_request kancası her yanıtı compress_response'a verir:
+- Kodlama Accept-Encoding'den seçilir: br (brotli paketi kuruluysa), yoksa gzip
+- Sadece CompressionConfig.MIMETYPES; MIN_BYTES altındaki gövdeler olduğu gibi gider
+- Akış yanıtları (?stream=1) parça parça sıkıştırılır; her parça flush edilir,
+  istemci veriyi beklemeden açabilir
+- Sıkıştırılan yanıtın ETag'i zayıf (W/) olur: gövde baytları değişti,
+  içerik aynı (conditional.py If-None-Match'i zayıf karşılaştırır)
+
+Dosya yanıtları (send_from_directory, direct_passthrough) ve zaten
+kodlanmış yanıtlar sıkıştırılmaz.
+"""
+import zlib
+
+from flask import Response, request
+
+from config import CompressionConfig
+
+try:
+    import brotli
+except ImportError:     # isteğe bağlı: yoksa sadece gzip
+    brotli = None
+
+ENCODINGS = ('br', 'gzip') if brotli else ('gzip',)
+
+
+class _GzipStream:
+    def __init__(self):
+        self._z = zlib.compressobj(CompressionConfig.GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._z.compress(data) + self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush()
+
+
+class _BrotliStream:
+    def __init__(self):
+        self._c = brotli.Compressor(quality=CompressionConfig.BROTLI_QUALITY)
+
+    def chunk(self, data: bytes) -> bytes:
+        return self._c.process(data) + self._c.flush()
+
+    def finish(self) -> bytes:
+        return self._c.finish()
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=CompressionConfig.BROTLI_QUALITY)
+    return zlib.compress(data, CompressionConfig.GZIP_LEVEL, wbits=31)
+
+
+def _compress_stream(chunks, encoding: str):
+    stream = _BrotliStream() if encoding == 'br' else _GzipStream()
+    try:
+        for data in chunks:
+            out = stream.chunk(data)
+            if out:
+                yield out
+        yield stream.finish()
+    finally:
+        # İstemci koparsa iç generator (ve bağlantısı) da kapansın
+        close = getattr(chunks, 'close', None)
+        if close:
+            close()
+
+
+def negotiate_encoding():
+    """İstemcinin kabul ettiği en iyi kodlama ('br' / 'gzip') veya None"""
+    return request.accept_encodings.best_match(ENCODINGS)
+
+
+def compress_response(response: Response) -> Response:
+    if (response.mimetype not in CompressionConfig.MIMETYPES or response.direct_passthrough
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers):
+        return response
+    response.vary.add('Accept-Encoding')
+
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+    if response.is_streamed:
+        response.response = _compress_stream(response.iter_encoded(), encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < CompressionConfig.MIN_BYTES:
+            return response
+        response.set_data(compress(data, encoding))
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -1,26 +1,165 @@
 """
 CONFIG.PY - Veritabanı Konfigürasyonu
 """
-import pyodbc
+import atexit
+import os
+import tempfile
+import threading
+from connection_pool import ConnectionPool
+from metrics import metrics
 
 class DatabaseConfig:
+    # Depolama sürücüsü: 'sqlserver' (pyodbc + stored procedure'ler) veya
+    # 'sqlite' (tek dosya; yerel geliştirme, benchmark ve yük testi için)
+    BACKEND = 'sqlserver'
+    SQLITE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'kutuphane.db')
+
     SERVER = r'excaliburG870\SQLEXPRESS'
     DATABASE = 'KutuphaneDB'
     DRIVER = '{ODBC Driver 17 for SQL Server}'
-    
+
+    # Bağlantı havuzu ayarları
+    POOL_MIN_SIZE = 2               # Boşta tutulacak minimum bağlantı
+    POOL_MAX_SIZE = 10              # Aynı anda açık maksimum bağlantı
+    POOL_TIMEOUT = 5.0              # Havuz doluyken bekleme süresi (saniye)
+    POOL_RECYCLE_SECONDS = 1800     # Bu süreden eski bağlantılar yenilenir
+    POOL_PRE_PING = True            # Uzun süre boşta kalan bağlantıyı kullanmadan önce test et
+    POOL_PING_AFTER_SECONDS = 30    # Pre-ping için minimum boşta kalma süresi
+    POOL_IDLE_TIMEOUT = 300         # min_size üzerindeki boşta bağlantıların ömrü
+
+    _pool = None
+    _pool_lock = threading.Lock()
+
     @classmethod
     def get_connection_string(cls):
         return f'DRIVER={cls.DRIVER};SERVER={cls.SERVER};DATABASE={cls.DATABASE};Trusted_Connection=yes;'
-    
+
     @classmethod
-    def get_connection(cls):
+    def create_connection(cls):
+        """Havuzu kullanmadan yeni fiziksel bağlantı açar"""
+        if cls.BACKEND == 'sqlite':
+            import sqlite_database
+            return sqlite_database.connect(cls.SQLITE_PATH)
+        # pyodbc sadece SQL Server sürücüsünde gerekir
+        import pyodbc
         return pyodbc.connect(cls.get_connection_string())
-    
+
+    @classmethod
+    def get_pool(cls) -> ConnectionPool:
+        if cls._pool is None:
+            with cls._pool_lock:
+                if cls._pool is None:
+                    cls._pool = ConnectionPool(
+                        cls.create_connection,
+                        min_size=cls.POOL_MIN_SIZE,
+                        max_size=cls.POOL_MAX_SIZE,
+                        timeout=cls.POOL_TIMEOUT,
+                        recycle_seconds=cls.POOL_RECYCLE_SECONDS,
+                        pre_ping=cls.POOL_PRE_PING,
+                        ping_after_seconds=cls.POOL_PING_AFTER_SECONDS,
+                        idle_timeout=cls.POOL_IDLE_TIMEOUT,
+                        observer=metrics.db_observer if MetricsConfig.ENABLED else None
+                    )
+                    atexit.register(cls._pool.dispose)
+        return cls._pool
+
+    @classmethod
+    def get_connection(cls, read_only: bool = False):
+        """Havuzdan bağlantı alır; close() bağlantıyı havuza geri bırakır"""
+        return cls.get_pool().acquire(read_only=read_only)
+
+    @classmethod
+    def get_pool_stats(cls) -> dict:
+        return cls.get_pool().stats()
+
+    @classmethod
+    def reset_pool(cls):
+        """Havuzu kapatır; sonraki bağlantı güncel ayarlarla (ör. BACKEND) yeni havuzdan alınır"""
+        with cls._pool_lock:
+            pool, cls._pool = cls._pool, None
+        if pool:
+            pool.dispose()
+
     @classmethod
     def test_connection(cls):
         try:
-            conn = cls.get_connection()
+            conn = cls.create_connection()
             conn.close()
             return True, "Bağlantı başarılı"
         except Exception as e:
             return False, str(e)
+
+
+class CacheConfig:
+    # Katalog (kitap / yazar / kategori) önbelleği
+    CATALOG_TTL_SECONDS = 300       # Kayıt ömrü; diğer worker'lardaki yazmalar en geç bu sürede görünür
+    CATALOG_MAX_ENTRIES = 512       # Aşılınca en eski kullanılan kayıt atılır
+    SUMMARY_TTL_SECONDS = 5         # Yönetici özeti (/api/admin/summary) önbellek süresi
+
+
+class SessionConfig:
+    # Oturum deposu: 'memory' (tek süreç) veya 'sqlite' (birden fazla worker süreci)
+    BACKEND = 'memory'
+    SQLITE_PATH = os.path.join(tempfile.gettempdir(), 'kutuphane_sessions.db')
+    TTL_SECONDS = 8 * 3600          # Oturum ömrü
+    SLIDING = True                  # Kullanıldıkça süre yenilensin
+    SWEEP_INTERVAL = 60             # Süresi dolanların toplu temizlik aralığı (saniye)
+
+
+class OverdueConfig:
+    # Gecikme zamanlayıcısı (services/overdue_scheduler.py)
+    ENABLED = True
+    RESYNC_SECONDS = 300            # Açık ödünçler bu aralıkla yeniden yüklenir (diğer worker'ların yazmaları)
+    EVENT_HISTORY = 200             # Bellekte tutulan son gecikme olayı sayısı
+
+
+class EventsConfig:
+    # Canlı değişiklik akışı (services/event_hub.py), GET /api/events
+    HISTORY = 1000                  # Yeniden bağlanan istemciye tekrar gönderilebilen son olay sayısı
+    HEARTBEAT_SECONDS = 15          # Olay yoksa yorum satırı: proxy zaman aşımı ve kopan bağlantı tespiti
+    RETRY_MS = 3000                 # EventSource yeniden bağlanma aralığı
+    # Süreç başına açık akış sınırı (aşılınca 503). Thread'li sunucuda (Flask geliştirme
+    # sunucusu, gunicorn gthread) her akış bir istek thread'i tutar: sınır worker thread
+    # sayısının altında kalmalı, yoksa akışlar API isteklerini bekletir
+    MAX_SUBSCRIBERS = 32
+    TICKET_TTL_SECONDS = 30         # Akış bileti ömrü (tek kullanımlık, POST /api/events/ticket)
+    TICKET_SQLITE_PATH = os.path.join(tempfile.gettempdir(), 'kutuphane_stream_tickets.db')
+
+
+class MetricsConfig:
+    # İstek / veritabanı metrikleri (metrics.py), /api/admin/metrics
+    ENABLED = True                  # Kapalıyken middleware ve cursor sarmalayıcı devre dışı
+
+
+class LogConfig:
+    # structured_log.py: kayıtlar kuyruğa bırakılır, ayrı thread yazar
+    LEVEL = 'WARNING'               # DEBUG: repository satır sayıları ve süreleri de yazılır
+    JSON = False                    # True: satır başına bir JSON nesnesi
+    QUEUE_SIZE = 10000              # Dolunca yeni kayıtlar atılır (istek thread'i beklemez)
+    SECURITY_SAMPLE = 10            # Doğrulama reddi logları: her N kayıttan biri
+
+
+class CompressionConfig:
+    # Yanıt sıkıştırma (compression.py): Accept-Encoding'e göre br (brotli kuruluysa) veya gzip
+    ENABLED = True
+    MIN_BYTES = 1024                # Bundan küçük gövdeler sıkıştırılmaz (kazanç başlık ve CPU maliyetinden az)
+    GZIP_LEVEL = 6
+    BROTLI_QUALITY = 5              # 0-11; üst seviyeler çok daha yavaş, az kazançlı
+    MIMETYPES = (
+        'application/json',
+        'application/vnd.kutuphane.columns+json',
+        'application/msgpack',
+        'text/plain',
+    )
+
+
+class StaticConfig:
+    # Frontend dosyaları (static_assets.py): içerik hash'li adlar, önceden sıkıştırılmış varyantlar
+    _BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+    SOURCE_DIR = next((path for path in (os.path.join(_BACKEND_DIR, 'frontend'),
+                                         os.path.normpath(os.path.join(_BACKEND_DIR, '..', 'fronted'))) if os.path.isdir(path)),
+                      os.path.join(_BACKEND_DIR, 'frontend'))
+    URL_PREFIX = '/assets'          # Hash'li dosyalar: /assets/app.<hash>.js
+    MAX_AGE = 365 * 24 * 3600       # Hash'li dosyalar değişmez (Cache-Control: immutable)
+    GZIP_LEVEL = 9                  # Sıkıştırma açılışta bir kez yapılır; en yüksek seviye
+    BROTLI_QUALITY = 11
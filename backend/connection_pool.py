@@ -0,0 +1,372 @@
+"""
+CONNECTION_POOL.PY - Veritabanı Bağlantı Havuzu
+
+Her repository çağrısında yeni bir ODBC oturumu açmak yerine bağlantılar
+havuzdan alınır ve işi biten bağlantı havuza geri bırakılır.
+- Minimum / maksimum havuz boyutu
+- Bağlantı bekleme süresi (timeout)
+- Eski bağlantıların yenilenmesi (recycle) ve kullanım öncesi kontrol (pre-ping)
+- Salt okunur işlemler için autocommit
+- İzleme için havuz istatistikleri
+- İsteğe bağlı gözlemci (observer): alınan bağlantıları ve cursor'ları izler
+- Anahtarlı cursor'lar (cursor(key)): fiziksel bağlantıda ifade başına
+  saklanır, hazırlanmış ifade sonraki kullanıcılarda da geçerlidir
+  (repositories/query_catalog.py)
+"""
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeoutError(Exception):
+    """Havuzdan belirtilen süre içinde bağlantı alınamadığında fırlatılır"""
+
+
+class _PoolEntry:
+    """Havuzdaki tek bir fiziksel bağlantı, zaman bilgileri ve saklanan cursor'ları"""
+    __slots__ = ('raw', 'created_at', 'last_used_at', 'cursors', 'active')
+
+    def __init__(self, raw):
+        now = time.monotonic()
+        self.raw = raw
+        self.created_at = now
+        self.last_used_at = now
+        self.cursors = {}       # anahtar -> sürücü cursor'ı
+        self.active = None      # son verilen cursor
+
+    def cursor(self, key=None):
+        """
+        Yeni cursor, key verilirse bu anahtarla saklanan cursor. Önceki
+        saklanan cursor'ın okunmamış sonuçları bırakılır: SQL Server (MARS
+        kapalı) başka bir cursor'da bekleyen sonuç varken 'connection busy'
+        verir. Anahtarsız cursor'lar saklanmaz, referansı bırakılınca kapanır.
+        """
+        cursor = self.cursors.get(key) if key is not None else None
+        if self.active is not None and self.active is not cursor:
+            self.close_results()
+        if cursor is None:
+            cursor = self.raw.cursor()
+            if key is None:
+                return cursor
+            self.cursors[key] = cursor
+        self.active = cursor
+        return cursor
+
+    def close_results(self):
+        """Son saklanan cursor'daki bekleyen result set'leri okumadan atar (hazırlanmış ifade kalır)"""
+        cursor, self.active = self.active, None
+        try:
+            while cursor is not None and cursor.nextset():
+                pass
+        except Exception:
+            pass
+
+
+class PooledConnection:
+    """
+    Havuzdan alınmış bağlantı vekili.
+
+    close() fiziksel bağlantıyı kapatmaz, havuza geri bırakır. Böylece
+    repository'lerdeki `finally: conn.close()` kalıbı değişmeden çalışır.
+    """
+    __slots__ = ('_pool', '_entry', '_dirty', '_broken')
+
+    def __init__(self, pool: 'ConnectionPool', entry: _PoolEntry):
+        self._pool = pool
+        self._entry = entry
+        self._dirty = False
+        self._broken = False
+
+    @property
+    def raw(self):
+        """Alttaki sürücü bağlantısı"""
+        if self._entry is None:
+            raise RuntimeError("Bağlantı havuza geri bırakılmış")
+        return self._entry.raw
+
+    @property
+    def autocommit(self) -> bool:
+        return self.raw.autocommit
+
+    @autocommit.setter
+    def autocommit(self, value: bool):
+        self.raw.autocommit = value
+
+    def cursor(self, key=None):
+        """
+        Args:
+            key: Verilirse aynı fiziksel bağlantıda bu anahtarla açılmış cursor
+                 yeniden kullanılır (bağlantı havuza dönünce de saklanır)
+        """
+        if self._entry is None:
+            raise RuntimeError("Bağlantı havuza geri bırakılmış")
+        self._dirty = True
+        cursor = self._entry.cursor(key)
+        observer = self._pool.observer
+        return cursor if observer is None else observer.cursor(cursor)
+
+    def commit(self):
+        self.raw.commit()
+        self._dirty = False
+
+    def rollback(self):
+        self.raw.rollback()
+        self._dirty = False
+
+    def invalidate(self):
+        """Bağlantıyı bozuk işaretler; close() sonrası havuza dönmez, kapatılır"""
+        self._broken = True
+
+    def close(self):
+        if self._entry is None:
+            return
+        entry, self._entry = self._entry, None
+        self._pool._release(entry, self._dirty, self._broken)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Sınırlı boyutlu, thread-safe bağlantı havuzu.
+
+    Args:
+        creator: Yeni fiziksel bağlantı oluşturan fonksiyon
+        min_size: Havuzda boşta tutulacak minimum bağlantı sayısı
+        max_size: Aynı anda açık olabilecek maksimum bağlantı sayısı
+        timeout: Havuz doluyken bağlantı için beklenecek süre (saniye)
+        recycle_seconds: Bu süreden eski bağlantılar kapatılıp yenilenir
+        pre_ping: Uzun süre boşta kalan bağlantı kullanılmadan önce test edilir
+        ping_after_seconds: Pre-ping için gereken minimum boşta kalma süresi
+        idle_timeout: min_size üzerindeki bağlantılar bu süre boşta kalırsa kapatılır
+        observer: acquired() ve cursor(raw_cursor) metodları olan nesne (ör. metrics.DbObserver)
+    """
+
+    PING_SQL = "SELECT 1"
+
+    def __init__(self, creator, min_size: int = 1, max_size: int = 10, timeout: float = 5.0,
+                 recycle_seconds: float = 1800, pre_ping: bool = True,
+                 ping_after_seconds: float = 30, idle_timeout: float = 300, observer=None):
+        if max_size < 1 or min_size < 0 or min_size > max_size:
+            raise ValueError("Geçersiz havuz boyutu")
+        self._creator = creator
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.recycle_seconds = recycle_seconds
+        self.pre_ping = pre_ping
+        self.ping_after_seconds = ping_after_seconds
+        self.idle_timeout = idle_timeout
+        self.observer = observer
+
+        self._idle = deque()
+        self._size = 0
+        self._closed = False
+        self._cond = threading.Condition(threading.Lock())
+
+        # İstatistikler
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_time = 0.0
+        self._timeouts = 0
+        self._created = 0
+        self._recycled = 0
+        self._ping_failures = 0
+
+    # ------------------------------------------------------------------
+    # Bağlantı alma / bırakma
+    # ------------------------------------------------------------------
+    def acquire(self, read_only: bool = False) -> PooledConnection:
+        """
+        Havuzdan bağlantı alır.
+
+        Args:
+            read_only: True ise bağlantı autocommit modunda verilir
+
+        Raises:
+            PoolTimeoutError: timeout süresi içinde bağlantı boşalmazsa
+        """
+        entry = self._checkout()
+        try:
+            entry = self._ensure_usable(entry)
+            entry.raw.autocommit = read_only
+        except Exception:
+            self._discard(entry)
+            raise
+        if self.observer is not None:
+            self.observer.acquired()
+        return PooledConnection(self, entry)
+
+    def _checkout(self) -> _PoolEntry:
+        deadline = None
+        waited_since = None
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Bağlantı havuzu kapatıldı")
+                if self._idle:
+                    entry = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    entry = None
+                    break
+
+                now = time.monotonic()
+                if deadline is None:
+                    deadline = now + self.timeout
+                    waited_since = now
+                    self._waits += 1
+                remaining = deadline - now
+                if remaining <= 0:
+                    self._wait_time += now - waited_since
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        f"{self.timeout} saniye içinde havuzdan bağlantı alınamadı "
+                        f"(maksimum {self.max_size})"
+                    )
+                self._cond.wait(remaining)
+
+            if waited_since is not None:
+                self._wait_time += time.monotonic() - waited_since
+            self._checkouts += 1
+
+        if entry is None:
+            entry = self._create_entry(reserved=True)
+        return entry
+
+    def _ensure_usable(self, entry: _PoolEntry) -> _PoolEntry:
+        """Yaşlı bağlantıyı yeniler, uzun süre boşta kalanı test eder"""
+        now = time.monotonic()
+        if self.recycle_seconds and now - entry.created_at > self.recycle_seconds:
+            self._close_raw(entry.raw)
+            with self._cond:
+                self._recycled += 1
+            return self._create_entry(reserved=False)
+
+        if self.pre_ping and now - entry.last_used_at > self.ping_after_seconds:
+            try:
+                cursor = entry.raw.cursor()
+                cursor.execute(self.PING_SQL)
+                cursor.fetchall()
+                cursor.close()
+            except Exception:
+                self._close_raw(entry.raw)
+                with self._cond:
+                    self._ping_failures += 1
+                return self._create_entry(reserved=False)
+        return entry
+
+    def _create_entry(self, reserved: bool) -> _PoolEntry:
+        try:
+            raw = self._creator()
+        except Exception:
+            if reserved:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+            raise
+        with self._cond:
+            self._created += 1
+        return _PoolEntry(raw)
+
+    def _release(self, entry: _PoolEntry, dirty: bool, broken: bool):
+        if not broken and dirty:
+            entry.close_results()
+            try:
+                if not entry.raw.autocommit:
+                    # Commit edilmemiş işler bir sonraki kullanıcıya sızmasın
+                    entry.raw.rollback()
+            except Exception:
+                broken = True
+
+        with self._cond:
+            if broken or self._closed:
+                self._size -= 1
+                self._cond.notify()
+                to_close = [entry.raw]
+            else:
+                entry.last_used_at = time.monotonic()
+                self._idle.append(entry)
+                to_close = self._prune_idle_locked(entry.last_used_at)
+                self._cond.notify()
+
+        for raw in to_close:
+            self._close_raw(raw)
+
+    def _discard(self, entry: _PoolEntry):
+        self._close_raw(entry.raw)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def _prune_idle_locked(self, now: float) -> list:
+        """min_size üzerindeki, uzun süre boşta kalmış bağlantıları ayırır"""
+        pruned = []
+        while (self._idle and self._size > self.min_size
+               and now - self._idle[0].last_used_at > self.idle_timeout):
+            pruned.append(self._idle.popleft().raw)
+            self._size -= 1
+        return pruned
+
+    @staticmethod
+    def _close_raw(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Yönetim
+    # ------------------------------------------------------------------
+    def prefill(self) -> int:
+        """Havuzu min_size kadar bağlantı ile doldurur, açılan sayıyı döndürür"""
+        opened = 0
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return opened
+                self._size += 1
+            entry = self._create_entry(reserved=True)
+            with self._cond:
+                self._idle.append(entry)
+                self._cond.notify()
+            opened += 1
+
+    def dispose(self):
+        """Boştaki tüm bağlantıları kapatır; kullanımdakiler bırakıldığında kapanır"""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            self._close_raw(entry.raw)
+
+    def stats(self) -> dict:
+        """İzleme için havuz istatistikleri"""
+        with self._cond:
+            idle = len(self._idle)
+            return {
+                "size": self._size,
+                "inUse": self._size - idle,
+                "idle": idle,
+                "minSize": self.min_size,
+                "maxSize": self.max_size,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "waitTimeMs": round(self._wait_time * 1000, 3),
+                "avgWaitMs": round(self._wait_time * 1000 / self._waits, 3) if self._waits else 0.0,
+                "timeouts": self._timeouts,
+                "created": self._created,
+                "recycled": self._recycled,
+                "pingFailures": self._ping_failures,
+            }
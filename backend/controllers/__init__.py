@@ -8,5 +8,6 @@ from controllers.transaction_controller import transaction_bp
 from controllers.penalty_controller import penalty_bp
 from controllers.member_controller import member_bp
 from controllers.stats_controller import stats_bp
+from controllers.events_controller import events_bp
 
-__all__ = ['auth_bp', 'user_bp', 'author_bp', 'category_bp', 'book_bp', 'transaction_bp', 'penalty_bp', 'member_bp', 'stats_bp']
+__all__ = ['auth_bp', 'user_bp', 'author_bp', 'category_bp', 'book_bp', 'transaction_bp', 'penalty_bp', 'member_bp', 'stats_bp', 'events_bp']
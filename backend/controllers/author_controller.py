@@ -1,21 +1,21 @@
 """AUTHOR_CONTROLLER.PY - Yazar API"""
 from flask import Blueprint, request, jsonify
 from services.author_service import author_service
+from controllers.conditional import conditional_json
 
 author_bp = Blueprint('authors', __name__, url_prefix='/api/authors')
 
 @author_bp.route('', methods=['GET'])
 def get_all():
     try:
-        return jsonify([a.to_dict() for a in author_service.get_all()])
+        return conditional_json('authors', author_service.get_all)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @author_bp.route('/<int:id>', methods=['GET'])
 def get_one(id):
     try:
-        author = author_service.get_by_id(id)
-        return jsonify(author.to_dict()) if author else (jsonify({"error": "Bulunamadı"}), 404)
+        return conditional_json('authors', lambda: author_service.get_by_id(id))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
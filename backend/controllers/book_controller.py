@@ -1,21 +1,77 @@
 """BOOK_CONTROLLER.PY - Kitap API"""
 from flask import Blueprint, request, jsonify
 from services.book_service import book_service
+from services.import_service import ImportFormatError, detect_format, import_service
+from services.search_service import search_service
+from controllers.pagination import PaginationError, page_args, page_response
+from controllers.streaming import json_stream_response, stream_requested
+from controllers import row_json
+from controllers.formats import FormatError, format_response, response_format
+from controllers.conditional import conditional_json
 
 book_bp = Blueprint('books', __name__, url_prefix='/api/books')
 
 @book_bp.route('', methods=['GET'])
 def get_all():
     try:
-        return jsonify([b.to_dict() for b in book_service.get_all()])
+        fmt = response_format()
+        if stream_requested() and fmt == 'json':
+            return json_stream_response(book_service.iter_all(raw=True), row_json.books)
+        page = page_args((int,))
+        if page:
+            limit, after = page
+            return conditional_json(
+                'books', lambda: page_response(book_service.get_page(limit + 1, after), limit, lambda b: (b.Id,)), fmt)
+        return conditional_json('books', book_service.get_all, fmt)
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+    except FormatError as e:
+        return jsonify({"error": str(e)}), 406
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@book_bp.route('/search', methods=['GET'])
+def search():
+    """
+    Tam metin arama: ?q=...&limit=20&offset=0
+    Kitap adı, yazar ve kategoride Türkçe harf/aksan duyarsız, BM25 sıralı.
+    """
+    try:
+        query = (request.args.get('q') or '').strip()
+        if not query:
+            return jsonify({"error": "Arama metni (q) gerekli"}), 400
+        limit = request.args.get('limit', search_service.DEFAULT_LIMIT, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        return conditional_json('books', lambda: search_service.search(query, limit, offset))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@book_bp.route('/import', methods=['POST'])
+def import_books():
+    """
+    Toplu içe aktarma: multipart 'file' alanı veya ham gövde (CSV / JSON / NDJSON).
+    Biçim dosya adından / Content-Type'tan bulunur, ?format= ile verilebilir.
+    """
+    try:
+        upload = request.files.get('file')
+        if upload:
+            stream, fmt = upload.stream, detect_format(upload.filename, upload.mimetype)
+        else:
+            stream, fmt = request.stream, detect_format(content_type=request.content_type)
+        fmt = request.args.get('format') or fmt
+        if not fmt:
+            return jsonify({"error": "Dosya biçimi belirlenemedi (csv, json, ndjson)"}), 400
+        report = import_service.import_stream(stream, fmt)
+        return jsonify(report.to_dict()), (400 if report.aborted else 200)
+    except ImportFormatError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @book_bp.route('/<int:id>', methods=['GET'])
 def get_one(id):
     try:
-        book = book_service.get_by_id(id)
-        return jsonify(book.to_dict()) if book else (jsonify({"error": "Bulunamadı"}), 404)
+        return conditional_json('books', lambda: book_service.get_by_id(id))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
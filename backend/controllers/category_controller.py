@@ -1,21 +1,21 @@
 """CATEGORY_CONTROLLER.PY - Kategori API"""
 from flask import Blueprint, request, jsonify
 from services.category_service import category_service
+from controllers.conditional import conditional_json
 
 category_bp = Blueprint('categories', __name__, url_prefix='/api/categories')
 
 @category_bp.route('', methods=['GET'])
 def get_all():
     try:
-        return jsonify([c.to_dict() for c in category_service.get_all()])
+        return conditional_json('categories', category_service.get_all)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 @category_bp.route('/<int:id>', methods=['GET'])
 def get_one(id):
     try:
-        cat = category_service.get_by_id(id)
-        return jsonify(cat.to_dict()) if cat else (jsonify({"error": "Bulunamadı"}), 404)
+        return conditional_json('categories', lambda: category_service.get_by_id(id))
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -0,0 +1,66 @@
+"""
+CONDITIONAL.PY - ETag / 304 Yanıtları
+
+Katalog endpoint'lerinin ETag'i yanıt gövdesinin özetidir (sha256, ilk 12
+hane). Özet gövde üretilirken bir kez hesaplanır ve katalog önbelleğinde
+(namespace sürümüyle, TTL'li) istek yolu ve biçim başına saklanır. İstemci
+If-None-Match ile aynı ETag'i gönderirse yanıt veritabanına hiç gidilmeden
+304 Not Modified olur.
+
+Etiket veriden türediği için worker'lar arasında tutarlıdır: aynı katalog
+her worker'da aynı ETag'i verir, başka bir worker'daki yazma bu worker'da
+TTL sonunda yeniden yüklenen veriyle birlikte ETag'i de değiştirir.
+
+Cache-Control: no-cache -> tarayıcı saklar ama her kullanımda doğrular.
+"""
+import hashlib
+from typing import Callable
+
+from flask import Response, jsonify, request
+
+from controllers.formats import format_response
+from services.cache import catalog_cache
+
+
+def _digest(response: Response) -> str:
+    return hashlib.sha256(response.get_data()).hexdigest()[:12]
+
+
+def conditional_json(namespace: str, producer: Callable, fmt: str = 'json'):
+    """
+    Args:
+        namespace: Önbellek namespace'i ("books", "authors", "categories")
+        producer: Entity, entity listesi veya dict döner; None dönerse 404
+        fmt: Yanıt biçimi (controllers/formats.py); gövde farklı olduğundan ETag'i de farklıdır
+
+    Returns:
+        304, 404 veya ETag'li JSON yanıtı
+    """
+    built = []
+
+    def build():
+        data = producer()
+        if data is None:
+            return None
+        if isinstance(data, list):
+            data = [item.to_dict() for item in data]
+        elif not isinstance(data, dict):
+            data = data.to_dict()
+        built.append(format_response(fmt, data))
+        return _digest(built[0])
+
+    # Saklı özet varsa gövde üretilmez; yoksa (ilk istek, yazma, TTL) üretilip özetlenir
+    tag = catalog_cache.get_or_load(namespace, ('etag', fmt, request.full_path), build)
+    if tag is None:
+        return jsonify({"error": "Bulunamadı"}), 404
+    # Sıkıştırılmış yanıtların ETag'i zayıftır (compression.py); zayıf karşılaştırma
+    if request.if_none_match.contains_weak(tag):
+        response = Response(status=304)
+    else:
+        if not built and build() is None:
+            return jsonify({"error": "Bulunamadı"}), 404
+        response = built[-1]
+        tag = _digest(response)
+    response.set_etag(tag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
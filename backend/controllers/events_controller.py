@@ -0,0 +1,64 @@
+"""
+EVENTS_CONTROLLER.PY - Canlı Değişiklik Akışı (Server-Sent Events)
+
+    POST /api/events/ticket        (Authorization: Bearer <token>)
+    GET  /api/events?ticket=...
+
+EventSource başlık gönderemez; oturum token'ı URL'ye yazılırsa sunucu /
+proxy loglarında ve tarayıcı geçmişinde kalır. Bu yüzden istemci önce
+tek kullanımlık, kısa ömürlü (EventsConfig.TICKET_TTL_SECONDS) bir akış
+bileti alır ve akışı onunla açar. Bilet sadece akış açar, API'de token
+yerine geçmez. Kullanılmış bilet reddedilir: yeniden bağlanırken yeni
+bilet alınır, kaldığı yer lastEventId parametresiyle verilir.
+Başlık gönderebilen istemciler Authorization ile de bağlanabilir.
+
+Bilet / token yoksa sadece kitap müsaitlik olayları, üyeye ek olarak kendi
+ödünç / ceza olayları, yöneticiye tüm olaylar gönderilir
+(services/event_hub.py). Kullanıcı bağlantı başında bir kez okunur.
+"""
+from flask import Blueprint, Response, jsonify, request
+from config import EventsConfig
+from services.auth_service import auth_service
+from services.event_hub import event_hub
+
+events_bp = Blueprint('events', __name__, url_prefix='/api')
+
+@events_bp.route('/events/ticket', methods=['POST'])
+def create_ticket():
+    try:
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_id = auth_service.get_user_id_from_token(token)
+        if not user_id:
+            return jsonify({"error": "Oturum gerekli"}), 401
+        return jsonify({
+            "ticket": auth_service.create_stream_ticket(user_id),
+            "expiresIn": EventsConfig.TICKET_TTL_SECONDS
+        }), 201
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@events_bp.route('/events', methods=['GET'])
+def stream_events():
+    try:
+        ticket = request.args.get('ticket')
+        if ticket:
+            user = auth_service.get_user_from_stream_ticket(ticket)
+            if not user:
+                return jsonify({"error": "Akış bileti geçersiz veya kullanılmış"}), 401
+        else:
+            token = request.headers.get('Authorization', '').replace('Bearer ', '')
+            user = auth_service.get_user_from_token(token) if token else None
+            if token and not user:
+                return jsonify({"error": "Oturum geçersiz"}), 401
+        last_event_id = request.headers.get('Last-Event-ID') or request.args.get('lastEventId')
+        subscription = event_hub.subscribe(user.Id if user else None, bool(user and user.is_admin()), last_event_id)
+        if subscription is None:
+            response = jsonify({"error": "Canlı akış kapasitesi dolu"})
+            response.headers['Retry-After'] = str(EventsConfig.RETRY_MS // 1000 or 1)
+            return response, 503
+        response = Response(subscription, mimetype='text/event-stream')
+        response.headers['Cache-Control'] = 'no-cache'
+        response.headers['X-Accel-Buffering'] = 'no'    # nginx: olaylar tamponlanmadan iletilsin
+        return response
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
@@ -0,0 +1,83 @@
+"""
+FORMATS.PY - Liste Yanıtı Biçimleri (İçerik Anlaşması)
+
+Liste endpoint'leri üç biçimde yanıt verebilir:
+- json     application/json (varsayılan): nesne dizisi, her satırda tüm anahtarlar
+- columns  application/vnd.kutuphane.columns+json: anahtarlar bir kez,
+           her anahtar için değer dizisi
+               {"columns": {"id": [3, 2], "title": ["A", "B"]}, "count": 2}
+- msgpack  application/msgpack: json ile aynı yapı, ikili (msgpack paketi kuruluysa)
+
+Seçim sırası: ?format=json|columns|msgpack, yoksa Accept başlığı. Accept
+eşleşmezse json döner; ?format= ile istenen biçim yoksa 406.
+Sayfalı yanıtlarda ({"items": [...], "nextCursor": ...}) biçim items'a
+uygulanır. ?stream=1 sadece json biçiminde geçerlidir.
+"""
+from typing import Dict, List, Union
+
+from flask import Response, after_this_request, json, jsonify, request
+
+try:
+    import msgpack
+except ImportError:     # isteğe bağlı: yoksa msgpack biçimi sunulmaz
+    msgpack = None
+
+MIMETYPES = {
+    'json': 'application/json',
+    'columns': 'application/vnd.kutuphane.columns+json',
+    'msgpack': 'application/msgpack',
+}
+FORMATS = tuple(name for name in MIMETYPES if name != 'msgpack' or msgpack)
+
+_BY_MIMETYPE = {MIMETYPES[name]: name for name in FORMATS}
+if msgpack:
+    _BY_MIMETYPE['application/x-msgpack'] = 'msgpack'
+
+
+class FormatError(ValueError):
+    """İstenen biçim tanınmıyor veya kullanılamıyor (406 döner)"""
+
+
+def response_format() -> str:
+    """
+    İsteğin yanıt biçimi. Yanıta `Vary: Accept` eklenir (aynı URL, farklı gövde).
+
+    Raises:
+        FormatError: ?format= tanınmıyor veya kurulu değil
+    """
+    @after_this_request
+    def vary_on_accept(response):
+        response.vary.add('Accept')
+        return response
+
+    name = request.args.get('format')
+    if name:
+        if name not in FORMATS:
+            raise FormatError(f"Desteklenen biçimler: {', '.join(FORMATS)}")
+        return name
+    best = request.accept_mimetypes.best_match(list(_BY_MIMETYPE))
+    return _BY_MIMETYPE[best] if best else 'json'
+
+
+def to_columns(items: List[dict]) -> dict:
+    """Nesne listesini sütun biçimine çevirir (anahtarlar ilk nesneden)"""
+    keys = items[0].keys() if items else ()
+    return {"columns": {key: [item[key] for item in items] for key in keys}, "count": len(items)}
+
+
+def format_response(name: str, payload: Union[List[dict], Dict]) -> Response:
+    """
+    Args:
+        name: response_format() sonucu
+        payload: to_dict listesi veya sayfa ({"items": [...], "nextCursor": ...})
+    """
+    if name == 'json':
+        return jsonify(payload)
+    if name == 'columns':
+        if isinstance(payload, dict):
+            payload = {**to_columns(payload['items']),
+                       **{key: value for key, value in payload.items() if key != 'items'}}
+        else:
+            payload = to_columns(payload)
+        return Response(json.dumps(payload, separators=(',', ':')) + '\n', mimetype=MIMETYPES['columns'])
+    return Response(msgpack.packb(payload, use_bin_type=True), mimetype=MIMETYPES['msgpack'])
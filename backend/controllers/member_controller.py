@@ -5,12 +5,19 @@ Stored Procedure Kullanır:
 - /api/borrow -> sp_BorrowBook
 - /api/my/transactions/{id}/return -> sp_ReturnBook (+ Trigger ile ceza)
 - /api/my/penalties/{id}/pay -> sp_PayPenalty
+
+/api/my/penalties/ledger bakiyeyi UserPenaltyBalances satırından okur
+(trg_PenaltyLedger günceller); cezalar toplanmaz.
+
+/api/my/dashboard ve /api/my/stats kullanıcıyı veritabanından okumaz,
+token'dan sadece Id alınır.
 """
 from flask import Blueprint, request, jsonify
 from services.auth_service import auth_service
 from services.borrow_service import borrow_service
 from services.penalty_service import penalty_service
 from services.stats_service import stats_service
+from controllers.pagination import DEFAULT_LIMIT, PaginationError, page_args, page_response
 
 member_bp = Blueprint('member', __name__, url_prefix='/api')
 
@@ -19,6 +26,11 @@ def get_current_user():
     token = request.headers.get('Authorization', '').replace('Bearer ', '')
     return auth_service.get_user_from_token(token)
 
+def get_current_user_id():
+    """Token'dan kullanıcı Id'si (veritabanına gitmez)"""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    return auth_service.get_user_id_from_token(token)
+
 @member_bp.route('/borrow', methods=['POST'])
 def borrow_book():
     """Kitap ödünç al - sp_BorrowBook STORED PROCEDURE kullanır"""
@@ -58,14 +70,45 @@ def get_my_penalties():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@member_bp.route('/my/penalties/ledger', methods=['GET'])
+def get_my_penalty_ledger():
+    """Ceza bakiyem ve defter kayıtlarım (sayfalı, en yeni önce)"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Oturum gerekli"}), 401
+        limit, after = page_args((int,)) or (DEFAULT_LIMIT, None)
+        balance, unpaid = penalty_service.get_user_balance(user_id)
+        page = page_response(penalty_service.get_ledger_page(limit + 1, after, user_id), limit, lambda e: (e.Id,))
+        return jsonify({"balance": balance, "unpaidCount": unpaid, **page})
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @member_bp.route('/my/stats', methods=['GET'])
 def get_my_stats():
     """Kendi istatistiklerimi getir"""
     try:
-        user = get_current_user()
-        if not user:
+        user_id = get_current_user_id()
+        if not user_id:
+            return jsonify({"error": "Oturum gerekli"}), 401
+        return jsonify(stats_service.get_user_stats(user_id))
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@member_bp.route('/my/dashboard', methods=['GET'])
+def get_my_dashboard():
+    """Üye panosu - sayılar, en yakın iade tarihi ve son işlemler tek sorguda"""
+    try:
+        user_id = get_current_user_id()
+        if not user_id:
             return jsonify({"error": "Oturum gerekli"}), 401
-        return jsonify(stats_service.get_user_stats(user.Id))
+        recent = request.args.get('recent', stats_service.DASHBOARD_RECENT, type=int)
+        dashboard = stats_service.get_user_dashboard(user_id, recent)
+        if dashboard is None:
+            return jsonify({"error": "Pano yüklenemedi"}), 500
+        return jsonify(dashboard)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -0,0 +1,104 @@
+"""
+PAGINATION.PY - Keyset (Cursor) Sayfalama Yardımcıları
+
+Liste endpoint'leri `?limit=N&after=<cursor>` parametrelerini kabul eder.
+Cursor, sayfanın son kaydının sıralama anahtarını taşıyan opak bir
+base64 metnidir; repository bu anahtarla OFFSET'siz aralık sorgusu yapar,
+böylece N. sayfa da 1. sayfa kadar ucuzdur.
+
+Parametre verilmezse endpoint eski davranışıyla (tam liste) döner.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from flask import request
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class PaginationError(ValueError):
+    """Geçersiz limit veya cursor (400 döner)"""
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value):
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(key: Sequence) -> str:
+    """Sıralama anahtarını opak cursor metnine çevirir"""
+    raw = json.dumps([_encode_value(v) for v in key], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str, types: Sequence[type]) -> tuple:
+    """
+    Cursor metnini sıralama anahtarına çevirir.
+
+    Args:
+        token: İstemciden gelen cursor
+        types: Anahtar alanlarının beklenen tipleri (ör. (datetime, int))
+
+    Raises:
+        PaginationError: Cursor bozuksa veya bu endpoint'e ait değilse
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        key = tuple(_decode_value(v) for v in json.loads(raw))
+    except (binascii.Error, ValueError, TypeError, AttributeError):
+        raise PaginationError("Geçersiz cursor")
+    if len(key) != len(types) or not all(
+            type(v) is t for v, t in zip(key, types)):
+        raise PaginationError("Geçersiz cursor")
+    return key
+
+
+def page_args(types: Sequence[type]) -> Optional[Tuple[int, Optional[tuple]]]:
+    """
+    İstekteki limit/after parametrelerini okur.
+
+    Returns:
+        Optional[Tuple[int, Optional[tuple]]]: (limit, after_key);
+        sayfalama istenmemişse None
+    """
+    raw_limit = request.args.get('limit')
+    token = request.args.get('after')
+    if raw_limit is None and token is None:
+        return None
+
+    if raw_limit is None:
+        limit = DEFAULT_LIMIT
+    else:
+        try:
+            limit = int(raw_limit)
+        except ValueError:
+            raise PaginationError("limit bir sayı olmalı")
+        if limit < 1 or limit > MAX_LIMIT:
+            raise PaginationError(f"limit 1 ile {MAX_LIMIT} arasında olmalı")
+
+    after = decode_cursor(token, types) if token else None
+    return limit, after
+
+
+def page_response(rows: List, limit: int, key: Callable) -> dict:
+    """
+    Repository'den limit + 1 satır istenir; fazladan gelen satır
+    bir sonraki sayfanın var olduğunu gösterir.
+
+    Returns:
+        dict: {"items": [...], "nextCursor": str | None}
+    """
+    items = rows[:limit]
+    next_cursor = encode_cursor(key(items[-1])) if len(rows) > limit else None
+    return {"items": [row.to_dict() for row in items], "nextCursor": next_cursor}
@@ -1,13 +1,42 @@
 """PENALTY_CONTROLLER.PY - Ceza API (Admin)"""
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from services.penalty_service import penalty_service
+from controllers.pagination import DEFAULT_LIMIT, PaginationError, page_args, page_response
+from controllers.streaming import json_array_response, json_stream_response, stream_requested
+from controllers import row_json
+from controllers.formats import FormatError, format_response, response_format
 
 penalty_bp = Blueprint('penalties', __name__, url_prefix='/api/penalties')
 
 @penalty_bp.route('', methods=['GET'])
 def get_all():
     try:
-        return jsonify([p.to_dict() for p in penalty_service.get_all_penalties()])
+        fmt = response_format()
+        if stream_requested() and fmt == 'json':
+            return json_stream_response(penalty_service.iter_all_penalties(raw=True), row_json.penalties)
+        page = page_args((int,))
+        if page:
+            limit, after = page
+            return format_response(fmt, page_response(penalty_service.get_penalties_page(limit + 1, after), limit, lambda p: (p.Id,)))
+        if fmt == 'json':
+            return json_array_response(penalty_service.iter_all_penalties(raw=True), row_json.penalties)
+        return format_response(fmt, [p.to_dict() for chunk in penalty_service.iter_all_penalties() for p in chunk])
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+    except FormatError as e:
+        return jsonify({"error": str(e)}), 406
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@penalty_bp.route('/ledger', methods=['GET'])
+def get_ledger():
+    """Ceza defteri (charge / payment / cancel), en yeni kayıt önce; her zaman sayfalı"""
+    try:
+        limit, after = page_args((int,)) or (DEFAULT_LIMIT, None)
+        user_id = request.args.get('userId', type=int)
+        return jsonify(page_response(penalty_service.get_ledger_page(limit + 1, after, user_id), limit, lambda e: (e.Id,)))
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
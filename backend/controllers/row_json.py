@@ -0,0 +1,98 @@
+"""
+ROW_JSON.PY - Satırdan Doğrudan JSON (Liste Endpoint'leri Hızlı Yolu)
+
+Liste yanıtlarında satır başına sürücü satırı -> entity -> dict -> JSON
+zinciri yerine satır doğrudan JSON metnine yazılır:
+- anahtarlar ve sabit değerler önceden kodlanmış şablonlardadır
+- metinler json'un C kodlayıcısıyla (ensure_ascii) kodlanır
+- tarih metinleri sınırlı bir önbellekte tutulur, tekrar biçimlenmez
+
+Çıktı entity.to_dict() + jsonify ile bayt bayt aynıdır (sıralı anahtarlar,
+ASCII, boşluksuz). Sütun sıraları repository'lerin _row_to_* eşlemeleriyle
+aynıdır; to_dict'e alan eklenirse buradaki şablon da güncellenmelidir
+(python -m benchmarks.row_json iki yolun çıktısını karşılaştırır).
+
+    json_array_response(borrow_service.iter_all_transactions(raw=True), row_json.transactions)
+"""
+from datetime import datetime
+from json.encoder import encode_basestring_ascii as _text
+from typing import Sequence
+
+DATETIME_CACHE_SIZE = 4096
+
+_datetimes = {}
+
+_RETURNED = _text("İade Edildi")
+_BORROWED = _text("Ödünçte")
+_UNKNOWN = _text("Bilinmiyor")
+
+
+def _datetime(value) -> str:
+    """datetime -> '"YYYY-MM-DD HH:MM:SS"' (to_dict'teki strftime biçimi), None -> null"""
+    if value is None:
+        return 'null'
+    text = _datetimes.get(value)
+    if text is None:
+        if len(_datetimes) >= DATETIME_CACHE_SIZE:
+            _datetimes.clear()
+        text = _datetimes[value] = '"' + value.isoformat(' ', 'seconds') + '"'
+    return text
+
+
+def _number(value) -> str:
+    return 'null' if value is None else repr(value)
+
+
+# ---- Satır şablonları (anahtarlar jsonify gibi alfabetik sırada) ----
+
+def _book(row) -> str:
+    # Id, Title, AuthorId, CategoryId, StockNumber, YearOfpublication, AuthorName, CategoryName, Available
+    stock, available = row[4], row[8]
+    return (f'{{"authorId":{row[2]},"authorName":{_text(row[6] or "")},'
+            f'"available":{stock if available is None else available},'
+            f'"categoryId":{row[3]},"categoryName":{_text(row[7] or "")},'
+            f'"id":{row[0]},"stockNumber":{stock},"title":{_text(row[1])},'
+            f'"yearOfPublication":{_number(row[5])}}}')
+
+
+def _transaction(row) -> str:
+    # Id, BookId, UserId, BorrowDate, ReturnDate, RealReturnDate, BookTitle, UserName
+    returned = row[5]
+    return (f'{{"bookId":{row[1]},"bookTitle":{_text(row[6] or "")},'
+            f'"borrowDate":{_datetime(row[3])},"id":{row[0]},'
+            f'"realReturnDate":{_datetime(returned)},"returnDate":{_datetime(row[4])},'
+            f'"state":{_RETURNED if returned else _BORROWED},'
+            f'"userId":{row[2]},"userName":{_text(row[7] or "")}}}')
+
+
+def _penalty(row, date: str) -> str:
+    # Id, Amount, BorrowTransactionsId, NumberOfDay, FullName, UserId
+    return (f'{{"amount":{repr(float(row[1])) if row[1] else "0.0"},'
+            f'"borrowTransactionsId":{row[2]},"date":{date},"id":{row[0]},'
+            f'"numberOfDay":{row[3] or 0},'
+            f'"userId":{row[5] or 0},"userName":{_text(row[4]) if row[4] else _UNKNOWN}}}')
+
+
+def _user(row) -> str:
+    # Id, FullName, Email, PasswordHash, Role (PasswordHash yazılmaz)
+    return f'{{"email":{_text(row[2])},"fullName":{_text(row[1])},"id":{row[0]},"role":{_text(row[4])}}}'
+
+
+# ---- Parça serileştiricileri: satır parçası -> köşeli parantezsiz JSON dizi gövdesi ----
+
+def books(rows: Sequence) -> str:
+    return ','.join([_book(row) for row in rows])
+
+
+def transactions(rows: Sequence) -> str:
+    return ','.join([_transaction(row) for row in rows])
+
+
+def penalties(rows: Sequence) -> str:
+    # Penalty.Date satır okunurken datetime.now(); parça başına bir kez biçimlenir
+    date = '"' + datetime.now().isoformat(' ', 'seconds') + '"'
+    return ','.join([_penalty(row, date) for row in rows])
+
+
+def users(rows: Sequence) -> str:
+    return ','.join([_user(row) for row in rows])
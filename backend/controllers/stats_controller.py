@@ -1,7 +1,13 @@
 """STATS_CONTROLLER.PY - İstatistik API"""
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify, request
 from services.stats_service import stats_service
 from config import DatabaseConfig
+from metrics import metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from services.cache import catalog_cache
+from services.search_index import search_index
+from services.overdue_scheduler import overdue_scheduler
+from services.event_hub import event_hub
+from repositories.query_catalog import catalog_stats
 
 stats_bp = Blueprint('stats', __name__, url_prefix='/api')
 
@@ -12,12 +18,96 @@ def get_stats():
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@stats_bp.route('/admin/summary', methods=['GET'])
+def get_admin_summary():
+    """Yönetici panosu: kitap, yazar, kategori, kullanıcı, ödünç, gecikme ve ceza sayıları"""
+    try:
+        return jsonify(stats_service.get_admin_summary())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @stats_bp.route('/health', methods=['GET'])
 def health_check():
     try:
         success, message = DatabaseConfig.test_connection()
         if success:
-            return jsonify({"status": "healthy", "database": "connected"})
+            return jsonify({"status": "healthy", "database": "connected", "pool": DatabaseConfig.get_pool_stats()})
         return jsonify({"status": "unhealthy", "database": "disconnected", "error": message}), 500
     except Exception as e:
         return jsonify({"status": "unhealthy", "error": str(e)}), 500
+
+@stats_bp.route('/admin/pool', methods=['GET'])
+def pool_stats():
+    """Bağlantı havuzu istatistikleri (izleme)"""
+    try:
+        return jsonify(DatabaseConfig.get_pool_stats())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@stats_bp.route('/admin/cache', methods=['GET'])
+def cache_stats():
+    """Katalog önbelleği istatistikleri (izleme)"""
+    try:
+        return jsonify(catalog_cache.stats())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@stats_bp.route('/admin/search', methods=['GET'])
+def search_stats():
+    """Arama indeksi istatistikleri (izleme)"""
+    try:
+        return jsonify(search_index.stats())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@stats_bp.route('/admin/events', methods=['GET'])
+def event_stats():
+    """Canlı değişiklik akışı: abone sayısı, yayınlanan olaylar, reset / red sayıları (izleme)"""
+    try:
+        return jsonify(event_hub.stats())
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@stats_bp.route('/admin/overdue', methods=['GET'])
+def overdue_loans():
+    """
+    Gecikmiş ödünçler - bellekteki zamanlayıcıdan, tablo taranmaz.
+    ?userId= verilirse o üyenin durumu; ?events=1 ile son gecikme olayları.
+    """
+    try:
+        overdue_scheduler.ensure_started()
+        if not overdue_scheduler.wait_loaded():
+            return jsonify({"error": "Gecikme zamanlayıcısı henüz yüklenmedi"}), 503
+        limit = max(1, min(request.args.get('limit', 100, type=int), 1000))
+        user_id = request.args.get('userId', type=int)
+        items = overdue_scheduler.overdue_loans(limit, user_id)
+        response = {"items": items, **overdue_scheduler.stats()}
+        if user_id is not None:
+            response["userId"] = user_id
+            response["overdue"] = overdue_scheduler.is_overdue(user_id)
+        if request.args.get('events') in ('1', 'true'):
+            response["events"] = overdue_scheduler.recent_events(limit)
+        return jsonify(response)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@stats_bp.route('/admin/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Route başına istek süresi, durum kodları ve veritabanı kullanımı (Prometheus metin formatı)"""
+    try:
+        return Response(metrics.render(DatabaseConfig.get_pool_stats(), catalog_stats()),
+                        content_type=METRICS_CONTENT_TYPE)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+@stats_bp.route('/admin/queries', methods=['GET'])
+def query_stats():
+    """
+    Sorgu kataloğu: ifade başına çalıştırma / hata sayısı ve execute süreleri
+    (toplam süreye göre azalan). ?all=1 ile hiç çalışmamış ifadeler de listelenir.
+    """
+    try:
+        statements = catalog_stats(include_idle=request.args.get('all') in ('1', 'true'))
+        return jsonify({"backend": DatabaseConfig.BACKEND, "statements": statements})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
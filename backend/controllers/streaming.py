@@ -0,0 +1,66 @@
+"""
+STREAMING.PY - Akış (Streaming) JSON Yanıtları
+
+Büyük listelerde tüm tablo belleğe alınmaz: repository satırları
+cursor.fetchmany ile parça parça okur, her parça ayrı serileştirilip
+istemciye gönderilir. Bellek kullanımı satır sayısından bağımsızdır.
+
+    GET /api/transactions?stream=1
+
+Yanıt gövdesi normal liste yanıtıyla aynı JSON dizisidir.
+
+Parçalar varsayılan olarak entity listesidir (to_dict + json.dumps);
+serialize verilirse ham satır parçaları o fonksiyonla doğrudan JSON'a
+yazılır (controllers/row_json.py).
+"""
+from itertools import chain
+from typing import Callable, Iterable, Iterator, List, Optional
+
+from flask import Response, json, request, stream_with_context
+
+
+def stream_requested() -> bool:
+    """İstemci ?stream=1 ile akış yanıtı istedi mi?"""
+    return request.args.get('stream') in ('1', 'true')
+
+
+def _entities(chunk: List) -> str:
+    return json.dumps([item.to_dict() for item in chunk])[1:-1]
+
+
+def json_array_chunks(chunks: Iterable[List], serialize: Optional[Callable[[List], str]] = None) -> Iterator[str]:
+    """
+    Parçaları tek bir JSON dizisinin parçaları olarak üretir.
+    Her parça tek çağrıyla serileştirilir (varsayılan: entity -> to_dict -> json.dumps).
+    """
+    serialize = serialize or _entities
+    yield '['
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        body = serialize(chunk)
+        yield body if first else ',' + body
+        first = False
+    yield ']'
+
+
+def json_stream_response(chunks: Iterable[List], serialize: Optional[Callable[[List], str]] = None) -> Response:
+    """
+    Akış yanıtı oluşturur. İlk parça burada okunur; bağlantı veya sorgu
+    hatası yanıt başlamadan exception olarak çıkar (endpoint 500 döner).
+    Bağlantı generator bitince (veya istemci koparsa) havuza geri bırakılır.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, [])
+    return Response(stream_with_context(json_array_chunks(chain([first], chunks), serialize)),
+                    mimetype='application/json')
+
+
+def json_array_response(chunks: Iterable[List], serialize: Optional[Callable[[List], str]] = None) -> Response:
+    """
+    Akışsız liste yanıtı: parçalar aynı şekilde serileştirilip tek gövdede
+    birleştirilir (jsonify çıktısıyla aynı, sondaki satır sonu dahil).
+    Ham satır parçaları serialize ile yazılırsa ara entity/dict listesi oluşmaz.
+    """
+    return Response(''.join(json_array_chunks(chunks, serialize)) + '\n', mimetype='application/json')
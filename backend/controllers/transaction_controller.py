@@ -1,13 +1,34 @@
 """TRANSACTION_CONTROLLER.PY - İşlem API (Admin)"""
-from flask import Blueprint, jsonify
+from datetime import datetime
+from flask import Blueprint, jsonify, request
 from services.borrow_service import borrow_service
+from controllers.pagination import PaginationError, page_args, page_response
+from controllers.streaming import json_array_response, json_stream_response, stream_requested
+from controllers import row_json
+from controllers.formats import FormatError, format_response, response_format
 
 transaction_bp = Blueprint('transactions', __name__, url_prefix='/api/transactions')
 
+RETURN_BATCH_MAX = 500
+
 @transaction_bp.route('', methods=['GET'])
 def get_all():
     try:
-        return jsonify([t.to_dict() for t in borrow_service.get_all_transactions()])
+        fmt = response_format()
+        if stream_requested() and fmt == 'json':
+            return json_stream_response(borrow_service.iter_all_transactions(raw=True), row_json.transactions)
+        page = page_args((datetime, int))
+        if page:
+            limit, after = page
+            rows = borrow_service.get_transactions_page(limit + 1, after)
+            return format_response(fmt, page_response(rows, limit, lambda t: (t.BorrowDate, t.Id)))
+        if fmt == 'json':
+            return json_array_response(borrow_service.iter_all_transactions(raw=True), row_json.transactions)
+        return format_response(fmt, [t.to_dict() for chunk in borrow_service.iter_all_transactions() for t in chunk])
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+    except FormatError as e:
+        return jsonify({"error": str(e)}), 406
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -19,6 +40,26 @@ def get_one(id):
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
+@transaction_bp.route('/return-batch', methods=['POST'])
+def return_batch():
+    """Toplu iade: {"transactionIds": [...]} -> işlem başına sonuç (tek round trip)"""
+    try:
+        data = request.get_json(silent=True) or {}
+        tx_ids = data.get('transactionIds')
+        if not isinstance(tx_ids, list) or not tx_ids:
+            return jsonify({"error": "transactionIds listesi gerekli"}), 400
+        if len(tx_ids) > RETURN_BATCH_MAX:
+            return jsonify({"error": f"En fazla {RETURN_BATCH_MAX} işlem gönderilebilir"}), 400
+        if not all(isinstance(i, int) and not isinstance(i, bool) for i in tx_ids):
+            return jsonify({"error": "transactionIds tam sayı olmalı"}), 400
+        if len(set(tx_ids)) != len(tx_ids):
+            return jsonify({"error": "transactionIds tekrar eden Id içeremez"}), 400
+        results = borrow_service.return_books(tx_ids)
+        returned = sum(1 for r in results if r["success"])
+        return jsonify({"results": results, "returned": returned, "failed": len(results) - returned})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
 @transaction_bp.route('/<int:id>', methods=['DELETE'])
 def delete(id):
     try:
@@ -1,13 +1,30 @@
 """USER_CONTROLLER.PY - Kullanıcı API"""
 from flask import Blueprint, request, jsonify
 from services.user_service import user_service
+from controllers.pagination import PaginationError, page_args, page_response
+from controllers.streaming import json_array_response, json_stream_response, stream_requested
+from controllers import row_json
+from controllers.formats import FormatError, format_response, response_format
 
 user_bp = Blueprint('users', __name__, url_prefix='/api/users')
 
 @user_bp.route('', methods=['GET'])
 def get_all():
     try:
-        return jsonify([u.to_dict() for u in user_service.get_all()])
+        fmt = response_format()
+        if stream_requested() and fmt == 'json':
+            return json_stream_response(user_service.iter_all(raw=True), row_json.users)
+        page = page_args((int,))
+        if page:
+            limit, after = page
+            return format_response(fmt, page_response(user_service.get_page(limit + 1, after), limit, lambda u: (u.Id,)))
+        if fmt == 'json':
+            return json_array_response(user_service.iter_all(raw=True), row_json.users)
+        return format_response(fmt, [u.to_dict() for chunk in user_service.iter_all() for u in chunk])
+    except PaginationError as e:
+        return jsonify({"error": str(e)}), 400
+    except FormatError as e:
+        return jsonify({"error": str(e)}), 406
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
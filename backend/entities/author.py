@@ -5,7 +5,7 @@ Author Entity - Yazar Veri Modeli
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Author:
     """Yazar Entity"""
     Id: int
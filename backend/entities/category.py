@@ -5,7 +5,7 @@ Category Entity - Kategori Veri Modeli
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True)
 class Category:
     """Kategori Entity"""
     Id: int
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Optional
+from datetime import datetime
+
+@dataclass(slots=True)
+class PenaltyLedgerEntry:
+    """Ceza defteri kaydı: charge (+), payment (-), cancel (-)"""
+    Id: int
+    UserId: int
+    PenaltyId: int
+    EntryType: str
+    Amount: float
+    CreatedDate: Optional[datetime] = None
+    UserName: Optional[str] = None
+    
+    def to_dict(self) -> dict:
+        return {
+            "id": self.Id,
+            "userId": self.UserId,
+            "userName": self.UserName or "",
+            "penaltyId": self.PenaltyId,
+            "entryType": self.EntryType,
+            "amount": float(self.Amount),
+            "createdDate": self.CreatedDate.strftime("%Y-%m-%d %H:%M:%S") if self.CreatedDate else None
+        }
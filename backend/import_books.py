@@ -0,0 +1,53 @@
+"""
+IMPORT_BOOKS.PY - Toplu Kitap İçe Aktarma (Komut Satırı)
+
+backend/ dizininden çalıştırılır:
+    python import_books.py bagis.csv
+    python import_books.py kitaplar.json --chunk-size 2000
+    python import_books.py kitaplar.ndjson --format ndjson
+
+Dosya biçimleri ve alanlar için: services/import_service.py
+Satır hatası varsa çıkış kodu 1 olur.
+"""
+import argparse
+import sys
+
+from services.import_service import FORMATS, ImportFormatError, ImportService, detect_format, import_service
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Kitap kataloğunu CSV / JSON / NDJSON dosyasından içe aktarır")
+    parser.add_argument('path', help="İçe aktarılacak dosya")
+    parser.add_argument('--format', choices=FORMATS, help="Dosya biçimi (varsayılan: uzantıdan)")
+    parser.add_argument('--chunk-size', type=int, default=ImportService.CHUNK_SIZE,
+                        help=f"Transaction başına satır (varsayılan: {ImportService.CHUNK_SIZE})")
+    parser.add_argument('--show-errors', type=int, default=20, help="Gösterilecek en fazla satır hatası")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or detect_format(args.path)
+    if not fmt:
+        parser.error("Dosya biçimi uzantıdan belirlenemedi, --format verin")
+
+    try:
+        with open(args.path, 'rb') as stream:
+            report = import_service.import_stream(stream, fmt, chunk_size=args.chunk_size)
+    except ImportFormatError as e:
+        print(f"❌ {e}")
+        return 1
+
+    result = report.to_dict()
+    print(f"📚 {result['total']} kayıt okundu, {result['inserted']} kitap eklendi, {result['failed']} hatalı")
+    print(f"✍️ Yeni yazar: {result['createdAuthors']} | 🏷️ Yeni kategori: {result['createdCategories']}")
+    print(f"⏱️ {result['seconds']} sn ({result['rowsPerSecond']} satır/sn)")
+    for error in result['errors'][:args.show_errors]:
+        field = f" [{error['field']}]" if 'field' in error else ''
+        print(f"   {error['row']}. satır{field}: {error['error']}")
+    if result['failed'] > args.show_errors:
+        print(f"   ... ve {result['failed'] - args.show_errors} hata daha")
+    if result['aborted']:
+        print(f"❌ İçe aktarma yarıda kaldı: {result['aborted']}")
+    return 1 if result['failed'] or result['aborted'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
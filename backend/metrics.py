@@ -0,0 +1,258 @@
+"""
+METRICS.PY - İstek ve Veritabanı Metrikleri
+
+Her blueprint route'u (route şablonu + HTTP metodu) için:
+- istek süresi histogramı ve durum kodu sayıları
+- havuzdan alınan bağlantı sayısı, sorgu sayısı ve veritabanında geçen süre
+
+Veritabanı sayaçlarını bağlantı havuzu besler: havuz bu modülün
+DbObserver'ını alır; istek sırasında alınan her bağlantı sayılır ve
+cursor'lar MeteredCursor ile sarılır (execute/executemany sorgu sayar;
+execute, fetch*, nextset ve satır okuma süresi veritabanı süresine eklenir).
+İstek dışındaki (arka plan thread'leri) bağlantılar sarılmaz, maliyetsizdir.
+
+İstek başına sayaçlar ContextVar'daki RequestUsage'da kilitsiz tutulur
+(istek tek thread'de işlenir); istek bitince tek kilitle route toplamına
+eklenir. Çıktı Prometheus metin formatıdır (/api/admin/metrics); sorgu
+kataloğunun ifade başına sayaçları (repositories/query_catalog.py) da eklenir.
+"""
+import bisect
+import contextvars
+import threading
+import time
+from typing import Optional
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class RequestUsage:
+    """Tek isteğin veritabanı kullanımı"""
+    __slots__ = ('connections', 'queries', 'db_seconds')
+
+    def __init__(self):
+        self.connections = 0
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_current = contextvars.ContextVar('request_usage', default=None)
+
+
+class MeteredCursor:
+    """Sürücü cursor'ı vekili: sorgu sayısı ve veritabanı süresi"""
+    __slots__ = ('_cursor', '_usage', '_iter')
+
+    def __init__(self, cursor, usage: RequestUsage):
+        object.__setattr__(self, '_cursor', cursor)
+        object.__setattr__(self, '_usage', usage)
+        object.__setattr__(self, '_iter', None)
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self._usage.db_seconds += time.perf_counter() - started
+
+    def execute(self, *args):
+        self._usage.queries += 1
+        self._timed(self._cursor.execute, *args)
+        return self
+
+    def executemany(self, *args):
+        self._usage.queries += 1
+        self._timed(self._cursor.executemany, *args)
+        return self
+
+    def fetchone(self):
+        return self._timed(self._cursor.fetchone)
+
+    def fetchall(self):
+        return self._timed(self._cursor.fetchall)
+
+    def fetchmany(self, *args):
+        return self._timed(self._cursor.fetchmany, *args)
+
+    def nextset(self):
+        return self._timed(self._cursor.nextset)
+
+    def __iter__(self):
+        object.__setattr__(self, '_iter', iter(self._cursor))
+        return self
+
+    def __next__(self):
+        return self._timed(next, self._iter)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __setattr__(self, name, value):
+        # ör. cursor.fast_executemany = True
+        setattr(self._cursor, name, value)
+
+
+class DbObserver:
+    """ConnectionPool'un çağırdığı kanca: istek içindeki bağlantı ve cursor'lar"""
+
+    @staticmethod
+    def acquired():
+        usage = _current.get()
+        if usage is not None:
+            usage.connections += 1
+
+    @staticmethod
+    def cursor(cursor):
+        usage = _current.get()
+        return cursor if usage is None else MeteredCursor(cursor, usage)
+
+
+class _RouteStats:
+    __slots__ = ('buckets', 'count', 'seconds', 'statuses', 'connections', 'queries', 'db_seconds')
+
+    def __init__(self, bucket_count: int):
+        self.buckets = [0] * (bucket_count + 1)     # son eleman: +Inf
+        self.count = 0
+        self.seconds = 0.0
+        self.statuses = {}
+        self.connections = 0
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+class Metrics:
+    """
+    Args:
+        buckets: İstek süresi histogramının üst sınırları (saniye, artan)
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.db_observer = DbObserver()
+        self._routes = {}
+        self._lock = threading.Lock()
+        self._started_at = time.time()
+
+    def start_request(self):
+        """İstek başında çağrılır; finish_request'e verilecek durumu döndürür"""
+        usage = RequestUsage()
+        return time.perf_counter(), usage, _current.set(usage)
+
+    def finish_request(self, state, blueprint: str, route: str, method: str, status: int):
+        started, usage, token = state
+        elapsed = time.perf_counter() - started
+        try:
+            _current.reset(token)
+        except ValueError:
+            _current.set(None)
+
+        key = (blueprint, route, method)
+        index = bisect.bisect_left(self.buckets, elapsed)
+        with self._lock:
+            stats = self._routes.get(key)
+            if stats is None:
+                stats = self._routes[key] = _RouteStats(len(self.buckets))
+            stats.buckets[index] += 1
+            stats.count += 1
+            stats.seconds += elapsed
+            stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.connections += usage.connections
+            stats.queries += usage.queries
+            stats.db_seconds += usage.db_seconds
+
+    def reset(self):
+        with self._lock:
+            self._routes.clear()
+
+    # ---- Prometheus metin formatı ----
+
+    def render(self, pool_stats: Optional[dict] = None, statements: Optional[list] = None) -> str:
+        """
+        Args:
+            pool_stats: ConnectionPool.stats()
+            statements: query_catalog.catalog_stats() (ifade başına sayaçlar)
+        """
+        with self._lock:
+            snapshot = [(key, list(s.buckets), dict(s.statuses), s.count, s.seconds,
+                         s.connections, s.queries, s.db_seconds)
+                        for key, s in sorted(self._routes.items())]
+
+        lines = []
+        add = lines.append
+
+        add("# HELP http_request_duration_seconds İstek süresi (route şablonu ve metoda göre)")
+        add("# TYPE http_request_duration_seconds histogram")
+        for key, buckets, _, count, seconds, *_ in snapshot:
+            labels = _labels(key)
+            cumulative = 0
+            for bound, hits in zip(self.buckets, buckets):
+                cumulative += hits
+                add(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            add(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            add(f'http_request_duration_seconds_sum{{{labels}}} {seconds:.6f}')
+            add(f'http_request_duration_seconds_count{{{labels}}} {count}')
+
+        add("# HELP http_requests_total İstek sayısı (durum koduna göre)")
+        add("# TYPE http_requests_total counter")
+        for key, _, statuses, *_ in snapshot:
+            labels = _labels(key)
+            for status, count in sorted(statuses.items()):
+                add(f'http_requests_total{{{labels},status="{status}"}} {count}')
+
+        for name, position, help_text in (
+            ("db_connections_total", 5, "İstek sırasında havuzdan alınan bağlantı sayısı"),
+            ("db_queries_total", 6, "İstek sırasında çalıştırılan sorgu sayısı"),
+            ("db_time_seconds_total", 7, "İstek sırasında veritabanında geçen süre"),
+        ):
+            add(f"# HELP {name} {help_text}")
+            add(f"# TYPE {name} counter")
+            for row in snapshot:
+                value = row[position]
+                add(f'{name}{{{_labels(row[0])}}} {value:.6f}' if isinstance(value, float)
+                    else f'{name}{{{_labels(row[0])}}} {value}')
+
+        if pool_stats:
+            for name, key, kind in (
+                ("db_pool_size", "size", "gauge"),
+                ("db_pool_in_use", "inUse", "gauge"),
+                ("db_pool_idle", "idle", "gauge"),
+                ("db_pool_max_size", "maxSize", "gauge"),
+                ("db_pool_checkouts_total", "checkouts", "counter"),
+                ("db_pool_waits_total", "waits", "counter"),
+                ("db_pool_timeouts_total", "timeouts", "counter"),
+                ("db_pool_connections_created_total", "created", "counter"),
+            ):
+                add(f"# TYPE {name} {kind}")
+                add(f"{name} {pool_stats.get(key, 0)}")
+            add("# TYPE db_pool_wait_seconds_total counter")
+            add(f"db_pool_wait_seconds_total {pool_stats.get('waitTimeMs', 0) / 1000:.6f}")
+
+        if statements:
+            for name, key, kind, help_text, scale in (
+                ("db_statement_executions_total", "calls", "counter", "İfade başına çalıştırma sayısı", None),
+                ("db_statement_errors_total", "errors", "counter", "İfade başına hata sayısı", None),
+                ("db_statement_seconds_total", "totalMs", "counter", "İfade başına toplam execute süresi", 1000),
+                ("db_statement_max_seconds", "maxMs", "gauge", "İfade başına en uzun execute süresi", 1000),
+            ):
+                add(f"# HELP {name} {help_text}")
+                add(f"# TYPE {name} {kind}")
+                for stat in statements:
+                    value = stat[key]
+                    add(f'{name}{{statement="{_escape(stat["name"])}"}} '
+                        + (f"{value / scale:.6f}" if scale else f"{value}"))
+
+        add("# TYPE process_start_time_seconds gauge")
+        add(f"process_start_time_seconds {self._started_at:.3f}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(key) -> str:
+    blueprint, route, method = key
+    return f'blueprint="{_escape(blueprint)}",route="{_escape(route)}",method="{method}"'
+
+
+metrics = Metrics()
@@ -0,0 +1,270 @@
+"""
+MIGRATE.PY - Şema Migration'ları (Komut Satırı)
+
+db_setup.sql / db_setup_sqlite.sql şemanın başlangıç sürümüdür (sürüm 0).
+Sonraki değişiklikler canlı veritabanına sürüm numaralı script'lerle uygulanır:
+
+    migrations/sqlserver/0001_performance_indexes.sql
+    migrations/sqlserver/0002_active_loans.sql
+    migrations/sqlserver/0003_penalty_ledger.sql
+    migrations/sqlite/0001_performance_indexes.sql
+    migrations/sqlite/0002_penalty_ledger.sql
+
+Sürüm numaraları sürücü başınadır: SQLite şeması (db_setup_sqlite.sql) ödünç
+sayacıyla başladığı için SQL Server'ın 0002'sinin karşılığı yoktur.
+
+Uygulanan sürümler SchemaMigrations tablosunda (sürüm, ad, checksum, süre)
+tutulur. Her migration kendi transaction'ında çalışır: yarıda kalan migration
+geri alınır, kaydı yazılmaz. Aynı anda çalışan iki runner'dan biri bekler
+(SQL Server: sp_getapplock, SQLite: BEGIN IMMEDIATE) ve uygulanmış sürümü
+atlar. Uygulanmış bir script sonradan değiştirilirse (checksum tutmazsa)
+runner durur; değişiklik yeni bir sürüm olarak yazılmalıdır.
+
+SQLite sürücüsünde bekleyen migration'lar dosya ilk açıldığında otomatik
+uygulanır (sqlite_database.initialize). SQL Server'da backend/ dizininden:
+
+    python migrate.py status
+    python migrate.py up
+    python migrate.py up --to 1
+    python migrate.py status --backend sqlite --sqlite-path kutuphane.db
+
+Bekleyen migration'ların önce / sonra sorgu maliyeti: python -m benchmarks.index_report
+"""
+import argparse
+import hashlib
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from repositories.query_catalog import SQLITE, SQLSERVER
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'migrations')
+LOCK_TIMEOUT_MS = 60000
+
+_FILE_NAME = re.compile(r'^(\d+)_(\w+)\.sql$')
+_GO = re.compile(r'^\s*GO\s*;?\s*$', re.IGNORECASE | re.MULTILINE)
+
+CREATE_TABLE = {
+    SQLSERVER: """
+        IF OBJECT_ID('dbo.SchemaMigrations', 'U') IS NULL
+        CREATE TABLE dbo.SchemaMigrations (
+            Version INT PRIMARY KEY,
+            Name NVARCHAR(200) NOT NULL,
+            Checksum CHAR(64) NOT NULL,
+            AppliedAt DATETIME NOT NULL,
+            DurationMs INT NOT NULL
+        )
+    """,
+    SQLITE: """
+        CREATE TABLE IF NOT EXISTS SchemaMigrations (
+            Version INTEGER PRIMARY KEY,
+            Name NVARCHAR(200) NOT NULL,
+            Checksum CHAR(64) NOT NULL,
+            AppliedAt DATETIME NOT NULL,
+            DurationMs INT NOT NULL
+        )
+    """,
+}
+SELECT_APPLIED = "SELECT Version, Name, Checksum, AppliedAt FROM SchemaMigrations ORDER BY Version"
+INSERT_APPLIED = "INSERT INTO SchemaMigrations (Version, Name, Checksum, AppliedAt, DurationMs) VALUES (?, ?, ?, ?, ?)"
+# Transaction sahipli kilit: commit / rollback ile bırakılır
+SQLSERVER_LOCK = """
+    SET NOCOUNT ON;
+    DECLARE @Result INT;
+    EXEC @Result = sp_getapplock @Resource = 'SchemaMigrations', @LockMode = 'Exclusive',
+                                 @LockOwner = 'Transaction', @LockTimeout = ?;
+    SELECT @Result;
+"""
+
+
+class MigrationError(Exception):
+    pass
+
+
+class Migration:
+    """Tek sürüm script'i; checksum satır sonlarından bağımsızdır (CRLF / LF)"""
+    __slots__ = ('version', 'name', 'path', 'sql', 'checksum')
+
+    def __init__(self, version: int, name: str, path: str, sql: str):
+        self.version = version
+        self.name = name
+        self.path = path
+        self.sql = sql.replace('\r\n', '\n')
+        self.checksum = hashlib.sha256(self.sql.encode('utf-8')).hexdigest()
+
+    def statements(self, dialect: str) -> List[str]:
+        """SQL Server: GO satırlarıyla ayrılmış batch'ler; SQLite: tam ifadeler"""
+        if dialect == SQLITE:
+            from sqlite_database import split_statements
+            return list(split_statements(self.sql))
+        return [batch for batch in _GO.split(self.sql) if batch.strip()]
+
+    def run(self, conn, dialect: str):
+        """Script'i açık transaction'da çalıştırır (commit / kayıt çağırana ait)"""
+        cursor = conn.cursor()
+        for statement in self.statements(dialect):
+            cursor.execute(statement)
+            # SQL Server: PRINT / satır sayısı gibi ara sonuçlar tüketilir
+            while dialect == SQLSERVER and cursor.nextset():
+                pass
+
+    def __repr__(self):
+        return f"Migration({self.version}, {self.name!r})"
+
+
+def discover(dialect: str, directory: Optional[str] = None) -> List[Migration]:
+    """migrations/<sürücü>/NNNN_ad.sql dosyaları, sürüm sırasıyla"""
+    path = os.path.join(directory or MIGRATIONS_DIR, dialect)
+    migrations = {}
+    for file_name in sorted(os.listdir(path)) if os.path.isdir(path) else ():
+        match = _FILE_NAME.match(file_name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f"Aynı sürüm iki kez tanımlı: {version} ({file_name})")
+        with open(os.path.join(path, file_name), encoding='utf-8') as f:
+            migrations[version] = Migration(version, match.group(2), os.path.join(path, file_name), f.read())
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def ensure_table(conn, dialect: str):
+    conn.cursor().execute(CREATE_TABLE[dialect])
+    conn.commit()
+
+
+def applied_versions(conn) -> Dict[int, tuple]:
+    """sürüm -> (ad, checksum, uygulanma zamanı)"""
+    rows = conn.cursor().execute(SELECT_APPLIED).fetchall()
+    return {row[0]: (row[1], row[2].strip(), row[3]) for row in rows}
+
+
+def verify(migrations: List[Migration], applied: Dict[int, tuple]):
+    """Uygulanmış script'ler değiştirilmemiş olmalı"""
+    changed = [m for m in migrations if m.version in applied and applied[m.version][1] != m.checksum]
+    if changed:
+        names = ", ".join(f"{m.version:04d}_{m.name}" for m in changed)
+        raise MigrationError(f"Uygulanmış migration değiştirilmiş: {names}. Değişikliği yeni bir sürüm olarak yazın")
+
+
+def pending(conn, dialect: str, target: Optional[int] = None) -> List[Migration]:
+    ensure_table(conn, dialect)
+    migrations = discover(dialect)
+    applied = applied_versions(conn)
+    conn.commit()
+    verify(migrations, applied)
+    return [m for m in migrations
+            if m.version not in applied and (target is None or m.version <= target)]
+
+
+def _begin(conn, dialect: str):
+    """Migration transaction'ını başlatır ve runner kilidini alır"""
+    if dialect == SQLITE:
+        conn.execute("BEGIN IMMEDIATE")
+        return
+    # pyodbc autocommit kapalı: ilk ifade transaction'ı açar
+    result = conn.cursor().execute(SQLSERVER_LOCK, (LOCK_TIMEOUT_MS,)).fetchone()[0]
+    if result < 0:
+        raise MigrationError(f"Migration kilidi alınamadı (sp_getapplock: {result})")
+
+
+def apply(conn, migration: Migration, dialect: str) -> bool:
+    """
+    Tek migration'ı transaction içinde uygular ve kaydını yazar.
+
+    Returns:
+        False: kilit beklenirken başka bir runner uygulamış
+    """
+    try:
+        _begin(conn, dialect)
+        if migration.version in applied_versions(conn):
+            conn.rollback()
+            return False
+        started = time.perf_counter()
+        migration.run(conn, dialect)
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        conn.cursor().execute(INSERT_APPLIED, (migration.version, migration.name, migration.checksum,
+                                               datetime.now(), duration_ms))
+        conn.commit()
+        return True
+    except Exception:
+        conn.rollback()
+        raise
+
+
+def upgrade(conn, dialect: str, target: Optional[int] = None,
+            log: Optional[Callable[[str], None]] = None) -> List[Migration]:
+    """
+    Bekleyen migration'ları sırayla uygular.
+
+    SQLite bağlantısı autocommit (isolation_level None) olmalıdır: transaction'ı
+    runner BEGIN IMMEDIATE ile açar.
+
+    Returns:
+        Bu çağrıda uygulanan migration'lar
+    """
+    done = []
+    for migration in pending(conn, dialect, target):
+        if log:
+            log(f"⏳ {migration.version:04d}_{migration.name} uygulanıyor...")
+        if apply(conn, migration, dialect):
+            done.append(migration)
+        elif log:
+            log(f"   {migration.version:04d}_{migration.name} başka bir işlem tarafından uygulanmış")
+    return done
+
+
+def _connect(backend: str, sqlite_path: str):
+    from config import DatabaseConfig
+    if backend == SQLITE:
+        import sqlite_database
+        conn = sqlite_database.connect(sqlite_path, upgrade=False)
+        conn.autocommit = True
+        return conn
+    return DatabaseConfig.create_connection()
+
+
+def main(argv=None) -> int:
+    from config import DatabaseConfig
+    parser = argparse.ArgumentParser(description="Şema migration'larını listeler / uygular")
+    parser.add_argument('command', choices=('status', 'up'), help="status: sürümleri listeler, up: bekleyenleri uygular")
+    parser.add_argument('--to', type=int, help="up: bu sürüme kadar (dahil) uygula")
+    parser.add_argument('--backend', choices=(SQLSERVER, SQLITE), default=DatabaseConfig.BACKEND,
+                        help=f"Depolama sürücüsü (varsayılan: {DatabaseConfig.BACKEND})")
+    parser.add_argument('--sqlite-path', default=DatabaseConfig.SQLITE_PATH, help="SQLite dosyası")
+    args = parser.parse_args(argv)
+
+    conn = _connect(args.backend, args.sqlite_path)
+    try:
+        if args.command == 'up':
+            done = upgrade(conn, args.backend, args.to, log=print)
+            print(f"✅ {len(done)} migration uygulandı" if done else "✅ Şema güncel")
+            return 0
+
+        ensure_table(conn, args.backend)
+        applied = applied_versions(conn)
+        migrations = discover(args.backend)
+        known = {m.version for m in migrations}
+        for m in migrations:
+            if m.version not in applied:
+                state = "bekliyor"
+            elif applied[m.version][1] != m.checksum:
+                state = "DEĞİŞTİRİLMİŞ (checksum tutmuyor)"
+            else:
+                state = f"uygulandı {applied[m.version][2]:%Y-%m-%d %H:%M}"
+            print(f"{m.version:04d}_{m.name:<40}{state}")
+        for version in sorted(set(applied) - known):
+            print(f"{version:04d}_{applied[version][0]:<40}uygulandı, dosyası yok")
+        return 0
+    except MigrationError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
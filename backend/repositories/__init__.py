@@ -2,6 +2,7 @@
 REPOSITORIES - Veritabanı İşlemleri
 - SQL Injection Koruması
 - Stored Procedure Kullanımı
+- repository_for: DatabaseConfig.BACKEND'e göre SQL Server / SQLite sürümü
 """
 from repositories.base_repository import BaseRepository
 from repositories.user_repository import UserRepository
@@ -10,6 +11,8 @@ from repositories.category_repository import CategoryRepository
 from repositories.book_repository import BookRepository
 from repositories.transaction_repository import TransactionRepository
 from repositories.penalty_repository import PenaltyRepository
+from repositories.stats_repository import StatsRepository
+from repositories.factory import repository_for
 
 __all__ = [
     'BaseRepository',
@@ -18,5 +21,7 @@ __all__ = [
     'CategoryRepository',
     'BookRepository',
     'TransactionRepository',
-    'PenaltyRepository'
+    'PenaltyRepository',
+    'StatsRepository',
+    'repository_for'
 ]
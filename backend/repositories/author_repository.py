@@ -1,8 +1,9 @@
 """
 AUTHOR_REPOSITORY.PY - Yazar Veritabanı İşlemleri
 """
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from repositories.base_repository import BaseRepository
+from repositories import queries
 from entities.author import Author
 
 class AuthorRepository(BaseRepository):
@@ -10,12 +11,11 @@ class AuthorRepository(BaseRepository):
     def get_all(self) -> List[Author]:
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT Id, Name, LastName, Country FROM Authors")
+            conn = self.get_connection(read_only=True)
+            cursor = self.execute(conn, queries.AUTHORS_ALL)
             return [Author(Id=row[0], Name=row[1], LastName=row[2], Country=row[3]) for row in cursor.fetchall()]
         except Exception as e:
-            print(f"[AuthorRepository.get_all] HATA: {e}")
+            self.log_error("get_all", e)
             return []
         finally:
             if conn: conn.close()
@@ -25,13 +25,11 @@ class AuthorRepository(BaseRepository):
             return None
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT Id, Name, LastName, Country FROM Authors WHERE Id = ?", (author_id,))
-            row = cursor.fetchone()
+            conn = self.get_connection(read_only=True)
+            row = self.execute(conn, queries.AUTHOR_BY_ID, (author_id,)).fetchone()
             return Author(Id=row[0], Name=row[1], LastName=row[2], Country=row[3]) if row else None
         except Exception as e:
-            print(f"[AuthorRepository.get_by_id] HATA: {e}")
+            self.log_error("get_by_id", e)
             return None
         finally:
             if conn: conn.close()
@@ -42,30 +40,54 @@ class AuthorRepository(BaseRepository):
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO Authors (Name, LastName, Country) VALUES (?, ?, ?); SELECT SCOPE_IDENTITY();", (name, lastname, country))
-            cursor.nextset()
-            new_id = cursor.fetchone()[0]
+            new_id = self.insert_identity(conn, queries.AUTHOR_INSERT, (name, lastname, country))
             conn.commit()
             return Author(Id=int(new_id), Name=name, LastName=lastname, Country=country)
         except Exception as e:
-            print(f"[AuthorRepository.add] HATA: {e}")
+            self.log_error("add", e)
             return None
         finally:
             if conn: conn.close()
     
+    def bulk_add(self, names: List[Tuple[str, str]], uow=None) -> List[Author]:
+        """
+        Toplu yazar ekleme (içe aktarma). Çok satırlı INSERT ... OUTPUT ile
+        (SQLite: RETURNING) tek round trip'te eklenir, oluşan ID'ler aynı sorgudan okunur.
+        
+        Args:
+            names: (ad, soyad) listesi
+        """
+        if not names:
+            return []
+        conn = None
+        try:
+            conn = self.get_connection(uow=uow)
+            authors = []
+            # SQL Server: en fazla 1000 VALUES satırı / 2100 parametre
+            for start in range(0, len(names), self.BULK_VALUES_LIMIT // 2):
+                part = names[start:start + self.BULK_VALUES_LIMIT // 2]
+                cursor = self.execute(conn, queries.AUTHORS_BULK_INSERT,
+                                      [value for pair in part for value in pair], rows=len(part))
+                authors.extend(Author(Id=row[0], Name=row[1], LastName=row[2], Country=None) for row in cursor.fetchall())
+            conn.commit()
+            return authors
+        except Exception as e:
+            self.log_error("bulk_add", e)
+            return []
+        finally:
+            if conn: conn.close()
+    
     def update(self, author_id: int, name: str, lastname: str, country: str) -> bool:
         if not self.validate_id(author_id):
             return False
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("UPDATE Authors SET Name = ?, LastName = ?, Country = ? WHERE Id = ?", (name, lastname, country, author_id))
+            cursor = self.execute(conn, queries.AUTHOR_UPDATE, (name, lastname, country, author_id))
             conn.commit()
             return cursor.rowcount > 0
         except Exception as e:
-            print(f"[AuthorRepository.update] HATA: {e}")
+            self.log_error("update", e)
             return False
         finally:
             if conn: conn.close()
@@ -76,12 +98,11 @@ class AuthorRepository(BaseRepository):
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM Authors WHERE Id = ?", (author_id,))
+            cursor = self.execute(conn, queries.AUTHOR_DELETE, (author_id,))
             conn.commit()
             return cursor.rowcount > 0
         except Exception as e:
-            print(f"[AuthorRepository.delete] HATA: {e}")
+            self.log_error("delete", e)
             return False
         finally:
             if conn: conn.close()
@@ -2,8 +2,13 @@
 BASE_REPOSITORY.PY - Temel Repository Sınıfı
 SQL Injection koruması ve ortak metodlar içerir.
 """
+import logging
 import re
-from config import DatabaseConfig
+from typing import Iterator, Optional
+from config import DatabaseConfig, LogConfig
+from structured_log import sampled
+from repositories.input_validator import InjectionRule, InputValidator
+from repositories.query_catalog import SQLSERVER, Query
 
 class BaseRepository:
     """
@@ -13,22 +18,145 @@ class BaseRepository:
     """
     
     # SQL Injection tespiti için tehlikeli kalıplar
-    SQL_INJECTION_PATTERNS = [
-        r"(\s|^)(DROP|TRUNCATE|ALTER|EXEC|EXECUTE)\s",  # DDL komutları
-        r"--",                    # SQL yorum satırı
-        r"/\*.*\*/",             # Çok satırlı yorum
-        r"xp_",                  # SQL Server extended procedures
-        r"sp_",                  # System procedures (dikkatli kullan)
-        r"0x[0-9a-fA-F]{8,}",    # Hex encoded strings
-        r";\s*(SELECT|INSERT|UPDATE|DELETE)",  # Chained queries
-        r"UNION\s+(ALL\s+)?SELECT",  # Union injection
-        r"OR\s+1\s*=\s*1",      # Classic OR injection
-        r"'\s*OR\s*'",          # String OR injection
+    # (kalıp, tetikleyici karakterle başlayan eşdeğeri, metin başı biçimi)
+    # Tetikleyici karakterler: boşluk - / _ 0 ; '  (bkz. input_validator.py)
+    SQL_INJECTION_RULES = [
+        InjectionRule(r"(\s|^)(DROP|TRUNCATE|ALTER|EXEC|EXECUTE)\s",     # DDL komutları
+                      r"\s(?:DROP|TRUNCATE|ALTER|EXEC|EXECUTE)\s",
+                      r"(?:DROP|TRUNCATE|ALTER|EXEC|EXECUTE)\s"),
+        InjectionRule(r"--"),                                            # SQL yorum satırı
+        InjectionRule(r"/\*.*\*/"),                                      # Çok satırlı yorum
+        InjectionRule(r"xp_", r"_(?<=xp_)"),                             # SQL Server extended procedures
+        InjectionRule(r"sp_", r"_(?<=sp_)"),                             # System procedures (dikkatli kullan)
+        InjectionRule(r"0x[0-9a-fA-F]{8,}"),                             # Hex encoded strings
+        InjectionRule(r";\s*(SELECT|INSERT|UPDATE|DELETE)",              # Chained queries
+                      r";\s*(?:SELECT|INSERT|UPDATE|DELETE)"),
+        InjectionRule(r"UNION\s+(ALL\s+)?SELECT",                         # Union injection
+                      r"\s(?<=UNION\s)\s*(?:ALL\s+)?SELECT"),
+        InjectionRule(r"OR\s+1\s*=\s*1", r"\s(?<=OR\s)\s*1\s*=\s*1"),     # Classic OR injection
+        InjectionRule(r"'\s*OR\s*'"),                                     # String OR injection
     ]
+    SQL_INJECTION_PATTERNS = [rule.pattern for rule in SQL_INJECTION_RULES]
     
-    def get_connection(self):
-        """Veritabanı bağlantısı döndürür"""
-        return DatabaseConfig.get_connection()
+    # Kalıplar tek regex'te birleştirilip bir kez derlenir
+    _validator = InputValidator(SQL_INJECTION_RULES, max_length=1000, log_sample=LogConfig.SECURITY_SAMPLE)
+    
+    EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+    
+    # Akış (streaming) okumalarında tek fetchmany ile alınan satır sayısı
+    STREAM_CHUNK_SIZE = 1000
+    
+    # Çok satırlı INSERT ... VALUES için üst sınır (SQL Server: 1000 satır, 2100 parametre)
+    BULK_VALUES_LIMIT = 1000
+    
+    # Sorgu kataloğu metin varyantı; SQL Server'da parametre tipleri de bildirilir
+    # (repositories/query_catalog.py, SQLite sürücüsü: 'sqlite')
+    DIALECT = SQLSERVER
+    
+    # Her alt sınıf kendi modülünün logger'ını kullanır (__init_subclass__)
+    logger = logging.getLogger(__name__)
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.logger = logging.getLogger(cls.__module__)
+    
+    @classmethod
+    def log(cls, level: int, method: str, msg: str, *args, sample: int = 1, exc_info=None, **fields):
+        """
+        Yapılandırılmış log kaydı (repository, method + verilen alanlar).
+        Seviye kapalıysa tek isEnabledFor kontrolüyle döner.
+        
+        Args:
+            sample: >1 ise aynı (sınıf, metod, mesaj) için her `sample` kayıttan biri yazılır
+            fields: Ek alanlar (ör. rows=..., duration_ms=...)
+        """
+        logger = cls.logger
+        if not logger.isEnabledFor(level):
+            return
+        if sample > 1:
+            if not sampled((cls.__name__, method, msg), sample):
+                return
+            fields["sample"] = sample
+        logger.log(level, msg, *args, exc_info=exc_info,
+                   extra={"repository": cls.__name__, "method": method, **fields})
+    
+    @classmethod
+    def log_error(cls, method: str, error: Exception, exc_info: bool = False):
+        cls.log(logging.ERROR, method, "HATA: %s", error, exc_info=error if exc_info else None)
+    
+    @classmethod
+    def log_rejected(cls, method: str, msg: str, *args):
+        """Doğrulama reddi - saldırı anında çok sık olabilir, örneklenir"""
+        cls.log(logging.WARNING, method, "[SECURITY] " + msg, *args, sample=LogConfig.SECURITY_SAMPLE)
+    
+    def get_connection(self, read_only: bool = False, uow=None):
+        """
+        Havuzdan veritabanı bağlantısı döndürür.
+        close() çağrısı bağlantıyı kapatmaz, havuza geri bırakır.
+        
+        Args:
+            read_only: Sadece okuma yapılacaksa True (autocommit, commit gerekmez)
+            uow: Verilirse UnitOfWork'ün paylaşılan bağlantısı kullanılır
+        """
+        if uow is not None:
+            return uow.connection
+        return DatabaseConfig.get_connection(read_only=read_only)
+    
+    def execute(self, conn, query: Query, params=(), rows: Optional[int] = None):
+        """
+        Katalogdaki ifadeyi çalıştırır, cursor'ı döndürür (repositories/queries.py).
+        
+        Args:
+            conn: get_connection() bağlantısı
+            rows: IN listesi / çok satırlı VALUES ifadelerinde değer sayısı
+        """
+        return query.execute(conn, params, self.DIALECT, rows)
+    
+    def executemany(self, conn, query: Query, seq_of_params, fast: bool = False):
+        return query.executemany(conn, seq_of_params, self.DIALECT, fast)
+    
+    def insert_identity(self, conn, query: Query, params) -> int:
+        """
+        Tek satırlık INSERT çalıştırır ve oluşan IDENTITY değerini döndürür.
+        SQL Server'da SCOPE_IDENTITY() aynı batch'te okunur (queries.insert);
+        diğer sürücüler (repositories/sqlite) bu metodu ezer.
+        """
+        cursor = self.execute(conn, query, params)
+        cursor.nextset()
+        return int(cursor.fetchone()[0])
+    
+    @staticmethod
+    def fetch_result_sets(cursor) -> list:
+        """
+        Batch/stored procedure sonucundaki tüm result set'leri sırayla okur.
+        Satır döndürmeyen ifadeler (description None) atlanır.
+        
+        Returns:
+            list: Her result set için satır listesi
+        """
+        result_sets = []
+        while True:
+            if cursor.description is not None:
+                result_sets.append(cursor.fetchall())
+            if not cursor.nextset():
+                break
+        return result_sets
+    
+    @staticmethod
+    def iter_chunks(cursor, row_mapper, chunk_size: int) -> Iterator[list]:
+        """
+        Çalıştırılmış sorgunun satırlarını fetchmany ile parça parça okur.
+        Aynı anda bellekte en fazla chunk_size satır bulunur.
+        
+        Yields:
+            list: row_mapper ile entity'ye çevrilmiş satır parçası
+                  (row_mapper None ise sürücü satırları olduğu gibi)
+        """
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                return
+            yield rows if row_mapper is None else [row_mapper(row) for row in rows]
     
     @staticmethod
     def validate_input(value, field_name: str = "alan") -> bool:
@@ -42,30 +170,21 @@ class BaseRepository:
         Returns:
             bool: Geçerli ise True, değilse False
         """
-        if value is None:
-            return True
-        
-        if isinstance(value, (int, float)):
-            return True
+        return BaseRepository._validator.is_valid(value, field_name)
+    
+    @staticmethod
+    def validate_records(records, fields=None) -> list:
+        """
+        Toplu girdi doğrulama - kayıt listesini tek geçişte kontrol eder.
         
-        if isinstance(value, str):
-            if len(value.strip()) == 0:
-                return True
-            
-            # Maksimum uzunluk kontrolü
-            if len(value) > 1000:
-                print(f"[SECURITY] {field_name} çok uzun: {len(value)} karakter")
-                return False
-            
-            # SQL Injection pattern kontrolü
-            for pattern in BaseRepository.SQL_INJECTION_PATTERNS:
-                if re.search(pattern, value, re.IGNORECASE):
-                    print(f"[SECURITY] SQL Injection tespit edildi - {field_name}: {pattern}")
-                    return False
-            
-            return True
+        Args:
+            records: dict veya değer dizisi olan kayıtlar (ör. içe aktarma dosyası)
+            fields: Sadece bu alanları kontrol et
         
-        return True
+        Returns:
+            list: ValidationError(index, field, reason) listesi; boşsa hepsi geçerli
+        """
+        return BaseRepository._validator.validate_records(records, fields)
     
     @staticmethod
     def validate_id(value, field_name: str = "ID") -> bool:
@@ -85,11 +204,11 @@ class BaseRepository:
         try:
             int_value = int(value)
             if int_value <= 0:
-                print(f"[SECURITY] {field_name} pozitif olmalı: {int_value}")
+                BaseRepository.log_rejected("validate_id", "%s pozitif olmalı: %s", field_name, int_value)
                 return False
             return True
         except (ValueError, TypeError):
-            print(f"[SECURITY] {field_name} integer olmalı: {value}")
+            BaseRepository.log_rejected("validate_id", "%s integer olmalı: %r", field_name, value)
             return False
     
     @staticmethod
@@ -107,9 +226,8 @@ class BaseRepository:
             return False
         
         # Email format kontrolü
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, email):
-            print(f"[SECURITY] Geçersiz email formatı: {email}")
+        if not BaseRepository.EMAIL_PATTERN.match(email):
+            BaseRepository.log_rejected("validate_email", "Geçersiz email formatı: %r", email)
             return False
         
         # SQL Injection kontrolü
@@ -133,9 +251,9 @@ class BaseRepository:
         try:
             float_value = float(value)
             if float_value < 0:
-                print(f"[SECURITY] {field_name} negatif olamaz: {float_value}")
+                BaseRepository.log_rejected("validate_amount", "%s negatif olamaz: %s", field_name, float_value)
                 return False
             return True
         except (ValueError, TypeError):
-            print(f"[SECURITY] {field_name} sayı olmalı: {value}")
+            BaseRepository.log_rejected("validate_amount", "%s sayı olmalı: %r", field_name, value)
             return False
@@ -1,39 +1,68 @@
 """
 BOOK_REPOSITORY.PY - Kitap Veritabanı İşlemleri
 """
-from typing import List, Optional
+import logging
+from typing import Iterator, List, Optional, Tuple
 from repositories.base_repository import BaseRepository
+from repositories import queries
 from entities.book import Book
 
 class BookRepository(BaseRepository):
     
+    @staticmethod
+    def _row_to_book(row) -> Book:
+        """JOIN'li kitap satırını (queries.BOOK_SELECT) entity'ye çevirir"""
+        return Book(
+            Id=row[0], Title=row[1], AuthorId=row[2], CategoryId=row[3],
+            StockNumber=row[4], YearOfpublication=row[5],
+            AuthorName=row[6], CategoryName=row[7], Available=row[8]
+        )
+    
     def get_all(self) -> List[Book]:
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT b.Id, b.Title, b.AuthorId, b.CategoryId, b.StockNumber, b.YearOfpublication,
-                       ISNULL(a.Name + ' ' + a.LastName, '') AS AuthorName,
-                       ISNULL(c.Name, '') AS CategoryName,
-                       b.StockNumber - ISNULL((
-                           SELECT COUNT(*) FROM BorrowTransactions bt 
-                           WHERE bt.BookId = b.Id AND bt.RealReturnDate IS NULL
-                       ), 0) AS Available
-                FROM Books b
-                LEFT JOIN Authors a ON b.AuthorId = a.Id
-                LEFT JOIN Categories c ON b.CategoryId = c.Id
-            """)
+            conn = self.get_connection(read_only=True)
             books = []
-            for row in cursor.fetchall():
-                books.append(Book(
-                    Id=row[0], Title=row[1], AuthorId=row[2], CategoryId=row[3],
-                    StockNumber=row[4], YearOfpublication=row[5],
-                    AuthorName=row[6], CategoryName=row[7], Available=row[8]
-                ))
+            for row in self.execute(conn, queries.BOOKS_ALL).fetchall():
+                books.append(self._row_to_book(row))
             return books
         except Exception as e:
-            print(f"[BookRepository.get_all] HATA: {e}")
+            self.log_error("get_all", e)
+            return []
+        finally:
+            if conn: conn.close()
+    
+    def iter_all(self, chunk_size: Optional[int] = None, raw: bool = False) -> Iterator[list]:
+        """
+        Tüm kitapları parça parça döndürür (akış yanıtları için).
+        Bağlantı generator tüketildiği sürece açık kalır, bitince havuza döner.
+        raw=True ise entity yerine sürücü satırları döner (controllers/row_json.py).
+        """
+        conn = self.get_connection(read_only=True)
+        try:
+            cursor = self.execute(conn, queries.BOOKS_ALL)
+            yield from self.iter_chunks(cursor, None if raw else self._row_to_book, chunk_size or self.STREAM_CHUNK_SIZE)
+        except Exception as e:
+            self.log_error("iter_all", e)
+            raise
+        finally:
+            conn.close()
+    
+    def get_page(self, limit: int, after: Optional[tuple] = None) -> List[Book]:
+        """
+        Keyset sayfalama: Id sırasına göre `after` anahtarından sonraki kitaplar.
+        
+        Args:
+            limit: Getirilecek en fazla kayıt
+            after: Önceki sayfanın son anahtarı (Id,); None ise ilk sayfa
+        """
+        conn = None
+        try:
+            conn = self.get_connection(read_only=True)
+            cursor = self.execute(conn, queries.BOOKS_PAGE, (limit, after[0] if after else 0))
+            return [self._row_to_book(row) for row in cursor.fetchall()]
+        except Exception as e:
+            self.log_error("get_page", e)
             return []
         finally:
             if conn: conn.close()
@@ -43,71 +72,103 @@ class BookRepository(BaseRepository):
             return None
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT b.Id, b.Title, b.AuthorId, b.CategoryId, b.StockNumber, b.YearOfpublication,
-                       ISNULL(a.Name + ' ' + a.LastName, '') AS AuthorName,
-                       ISNULL(c.Name, '') AS CategoryName,
-                       b.StockNumber - ISNULL((
-                           SELECT COUNT(*) FROM BorrowTransactions bt 
-                           WHERE bt.BookId = b.Id AND bt.RealReturnDate IS NULL
-                       ), 0) AS Available
-                FROM Books b
-                LEFT JOIN Authors a ON b.AuthorId = a.Id
-                LEFT JOIN Categories c ON b.CategoryId = c.Id
-                WHERE b.Id = ?
-            """, (book_id,))
-            row = cursor.fetchone()
+            conn = self.get_connection(read_only=True)
+            row = self.execute(conn, queries.BOOK_BY_ID, (book_id,)).fetchone()
             if row:
-                return Book(
-                    Id=row[0], Title=row[1], AuthorId=row[2], CategoryId=row[3],
-                    StockNumber=row[4], YearOfpublication=row[5],
-                    AuthorName=row[6], CategoryName=row[7], Available=row[8]
-                )
+                return self._row_to_book(row)
             return None
         except Exception as e:
-            print(f"[BookRepository.get_by_id] HATA: {e}")
+            self.log_error("get_by_id", e)
             return None
         finally:
             if conn: conn.close()
     
+    def get_by_ids(self, book_ids: List[int]) -> List[Book]:
+        """
+        Verilen Id'lerdeki kitaplar tek sorguda (sıra korunmaz; arama sonuçları için).
+        IN listesi 2'nin kuvveti uzunluğa son Id tekrarlanarak tamamlanır: her
+        liste boyutu için ayrı plan yerine en fazla ~10 plan (1, 2, 4 ... 1024).
+        """
+        book_ids = [i for i in book_ids if self.validate_id(i)][:self.BULK_VALUES_LIMIT]
+        if not book_ids:
+            return []
+        size = 1 << (len(book_ids) - 1).bit_length()
+        conn = None
+        try:
+            conn = self.get_connection(read_only=True)
+            cursor = self.execute(conn, queries.BOOKS_BY_IDS,
+                                  book_ids + book_ids[-1:] * (size - len(book_ids)), rows=size)
+            return [self._row_to_book(row) for row in cursor.fetchall()]
+        except Exception as e:
+            self.log_error("get_by_ids", e)
+            return []
+        finally:
+            if conn: conn.close()
+    
     def add(self, title: str, author_id: int, category_id: int, stock: int, year: int) -> Optional[Book]:
         if not self.validate_input(title) or not self.validate_id(author_id) or not self.validate_id(category_id):
             return None
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO Books (Title, AuthorId, CategoryId, StockNumber, YearOfpublication) VALUES (?, ?, ?, ?, ?); SELECT SCOPE_IDENTITY();",
-                (title, author_id, category_id, stock, year)
-            )
-            cursor.nextset()
-            new_id = cursor.fetchone()[0]
+            new_id = self.insert_identity(conn, queries.BOOK_INSERT, (title, author_id, category_id, stock, year))
             conn.commit()
             return self.get_by_id(int(new_id))
         except Exception as e:
-            print(f"[BookRepository.add] HATA: {e}")
+            self.log_error("add", e)
             return None
         finally:
             if conn: conn.close()
     
+    def bulk_add(self, rows: List[tuple], uow=None) -> List[Tuple[int, str]]:
+        """
+        Toplu kitap ekleme (içe aktarma).
+        Parça tek fast_executemany çağrısıyla gönderilir. Bir satır hata verirse
+        parça savepoint'e geri alınır ve satır satır eklenir; iş biriminin önceki
+        yazmaları (yeni yazarlar vb.) korunur, sadece hatalı satırlar raporlanır.
+        
+        Args:
+            rows: (satır_no, title, author_id, category_id, stock, year) listesi
+            uow: Verilirse parça iş biriminin transaction'ında eklenir
+        
+        Returns:
+            List[Tuple[int, str]]: (satır_no, hata) listesi; boşsa hepsi eklendi
+        """
+        if not rows:
+            return []
+        conn = self.get_connection(uow=uow)
+        try:
+            self.execute(conn, queries.BOOKS_BULK_SAVEPOINT)
+            try:
+                self.executemany(conn, queries.BOOKS_BULK_INSERT, [row[1:] for row in rows], fast=True)
+                conn.commit()
+                return []
+            except Exception as e:
+                self.log(logging.WARNING, "bulk_add", "Toplu ekleme başarısız, satır satır deneniyor: %s", e)
+                self.execute(conn, queries.BOOKS_BULK_ROLLBACK)
+            
+            errors = []
+            for row in rows:
+                try:
+                    self.execute(conn, queries.BOOKS_BULK_INSERT, row[1:])
+                except Exception as e:
+                    errors.append((row[0], str(e)))
+            conn.commit()
+            return errors
+        finally:
+            conn.close()
+    
     def update(self, book_id: int, title: str, author_id: int, category_id: int, stock: int, year: int) -> bool:
         if not self.validate_id(book_id) or not self.validate_input(title):
             return False
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "UPDATE Books SET Title = ?, AuthorId = ?, CategoryId = ?, StockNumber = ?, YearOfpublication = ? WHERE Id = ?",
-                (title, author_id, category_id, stock, year, book_id)
-            )
+            cursor = self.execute(conn, queries.BOOK_UPDATE, (title, author_id, category_id, stock, year, book_id))
             conn.commit()
             return cursor.rowcount > 0
         except Exception as e:
-            print(f"[BookRepository.update] HATA: {e}")
+            self.log_error("update", e)
             return False
         finally:
             if conn: conn.close()
@@ -118,12 +179,11 @@ class BookRepository(BaseRepository):
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM Books WHERE Id = ?", (book_id,))
+            cursor = self.execute(conn, queries.BOOK_DELETE, (book_id,))
             conn.commit()
             return cursor.rowcount > 0
         except Exception as e:
-            print(f"[BookRepository.delete] HATA: {e}")
+            self.log_error("delete", e)
             return False
         finally:
             if conn: conn.close()
@@ -3,6 +3,7 @@ CATEGORY_REPOSITORY.PY - Kategori Veritabanı İşlemleri
 """
 from typing import List, Optional
 from repositories.base_repository import BaseRepository
+from repositories import queries
 from entities.category import Category
 
 class CategoryRepository(BaseRepository):
@@ -10,12 +11,11 @@ class CategoryRepository(BaseRepository):
     def get_all(self) -> List[Category]:
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT Id, Name FROM Categories")
+            conn = self.get_connection(read_only=True)
+            cursor = self.execute(conn, queries.CATEGORIES_ALL)
             return [Category(Id=row[0], Name=row[1]) for row in cursor.fetchall()]
         except Exception as e:
-            print(f"[CategoryRepository.get_all] HATA: {e}")
+            self.log_error("get_all", e)
             return []
         finally:
             if conn: conn.close()
@@ -25,13 +25,11 @@ class CategoryRepository(BaseRepository):
             return None
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT Id, Name FROM Categories WHERE Id = ?", (category_id,))
-            row = cursor.fetchone()
+            conn = self.get_connection(read_only=True)
+            row = self.execute(conn, queries.CATEGORY_BY_ID, (category_id,)).fetchone()
             return Category(Id=row[0], Name=row[1]) if row else None
         except Exception as e:
-            print(f"[CategoryRepository.get_by_id] HATA: {e}")
+            self.log_error("get_by_id", e)
             return None
         finally:
             if conn: conn.close()
@@ -42,30 +40,49 @@ class CategoryRepository(BaseRepository):
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("INSERT INTO Categories (Name) VALUES (?); SELECT SCOPE_IDENTITY();", (name,))
-            cursor.nextset()
-            new_id = cursor.fetchone()[0]
+            new_id = self.insert_identity(conn, queries.CATEGORY_INSERT, (name,))
             conn.commit()
             return Category(Id=int(new_id), Name=name)
         except Exception as e:
-            print(f"[CategoryRepository.add] HATA: {e}")
+            self.log_error("add", e)
             return None
         finally:
             if conn: conn.close()
     
+    def bulk_add(self, names: List[str], uow=None) -> List[Category]:
+        """
+        Toplu kategori ekleme (içe aktarma). Çok satırlı INSERT ... OUTPUT ile
+        (SQLite: RETURNING) tek round trip'te eklenir, oluşan ID'ler aynı sorgudan okunur.
+        """
+        if not names:
+            return []
+        conn = None
+        try:
+            conn = self.get_connection(uow=uow)
+            categories = []
+            for start in range(0, len(names), self.BULK_VALUES_LIMIT):
+                part = names[start:start + self.BULK_VALUES_LIMIT]
+                cursor = self.execute(conn, queries.CATEGORIES_BULK_INSERT, part, rows=len(part))
+                categories.extend(Category(Id=row[0], Name=row[1]) for row in cursor.fetchall())
+            conn.commit()
+            return categories
+        except Exception as e:
+            self.log_error("bulk_add", e)
+            return []
+        finally:
+            if conn: conn.close()
+    
     def update(self, category_id: int, name: str) -> bool:
         if not self.validate_id(category_id):
             return False
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("UPDATE Categories SET Name = ? WHERE Id = ?", (name, category_id))
+            cursor = self.execute(conn, queries.CATEGORY_UPDATE, (name, category_id))
             conn.commit()
             return cursor.rowcount > 0
         except Exception as e:
-            print(f"[CategoryRepository.update] HATA: {e}")
+            self.log_error("update", e)
             return False
         finally:
             if conn: conn.close()
@@ -76,12 +93,11 @@ class CategoryRepository(BaseRepository):
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM Categories WHERE Id = ?", (category_id,))
+            cursor = self.execute(conn, queries.CATEGORY_DELETE, (category_id,))
             conn.commit()
             return cursor.rowcount > 0
         except Exception as e:
-            print(f"[CategoryRepository.delete] HATA: {e}")
+            self.log_error("delete", e)
             return False
         finally:
             if conn: conn.close()
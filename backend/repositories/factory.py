@@ -0,0 +1,20 @@
+"""
+FACTORY.PY - Depolama Sürücüsüne Göre Repository Seçimi
+
+Servisler repository'leri bu fonksiyonla oluşturur:
+
+    self.repo = repository_for(BookRepository)
+
+DatabaseConfig.BACKEND 'sqlite' ise aynı arayüzün SQLite sürümü
+(repositories/sqlite) döner. Seçim servis oluşturulurken yapılır;
+BACKEND uygulama (servis modülleri) yüklenmeden önce ayarlanmalıdır.
+"""
+from config import DatabaseConfig
+
+
+def repository_for(repo_class):
+    """Yapılandırılan sürücü için repo_class örneği"""
+    if DatabaseConfig.BACKEND == 'sqlite':
+        from repositories.sqlite import SQLITE_REPOSITORIES
+        return SQLITE_REPOSITORIES[repo_class]()
+    return repo_class()
@@ -0,0 +1,152 @@
+"""
+INPUT_VALIDATOR.PY - Derlenmiş SQL Injection Doğrulayıcı
+
+Tüm tehlikeli kalıplar bir kez derlenip birleşik regex'lere dönüştürülür;
+her değer için kalıp başına ayrı re.search yapılmaz.
+
+Her kalıp en az bir "tetikleyici" karakter (boşluk - / _ 0 ; ') içerir ve
+eşleşmesi bu karakterden başlayacak şekilde yazılır (sabitlenmiş biçim).
+- Hiç tetikleyici karakter içermeyen değerler regex'e girmeden geçer.
+- Boşlukla başlayan kalıplar tek bir alternation'da, harf dışı bir karakterle
+  başlayanlar ayrı bir alternation'da birleştirilir. İkincisinin tüm dalları
+  büyük/küçük harf ayrımı olmayan bir karakterle başladığından regex motoru
+  metinde sadece bu karakterlerin geçtiği konumları dener.
+- Eşleşme olduğunda (nadir durum) hangi kalıbın tuttuğu ayrıca bulunur.
+"""
+import logging
+import re
+from typing import Iterable, List, NamedTuple, Optional, Sequence
+
+from structured_log import sampled
+
+logger = logging.getLogger(__name__)
+
+# Kalıpların eşleşebilmesi için gereken karakterler (regex sınıf içeriği)
+TRIGGER_CHARS = r"\s\-/_0;'"
+
+
+class InjectionRule(NamedTuple):
+    """
+    Tek bir SQL Injection kalıbı.
+
+    pattern:  Okunabilir kalıp (loglarda gösterilir)
+    anchored: Tetikleyici karakterle başlayan eşdeğer biçim (None ise pattern)
+    leading:  Kalıbın metin başında (^) eşleşen biçimi, yoksa None
+    """
+    pattern: str
+    anchored: Optional[str] = None
+    leading: Optional[str] = None
+
+
+class ValidationError(NamedTuple):
+    """Toplu doğrulamada reddedilen alan"""
+    index: int      # Kaydın sırası
+    field: str      # Alan adı
+    reason: str     # Red nedeni
+
+
+class InputValidator:
+    """
+    SQL Injection doğrulama motoru.
+
+    Args:
+        rules: Tehlikeli kalıplar
+        max_length: İzin verilen maksimum karakter sayısı
+        log_sample: Red logları için örnekleme (her N redden biri loglanır)
+    """
+
+    # Red nedenini ararken eşleşmenin ne kadar gerisine bakılacağı
+    LOOKBEHIND = 8
+
+    def __init__(self, rules: Sequence[InjectionRule], max_length: int = 1000, log_sample: int = 1):
+        self.rules = tuple(rules)
+        self.max_length = max_length
+        self.log_sample = log_sample
+        self._trigger = re.compile(f"[{TRIGGER_CHARS}]")
+
+        anchored = [rule.anchored or rule.pattern for rule in self.rules]
+        spaced = [a[2:] for a in anchored if a.startswith(r"\s")]
+        literal = [a for a in anchored if not a.startswith(r"\s")]
+        leading = [rule.leading for rule in self.rules if rule.leading]
+
+        matchers = []
+        if spaced:
+            matchers.append(re.compile(r"\s(?:" + "|".join(spaced) + ")", re.IGNORECASE).search)
+        if literal:
+            matchers.append(re.compile("|".join(literal), re.IGNORECASE).search)
+        if leading:
+            matchers.append(re.compile("|".join(leading), re.IGNORECASE).match)
+        self._matchers = tuple(matchers)
+
+        # Sadece red nedenini bulmak için (nadir yol)
+        self._single = tuple(
+            (re.compile(rule.pattern, re.IGNORECASE), rule.pattern) for rule in self.rules
+        )
+
+    def check(self, value) -> Optional[str]:
+        """
+        Tek bir değeri kontrol eder.
+
+        Returns:
+            Optional[str]: Geçerli ise None, değilse red nedeni
+        """
+        if value is None or not isinstance(value, str):
+            return None
+
+        length = len(value)
+        if length > self.max_length and value.strip():
+            return f"çok uzun: {length} karakter"
+
+        # Ön kontrol: tetikleyici karakter yoksa hiçbir kalıp eşleşemez
+        if not self._trigger.search(value):
+            return None
+
+        for matcher in self._matchers:
+            match = matcher(value)
+            if match:
+                return f"SQL Injection tespit edildi: {self._matched_pattern(value, match)}"
+        return None
+
+    def _matched_pattern(self, value: str, match) -> str:
+        """Eşleşen kalıbı sadece eşleşme çevresinde arar"""
+        start = max(0, match.start() - self.LOOKBEHIND)
+        for regex, pattern in self._single:
+            if regex.search(value, start, match.end()):
+                return pattern
+        return "?"
+
+    def is_valid(self, value, field_name: str = "alan") -> bool:
+        """Tek değer doğrulama; reddedilen değer loglanır"""
+        reason = self.check(value)
+        if reason is None:
+            return True
+        if logger.isEnabledFor(logging.WARNING) and sampled((id(self), field_name), self.log_sample):
+            logger.warning("[SECURITY] %s %s", field_name, reason,
+                           extra={"field": field_name, "sample": self.log_sample})
+        return False
+
+    def validate_records(self, records: Iterable, fields: Optional[Sequence[str]] = None) -> List[ValidationError]:
+        """
+        Kayıt listesini (ör. içe aktarma dosyası) tek geçişte doğrular.
+
+        Args:
+            records: dict (alan -> değer) veya değer dizisi olan kayıtlar
+            fields: Sadece bu alanları kontrol et (dict kayıtlar için)
+
+        Returns:
+            List[ValidationError]: Reddedilen alanlar; boşsa tüm kayıtlar geçerli
+        """
+        check = self.check
+        errors = []
+        for index, record in enumerate(records):
+            if isinstance(record, dict):
+                items = ((f, record.get(f)) for f in fields) if fields else record.items()
+            else:
+                items = ((str(i), v) for i, v in enumerate(record))
+            for field, value in items:
+                reason = check(value)
+                if reason is not None:
+                    errors.append(ValidationError(index, field, reason))
+        if errors:
+            logger.warning("[SECURITY] Toplu doğrulama: %d alan reddedildi", len(errors))
+        return errors
@@ -2,37 +2,39 @@
 Penalty Repository - Ceza Veritabanı İşlemleri (SQL Injection Korumalı)
 """
 
-from typing import List, Optional
+import logging
+import time
+from typing import Iterator, List, Optional, Tuple
 from datetime import datetime
 from repositories.base_repository import BaseRepository
+from repositories import queries
 from entities.penalty import Penalty
+from entities.penalty_ledger_entry import PenaltyLedgerEntry
 
 
 class PenaltyRepository(BaseRepository):
     """Ceza Repository - SQL Injection korumalı"""
     
+    @staticmethod
+    def _row_to_penalty(row) -> Penalty:
+        """JOIN'li ceza satırını (queries.PENALTY_SELECT) entity'ye çevirir"""
+        return Penalty(
+            Id=row[0],
+            Amount=float(row[1]) if row[1] else 0.0,
+            BorrowTransactionsId=row[2],
+            NumberOfDay=row[3] if row[3] else 0,
+            Date=datetime.now(),
+            UserName=row[4] if row[4] else "Bilinmiyor",
+            UserId=row[5] if row[5] else 0
+        )
+    
     def get_all(self) -> List[Penalty]:
-        """Tüm cezaları getirir"""
+        """Ödenmemiş tüm cezaları getirir (ödenenler defterde: get_ledger_page)"""
+        started = time.perf_counter()
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            sql = """
-                SELECT 
-                    p.Id, 
-                    p.Amount, 
-                    p.BorrowTransactionsId, 
-                    p.NumberOfDay,
-                    u.FullName,
-                    bt.UserId
-                FROM Penalties p
-                INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
-                INNER JOIN Users u ON bt.UserId = u.Id
-                ORDER BY p.Id DESC
-            """
-            cursor.execute(sql)
-            rows = cursor.fetchall()
+            conn = self.get_connection(read_only=True)
+            rows = self.execute(conn, queries.PENALTIES_ALL).fetchall()
             
             penalties = []
             for row in rows:
@@ -47,11 +49,50 @@ class PenaltyRepository(BaseRepository):
                 )
                 penalties.append(penalty)
             
-            print(f"[PenaltyRepository.get_all] {len(penalties)} ceza bulundu")
+            self.log(logging.DEBUG, "get_all", "%d ceza bulundu", len(penalties), rows=len(penalties),
+                     duration_ms=round((time.perf_counter() - started) * 1000, 3))
             return penalties
             
         except Exception as e:
-            print(f"[PenaltyRepository.get_all] HATA: {e}")
+            self.log_error("get_all", e)
+            return []
+        finally:
+            if conn:
+                conn.close()
+    
+    def iter_all(self, chunk_size: Optional[int] = None, raw: bool = False) -> Iterator[list]:
+        """
+        Tüm cezaları parça parça döndürür (akış yanıtları için).
+        Bağlantı generator tüketildiği sürece açık kalır, bitince havuza döner.
+        raw=True ise entity yerine sürücü satırları döner (controllers/row_json.py).
+        """
+        conn = self.get_connection(read_only=True)
+        try:
+            cursor = self.execute(conn, queries.PENALTIES_ALL)
+            yield from self.iter_chunks(cursor, None if raw else self._row_to_penalty, chunk_size or self.STREAM_CHUNK_SIZE)
+        except Exception as e:
+            self.log_error("iter_all", e)
+            raise
+        finally:
+            conn.close()
+    
+    def get_page(self, limit: int, after: Optional[tuple] = None) -> List[Penalty]:
+        """
+        Keyset sayfalama: Id DESC sırasında `after` anahtarından sonraki cezalar.
+        
+        Args:
+            limit: Getirilecek en fazla kayıt
+            after: Önceki sayfanın son anahtarı (Id,); None ise ilk sayfa
+        """
+        conn = None
+        try:
+            conn = self.get_connection(read_only=True)
+            cursor = self.execute(conn, queries.PENALTIES_PAGE, (limit, after[0] if after else 2147483647))
+            
+            return [self._row_to_penalty(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            self.log_error("get_page", e)
             return []
         finally:
             if conn:
@@ -65,24 +106,8 @@ class PenaltyRepository(BaseRepository):
         
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            sql = """
-                SELECT 
-                    p.Id, 
-                    p.Amount, 
-                    p.BorrowTransactionsId, 
-                    p.NumberOfDay,
-                    u.FullName,
-                    bt.UserId
-                FROM Penalties p
-                INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
-                INNER JOIN Users u ON bt.UserId = u.Id
-                WHERE p.Id = ?
-            """
-            cursor.execute(sql, (penalty_id,))
-            row = cursor.fetchone()
+            conn = self.get_connection(read_only=True)
+            row = self.execute(conn, queries.PENALTY_BY_ID, (penalty_id,)).fetchone()
             
             if row:
                 return Penalty(
@@ -97,39 +122,23 @@ class PenaltyRepository(BaseRepository):
             return None
             
         except Exception as e:
-            print(f"[PenaltyRepository.get_by_id] HATA: {e}")
+            self.log_error("get_by_id", e)
             return None
         finally:
             if conn:
                 conn.close()
     
     def get_by_user_id(self, user_id: int) -> List[Penalty]:
-        """Kullanıcının cezalarını getirir"""
+        """Kullanıcının ödenmemiş cezalarını getirir"""
         # SQL Injection kontrolü
         if not self.validate_id(user_id, "user_id"):
             return []
         
+        started = time.perf_counter()
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            sql = """
-                SELECT 
-                    p.Id, 
-                    p.Amount, 
-                    p.BorrowTransactionsId, 
-                    p.NumberOfDay,
-                    u.FullName,
-                    bt.UserId
-                FROM Penalties p
-                INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
-                INNER JOIN Users u ON bt.UserId = u.Id
-                WHERE bt.UserId = ?
-                ORDER BY p.Id DESC
-            """
-            cursor.execute(sql, (user_id,))
-            rows = cursor.fetchall()
+            conn = self.get_connection(read_only=True)
+            rows = self.execute(conn, queries.PENALTIES_BY_USER, (user_id,)).fetchall()
             
             penalties = []
             for row in rows:
@@ -144,11 +153,12 @@ class PenaltyRepository(BaseRepository):
                 )
                 penalties.append(penalty)
             
-            print(f"[PenaltyRepository.get_by_user_id] User {user_id}: {len(penalties)} ceza")
+            self.log(logging.DEBUG, "get_by_user_id", "User %s: %d ceza", user_id, len(penalties),
+                     rows=len(penalties), duration_ms=round((time.perf_counter() - started) * 1000, 3))
             return penalties
             
         except Exception as e:
-            print(f"[PenaltyRepository.get_by_user_id] HATA: {e}")
+            self.log_error("get_by_user_id", e)
             return []
         finally:
             if conn:
@@ -158,152 +168,181 @@ class PenaltyRepository(BaseRepository):
         """Yeni ceza ekler"""
         # SQL Injection kontrolleri
         if not self.validate_id(borrow_tx_id, "borrow_tx_id"):
-            print("[PenaltyRepository.add] Geçersiz borrow_tx_id")
+            self.log(logging.WARNING, "add", "Geçersiz borrow_tx_id")
             return None
         if not self.validate_id(delay_minutes, "delay_minutes"):
-            print("[PenaltyRepository.add] Geçersiz delay_minutes")
+            self.log(logging.WARNING, "add", "Geçersiz delay_minutes")
             return None
         if not self.validate_amount(amount, "amount"):
-            print("[PenaltyRepository.add] Geçersiz amount")
+            self.log(logging.WARNING, "add", "Geçersiz amount")
             return None
         
         conn = None
         try:
-            print(f"[PenaltyRepository.add] Ceza ekleniyor: tx={borrow_tx_id}, dakika={delay_minutes}, tutar={amount}")
-            
             conn = self.get_connection()
-            cursor = conn.cursor()
-            
             # Transaction kontrolü
-            cursor.execute("SELECT Id, UserId FROM BorrowTransactions WHERE Id = ?", (borrow_tx_id,))
-            tx_row = cursor.fetchone()
+            tx_row = self.execute(conn, queries.TRANSACTION_OWNER, (borrow_tx_id,)).fetchone()
             
             if not tx_row:
-                print(f"[PenaltyRepository.add] Transaction bulunamadı: {borrow_tx_id}")
+                self.log(logging.WARNING, "add", "Transaction bulunamadı: %s", borrow_tx_id)
                 return None
             
-            print(f"[PenaltyRepository.add] Transaction OK: Id={tx_row[0]}, UserId={tx_row[1]}")
-            
-            # Ceza ekle
-            cursor.execute(
-                "INSERT INTO Penalties (BorrowTransactionsId, NumberOfDay, Amount) VALUES (?, ?, ?)",
-                (borrow_tx_id, delay_minutes, amount)
-            )
+            # Ceza ekle ve yeni ID'yi aynı batch'te al
+            new_id = self.insert_identity(conn, queries.PENALTY_INSERT, (borrow_tx_id, delay_minutes, amount))
             conn.commit()
             
-            # Yeni ID al
-            cursor.execute("SELECT @@IDENTITY")
-            new_id_row = cursor.fetchone()
-            
-            if new_id_row and new_id_row[0]:
-                new_id = int(new_id_row[0])
-                print(f"[PenaltyRepository.add] ✓ Ceza eklendi: ID={new_id}")
-                return self.get_by_id(new_id)
-            
-            print("[PenaltyRepository.add] ID alınamadı")
-            return None
+            self.log(logging.INFO, "add", "Ceza eklendi: ID=%s", new_id,
+                     transaction=borrow_tx_id, minutes=delay_minutes, amount=amount)
+            return self.get_by_id(new_id)
             
         except Exception as e:
-            print(f"[PenaltyRepository.add] HATA: {e}")
-            import traceback
-            traceback.print_exc()
+            self.log_error("add", e, exc_info=True)
             return None
         finally:
             if conn:
                 conn.close()
     
     def delete(self, penalty_id: int) -> bool:
-        """Ceza siler"""
+        """Ceza siler; ödenmemişse trigger defterde iptal (cancel) kaydı yazar ve bakiyeyi düşer"""
         if not self.validate_id(penalty_id, "penalty_id"):
             return False
         
         conn = None
         try:
-            print(f"[PenaltyRepository.delete] Ceza siliniyor: {penalty_id}")
-            
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM Penalties WHERE Id = ?", (penalty_id,))
+            cursor = self.execute(conn, queries.PENALTY_DELETE, (penalty_id,))
             conn.commit()
             
             deleted = cursor.rowcount > 0
-            print(f"[PenaltyRepository.delete] Silindi: {deleted}")
+            self.log(logging.INFO, "delete", "Ceza silindi: %s", penalty_id, deleted=deleted)
             return deleted
             
         except Exception as e:
-            print(f"[PenaltyRepository.delete] HATA: {e}")
+            self.log_error("delete", e)
             return False
         finally:
             if conn:
                 conn.close()
     
-    def get_total_amount(self) -> float:
-        """Toplam ceza tutarı"""
+    def pay_penalty_sp(self, penalty_id: int, user_id: int) -> Tuple[bool, str]:
+        """
+        STORED PROCEDURE ile ceza ödeme: sp_PayPenalty
+        Kullanıcı sadece kendi cezasını ödeyebilir. Ceza silinmez, PaidDate
+        yazılır; ödeme kaydını ve bakiyeyi trg_PenaltyLedger yazar.
+        
+        Returns:
+            Tuple[bool, str]: (başarı, mesaj)
+        """
+        if not self.validate_id(penalty_id, "penalty_id") or not self.validate_id(user_id, "user_id"):
+            return False, "Geçersiz parametreler"
+        
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT ISNULL(SUM(p.Amount), 0) 
-                FROM Penalties p
-                INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
-            """)
-            row = cursor.fetchone()
+            cursor = self.execute(conn, queries.PAY_PENALTY, (penalty_id, user_id))
+            result_sets = self.fetch_result_sets(cursor)
+            conn.commit()
+            
+            if not result_sets or not result_sets[-1]:
+                return False, "Bilinmeyen hata"
+            status = result_sets[-1][0]
+            return bool(status[0]), status[1] or "İşlem tamamlandı"
+            
+        except Exception as e:
+            self.log_error("pay_penalty_sp", e)
+            return False, str(e)
+        finally:
+            if conn:
+                conn.close()
+    
+    def get_total_amount(self) -> float:
+        """Ödenmemiş cezaların toplamı (bakiyelerin toplamı)"""
+        conn = None
+        try:
+            conn = self.get_connection(read_only=True)
+            row = self.execute(conn, queries.PENALTIES_TOTAL).fetchone()
             return float(row[0]) if row and row[0] else 0.0
         except Exception as e:
-            print(f"[PenaltyRepository.get_total_amount] HATA: {e}")
+            self.log_error("get_total_amount", e)
             return 0.0
         finally:
             if conn:
                 conn.close()
     
-    def get_user_total_amount(self, user_id: int) -> float:
-        """Kullanıcının toplam ceza tutarı"""
+    def get_balance(self, user_id: int) -> Tuple[float, int]:
+        """
+        Kullanıcının ceza bakiyesi ve ödenmemiş ceza sayısı: UserPenaltyBalances
+        satırı (trg_PenaltyLedger günceller), JOIN / toplama yok.
+
+        Returns:
+            Tuple[float, int]: (bakiye, ödenmemiş ceza sayısı); hata durumunda (0.0, 0)
+        """
         if not self.validate_id(user_id, "user_id"):
-            return 0.0
+            return 0.0, 0
         
+        started = time.perf_counter()
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT ISNULL(SUM(p.Amount), 0) 
-                FROM Penalties p
-                INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
-                WHERE bt.UserId = ?
-            """, (user_id,))
-            row = cursor.fetchone()
-            total = float(row[0]) if row and row[0] else 0.0
-            print(f"[PenaltyRepository.get_user_total_amount] User {user_id}: {total} TL")
-            return total
+            conn = self.get_connection(read_only=True)
+            row = self.execute(conn, queries.PENALTY_BALANCE, (user_id,)).fetchone()
+            balance, unpaid = float(row[0]), row[1]
+            self.log(logging.DEBUG, "get_balance", "User %s: %s TL, %d ceza", user_id, balance, unpaid,
+                     duration_ms=round((time.perf_counter() - started) * 1000, 3))
+            return balance, unpaid
         except Exception as e:
-            print(f"[PenaltyRepository.get_user_total_amount] HATA: {e}")
-            return 0.0
+            self.log_error("get_balance", e)
+            return 0.0, 0
         finally:
             if conn:
                 conn.close()
     
+    def get_user_total_amount(self, user_id: int) -> float:
+        """Kullanıcının ödenmemiş ceza toplamı"""
+        return self.get_balance(user_id)[0]
+    
     def user_has_unpaid_penalty(self, user_id: int) -> bool:
         """Kullanıcının ödenmemiş cezası var mı?"""
-        if not self.validate_id(user_id, "user_id"):
-            return False
+        return self.get_balance(user_id)[1] > 0
+    
+    @staticmethod
+    def _row_to_ledger_entry(row) -> PenaltyLedgerEntry:
+        """Defter satırını (queries.PENALTY_LEDGER_SELECT) entity'ye çevirir"""
+        return PenaltyLedgerEntry(
+            Id=row[0],
+            UserId=row[1],
+            UserName=row[2],
+            PenaltyId=row[3],
+            EntryType=row[4],
+            Amount=float(row[5]),
+            CreatedDate=row[6]
+        )
+    
+    def get_ledger_page(self, limit: int, after: Optional[tuple] = None,
+                        user_id: Optional[int] = None) -> List[PenaltyLedgerEntry]:
+        """
+        Ceza defteri, keyset sayfalama: Id DESC sırasında `after` anahtarından sonraki kayıtlar.
+        
+        Args:
+            limit: Getirilecek en fazla kayıt
+            after: Önceki sayfanın son anahtarı (Id,); None ise ilk sayfa
+            user_id: Verilirse sadece bu kullanıcının kayıtları (IX_PenaltyLedger_User)
+        """
+        if user_id is not None and not self.validate_id(user_id, "user_id"):
+            return []
         
+        last_id = after[0] if after else 2147483647
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT COUNT(*) 
-                FROM Penalties p
-                INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
-                WHERE bt.UserId = ?
-            """, (user_id,))
-            row = cursor.fetchone()
-            count = row[0] if row else 0
-            return count > 0
+            conn = self.get_connection(read_only=True)
+            if user_id is None:
+                cursor = self.execute(conn, queries.PENALTY_LEDGER_PAGE, (limit, last_id))
+            else:
+                cursor = self.execute(conn, queries.PENALTY_LEDGER_USER_PAGE, (limit, user_id, last_id))
+            return [self._row_to_ledger_entry(row) for row in cursor.fetchall()]
+            
         except Exception as e:
-            print(f"[PenaltyRepository.user_has_unpaid_penalty] HATA: {e}")
-            return False
+            self.log_error("get_ledger_page", e)
+            return []
         finally:
             if conn:
                 conn.close()
@@ -0,0 +1,306 @@
+"""
+QUERIES.PY - Sorgu Kataloğu (SQL Server + SQLite varyantları)
+
+Repository'lerin çalıştırdığı tüm ifadeler (bkz. repositories/query_catalog.py).
+Kitap, işlem ve ceza satırlarının sütun listesi ve JOIN'leri burada bir
+kez yazılır; get_all / get_by_id / get_by_user_id ... aynı parçadan türer.
+Parametre tipleri db_setup.sql'deki sütun tipleridir.
+
+sqlite= metinleri aynı parametrelerle SQLite'ta çalışır (TOP yerine
+numaralı yer tutuculu LIMIT, OUTPUT yerine RETURNING ...). Stored
+procedure karşılıklarının ifadeleri repositories/sqlite/queries.py'dedir.
+"""
+from repositories.query_catalog import DATETIME, DECIMAL, INT, NVARCHAR, TVP, Query, Repeat
+
+# ---- Sütun tipleri (db_setup.sql) ----
+TITLE = NVARCHAR(200)
+NAME = NVARCHAR(50)             # Authors.Name / LastName / Country, Categories.Name
+FULL_NAME = NVARCHAR(100)
+EMAIL = NVARCHAR(100)
+PASSWORD_HASH = NVARCHAR(256)
+ROLE = NVARCHAR(20)
+AMOUNT = DECIMAL(10, 2)
+
+IDENTITY = "; SELECT SCOPE_IDENTITY();"
+
+
+def insert(name: str, sql: str, *params) -> Query:
+    """Tek satırlık INSERT; SQL Server'da oluşan Id aynı batch'te okunur (BaseRepository.insert_identity)"""
+    return Query(name, sql + IDENTITY, *params, sqlite=sql)
+
+
+# ---- Kullanıcılar ----
+USER_COLUMNS = "Id, FullName, Email, PasswordHash, Role"
+
+USERS_ALL = Query('users.all', f"SELECT {USER_COLUMNS} FROM Users ORDER BY Id")
+USERS_PAGE = Query(
+    'users.page',
+    f"SELECT TOP (?) {USER_COLUMNS} FROM Users WHERE Id > ? ORDER BY Id",
+    INT, INT,
+    sqlite=f"SELECT {USER_COLUMNS} FROM Users WHERE Id > ?2 ORDER BY Id LIMIT ?1"
+)
+USER_BY_ID = Query('users.by_id', f"SELECT {USER_COLUMNS} FROM Users WHERE Id = ?", INT)
+USER_BY_EMAIL = Query('users.by_email', f"SELECT {USER_COLUMNS} FROM Users WHERE Email = ?", EMAIL)
+USER_INSERT = insert(
+    'users.insert',
+    "INSERT INTO Users (FullName, Email, PasswordHash, Role) VALUES (?, ?, ?, ?)",
+    FULL_NAME, EMAIL, PASSWORD_HASH, ROLE
+)
+USER_UPDATE = Query(
+    'users.update',
+    "UPDATE Users SET FullName = ?, Email = ?, Role = ? WHERE Id = ?",
+    FULL_NAME, EMAIL, ROLE, INT
+)
+USER_DELETE = Query('users.delete', "DELETE FROM Users WHERE Id = ?", INT)
+
+# ---- Yazarlar ----
+AUTHORS_ALL = Query('authors.all', "SELECT Id, Name, LastName, Country FROM Authors")
+AUTHOR_BY_ID = Query('authors.by_id', "SELECT Id, Name, LastName, Country FROM Authors WHERE Id = ?", INT)
+AUTHOR_INSERT = insert('authors.insert', "INSERT INTO Authors (Name, LastName, Country) VALUES (?, ?, ?)",
+                       NAME, NAME, NAME)
+AUTHORS_BULK_INSERT = Query(
+    'authors.bulk_insert',
+    "INSERT INTO Authors (Name, LastName) OUTPUT INSERTED.Id, INSERTED.Name, INSERTED.LastName VALUES {values}",
+    Repeat("(?, ?)", NAME, NAME),
+    sqlite="INSERT INTO Authors (Name, LastName) VALUES {values} RETURNING Id, Name, LastName"
+)
+AUTHOR_UPDATE = Query('authors.update', "UPDATE Authors SET Name = ?, LastName = ?, Country = ? WHERE Id = ?",
+                      NAME, NAME, NAME, INT)
+AUTHOR_DELETE = Query('authors.delete', "DELETE FROM Authors WHERE Id = ?", INT)
+
+# ---- Kategoriler ----
+CATEGORIES_ALL = Query('categories.all', "SELECT Id, Name FROM Categories")
+CATEGORY_BY_ID = Query('categories.by_id', "SELECT Id, Name FROM Categories WHERE Id = ?", INT)
+CATEGORY_INSERT = insert('categories.insert', "INSERT INTO Categories (Name) VALUES (?)", NAME)
+CATEGORIES_BULK_INSERT = Query(
+    'categories.bulk_insert',
+    "INSERT INTO Categories (Name) OUTPUT INSERTED.Id, INSERTED.Name VALUES {values}",
+    Repeat("(?)", NAME),
+    sqlite="INSERT INTO Categories (Name) VALUES {values} RETURNING Id, Name"
+)
+CATEGORY_UPDATE = Query('categories.update', "UPDATE Categories SET Name = ? WHERE Id = ?", NAME, INT)
+CATEGORY_DELETE = Query('categories.delete', "DELETE FROM Categories WHERE Id = ?", INT)
+
+# ---- Kitaplar: yazar / kategori adı ve müsait adet ----
+BOOK_SELECT = """
+    SELECT {top}b.Id, b.Title, b.AuthorId, b.CategoryId, b.StockNumber, b.YearOfpublication,
+           {author_name} AS AuthorName,
+           {category_name} AS CategoryName,
+           b.StockNumber - b.ActiveLoans AS Available
+    FROM Books b
+    LEFT JOIN Authors a ON b.AuthorId = a.Id
+    LEFT JOIN Categories c ON b.CategoryId = c.Id
+"""
+_BOOK_SQLSERVER = BOOK_SELECT.format(top="{top}", author_name="ISNULL(a.Name + ' ' + a.LastName, '')",
+                                     category_name="ISNULL(c.Name, '')")
+_BOOK_SQLITE = BOOK_SELECT.format(top="", author_name="COALESCE(a.Name || ' ' || a.LastName, '')",
+                                  category_name="COALESCE(c.Name, '')")
+
+
+def _book(name: str, where: str, *params) -> Query:
+    return Query(name, _BOOK_SQLSERVER.format(top="") + where, *params, sqlite=_BOOK_SQLITE + where)
+
+
+BOOKS_ALL = _book('books.all', "ORDER BY b.Id")
+BOOKS_PAGE = Query(
+    'books.page',
+    _BOOK_SQLSERVER.format(top="TOP (?) ") + "WHERE b.Id > ? ORDER BY b.Id",
+    INT, INT,
+    sqlite=_BOOK_SQLITE + "WHERE b.Id > ?2 ORDER BY b.Id LIMIT ?1"
+)
+BOOK_BY_ID = _book('books.by_id', "WHERE b.Id = ?", INT)
+BOOKS_BY_IDS = _book('books.by_ids', "WHERE b.Id IN ({values})", Repeat("?", INT))
+BOOK_INSERT_SQL = "INSERT INTO Books (Title, AuthorId, CategoryId, StockNumber, YearOfpublication) VALUES (?, ?, ?, ?, ?)"
+BOOK_INSERT = insert('books.insert', BOOK_INSERT_SQL, TITLE, INT, INT, INT, INT)
+BOOKS_BULK_INSERT = Query('books.bulk_insert', BOOK_INSERT_SQL, TITLE, INT, INT, INT, INT)
+# Hatalı toplu parça savepoint'e geri alınır (iş biriminin önceki yazmaları korunur).
+# Sadece SQL Server; SQLite karşılıkları repositories/sqlite/queries.py'dedir
+BOOKS_BULK_SAVEPOINT = Query('books.bulk_insert.savepoint',
+                             "IF @@TRANCOUNT = 0 BEGIN TRANSACTION; SAVE TRANSACTION bulk_books")
+BOOKS_BULK_ROLLBACK = Query('books.bulk_insert.rollback', "ROLLBACK TRANSACTION bulk_books")
+BOOK_UPDATE = Query(
+    'books.update',
+    "UPDATE Books SET Title = ?, AuthorId = ?, CategoryId = ?, StockNumber = ?, YearOfpublication = ? WHERE Id = ?",
+    TITLE, INT, INT, INT, INT, INT
+)
+BOOK_DELETE = Query('books.delete', "DELETE FROM Books WHERE Id = ?", INT)
+
+# ---- Ödünç işlemleri: kitap adı ve üye adı ----
+TRANSACTION_SELECT = """
+    SELECT {top}bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
+           COALESCE(b.Title, '') AS BookTitle, COALESCE(u.FullName, '') AS UserName
+    FROM BorrowTransactions bt
+    LEFT JOIN Books b ON bt.BookId = b.Id
+    LEFT JOIN Users u ON bt.UserId = u.Id
+"""
+_TRANSACTION = TRANSACTION_SELECT.format(top="")
+_TRANSACTION_TOP = TRANSACTION_SELECT.format(top="TOP (?) ")
+
+TRANSACTIONS_ALL = Query('transactions.all', _TRANSACTION + "ORDER BY bt.BorrowDate DESC, bt.Id DESC")
+# Filtreli IX_BorrowTransactions_Overdue index'i sadece açık satırları içerir
+TRANSACTIONS_OPEN = Query('transactions.open', _TRANSACTION + """
+    WHERE bt.RealReturnDate IS NULL
+    ORDER BY bt.ReturnDate, bt.Id
+""")
+TRANSACTIONS_FIRST_PAGE = Query(
+    'transactions.first_page',
+    _TRANSACTION_TOP + "ORDER BY bt.BorrowDate DESC, bt.Id DESC",
+    INT,
+    sqlite=_TRANSACTION + "ORDER BY bt.BorrowDate DESC, bt.Id DESC LIMIT ?1"
+)
+# DATETIME sütunu ile aynı tipte karşılaştırma (datetime2'ye yükseltme olmasın)
+TRANSACTIONS_PAGE = Query(
+    'transactions.page',
+    _TRANSACTION_TOP + """
+    WHERE bt.BorrowDate < CAST(? AS DATETIME)
+       OR (bt.BorrowDate = CAST(? AS DATETIME) AND bt.Id < ?)
+    ORDER BY bt.BorrowDate DESC, bt.Id DESC
+""",
+    INT, DATETIME, DATETIME, INT,
+    sqlite=_TRANSACTION + """
+    WHERE bt.BorrowDate < ?2 OR (bt.BorrowDate = ?3 AND bt.Id < ?4)
+    ORDER BY bt.BorrowDate DESC, bt.Id DESC
+    LIMIT ?1
+"""
+)
+TRANSACTION_BY_ID = Query('transactions.by_id', _TRANSACTION + "WHERE bt.Id = ?", INT)
+TRANSACTIONS_BY_USER = Query('transactions.by_user', _TRANSACTION + """
+    WHERE bt.UserId = ?
+    ORDER BY bt.BorrowDate DESC, bt.Id DESC
+""", INT)
+TRANSACTION_OWNER = Query('transactions.owner', "SELECT Id, UserId FROM BorrowTransactions WHERE Id = ?", INT)
+TRANSACTIONS_ACTIVE_COUNT = Query(
+    'transactions.active_count',
+    "SELECT COUNT(*) FROM BorrowTransactions WHERE UserId = ? AND RealReturnDate IS NULL",
+    INT
+)
+TRANSACTION_DELETE_PENALTIES = Query('transactions.delete_penalties',
+                                     "DELETE FROM Penalties WHERE BorrowTransactionsId = ?", INT)
+TRANSACTION_DELETE = Query('transactions.delete', "DELETE FROM BorrowTransactions WHERE Id = ?", INT)
+
+# Stored procedure'ler (SET NOCOUNT ON: sadece SELECT'ler result set döner)
+BORROW_BOOK = Query('transactions.borrow', """
+    SET NOCOUNT ON;
+    DECLARE @NewId INT, @ErrMsg NVARCHAR(500);
+    EXEC sp_BorrowBook
+        @BookId = ?,
+        @UserId = ?,
+        @LoanDurationMinutes = 1,
+        @NewTransactionId = @NewId OUTPUT,
+        @ErrorMessage = @ErrMsg OUTPUT;
+    SELECT @NewId AS NewId, @ErrMsg AS ErrorMsg;
+""", INT, INT)
+RETURN_BOOK = Query('transactions.return', """
+    SET NOCOUNT ON;
+    DECLARE @Suc BIT, @Msg NVARCHAR(500);
+    EXEC sp_ReturnBook
+        @TransactionId = ?,
+        @UserId = ?,
+        @Success = @Suc OUTPUT,
+        @Message = @Msg OUTPUT;
+    SELECT @Suc AS Success, @Msg AS Message;
+""", INT, INT)
+RETURN_BOOKS = Query('transactions.return_many', """
+    SET NOCOUNT ON;
+    EXEC sp_ReturnBooks @TransactionIds = ?, @UserId = ?;
+""", TVP, INT)
+
+# ---- Cezalar: işlem ve üye bilgisi ----
+PENALTY_SELECT = """
+    SELECT {top}p.Id, p.Amount, p.BorrowTransactionsId, p.NumberOfDay, u.FullName, bt.UserId
+    FROM Penalties p
+    INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
+    INNER JOIN Users u ON bt.UserId = u.Id
+"""
+_PENALTY = PENALTY_SELECT.format(top="")
+
+# Listeler ödenmemiş cezalardır; ödenenler defterde kalır (PENALTY_LEDGER_*)
+PENALTIES_ALL = Query('penalties.all', _PENALTY + "WHERE p.PaidDate IS NULL ORDER BY p.Id DESC")
+PENALTIES_PAGE = Query(
+    'penalties.page',
+    PENALTY_SELECT.format(top="TOP (?) ") + "WHERE p.PaidDate IS NULL AND p.Id < ? ORDER BY p.Id DESC",
+    INT, INT,
+    sqlite=_PENALTY + "WHERE p.PaidDate IS NULL AND p.Id < ?2 ORDER BY p.Id DESC LIMIT ?1"
+)
+PENALTY_BY_ID = Query('penalties.by_id', _PENALTY + "WHERE p.Id = ?", INT)
+PENALTIES_BY_USER = Query('penalties.by_user', _PENALTY + """
+    WHERE bt.UserId = ? AND p.PaidDate IS NULL
+    ORDER BY p.Id DESC
+""", INT)
+PENALTY_INSERT = insert(
+    'penalties.insert',
+    "INSERT INTO Penalties (BorrowTransactionsId, NumberOfDay, Amount) VALUES (?, ?, ?)",
+    INT, INT, AMOUNT
+)
+PENALTY_DELETE = Query('penalties.delete', "DELETE FROM Penalties WHERE Id = ?", INT)
+PENALTIES_TOTAL = Query('penalties.total', "SELECT COALESCE(SUM(Balance), 0) FROM UserPenaltyBalances")
+# Bakiye satırı (trg_PenaltyLedger yazar): tek satır okuma; satır yoksa da (0, 0) döner
+PENALTY_BALANCE = Query('penalties.balance', """
+    SELECT COALESCE(MAX(Balance), 0) AS Balance, COALESCE(MAX(UnpaidCount), 0) AS UnpaidCount
+    FROM UserPenaltyBalances
+    WHERE UserId = ?
+""", INT)
+PAY_PENALTY = Query('penalties.pay', """
+    SET NOCOUNT ON;
+    DECLARE @Suc BIT, @Msg NVARCHAR(500);
+    EXEC sp_PayPenalty
+        @PenaltyId = ?,
+        @UserId = ?,
+        @Success = @Suc OUTPUT,
+        @Message = @Msg OUTPUT;
+    SELECT @Suc AS Success, @Msg AS Message;
+""", INT, INT)
+
+# ---- Ceza defteri: değişmez charge / payment / cancel kayıtları ----
+PENALTY_LEDGER_SELECT = """
+    SELECT {top}l.Id, l.UserId, u.FullName, l.PenaltyId, l.EntryType, l.Amount, l.CreatedDate
+    FROM PenaltyLedger l
+    LEFT JOIN Users u ON l.UserId = u.Id
+"""
+_PENALTY_LEDGER = PENALTY_LEDGER_SELECT.format(top="")
+
+PENALTY_LEDGER_PAGE = Query(
+    'penalty_ledger.page',
+    PENALTY_LEDGER_SELECT.format(top="TOP (?) ") + "WHERE l.Id < ? ORDER BY l.Id DESC",
+    INT, INT,
+    sqlite=_PENALTY_LEDGER + "WHERE l.Id < ?2 ORDER BY l.Id DESC LIMIT ?1"
+)
+PENALTY_LEDGER_USER_PAGE = Query(
+    'penalty_ledger.user_page',
+    PENALTY_LEDGER_SELECT.format(top="TOP (?) ") + "WHERE l.UserId = ? AND l.Id < ? ORDER BY l.Id DESC",
+    INT, INT, INT,
+    sqlite=_PENALTY_LEDGER + "WHERE l.UserId = ?2 AND l.Id < ?3 ORDER BY l.Id DESC LIMIT ?1"
+)
+
+# ---- Panolar ----
+ADMIN_SUMMARY = Query('stats.summary', """
+    SELECT
+        (SELECT COUNT(*) FROM Books) AS Books,
+        (SELECT COUNT(*) FROM Authors) AS Authors,
+        (SELECT COUNT(*) FROM Categories) AS Categories,
+        (SELECT COUNT(*) FROM Users) AS Users,
+        (SELECT COALESCE(SUM(ActiveLoans), 0) FROM Books) AS ActiveLoans,
+        (SELECT COUNT(*) FROM BorrowTransactions
+         WHERE RealReturnDate IS NULL AND ReturnDate < GETDATE()) AS OverdueLoans,
+        (SELECT COALESCE(SUM(Balance), 0) FROM UserPenaltyBalances) AS OutstandingPenalties
+""")
+# Tek batch, üç result set: ödünç sayıları, ceza bakiyesi, son işlemler
+USER_DASHBOARD = Query('stats.user_dashboard', """
+    SET NOCOUNT ON;
+
+    SELECT
+        COUNT(CASE WHEN RealReturnDate IS NULL THEN 1 END) AS ActiveLoans,
+        COUNT(*) AS TotalLoans,
+        COUNT(CASE WHEN RealReturnDate IS NULL AND ReturnDate < GETDATE() THEN 1 END) AS OverdueLoans,
+        MIN(CASE WHEN RealReturnDate IS NULL THEN ReturnDate END) AS NextDueDate,
+        (SELECT COUNT(*) FROM Books) AS CatalogBooks
+    FROM BorrowTransactions
+    WHERE UserId = ?;
+
+    SELECT COALESCE(MAX(Balance), 0) AS Outstanding, COALESCE(MAX(UnpaidCount), 0) AS PenaltyCount
+    FROM UserPenaltyBalances
+    WHERE UserId = ?;
+""" + _TRANSACTION_TOP + """
+    WHERE bt.UserId = ?
+    ORDER BY bt.BorrowDate DESC, bt.Id DESC;
+""", INT, INT, INT, INT)
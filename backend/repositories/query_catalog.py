@@ -0,0 +1,234 @@
+"""
+QUERY_CATALOG.PY - Sorgu Kataloğu Altyapısı
+
+Repository'lerin çalıştırdığı her SQL ifadesi repositories/queries.py'de
+(SQLite'a özgü olanlar repositories/sqlite/queries.py'de) bir kez, adı ve
+parametre tipleriyle tanımlanır:
+
+    USER_BY_ID = Query('users.by_id', f"SELECT {USER_COLUMNS} FROM Users WHERE Id = ?", INT)
+
+ve BaseRepository.execute ile çalıştırılır:
+
+    row = self.execute(conn, queries.USER_BY_ID, (user_id,)).fetchone()
+
+- Tipli parametreler: SQL Server'da cursor.setinputsizes ile bildirilir.
+  Bildirilmezse pyodbc tipi ve uzunluğu değerden çıkarır (nvarchar(5),
+  nvarchar(7) ...) ve her varyant için ayrı plan önbelleğe girer
+- Yeniden kullanım: SQL Server'da cursor'lar fiziksel bağlantıda ifade
+  başına saklanır (PooledConnection.cursor(key)); pyodbc aynı metni aynı
+  cursor'da tekrar hazırlamaz (SQLPrepare bir kez, sonra sadece SQLExecute).
+  SQLite'ta cursor saklanmaz: sqlite3'ün bağlantı başına ifade önbelleği
+  aynı işi görür, yarım okunmuş saklı cursor ise okuma snapshot'ını açık tutardı
+- İstatistik: ifade başına çalıştırma / hata sayısı, toplam ve en uzun
+  execute süresi (sonuç okuma hariç): GET /api/admin/queries, /api/admin/metrics
+
+sqlite= aynı parametrelerle SQLite'ta çalışan metindir; parametre sırası
+farklıysa numaralı yer tutucular kullanılır (WHERE Id > ?2 ... LIMIT ?1).
+
+Değişken sayıda değer alan ifadelerde (IN listesi, çok satırlı VALUES)
+metindeki {values} yerine Repeat parçası `rows` kez yazılır. Bu ifadelerin
+metni ve cursor'ı sadece 2'nin kuvveti boyutlarda saklanır (get_by_ids
+listeyi bu boyutlara tamamlar); diğer boyutlar her çağrıda yeniden üretilir.
+"""
+import threading
+import time
+from typing import Dict, List, Optional
+
+SQLSERVER = 'sqlserver'
+SQLITE = 'sqlite'
+
+VALUES = '{values}'
+
+
+class SqlType:
+    """
+    Parametre tipi (pyodbc sabit adı, sütun boyutu, ondalık hane).
+    pyodbc sabiti ilk kullanımda çözülür; SQLite sürücüsü pyodbc'yi yüklemez.
+    """
+    __slots__ = ('name', 'size', 'digits')
+
+    def __init__(self, name: str, size: int = 0, digits: int = 0):
+        self.name = name
+        self.size = size
+        self.digits = digits
+
+    def input_size(self) -> tuple:
+        import pyodbc
+        return getattr(pyodbc, self.name), self.size, self.digits
+
+    def __repr__(self):
+        return f"SqlType({self.name}, {self.size}, {self.digits})"
+
+
+INT = SqlType('SQL_INTEGER')
+BIT = SqlType('SQL_BIT')
+DATETIME = SqlType('SQL_TYPE_TIMESTAMP', 23, 3)     # DATETIME sütunları (datetime2'ye yükseltilmez)
+TVP = None                                          # table-valued parameter: tipi sürücü belirler
+
+
+def NVARCHAR(length: int) -> SqlType:
+    return SqlType('SQL_WVARCHAR', length)
+
+
+def DECIMAL(precision: int, scale: int) -> SqlType:
+    return SqlType('SQL_DECIMAL', precision, scale)
+
+
+class Repeat:
+    """{values} yerine `rows` kez yazılan parça ve her tekrarın parametre tipleri"""
+    __slots__ = ('fragment', 'types')
+
+    def __init__(self, fragment: str, *types):
+        self.fragment = fragment
+        self.types = types
+
+
+def _reusable(rows: Optional[int]) -> bool:
+    """Sabit metinli ifade veya 2'nin kuvveti boyut: metin ve cursor saklanır"""
+    return rows is None or rows & (rows - 1) == 0
+
+
+CATALOG: Dict[str, 'Query'] = {}
+_stats_lock = threading.Lock()
+
+
+class Query:
+    """
+    Args:
+        name: Katalogda benzersiz ad ('tablo.işlem')
+        sql: SQL Server metni
+        params: Parametre tipleri, metindeki sırayla (en fazla bir Repeat)
+        sqlite: SQLite metni; verilmezse sql iki sürücüde de kullanılır
+    """
+    __slots__ = ('name', 'sql', 'sqlite', 'params', 'repeat',
+                 'calls', 'errors', 'seconds', 'max_seconds', '_texts', '_sizes')
+
+    def __init__(self, name: str, sql: str, *params, sqlite: Optional[str] = None):
+        if name in CATALOG:
+            raise ValueError(f"Sorgu adı zaten tanımlı: {name}")
+        repeats = [param for param in params if isinstance(param, Repeat)]
+        if len(repeats) > 1 or bool(repeats) != (VALUES in sql):
+            raise ValueError(f"{name}: {VALUES} ve tek Repeat birlikte kullanılmalı")
+        self.name = name
+        self.sql = sql
+        self.sqlite = sqlite
+        self.params = params
+        self.repeat = repeats[0] if repeats else None
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self._texts = {}    # (sürücü, rows) -> metin
+        self._sizes = {}    # rows -> setinputsizes listesi
+        CATALOG[name] = self
+
+    def text(self, dialect: str = SQLSERVER, rows: Optional[int] = None) -> str:
+        key = (dialect, rows)
+        text = self._texts.get(key)
+        if text is None:
+            text = self.sqlite if dialect == SQLITE and self.sqlite else self.sql
+            if self.repeat is not None:
+                if not rows:
+                    raise ValueError(f"{self.name}: değer sayısı (rows) verilmeli")
+                text = text.replace(VALUES, ", ".join([self.repeat.fragment] * rows))
+            if _reusable(rows):
+                self._texts[key] = text
+        return text
+
+    def input_sizes(self, rows: Optional[int] = None) -> list:
+        """cursor.setinputsizes listesi (pyodbc tipleri; TVP için None)"""
+        sizes = self._sizes.get(rows)
+        if sizes is None:
+            types = []
+            for param in self.params:
+                types.extend(param.types * rows if isinstance(param, Repeat) else (param,))
+            sizes = [None if param is TVP else param.input_size() for param in types]
+            if _reusable(rows):
+                self._sizes[rows] = sizes
+        return sizes
+
+    def _cursor(self, conn, dialect: str, rows: Optional[int]):
+        if dialect != SQLSERVER:
+            return conn.cursor()
+        cursor = conn.cursor((self.name, rows) if _reusable(rows) else None)
+        if self.params:
+            cursor.setinputsizes(self.input_sizes(rows))
+        return cursor
+
+    def execute(self, conn, params=(), dialect: str = SQLSERVER, rows: Optional[int] = None):
+        """
+        İfadeyi çalıştırır, cursor'ı döndürür (sonuçlar cursor'dan okunur).
+
+        Args:
+            conn: Havuz bağlantısı (PooledConnection veya UnitOfWork bağlantısı)
+            rows: Repeat'li ifadelerde tekrar sayısı
+        """
+        cursor = self._cursor(conn, dialect, rows)
+        text = self.text(dialect, rows)
+        started = time.perf_counter()
+        try:
+            cursor.execute(text, params)
+        except Exception:
+            self._record(started, failed=True)
+            raise
+        self._record(started)
+        return cursor
+
+    def executemany(self, conn, seq_of_params, dialect: str = SQLSERVER, fast: bool = False):
+        """
+        Args:
+            fast: SQL Server'da fast_executemany (tek round trip; tipler
+                  setinputsizes'tan gelir, ilk satırdan tahmin edilmez)
+        """
+        cursor = self._cursor(conn, dialect, None)
+        if dialect == SQLSERVER:
+            cursor.fast_executemany = fast
+        text = self.text(dialect)
+        started = time.perf_counter()
+        try:
+            cursor.executemany(text, seq_of_params)
+        except Exception:
+            self._record(started, failed=True)
+            raise
+        self._record(started)
+        return cursor
+
+    def _record(self, started: float, failed: bool = False):
+        elapsed = time.perf_counter() - started
+        with _stats_lock:
+            self.calls += 1
+            self.errors += failed
+            self.seconds += elapsed
+            if elapsed > self.max_seconds:
+                self.max_seconds = elapsed
+
+    def __repr__(self):
+        return f"Query({self.name!r})"
+
+
+def catalog_stats(include_idle: bool = False) -> List[dict]:
+    """
+    İfade başına çalıştırma istatistikleri, toplam süreye göre azalan.
+
+    Args:
+        include_idle: Hiç çalışmamış ifadeler de listelensin (ör. diğer sürücünün ifadeleri)
+    """
+    with _stats_lock:
+        snapshot = [(q.name, q.calls, q.errors, q.seconds, q.max_seconds)
+                    for q in CATALOG.values() if q.calls or include_idle]
+    snapshot.sort(key=lambda row: row[3], reverse=True)
+    return [{
+        "name": name,
+        "calls": calls,
+        "errors": errors,
+        "totalMs": round(seconds * 1000, 3),
+        "avgMs": round(seconds * 1000 / calls, 3) if calls else 0.0,
+        "maxMs": round(max_seconds * 1000, 3),
+    } for name, calls, errors, seconds, max_seconds in snapshot]
+
+
+def reset_stats():
+    with _stats_lock:
+        for query in CATALOG.values():
+            query.calls = query.errors = 0
+            query.seconds = query.max_seconds = 0.0
@@ -0,0 +1,45 @@
+"""
+SQLITE - SQLite Depolama Sürücüsü Repository'leri
+
+Her sınıf SQL Server repository'sinden türetilir. T-SQL'e özgü sorguların
+(TOP, SCOPE_IDENTITY, OUTPUT) SQLite metinleri sorgu kataloğundadır
+(repositories/queries.py, sqlite=); burada sadece stored procedure'lerin
+ve çoklu result set'li batch'lerin Python karşılıkları yazılır
+(ifadeleri repositories/sqlite/queries.py). Trigger'lar
+db_setup_sqlite.sql içindedir.
+"""
+from repositories.user_repository import UserRepository
+from repositories.author_repository import AuthorRepository
+from repositories.category_repository import CategoryRepository
+from repositories.book_repository import BookRepository
+from repositories.transaction_repository import TransactionRepository
+from repositories.penalty_repository import PenaltyRepository
+from repositories.stats_repository import StatsRepository
+from repositories.sqlite.user_repository import SqliteUserRepository
+from repositories.sqlite.author_repository import SqliteAuthorRepository
+from repositories.sqlite.category_repository import SqliteCategoryRepository
+from repositories.sqlite.book_repository import SqliteBookRepository
+from repositories.sqlite.transaction_repository import SqliteTransactionRepository
+from repositories.sqlite.penalty_repository import SqlitePenaltyRepository
+from repositories.sqlite.stats_repository import SqliteStatsRepository
+
+SQLITE_REPOSITORIES = {
+    UserRepository: SqliteUserRepository,
+    AuthorRepository: SqliteAuthorRepository,
+    CategoryRepository: SqliteCategoryRepository,
+    BookRepository: SqliteBookRepository,
+    TransactionRepository: SqliteTransactionRepository,
+    PenaltyRepository: SqlitePenaltyRepository,
+    StatsRepository: SqliteStatsRepository,
+}
+
+__all__ = [
+    'SQLITE_REPOSITORIES',
+    'SqliteUserRepository',
+    'SqliteAuthorRepository',
+    'SqliteCategoryRepository',
+    'SqliteBookRepository',
+    'SqliteTransactionRepository',
+    'SqlitePenaltyRepository',
+    'SqliteStatsRepository'
+]
@@ -0,0 +1,10 @@
+"""
+AUTHOR_REPOSITORY.PY - Yazar Veritabanı İşlemleri (SQLite)
+
+Toplu ekleme INSERT ... RETURNING ile (OUTPUT karşılığı, repositories/queries.py).
+"""
+from repositories.author_repository import AuthorRepository
+from repositories.sqlite.base import SqliteRepositoryMixin
+
+class SqliteAuthorRepository(SqliteRepositoryMixin, AuthorRepository):
+    pass
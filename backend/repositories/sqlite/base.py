@@ -0,0 +1,23 @@
+"""
+BASE.PY - SQLite Repository'leri İçin Ortak Metodlar
+"""
+from repositories.query_catalog import SQLITE
+from repositories.sqlite import queries
+
+
+class SqliteRepositoryMixin:
+    """BaseRepository'nin SQL Server'a özgü yardımcılarının SQLite karşılıkları"""
+
+    DIALECT = SQLITE
+
+    def insert_identity(self, conn, query, params) -> int:
+        return self.execute(conn, query, params).lastrowid
+
+    def begin_immediate(self, conn):
+        """
+        Yazma kilidini transaction başında alır (SQL Server'daki UPDLOCK karşılığı):
+        aynı anda çalışan procedure'ler sıraya girer. İş birimi transaction'ı
+        zaten açıksa ona katılınır.
+        """
+        if not conn.in_transaction:
+            self.execute(conn, queries.BEGIN_IMMEDIATE)
@@ -0,0 +1,43 @@
+"""
+BOOK_REPOSITORY.PY - Kitap Veritabanı İşlemleri (SQLite)
+"""
+import logging
+from typing import List, Tuple
+from repositories.book_repository import BookRepository
+from repositories.sqlite.base import SqliteRepositoryMixin
+from repositories.sqlite import queries as sqlite_queries
+from repositories import queries
+
+class SqliteBookRepository(SqliteRepositoryMixin, BookRepository):
+    
+    def bulk_add(self, rows: List[tuple], uow=None) -> List[Tuple[int, str]]:
+        """
+        Toplu kitap ekleme (içe aktarma): parça tek executemany ile eklenir.
+        Bir satır hata verirse parça savepoint'e geri alınır ve satır satır
+        eklenir; iş biriminin önceki yazmaları (yeni yazarlar vb.) korunur.
+        """
+        if not rows:
+            return []
+        conn = self.get_connection(uow=uow)
+        try:
+            self.execute(conn, sqlite_queries.SAVEPOINT_BULK_BOOKS)
+            try:
+                self.executemany(conn, queries.BOOKS_BULK_INSERT, [row[1:] for row in rows])
+                self.execute(conn, sqlite_queries.RELEASE_BULK_BOOKS)
+                conn.commit()
+                return []
+            except Exception as e:
+                self.log(logging.WARNING, "bulk_add", "Toplu ekleme başarısız, satır satır deneniyor: %s", e)
+                self.execute(conn, sqlite_queries.ROLLBACK_BULK_BOOKS)
+                self.execute(conn, sqlite_queries.RELEASE_BULK_BOOKS)
+            
+            errors = []
+            for row in rows:
+                try:
+                    self.execute(conn, queries.BOOKS_BULK_INSERT, row[1:])
+                except Exception as e:
+                    errors.append((row[0], str(e)))
+            conn.commit()
+            return errors
+        finally:
+            conn.close()
@@ -0,0 +1,10 @@
+"""
+CATEGORY_REPOSITORY.PY - Kategori Veritabanı İşlemleri (SQLite)
+
+Toplu ekleme INSERT ... RETURNING ile (OUTPUT karşılığı, repositories/queries.py).
+"""
+from repositories.category_repository import CategoryRepository
+from repositories.sqlite.base import SqliteRepositoryMixin
+
+class SqliteCategoryRepository(SqliteRepositoryMixin, CategoryRepository):
+    pass
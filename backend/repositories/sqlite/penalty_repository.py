@@ -0,0 +1,50 @@
+"""
+PENALTY_REPOSITORY.PY - Ceza Veritabanı İşlemleri (SQLite)
+
+sp_PayPenalty -> pay_penalty_sp (aynı kontroller ve mesajlar)
+"""
+from datetime import datetime
+from typing import Tuple
+from repositories.penalty_repository import PenaltyRepository
+from repositories.sqlite.base import SqliteRepositoryMixin
+from repositories.sqlite import queries as sqlite_queries
+
+class SqlitePenaltyRepository(SqliteRepositoryMixin, PenaltyRepository):
+
+    def pay_penalty_sp(self, penalty_id: int, user_id: int) -> Tuple[bool, str]:
+        """
+        sp_PayPenalty karşılığı: kullanıcı sadece kendi cezasını ödeyebilir.
+        PaidDate yazılır; defter kaydını ve bakiyeyi trg_PenaltyLedger_Payment yazar.
+
+        Returns:
+            Tuple[bool, str]: (başarı, mesaj)
+        """
+        if not self.validate_id(penalty_id, "penalty_id") or not self.validate_id(user_id, "user_id"):
+            return False, "Geçersiz parametreler"
+
+        conn = None
+        try:
+            conn = self.get_connection()
+            self.begin_immediate(conn)
+
+            row = self.execute(conn, sqlite_queries.PAY_LOOKUP, (penalty_id,)).fetchone()
+            if row is None:
+                conn.commit()
+                return False, "Ceza bulunamadı"
+            if row[1] != user_id:
+                conn.commit()
+                return False, "Bu ceza size ait değil"
+            if row[2] is not None:
+                conn.commit()
+                return False, "Ceza zaten ödenmiş"
+
+            self.execute(conn, sqlite_queries.PAY_UPDATE, (datetime.now(), penalty_id))
+            conn.commit()
+            return True, f"{float(row[0]):.2f} TL ceza başarıyla ödendi"
+
+        except Exception as e:
+            self.log_error("pay_penalty_sp", e)
+            if conn: conn.rollback()
+            return False, str(e)
+        finally:
+            if conn: conn.close()
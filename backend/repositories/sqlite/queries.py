@@ -0,0 +1,86 @@
+"""
+QUERIES.PY - SQLite'a Özgü İfadeler
+
+Stored procedure'lerin Python karşılıkları (repositories/sqlite) ve tek
+batch'te çalışan SQL Server ifadelerinin parçaları. İki sürücüde ortak
+olan ifadeler repositories/queries.py'dedir (sqlite= varyantlarıyla).
+"""
+from repositories.query_catalog import DATETIME, INT, Query, Repeat
+from repositories.queries import TRANSACTION_SELECT
+
+_TRANSACTION = TRANSACTION_SELECT.format(top="")
+
+BEGIN_IMMEDIATE = Query('sqlite.begin_immediate', "BEGIN IMMEDIATE")
+
+# ---- Toplu kitap ekleme (hatalı parça savepoint'e geri alınır) ----
+SAVEPOINT_BULK_BOOKS = Query('sqlite.bulk_books.savepoint', "SAVEPOINT bulk_books")
+RELEASE_BULK_BOOKS = Query('sqlite.bulk_books.release', "RELEASE bulk_books")
+ROLLBACK_BULK_BOOKS = Query('sqlite.bulk_books.rollback', "ROLLBACK TO bulk_books")
+
+# ---- sp_BorrowBook ----
+BORROW_AVAILABLE = Query('sp_BorrowBook.available', "SELECT StockNumber - ActiveLoans FROM Books WHERE Id = ?", INT)
+BORROW_DUPLICATE = Query('sp_BorrowBook.duplicate', """
+    SELECT COUNT(*) FROM BorrowTransactions
+    WHERE UserId = ? AND BookId = ? AND RealReturnDate IS NULL
+""", INT, INT)
+BORROW_INSERT = Query(
+    'sp_BorrowBook.insert',
+    "INSERT INTO BorrowTransactions (BookId, UserId, BorrowDate, ReturnDate) VALUES (?, ?, ?, ?)",
+    INT, INT, DATETIME, DATETIME
+)
+BORROW_COUNT_LOAN = Query('sp_BorrowBook.count_loan', "UPDATE Books SET ActiveLoans = ActiveLoans + 1 WHERE Id = ?", INT)
+
+# ---- sp_ReturnBook ----
+RETURN_LOOKUP = Query('sp_ReturnBook.lookup', """
+    SELECT bt.UserId, bt.RealReturnDate, bt.ReturnDate, b.Title
+    FROM BorrowTransactions bt
+    INNER JOIN Books b ON bt.BookId = b.Id
+    WHERE bt.Id = ?
+""", INT)
+RETURN_UPDATE = Query('sp_ReturnBook.update', "UPDATE BorrowTransactions SET RealReturnDate = ? WHERE Id = ?",
+                      DATETIME, INT)
+
+# ---- sp_ReturnBooks (trigger her satırın cezasını yazar) ----
+RETURN_MANY_UPDATE = Query('sp_ReturnBooks.update', """
+    UPDATE BorrowTransactions SET RealReturnDate = ?
+    WHERE Id IN ({values}) AND RealReturnDate IS NULL
+    RETURNING Id
+""", DATETIME, Repeat("?", INT))
+RETURN_MANY_UPDATE_OWN = Query('sp_ReturnBooks.update_own', """
+    UPDATE BorrowTransactions SET RealReturnDate = ?
+    WHERE Id IN ({values}) AND RealReturnDate IS NULL AND UserId = ?
+    RETURNING Id
+""", DATETIME, Repeat("?", INT), INT)
+RETURN_MANY_RESULTS = Query('sp_ReturnBooks.results', _TRANSACTION.replace(
+    "FROM BorrowTransactions bt", ", p.NumberOfDay, p.Amount FROM BorrowTransactions bt"
+) + """
+    LEFT JOIN Penalties p ON p.BorrowTransactionsId = bt.Id
+    WHERE bt.Id IN ({values})
+""", Repeat("?", INT))
+
+# ---- sp_PayPenalty ----
+PAY_LOOKUP = Query('sp_PayPenalty.lookup', """
+    SELECT p.Amount, bt.UserId, p.PaidDate
+    FROM Penalties p
+    INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
+    WHERE p.Id = ?
+""", INT)
+PAY_UPDATE = Query('sp_PayPenalty.update', "UPDATE Penalties SET PaidDate = ? WHERE Id = ?", DATETIME, INT)
+
+# ---- Üye panosu: SQLite tek execute'ta çoklu result set döndüremez ----
+# MIN() sonucu tip bilgisi taşımaz; sütun adındaki [DATETIME] ile datetime'a çevrilir
+DASHBOARD_LOANS = Query('stats.user_dashboard.loans', """
+    SELECT
+        COUNT(CASE WHEN RealReturnDate IS NULL THEN 1 END) AS ActiveLoans,
+        COUNT(*) AS TotalLoans,
+        COUNT(CASE WHEN RealReturnDate IS NULL AND ReturnDate < GETDATE() THEN 1 END) AS OverdueLoans,
+        MIN(CASE WHEN RealReturnDate IS NULL THEN ReturnDate END) AS "NextDueDate [DATETIME]",
+        (SELECT COUNT(*) FROM Books) AS CatalogBooks
+    FROM BorrowTransactions
+    WHERE UserId = ?
+""", INT)
+DASHBOARD_RECENT = Query('stats.user_dashboard.recent', _TRANSACTION + """
+    WHERE bt.UserId = ?
+    ORDER BY bt.BorrowDate DESC, bt.Id DESC
+    LIMIT ?
+""", INT, INT)
@@ -0,0 +1,40 @@
+"""
+STATS_REPOSITORY.PY - Yönetici Özeti Sorguları (SQLite)
+
+SQLite tek execute'ta çoklu result set döndüremez; üye panosu aynı
+bağlantıda üç sorguyla okunur (süreç içi, round trip maliyeti yok).
+"""
+from typing import Optional
+from repositories.stats_repository import StatsRepository
+from repositories.transaction_repository import TransactionRepository
+from repositories.sqlite.base import SqliteRepositoryMixin
+from repositories.sqlite import queries as sqlite_queries
+from repositories import queries
+
+class SqliteStatsRepository(SqliteRepositoryMixin, StatsRepository):
+
+    def get_user_dashboard(self, user_id: int, recent_limit: int = 5) -> Optional[dict]:
+        """Üye panosu: ödünç sayıları, ceza bakiyesi satırı ve son recent_limit işlem"""
+        if not self.validate_id(user_id, "user_id"):
+            return None
+        conn = None
+        try:
+            conn = self.get_connection(read_only=True)
+            loans = self.execute(conn, sqlite_queries.DASHBOARD_LOANS, (user_id,)).fetchone()
+            penalties = self.execute(conn, queries.PENALTY_BALANCE, (user_id,)).fetchone()
+            recent = self.execute(conn, sqlite_queries.DASHBOARD_RECENT, (user_id, recent_limit)).fetchall()
+            return {
+                "activeLoans": loans[0],
+                "totalLoans": loans[1],
+                "overdueLoans": loans[2],
+                "nextDueDate": loans[3],
+                "catalogBooks": loans[4],
+                "outstandingPenalties": float(penalties[0]),
+                "penaltyCount": penalties[1],
+                "recentTransactions": [TransactionRepository._row_to_transaction(row) for row in recent]
+            }
+        except Exception as e:
+            self.log_error("get_user_dashboard", e)
+            return None
+        finally:
+            if conn: conn.close()
@@ -0,0 +1,191 @@
+"""
+TRANSACTION_REPOSITORY.PY - Ödünç İşlemi Veritabanı İşlemleri (SQLite)
+
+Stored procedure'lerin Python karşılıkları (aynı kontroller, aynı sıra,
+aynı mesajlar). Cezayı ve ödünç sayacını db_setup_sqlite.sql'deki
+trg_CalculatePenalty trigger'ı yazar.
+- sp_BorrowBook  -> borrow_book_sp
+- sp_ReturnBook  -> return_book_sp
+- sp_ReturnBooks -> return_books_sp
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from repositories.transaction_repository import TransactionRepository
+from repositories.sqlite.base import SqliteRepositoryMixin
+from repositories.sqlite import queries as sqlite_queries
+from repositories import queries
+from entities.borrow_transaction import BorrowTransaction
+
+class SqliteTransactionRepository(SqliteRepositoryMixin, TransactionRepository):
+
+    LOAN_DURATION_MINUTES = 1       # sp_BorrowBook @LoanDurationMinutes
+    PENALTY_PER_MINUTE = 5          # trg_CalculatePenalty @PenaltyPerMinute
+
+    @staticmethod
+    def delay_minutes(return_date: datetime, real_return_date: datetime) -> int:
+        """DATEDIFF(MINUTE, ReturnDate, RealReturnDate) karşılığı (dakika sınırı sayısı), en az 1"""
+        floor = lambda d: d.replace(second=0, microsecond=0)
+        return max(1, int((floor(real_return_date) - floor(return_date)).total_seconds() // 60))
+
+    def borrow_book_sp(self, book_id: int, user_id: int, uow=None) -> Tuple[bool, str, Optional[BorrowTransaction]]:
+        """
+        sp_BorrowBook karşılığı: stok, mükerrer ödünç ve ceza kontrolleri,
+        işlem kaydı ve ödünç sayacı tek transaction'da (BEGIN IMMEDIATE).
+
+        Returns:
+            Tuple[bool, str, Optional[BorrowTransaction]]: (başarı, mesaj, yeni_işlem)
+        """
+        if not self.validate_id(book_id) or not self.validate_id(user_id):
+            return False, "Geçersiz parametreler", None
+
+        conn = None
+        try:
+            conn = self.get_connection(uow=uow)
+            self.begin_immediate(conn)
+
+            # Kitap var mı, stokta var mı? (ActiveLoans sayacı)
+            row = self.execute(conn, sqlite_queries.BORROW_AVAILABLE, (book_id,)).fetchone()
+            error = None
+            if row is None:
+                error = "Kitap bulunamadı"
+            elif row[0] <= 0:
+                error = "Kitap stokta yok"
+            elif self.execute(conn, sqlite_queries.BORROW_DUPLICATE, (user_id, book_id)).fetchone()[0] > 0:
+                error = "Bu kitabı zaten ödünç almışsınız"
+            elif self.execute(conn, queries.PENALTY_BALANCE, (user_id,)).fetchone()[1] > 0:
+                error = "Ödenmemiş cezanız var. Önce cezanızı ödeyin."
+            if error:
+                conn.rollback()
+                return False, error, None
+
+            # İşlemi kaydet ve ödünç sayacını artır
+            borrow_date = datetime.now()
+            return_date = borrow_date + timedelta(minutes=self.LOAN_DURATION_MINUTES)
+            new_id = self.insert_identity(conn, sqlite_queries.BORROW_INSERT,
+                                          (book_id, user_id, borrow_date, return_date))
+            self.execute(conn, sqlite_queries.BORROW_COUNT_LOAN, (book_id,))
+            tx = self._row_to_transaction(self.execute(conn, queries.TRANSACTION_BY_ID, (new_id,)).fetchone())
+            conn.commit()
+
+            return_date_str = tx.ReturnDate.strftime('%d.%m.%Y %H:%M:%S')
+            return True, f"'{tx.BookTitle}' kitabı ödünç alındı. Son iade: {return_date_str}", tx
+
+        except Exception as e:
+            self.log_error("borrow_book_sp", e)
+            if conn: conn.rollback()
+            return False, str(e), None
+        finally:
+            if conn: conn.close()
+
+    def return_book_sp(self, tx_id: int, user_id: int, uow=None) -> Tuple[bool, str, Optional[BorrowTransaction]]:
+        """
+        sp_ReturnBook karşılığı: sahiplik ve iade kontrolleri, RealReturnDate
+        güncellemesi (trigger cezayı yazar ve sayacı düşer).
+
+        Returns:
+            Tuple[bool, str, Optional[BorrowTransaction]]: (başarı, mesaj, işlem)
+        """
+        if not self.validate_id(tx_id) or not self.validate_id(user_id):
+            return False, "Geçersiz parametreler", None
+
+        conn = None
+        try:
+            conn = self.get_connection(uow=uow)
+            self.begin_immediate(conn)
+
+            row = self.execute(conn, sqlite_queries.RETURN_LOOKUP, (tx_id,)).fetchone()
+            error = None
+            if row is None:
+                error = "İşlem bulunamadı"
+            elif row[0] != user_id:
+                error = "Bu işlem size ait değil"
+            elif row[1] is not None:
+                error = "Kitap zaten iade edilmiş"
+            if error:
+                conn.commit()   # sp_ReturnBook gibi: yazma yok, dıştaki transaction'a dokunma
+                return False, error, None
+
+            # İade işlemi (Trigger ceza hesaplayacak)
+            real_return_date = datetime.now()
+            self.execute(conn, sqlite_queries.RETURN_UPDATE, (real_return_date, tx_id))
+
+            return_date, title = row[2], row[3]
+            if real_return_date > return_date:
+                minutes = self.delay_minutes(return_date, real_return_date)
+                message = (f"'{title}' iade edildi. {minutes} dakika gecikme için "
+                           f"{minutes * self.PENALTY_PER_MINUTE} TL ceza kesildi!")
+            else:
+                message = f"'{title}' başarıyla iade edildi. Teşekkürler!"
+
+            tx = self._row_to_transaction(self.execute(conn, queries.TRANSACTION_BY_ID, (tx_id,)).fetchone())
+            conn.commit()
+            return True, message, tx
+
+        except Exception as e:
+            self.log_error("return_book_sp", e)
+            if conn: conn.rollback()
+            return False, str(e), None
+        finally:
+            if conn: conn.close()
+
+    def return_books_sp(self, tx_ids: List[int], user_id: Optional[int] = None,
+                        uow=None) -> Dict[int, Tuple[bool, str, float, Optional[BorrowTransaction]]]:
+        """
+        sp_ReturnBooks karşılığı: uygun işlemler tek UPDATE ile iade edilir,
+        sonuçlar tek SELECT ile okunur. user_id None ise sahiplik kontrolü yapılmaz.
+
+        Returns:
+            Dict[int, Tuple]: işlem Id -> (başarı, mesaj, ceza tutarı, işlem)
+        """
+        ids = list(dict.fromkeys(tx_ids))
+        results = {tx_id: (False, "Geçersiz işlem ID", 0.0, None)
+                   for tx_id in ids if not self.validate_id(tx_id)}
+        valid = [tx_id for tx_id in ids if tx_id not in results]
+        if user_id is not None and not self.validate_id(user_id):
+            return {tx_id: (False, "Geçersiz parametreler", 0.0, None) for tx_id in ids}
+        if not valid:
+            return results
+        if len(valid) > self.BULK_VALUES_LIMIT:
+            raise ValueError(f"En fazla {self.BULK_VALUES_LIMIT} işlem gönderilebilir")
+
+        conn = None
+        try:
+            conn = self.get_connection(uow=uow)
+            self.begin_immediate(conn)
+
+            # İade işlemi (Trigger her satır için cezayı hesaplayacak)
+            if user_id is None:
+                cursor = self.execute(conn, sqlite_queries.RETURN_MANY_UPDATE,
+                                      [datetime.now(), *valid], rows=len(valid))
+            else:
+                cursor = self.execute(conn, sqlite_queries.RETURN_MANY_UPDATE_OWN,
+                                      [datetime.now(), *valid, user_id], rows=len(valid))
+            returned = {row[0] for row in cursor.fetchall()}
+
+            cursor = self.execute(conn, sqlite_queries.RETURN_MANY_RESULTS, valid, rows=len(valid))
+            found = {row[0]: row for row in cursor.fetchall()}
+            conn.commit()
+
+            for tx_id in valid:
+                row = found.get(tx_id)
+                tx = self._row_to_transaction(row) if row else None
+                if tx_id in returned and row[9] is not None:
+                    results[tx_id] = (True, f"'{tx.BookTitle}' iade edildi. {row[8]} dakika gecikme için "
+                                            f"{int(row[9])} TL ceza kesildi!", float(row[9]), tx)
+                elif tx_id in returned:
+                    results[tx_id] = (True, f"'{tx.BookTitle}' başarıyla iade edildi. Teşekkürler!", 0.0, tx)
+                elif row is None:
+                    results[tx_id] = (False, "İşlem bulunamadı", 0.0, None)
+                elif user_id is not None and tx.UserId != user_id:
+                    results[tx_id] = (False, "Bu işlem size ait değil", 0.0, tx)
+                else:
+                    results[tx_id] = (False, "Kitap zaten iade edilmiş", 0.0, tx)
+            return results
+
+        except Exception as e:
+            self.log_error("return_books_sp", e)
+            if conn: conn.rollback()
+            results.update((tx_id, (False, str(e), 0.0, None)) for tx_id in valid)
+            return results
+        finally:
+            if conn: conn.close()
@@ -0,0 +1,10 @@
+"""
+USER_REPOSITORY.PY - Kullanıcı Veritabanı İşlemleri (SQLite)
+
+Sorguların SQLite metinleri repositories/queries.py'dedir (sqlite=).
+"""
+from repositories.user_repository import UserRepository
+from repositories.sqlite.base import SqliteRepositoryMixin
+
+class SqliteUserRepository(SqliteRepositoryMixin, UserRepository):
+    pass
@@ -0,0 +1,79 @@
+"""
+STATS_REPOSITORY.PY - Yönetici Özeti Sorguları
+
+Panodaki tüm sayılar tek sorguda (tek round trip) okunur.
+- Ödünçteki kitap sayısı Books.ActiveLoans sayacından toplanır
+  (BorrowTransactions taranmaz)
+- Gecikmiş iadeler IX_BorrowTransactions_OpenLoans filtreli index'inden
+  sayılır (sadece açık ödünçler, ReturnDate index'e dahil)
+- Ödenmemiş ceza toplamları UserPenaltyBalances satırlarından okunur
+  (trg_PenaltyLedger günceller; Penalties JOIN'lenmez)
+- Üye panosu tek batch'te üç result set döner; geçmişin tamamı çekilmez
+"""
+from typing import Optional
+from repositories.base_repository import BaseRepository
+from repositories import queries
+from repositories.transaction_repository import TransactionRepository
+
+
+class StatsRepository(BaseRepository):
+
+    EMPTY_SUMMARY = {
+        "books": 0, "authors": 0, "categories": 0, "users": 0,
+        "activeLoans": 0, "overdueLoans": 0, "outstandingPenalties": 0.0
+    }
+
+    def get_summary(self) -> Optional[dict]:
+        """Yönetici panosu sayıları; hata durumunda None"""
+        conn = None
+        try:
+            conn = self.get_connection(read_only=True)
+            row = self.execute(conn, queries.ADMIN_SUMMARY).fetchone()
+            return {
+                "books": row[0],
+                "authors": row[1],
+                "categories": row[2],
+                "users": row[3],
+                "activeLoans": row[4],
+                "overdueLoans": row[5],
+                "outstandingPenalties": float(row[6])
+            }
+        except Exception as e:
+            self.log_error("get_summary", e)
+            return None
+        finally:
+            if conn: conn.close()
+
+    def get_user_dashboard(self, user_id: int, recent_limit: int = 5) -> Optional[dict]:
+        """
+        Üye panosu - tek bağlantı, tek round trip, üç result set:
+        1. Ödünç sayıları ve en yakın iade tarihi (+ katalogdaki kitap sayısı)
+        2. Ödenmemiş ceza toplamı
+        3. Son recent_limit işlem
+        
+        Returns:
+            Optional[dict]: Pano verisi (recentTransactions entity listesi); hata durumunda None
+        """
+        if not self.validate_id(user_id, "user_id"):
+            return None
+        conn = None
+        try:
+            conn = self.get_connection(read_only=True)
+            cursor = self.execute(conn, queries.USER_DASHBOARD, (user_id, user_id, recent_limit, user_id))
+            loans, penalties, recent = self.fetch_result_sets(cursor)
+            loans, penalties = loans[0], penalties[0]
+            return {
+                "activeLoans": loans[0],
+                "totalLoans": loans[1],
+                "overdueLoans": loans[2],
+                "nextDueDate": loans[3],
+                "catalogBooks": loans[4],
+                "outstandingPenalties": float(penalties[0]),
+                "penaltyCount": penalties[1],
+                "recentTransactions": [TransactionRepository._row_to_transaction(row) for row in recent]
+            }
+        except Exception as e:
+            self.log_error("get_user_dashboard", e)
+            return None
+        finally:
+            if conn: conn.close()
@@ -4,67 +4,105 @@ TRANSACTION_REPOSITORY.PY - Ödünç İşlemi Veritabanı İşlemleri
 *** STORED PROCEDURE KULLANIR ***
 - sp_BorrowBook: Kitap ödünç alma
 - sp_ReturnBook: Kitap iade etme (Trigger otomatik ceza hesaplar)
+- sp_ReturnBooks: Toplu iade (TransactionIdList TVP, tek round trip)
 """
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 from repositories.base_repository import BaseRepository
+from repositories import queries
 from entities.borrow_transaction import BorrowTransaction
 
 class TransactionRepository(BaseRepository):
     
+    @staticmethod
+    def _row_to_transaction(row) -> BorrowTransaction:
+        """JOIN'li işlem satırını (queries.TRANSACTION_SELECT) entity'ye çevirir"""
+        return BorrowTransaction(
+            Id=row[0], BookId=row[1], UserId=row[2],
+            BorrowDate=row[3], ReturnDate=row[4], RealReturnDate=row[5],
+            BookTitle=row[6], UserName=row[7]
+        )
+    
     def get_all(self) -> List[BorrowTransaction]:
         """Tüm işlemleri getirir"""
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
-                       ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
-                FROM BorrowTransactions bt
-                LEFT JOIN Books b ON bt.BookId = b.Id
-                LEFT JOIN Users u ON bt.UserId = u.Id
-                ORDER BY bt.BorrowDate DESC
-            """)
+            conn = self.get_connection(read_only=True)
             transactions = []
-            for row in cursor.fetchall():
-                transactions.append(BorrowTransaction(
-                    Id=row[0], BookId=row[1], UserId=row[2],
-                    BorrowDate=row[3], ReturnDate=row[4], RealReturnDate=row[5],
-                    BookTitle=row[6], UserName=row[7]
-                ))
+            for row in self.execute(conn, queries.TRANSACTIONS_ALL).fetchall():
+                transactions.append(self._row_to_transaction(row))
             return transactions
         except Exception as e:
-            print(f"[TransactionRepository.get_all] HATA: {e}")
+            self.log_error("get_all", e)
+            return []
+        finally:
+            if conn: conn.close()
+    
+    def iter_all(self, chunk_size: Optional[int] = None, raw: bool = False) -> Iterator[list]:
+        """
+        Tüm işlemleri parça parça döndürür (akış yanıtları için).
+        Bağlantı generator tüketildiği sürece açık kalır, bitince havuza döner.
+        raw=True ise entity yerine sürücü satırları döner (controllers/row_json.py).
+        """
+        conn = self.get_connection(read_only=True)
+        try:
+            cursor = self.execute(conn, queries.TRANSACTIONS_ALL)
+            yield from self.iter_chunks(cursor, None if raw else self._row_to_transaction, chunk_size or self.STREAM_CHUNK_SIZE)
+        except Exception as e:
+            self.log_error("iter_all", e)
+            raise
+        finally:
+            conn.close()
+    
+    def iter_open(self, chunk_size: Optional[int] = None) -> Iterator[List[BorrowTransaction]]:
+        """
+        İade edilmemiş (açık) ödünçleri son iade tarihine göre parça parça döndürür.
+        Filtreli IX_BorrowTransactions_Overdue index'i (migration 0001) sadece açık
+        satırları bu sırada içerir.
+        """
+        conn = self.get_connection(read_only=True)
+        try:
+            cursor = self.execute(conn, queries.TRANSACTIONS_OPEN)
+            yield from self.iter_chunks(cursor, self._row_to_transaction, chunk_size or self.STREAM_CHUNK_SIZE)
+        except Exception as e:
+            self.log_error("iter_open", e)
+            raise
+        finally:
+            conn.close()
+    
+    def get_page(self, limit: int, after: Optional[tuple] = None) -> List[BorrowTransaction]:
+        """
+        Keyset sayfalama: (BorrowDate DESC, Id DESC) sırasında `after` anahtarından
+        sonraki işlemler. Id eşitlik durumunda sırayı kararlı tutar.
+        
+        Args:
+            limit: Getirilecek en fazla kayıt
+            after: Önceki sayfanın son anahtarı (BorrowDate, Id); None ise ilk sayfa
+        """
+        conn = None
+        try:
+            conn = self.get_connection(read_only=True)
+            if after:
+                cursor = self.execute(conn, queries.TRANSACTIONS_PAGE, (limit, after[0], after[0], after[1]))
+            else:
+                cursor = self.execute(conn, queries.TRANSACTIONS_FIRST_PAGE, (limit,))
+            return [self._row_to_transaction(row) for row in cursor.fetchall()]
+        except Exception as e:
+            self.log_error("get_page", e)
             return []
         finally:
             if conn: conn.close()
     
-    def get_by_id(self, tx_id: int) -> Optional[BorrowTransaction]:
+    def get_by_id(self, tx_id: int, uow=None) -> Optional[BorrowTransaction]:
         """ID ile işlem getirir"""
         if not self.validate_id(tx_id):
             return None
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
-                       ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
-                FROM BorrowTransactions bt
-                LEFT JOIN Books b ON bt.BookId = b.Id
-                LEFT JOIN Users u ON bt.UserId = u.Id
-                WHERE bt.Id = ?
-            """, (tx_id,))
-            row = cursor.fetchone()
-            if row:
-                return BorrowTransaction(
-                    Id=row[0], BookId=row[1], UserId=row[2],
-                    BorrowDate=row[3], ReturnDate=row[4], RealReturnDate=row[5],
-                    BookTitle=row[6], UserName=row[7]
-                )
-            return None
+            conn = self.get_connection(read_only=True, uow=uow)
+            row = self.execute(conn, queries.TRANSACTION_BY_ID, (tx_id,)).fetchone()
+            return self._row_to_transaction(row) if row else None
         except Exception as e:
-            print(f"[TransactionRepository.get_by_id] HATA: {e}")
+            self.log_error("get_by_id", e)
             return None
         finally:
             if conn: conn.close()
@@ -75,134 +113,137 @@ class TransactionRepository(BaseRepository):
             return []
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
-                       ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
-                FROM BorrowTransactions bt
-                LEFT JOIN Books b ON bt.BookId = b.Id
-                LEFT JOIN Users u ON bt.UserId = u.Id
-                WHERE bt.UserId = ?
-                ORDER BY bt.BorrowDate DESC
-            """, (user_id,))
+            conn = self.get_connection(read_only=True)
             transactions = []
-            for row in cursor.fetchall():
-                transactions.append(BorrowTransaction(
-                    Id=row[0], BookId=row[1], UserId=row[2],
-                    BorrowDate=row[3], ReturnDate=row[4], RealReturnDate=row[5],
-                    BookTitle=row[6], UserName=row[7]
-                ))
+            for row in self.execute(conn, queries.TRANSACTIONS_BY_USER, (user_id,)).fetchall():
+                transactions.append(self._row_to_transaction(row))
             return transactions
         except Exception as e:
-            print(f"[TransactionRepository.get_by_user_id] HATA: {e}")
+            self.log_error("get_by_user_id", e)
             return []
         finally:
             if conn: conn.close()
     
-    def borrow_book_sp(self, book_id: int, user_id: int) -> Tuple[bool, str, Optional[int]]:
+    def borrow_book_sp(self, book_id: int, user_id: int, uow=None) -> Tuple[bool, str, Optional[BorrowTransaction]]:
         """
         STORED PROCEDURE ile kitap ödünç alma: sp_BorrowBook
+        Procedure başarılı olursa oluşan işlemi (JOIN'li satır) doğrudan döndürür,
+        tekrar sorgulama yapılmaz.
         
         Returns:
-            Tuple[bool, str, Optional[int]]: (başarı, mesaj, yeni_işlem_id)
+            Tuple[bool, str, Optional[BorrowTransaction]]: (başarı, mesaj, yeni_işlem)
         """
         if not self.validate_id(book_id) or not self.validate_id(user_id):
             return False, "Geçersiz parametreler", None
         
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            conn = self.get_connection(uow=uow)
             
             # Stored Procedure çağır - SET NOCOUNT ON ile
-            sql = """
-                SET NOCOUNT ON;
-                DECLARE @NewId INT, @ErrMsg NVARCHAR(500);
-                EXEC sp_BorrowBook 
-                    @BookId = ?, 
-                    @UserId = ?, 
-                    @LoanDurationMinutes = 1,
-                    @NewTransactionId = @NewId OUTPUT, 
-                    @ErrorMessage = @ErrMsg OUTPUT;
-                SELECT @NewId AS NewId, @ErrMsg AS ErrorMsg;
-            """
-            cursor.execute(sql, (book_id, user_id))
-            
-            # Tüm result set'leri atla ve son SELECT'e ulaş
-            while cursor.description is None:
-                if not cursor.nextset():
-                    break
+            cursor = self.execute(conn, queries.BORROW_BOOK, (book_id, user_id))
             
-            row = cursor.fetchone()
+            # Başarılıysa: [işlem satırı], [durum]; değilse sadece [durum]
+            result_sets = self.fetch_result_sets(cursor)
             conn.commit()
             
-            if row:
-                new_id = row[0]
-                error_msg = row[1]
-                
-                if new_id and new_id > 0:
-                    tx = self.get_by_id(new_id)
-                    if tx:
-                        return_date_str = tx.ReturnDate.strftime('%d.%m.%Y %H:%M:%S')
-                        return True, f"'{tx.BookTitle}' kitabı ödünç alındı. Son iade: {return_date_str}", new_id
-                    return True, "Kitap ödünç alındı", new_id
-                else:
-                    return False, error_msg if error_msg else "İşlem başarısız", None
+            if not result_sets or not result_sets[-1]:
+                return False, "Bilinmeyen hata", None
+            
+            new_id, error_msg = result_sets[-1][0][0], result_sets[-1][0][1]
+            if not new_id or new_id <= 0:
+                return False, error_msg if error_msg else "İşlem başarısız", None
             
-            return False, "Bilinmeyen hata", None
+            tx_rows = result_sets[0] if len(result_sets) > 1 else []
+            if not tx_rows:
+                return True, "Kitap ödünç alındı", None
+            tx = self._row_to_transaction(tx_rows[0])
+            return_date_str = tx.ReturnDate.strftime('%d.%m.%Y %H:%M:%S')
+            return True, f"'{tx.BookTitle}' kitabı ödünç alındı. Son iade: {return_date_str}", tx
             
         except Exception as e:
-            print(f"[TransactionRepository.borrow_book_sp] HATA: {e}")
+            self.log_error("borrow_book_sp", e)
             return False, str(e), None
         finally:
             if conn: conn.close()
     
-    def return_book_sp(self, tx_id: int, user_id: int) -> Tuple[bool, str]:
+    def return_book_sp(self, tx_id: int, user_id: int, uow=None) -> Tuple[bool, str, Optional[BorrowTransaction]]:
         """
         STORED PROCEDURE ile kitap iade: sp_ReturnBook
         TRIGGER (trg_CalculatePenalty) otomatik olarak ceza hesaplar!
+        Procedure güncellenen işlemi (JOIN'li satır) doğrudan döndürür.
         
         Returns:
-            Tuple[bool, str]: (başarı, mesaj)
+            Tuple[bool, str, Optional[BorrowTransaction]]: (başarı, mesaj, işlem)
         """
         if not self.validate_id(tx_id) or not self.validate_id(user_id):
-            return False, "Geçersiz parametreler"
+            return False, "Geçersiz parametreler", None
         
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            conn = self.get_connection(uow=uow)
+            cursor = self.execute(conn, queries.RETURN_BOOK, (tx_id, user_id))
             
-            sql = """
-                SET NOCOUNT ON;
-                DECLARE @Suc BIT, @Msg NVARCHAR(500);
-                EXEC sp_ReturnBook 
-                    @TransactionId = ?, 
-                    @UserId = ?,
-                    @Success = @Suc OUTPUT, 
-                    @Message = @Msg OUTPUT;
-                SELECT @Suc AS Success, @Msg AS Message;
-            """
-            cursor.execute(sql, (tx_id, user_id))
+            result_sets = self.fetch_result_sets(cursor)
+            conn.commit()
             
-            while cursor.description is None:
-                if not cursor.nextset():
-                    break
+            if not result_sets or not result_sets[-1]:
+                return False, "Bilinmeyen hata", None
             
-            row = cursor.fetchone()
-            conn.commit()
+            status = result_sets[-1][0]
+            success = bool(status[0]) if status[0] is not None else False
+            message = status[1] if status[1] else "İşlem tamamlandı"
+            tx_rows = result_sets[0] if len(result_sets) > 1 else []
+            tx = self._row_to_transaction(tx_rows[0]) if success and tx_rows else None
+            return success, message, tx
             
-            if row:
-                success = bool(row[0]) if row[0] is not None else False
-                message = row[1] if row[1] else "İşlem tamamlandı"
-                return success, message
+        except Exception as e:
+            self.log_error("return_book_sp", e)
+            return False, str(e), None
+        finally:
+            if conn: conn.close()
+    
+    def return_books_sp(self, tx_ids: List[int], user_id: Optional[int] = None,
+                        uow=None) -> Dict[int, Tuple[bool, str, float, Optional[BorrowTransaction]]]:
+        """
+        STORED PROCEDURE ile toplu iade: sp_ReturnBooks
+        Id listesi table-valued parameter olarak tek çağrıda gönderilir; uygun
+        işlemler tek UPDATE ile iade edilir, TRIGGER cezaları set-based yazar.
+        user_id None ise (yönetici) sahiplik kontrolü yapılmaz.
+        
+        Returns:
+            Dict[int, Tuple]: işlem Id -> (başarı, mesaj, ceza tutarı, işlem)
+        """
+        ids = list(dict.fromkeys(tx_ids))
+        results = {tx_id: (False, "Geçersiz işlem ID", 0.0, None)
+                   for tx_id in ids if not self.validate_id(tx_id)}
+        valid = [tx_id for tx_id in ids if tx_id not in results]
+        if user_id is not None and not self.validate_id(user_id):
+            return {tx_id: (False, "Geçersiz parametreler", 0.0, None) for tx_id in ids}
+        if not valid:
+            return results
+        if len(valid) > self.BULK_VALUES_LIMIT:
+            raise ValueError(f"En fazla {self.BULK_VALUES_LIMIT} işlem gönderilebilir")
+        
+        conn = None
+        try:
+            conn = self.get_connection(uow=uow)
+            cursor = self.execute(conn, queries.RETURN_BOOKS, ([(tx_id,) for tx_id in valid], user_id))
+            rows = self.fetch_result_sets(cursor)[-1]
+            conn.commit()
             
-            return False, "Bilinmeyen hata"
+            for row in rows:
+                success = bool(row[1])
+                tx = self._row_to_transaction(row[4:]) if row[4] is not None else None
+                results[row[0]] = (success, row[2] or "İşlem tamamlandı", float(row[3] or 0), tx)
+            for tx_id in valid:
+                results.setdefault(tx_id, (False, "Bilinmeyen hata", 0.0, None))
+            return results
             
         except Exception as e:
-            print(f"[TransactionRepository.return_book_sp] HATA: {e}")
-            return False, str(e)
+            self.log_error("return_books_sp", e)
+            results.update((tx_id, (False, str(e), 0.0, None)) for tx_id in valid)
+            return results
         finally:
             if conn: conn.close()
     
@@ -213,13 +254,12 @@ class TransactionRepository(BaseRepository):
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM Penalties WHERE BorrowTransactionsId = ?", (tx_id,))
-            cursor.execute("DELETE FROM BorrowTransactions WHERE Id = ?", (tx_id,))
+            self.execute(conn, queries.TRANSACTION_DELETE_PENALTIES, (tx_id,))
+            cursor = self.execute(conn, queries.TRANSACTION_DELETE, (tx_id,))
             conn.commit()
             return cursor.rowcount > 0
         except Exception as e:
-            print(f"[TransactionRepository.delete] HATA: {e}")
+            self.log_error("delete", e)
             return False
         finally:
             if conn: conn.close()
@@ -230,12 +270,10 @@ class TransactionRepository(BaseRepository):
             return 0
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM BorrowTransactions WHERE UserId = ? AND RealReturnDate IS NULL", (user_id,))
-            return cursor.fetchone()[0] or 0
+            conn = self.get_connection(read_only=True)
+            return self.execute(conn, queries.TRANSACTIONS_ACTIVE_COUNT, (user_id,)).fetchone()[0] or 0
         except Exception as e:
-            print(f"[TransactionRepository.count_active_by_user] HATA: {e}")
+            self.log_error("count_active_by_user", e)
             return 0
         finally:
             if conn: conn.close()
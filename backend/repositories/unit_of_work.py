@@ -0,0 +1,89 @@
+"""
+UNIT_OF_WORK.PY - İstek Kapsamlı İş Birimi
+
+Bir servis işlemi boyunca tek bağlantı ve tek transaction kullanılmasını sağlar.
+Repository metodlarına `uow` parametresi ile verilir:
+
+    with UnitOfWork() as uow:
+        ok, msg, tx = tx_repo.borrow_book_sp(book_id, user_id, uow=uow)
+
+Blok hatasız biterse commit, exception ile biterse (veya bir repository
+hata sonrası rollback istediyse) rollback yapılır.
+"""
+from config import DatabaseConfig
+
+
+class _SharedConnection:
+    """
+    Repository'lere verilen bağlantı vekili.
+    commit() ve close() iş birimine aittir; repository içinden çağrıldığında etkisizdir.
+    rollback() transaction'ı bitirmez (önceki repository'lerin yazmaları kaybolurdu),
+    iş birimini geri alınacak olarak işaretler; geri alma blok sonunda yapılır.
+    Kısmi geri alma savepoint iledir (BookRepository.bulk_add).
+    """
+    __slots__ = ('_conn', 'rollback_only')
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.rollback_only = False
+
+    def cursor(self, key=None):
+        return self._conn.cursor(key)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollback_only = True
+
+    def close(self):
+        pass
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+class UnitOfWork:
+    """Tek bağlantı + tek transaction"""
+
+    def __init__(self, read_only: bool = False):
+        self.read_only = read_only
+        self._conn = None
+        self._shared = None
+
+    def __enter__(self) -> 'UnitOfWork':
+        self._conn = DatabaseConfig.get_connection(read_only=self.read_only)
+        self._shared = _SharedConnection(self._conn)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if not self.read_only:
+                if exc_type is None and not self._shared.rollback_only:
+                    self._conn.commit()
+                else:
+                    self._conn.rollback()
+        finally:
+            self._conn.close()
+            self._conn = None
+            self._shared = None
+        return False
+
+    @property
+    def connection(self):
+        """Repository'lerin kullanacağı paylaşılan bağlantı"""
+        if self._shared is None:
+            raise RuntimeError("UnitOfWork 'with' bloğu dışında kullanılamaz")
+        return self._shared
+
+    def commit(self):
+        """Blok bitmeden ara commit"""
+        if self._shared is not None and self._shared.rollback_only:
+            raise RuntimeError("İş birimi geri alınacak olarak işaretlendi")
+        if not self.read_only:
+            self._conn.commit()
+
+    def rollback(self):
+        if not self.read_only:
+            self._conn.rollback()
+            self._shared.rollback_only = False
@@ -2,8 +2,9 @@
 USER_REPOSITORY.PY - Kullanıcı Veritabanı İşlemleri
 SQL Injection korumalı parametreli sorgular kullanır.
 """
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from repositories.base_repository import BaseRepository
+from repositories import queries
 from entities.user import User
 
 class UserRepository(BaseRepository):
@@ -12,15 +13,49 @@ class UserRepository(BaseRepository):
         """Tüm kullanıcıları getirir"""
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT Id, FullName, Email, PasswordHash, Role FROM Users")
+            conn = self.get_connection(read_only=True)
             users = []
-            for row in cursor.fetchall():
+            for row in self.execute(conn, queries.USERS_ALL).fetchall():
                 users.append(User(Id=row[0], FullName=row[1], Email=row[2], PasswordHash=row[3], Role=row[4]))
             return users
         except Exception as e:
-            print(f"[UserRepository.get_all] HATA: {e}")
+            self.log_error("get_all", e)
+            return []
+        finally:
+            if conn: conn.close()
+    
+    def iter_all(self, chunk_size: Optional[int] = None, raw: bool = False) -> Iterator[list]:
+        """
+        Tüm kullanıcıları parça parça döndürür (akış yanıtları için).
+        Bağlantı generator tüketildiği sürece açık kalır, bitince havuza döner.
+        raw=True ise entity yerine sürücü satırları döner (controllers/row_json.py).
+        """
+        conn = self.get_connection(read_only=True)
+        try:
+            cursor = self.execute(conn, queries.USERS_ALL)
+            yield from self.iter_chunks(cursor, None if raw else lambda row: User(Id=row[0], FullName=row[1], Email=row[2], PasswordHash=row[3], Role=row[4]), chunk_size or self.STREAM_CHUNK_SIZE)
+        except Exception as e:
+            self.log_error("iter_all", e)
+            raise
+        finally:
+            conn.close()
+    
+    def get_page(self, limit: int, after: Optional[tuple] = None) -> List[User]:
+        """
+        Keyset sayfalama: Id sırasına göre `after` anahtarından sonraki kullanıcılar.
+        
+        Args:
+            limit: Getirilecek en fazla kayıt
+            after: Önceki sayfanın son anahtarı (Id,); None ise ilk sayfa
+        """
+        conn = None
+        try:
+            conn = self.get_connection(read_only=True)
+            cursor = self.execute(conn, queries.USERS_PAGE, (limit, after[0] if after else 0))
+            return [User(Id=row[0], FullName=row[1], Email=row[2], PasswordHash=row[3], Role=row[4])
+                    for row in cursor.fetchall()]
+        except Exception as e:
+            self.log_error("get_page", e)
             return []
         finally:
             if conn: conn.close()
@@ -31,16 +66,14 @@ class UserRepository(BaseRepository):
             return None
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            conn = self.get_connection(read_only=True)
             # Parametreli sorgu - SQL Injection koruması
-            cursor.execute("SELECT Id, FullName, Email, PasswordHash, Role FROM Users WHERE Id = ?", (user_id,))
-            row = cursor.fetchone()
+            row = self.execute(conn, queries.USER_BY_ID, (user_id,)).fetchone()
             if row:
                 return User(Id=row[0], FullName=row[1], Email=row[2], PasswordHash=row[3], Role=row[4])
             return None
         except Exception as e:
-            print(f"[UserRepository.get_by_id] HATA: {e}")
+            self.log_error("get_by_id", e)
             return None
         finally:
             if conn: conn.close()
@@ -51,15 +84,13 @@ class UserRepository(BaseRepository):
             return None
         conn = None
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT Id, FullName, Email, PasswordHash, Role FROM Users WHERE Email = ?", (email,))
-            row = cursor.fetchone()
+            conn = self.get_connection(read_only=True)
+            row = self.execute(conn, queries.USER_BY_EMAIL, (email,)).fetchone()
             if row:
                 return User(Id=row[0], FullName=row[1], Email=row[2], PasswordHash=row[3], Role=row[4])
             return None
         except Exception as e:
-            print(f"[UserRepository.get_by_email] HATA: {e}")
+            self.log_error("get_by_email", e)
             return None
         finally:
             if conn: conn.close()
@@ -73,17 +104,11 @@ class UserRepository(BaseRepository):
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute(
-                "INSERT INTO Users (FullName, Email, PasswordHash, Role) VALUES (?, ?, ?, ?); SELECT SCOPE_IDENTITY();",
-                (fullname, email, password_hash, role)
-            )
-            cursor.nextset()
-            new_id = cursor.fetchone()[0]
+            new_id = self.insert_identity(conn, queries.USER_INSERT, (fullname, email, password_hash, role))
             conn.commit()
             return User(Id=int(new_id), FullName=fullname, Email=email, PasswordHash=password_hash, Role=role)
         except Exception as e:
-            print(f"[UserRepository.add] HATA: {e}")
+            self.log_error("add", e)
             return None
         finally:
             if conn: conn.close()
@@ -95,12 +120,11 @@ class UserRepository(BaseRepository):
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("UPDATE Users SET FullName = ?, Email = ?, Role = ? WHERE Id = ?", (fullname, email, role, user_id))
+            cursor = self.execute(conn, queries.USER_UPDATE, (fullname, email, role, user_id))
             conn.commit()
             return cursor.rowcount > 0
         except Exception as e:
-            print(f"[UserRepository.update] HATA: {e}")
+            self.log_error("update", e)
             return False
         finally:
             if conn: conn.close()
@@ -112,12 +136,11 @@ class UserRepository(BaseRepository):
         conn = None
         try:
             conn = self.get_connection()
-            cursor = conn.cursor()
-            cursor.execute("DELETE FROM Users WHERE Id = ?", (user_id,))
+            cursor = self.execute(conn, queries.USER_DELETE, (user_id,))
             conn.commit()
             return cursor.rowcount > 0
         except Exception as e:
-            print(f"[UserRepository.delete] HATA: {e}")
+            self.log_error("delete", e)
             return False
         finally:
             if conn: conn.close()
@@ -10,6 +10,8 @@ from services.book_service import BookService, book_service
 from services.borrow_service import BorrowService, borrow_service
 from services.penalty_service import PenaltyService, penalty_service
 from services.stats_service import StatsService, stats_service
+from services.search_service import SearchService, search_service
+from services.overdue_scheduler import OverdueScheduler, overdue_scheduler
 
 __all__ = [
     'AuthService', 'auth_service',
@@ -19,5 +21,7 @@ __all__ = [
     'BookService', 'book_service',
     'BorrowService', 'borrow_service',
     'PenaltyService', 'penalty_service',
-    'StatsService', 'stats_service'
+    'StatsService', 'stats_service',
+    'SearchService', 'search_service',
+    'OverdueScheduler', 'overdue_scheduler'
 ]
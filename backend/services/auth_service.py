@@ -5,27 +5,52 @@ import hashlib
 import secrets
 from typing import Optional, Tuple
 from repositories.user_repository import UserRepository
+from repositories.factory import repository_for
 from entities.user import User
+from config import EventsConfig
+from services.session_store import create_session_store
 
 class AuthService:
     def __init__(self):
-        self.user_repo = UserRepository()
-        self.active_sessions = {}
+        self.user_repo = repository_for(UserRepository)
+        # Token -> kullanıcı ID; süreli, SessionConfig ile worker'lar arası paylaşılabilir
+        self.sessions = create_session_store()
+        # Akış bileti -> kullanıcı ID; EventSource başlık gönderemez, token URL'ye yazılmasın diye
+        self.stream_tickets = create_session_store(ttl_seconds=EventsConfig.TICKET_TTL_SECONDS, sliding=False,
+                                                   sqlite_path=EventsConfig.TICKET_SQLITE_PATH)
     
     def hash_password(self, password: str) -> str:
         return hashlib.sha256(password.encode()).hexdigest()
     
     def create_token(self, user_id: int) -> str:
         token = secrets.token_hex(32)
-        self.active_sessions[token] = user_id
+        self.sessions.create(token, user_id)
         return token
     
+    def get_user_id_from_token(self, token: str) -> Optional[int]:
+        """Sadece oturum deposuna bakar, veritabanına gitmez"""
+        return self.sessions.get(token) if token else None
+    
     def get_user_from_token(self, token: str) -> Optional[User]:
-        user_id = self.active_sessions.get(token)
+        user_id = self.get_user_id_from_token(token)
         if user_id:
             return self.user_repo.get_by_id(user_id)
         return None
     
+    def create_stream_ticket(self, user_id: int) -> str:
+        """GET /api/events için tek kullanımlık, kısa ömürlü bilet"""
+        ticket = secrets.token_urlsafe(24)
+        self.stream_tickets.create(ticket, user_id)
+        return ticket
+    
+    def get_user_from_stream_ticket(self, ticket: str) -> Optional[User]:
+        """Bileti harcar; süresi dolmuş veya kullanılmış bilette None"""
+        user_id = self.stream_tickets.get(ticket) if ticket else None
+        # delete() sadece bir istekte True döner: aynı bilet iki akış açamaz
+        if user_id and self.stream_tickets.delete(ticket):
+            return self.user_repo.get_by_id(user_id)
+        return None
+    
     def login(self, email: str, password: str) -> Tuple[bool, str, Optional[User]]:
         if not email or not password:
             return False, "Email ve şifre gerekli", None
@@ -49,9 +74,6 @@ class AuthService:
         return False, "Kayıt başarısız", None
     
     def logout(self, token: str) -> bool:
-        if token in self.active_sessions:
-            del self.active_sessions[token]
-            return True
-        return False
+        return bool(token) and self.sessions.delete(token)
 
 auth_service = AuthService()
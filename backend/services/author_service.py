@@ -1,25 +1,42 @@
 """AUTHOR_SERVICE.PY - Yazar Servisi"""
 from typing import List, Optional
 from repositories.author_repository import AuthorRepository
+from repositories.factory import repository_for
 from entities.author import Author
+from services.cache import catalog_cache
+from services.search_index import search_index
 
 class AuthorService:
     def __init__(self):
-        self.repo = AuthorRepository()
+        self.repo = repository_for(AuthorRepository)
     
     def get_all(self) -> List[Author]:
-        return self.repo.get_all()
+        return catalog_cache.get_or_load('authors', 'all', self.repo.get_all)
     
     def get_by_id(self, author_id: int) -> Optional[Author]:
-        return self.repo.get_by_id(author_id)
+        return catalog_cache.get_or_load('authors', ('id', author_id), lambda: self.repo.get_by_id(author_id))
     
     def create(self, name: str, lastname: str, country: str) -> Optional[Author]:
-        return self.repo.add(name, lastname, country)
+        author = self.repo.add(name, lastname, country)
+        if author:
+            search_index.set_author(author.Id, f"{author.Name} {author.LastName}")
+            catalog_cache.invalidate('authors')
+        return author
     
     def update(self, author_id: int, name: str, lastname: str, country: str) -> bool:
-        return self.repo.update(author_id, name, lastname, country)
+        updated = self.repo.update(author_id, name, lastname, country)
+        if updated:
+            search_index.set_author(author_id, f"{name} {lastname}")
+            # Kitap listesi yazar adını içerdiği için kitaplar da geçersiz olur
+            catalog_cache.invalidate('authors', 'books')
+        return updated
     
     def delete(self, author_id: int) -> bool:
-        return self.repo.delete(author_id)
+        deleted = self.repo.delete(author_id)
+        if deleted:
+            search_index.remove_author(author_id)
+            # ON DELETE CASCADE ile bağlı kitaplar da silinir
+            catalog_cache.invalidate('authors', 'books')
+        return deleted
 
 author_service = AuthorService()
@@ -1,25 +1,47 @@
 """BOOK_SERVICE.PY - Kitap Servisi"""
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from repositories.book_repository import BookRepository
+from repositories.factory import repository_for
 from entities.book import Book
+from services.cache import catalog_cache
+from services.search_index import search_index
+from services.search_service import search_service
 
 class BookService:
     def __init__(self):
-        self.repo = BookRepository()
+        self.repo = repository_for(BookRepository)
     
     def get_all(self) -> List[Book]:
-        return self.repo.get_all()
+        return catalog_cache.get_or_load('books', 'all', self.repo.get_all)
+    
+    def iter_all(self, raw: bool = False) -> Iterator[list]:
+        return self.repo.iter_all(raw=raw)
+    
+    def get_page(self, limit: int, after: Optional[tuple] = None) -> List[Book]:
+        return catalog_cache.get_or_load('books', ('page', limit, after), lambda: self.repo.get_page(limit, after))
     
     def get_by_id(self, book_id: int) -> Optional[Book]:
-        return self.repo.get_by_id(book_id)
+        return catalog_cache.get_or_load('books', ('id', book_id), lambda: self.repo.get_by_id(book_id))
     
     def create(self, title: str, author_id: int, category_id: int, stock: int, year: int) -> Optional[Book]:
-        return self.repo.add(title, author_id, category_id, stock, year)
+        book = self.repo.add(title, author_id, category_id, stock, year)
+        if book:
+            catalog_cache.invalidate('books')
+            search_index.upsert_book(book)
+        return book
     
     def update(self, book_id: int, title: str, author_id: int, category_id: int, stock: int, year: int) -> bool:
-        return self.repo.update(book_id, title, author_id, category_id, stock, year)
+        updated = self.repo.update(book_id, title, author_id, category_id, stock, year)
+        if updated:
+            catalog_cache.invalidate('books')
+            search_service.index_book(book_id)
+        return updated
     
     def delete(self, book_id: int) -> bool:
-        return self.repo.delete(book_id)
+        deleted = self.repo.delete(book_id)
+        if deleted:
+            catalog_cache.invalidate('books')
+            search_index.remove_book(book_id)
+        return deleted
 
 book_service = BookService()
@@ -4,23 +4,41 @@ BORROW_SERVICE.PY - Ödünç Alma Servisi
 *** STORED PROCEDURE ve TRIGGER KULLANIR ***
 - sp_BorrowBook: Kitap ödünç alma
 - sp_ReturnBook: Kitap iade etme
+- sp_ReturnBooks: Toplu iade (iade masası sepeti, tek round trip)
 - trg_CalculatePenalty: Gecikme cezası otomatik hesaplama
 
 CEZA SİSTEMİ:
 - İade süresi: 1 dakika
 - Gecikme cezası: 5 TL/dakika (SQL Trigger'da hesaplanır)
+
+Başarılı yazmalardan sonra canlı akışa (services/event_hub.py) ödünç olayları
+ve etkilenen kitapların müsait sayısı yayınlanır; abone yoksa atlanır.
 """
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 from repositories.transaction_repository import TransactionRepository
+from repositories.book_repository import BookRepository
+from repositories.unit_of_work import UnitOfWork
+from repositories.factory import repository_for
 from entities.borrow_transaction import BorrowTransaction
+from services.cache import catalog_cache
+from services.overdue_scheduler import overdue_scheduler
+from services.event_hub import event_hub
+from services.penalty_service import penalty_service
 
 class BorrowService:
     def __init__(self):
-        self.tx_repo = TransactionRepository()
+        self.tx_repo = repository_for(TransactionRepository)
+        self.book_repo = repository_for(BookRepository)
     
     def get_all_transactions(self) -> List[BorrowTransaction]:
         return self.tx_repo.get_all()
     
+    def iter_all_transactions(self, raw: bool = False) -> Iterator[list]:
+        return self.tx_repo.iter_all(raw=raw)
+    
+    def get_transactions_page(self, limit: int, after: Optional[tuple] = None) -> List[BorrowTransaction]:
+        return self.tx_repo.get_page(limit, after)
+    
     def get_user_transactions(self, user_id: int) -> List[BorrowTransaction]:
         return self.tx_repo.get_by_user_id(user_id)
     
@@ -28,22 +46,87 @@ class BorrowService:
         return self.tx_repo.get_by_id(tx_id)
     
     def borrow_book(self, user_id: int, book_id: int) -> Tuple[bool, str, Optional[BorrowTransaction]]:
-        """Kitap ödünç alma - sp_BorrowBook STORED PROCEDURE kullanır"""
-        success, message, new_id = self.tx_repo.borrow_book_sp(book_id, user_id)
-        if success and new_id:
-            tx = self.tx_repo.get_by_id(new_id)
+        """Kitap ödünç alma - sp_BorrowBook STORED PROCEDURE kullanır (tek bağlantı, tek round trip)"""
+        with UnitOfWork() as uow:
+            success, message, tx = self.tx_repo.borrow_book_sp(book_id, user_id, uow=uow)
+        if success:
+            catalog_cache.invalidate('books')
+            overdue_scheduler.add(tx)
+            self._publish('loan.created', [tx])
             return True, message, tx
         return False, message, None
     
     def return_book(self, tx_id: int, user_id: int) -> Tuple[bool, str, Optional[BorrowTransaction]]:
-        """Kitap iade - sp_ReturnBook + trg_CalculatePenalty kullanır"""
-        success, message = self.tx_repo.return_book_sp(tx_id, user_id)
+        """Kitap iade - sp_ReturnBook + trg_CalculatePenalty kullanır (tek bağlantı, tek round trip)"""
+        with UnitOfWork() as uow:
+            success, message, tx = self.tx_repo.return_book_sp(tx_id, user_id, uow=uow)
         if success:
-            tx = self.tx_repo.get_by_id(tx_id)
+            catalog_cache.invalidate('books')
+            overdue_scheduler.remove(tx_id)
+            self._publish('loan.returned', [tx])
+            penalty_service.publish_created([tx])
             return True, message, tx
         return False, message, None
     
+    def return_books(self, tx_ids: List[int], user_id: Optional[int] = None) -> List[dict]:
+        """
+        Toplu iade - sp_ReturnBooks + set-based trg_CalculatePenalty (tek bağlantı, tek round trip).
+        Sonuçlar istek sırasıyla, işlem başına bir kez döner (tekrar eden Id'ler birleştirilir).
+        """
+        with UnitOfWork() as uow:
+            results = self.tx_repo.return_books_sp(tx_ids, user_id, uow=uow)
+        if any(success for success, _, _, _ in results.values()):
+            catalog_cache.invalidate('books')
+        for tx_id, (success, _, _, _) in results.items():
+            if success:
+                overdue_scheduler.remove(tx_id)
+        returned = [tx for success, _, _, tx in results.values() if success]
+        self._publish('loan.returned', returned)
+        penalty_service.publish_created(returned)
+        items = []
+        for tx_id in dict.fromkeys(tx_ids):
+            success, message, penalty, tx = results[tx_id]
+            items.append({
+                "transactionId": tx_id,
+                "success": success,
+                "message": message,
+                "penaltyAmount": penalty,
+                "transaction": tx.to_dict() if tx else None
+            })
+        return items
+    
     def delete_transaction(self, tx_id: int) -> bool:
-        return self.tx_repo.delete(tx_id)
+        # Olay için sahibi ve kitabı silmeden önce okunur (sadece abone varsa)
+        tx = self.tx_repo.get_by_id(tx_id) if event_hub.active() else None
+        deleted = self.tx_repo.delete(tx_id)
+        if deleted:
+            catalog_cache.invalidate('books')
+            overdue_scheduler.remove(tx_id)
+            if tx:
+                event_hub.publish('loan.deleted', {"id": tx.Id, "userId": tx.UserId, "bookId": tx.BookId},
+                                  user_id=tx.UserId)
+                self._publish_availability([tx])
+        return deleted
+    
+    def _publish(self, event_type: str, transactions: List[Optional[BorrowTransaction]]):
+        """Ödünç olayları ve kitapların yeni müsait sayısı"""
+        transactions = [tx for tx in transactions if tx is not None]
+        if not transactions or not event_hub.active():
+            return
+        for tx in transactions:
+            event_hub.publish(event_type, tx.to_dict(), user_id=tx.UserId)
+        self._publish_availability(transactions)
+    
+    def _publish_availability(self, transactions: List[BorrowTransaction]):
+        """
+        Müsait sayı commit sonrası tek sorguyla veritabanından okunur (önbellekten değil).
+        Olay fark değil mutlak değer taşır: kaçırılan olay sonraki olayla düzelir.
+        """
+        for book in self.book_repo.get_by_ids(sorted({tx.BookId for tx in transactions})):
+            event_hub.publish('book.availability', {
+                "id": book.Id,
+                "available": book.Available if book.Available is not None else book.StockNumber,
+                "stockNumber": book.StockNumber
+            })
 
 borrow_service = BorrowService()
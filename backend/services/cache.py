@@ -0,0 +1,111 @@
+"""
+CACHE.PY - Katalog Önbelleği (Read-Through)
+
+Kitap, yazar ve kategori okumaları servis katmanında önbelleğe alınır.
+
+- Her namespace ("books", "authors", "categories") bir sürüm sayacı tutar.
+  Önbellek anahtarı sürümü içerir; yazma işlemi sürümü artırır ve eski
+  kayıtlar bir daha okunmaz (LRU ile zamanla düşer).
+- Kayıtlar TTL sonunda yeniden yüklenir; toplam kayıt sayısı sınırlıdır.
+- Yanıt ETag'leri de (gövde özeti, controllers/conditional.py) burada
+  namespace altında saklanır: yazma ve TTL onları da yeniler.
+
+Not: Sürümler süreç içidir. Birden fazla worker'da başka bir süreçteki
+yazma, bu süreçte (ETag'ler dahil) en geç TTL kadar sonra görünür.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+from config import CacheConfig
+
+_MISSING = object()
+
+
+class CatalogCache:
+    """
+    TTL + LRU sınırlı, sürüm tabanlı geçersiz kılınan önbellek.
+
+    Args:
+        max_entries: En fazla kayıt sayısı (aşılınca en eski kullanılan atılır)
+        ttl_seconds: Kaydın geçerlilik süresi
+    """
+
+    def __init__(self, max_entries: int = 512, ttl_seconds: float = 300):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def version(self, namespace: str) -> int:
+        return self._versions.get(namespace, 0)
+
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable):
+        """
+        Önbellekte varsa döndürür, yoksa loader() ile yükleyip saklar.
+        Boş sonuçlar (None, []) saklanmaz: repository hata durumunda da
+        boş döndüğü için geçici bir hata TTL boyunca önbellekte kalmasın.
+        """
+        with self._lock:
+            full_key = (namespace, self._versions.get(namespace, 0), key)
+            entry = self._entries.get(full_key, _MISSING)
+            if entry is not _MISSING and entry[0] > time.monotonic():
+                self._entries.move_to_end(full_key)
+                self._hits += 1
+                return entry[1]
+            self._misses += 1
+
+        value = loader()
+        if not value:
+            return value
+
+        with self._lock:
+            # Yükleme sırasında yazma olduysa (sürüm değiştiyse) eski veriyi saklama
+            if full_key[1] != self._versions.get(namespace, 0):
+                return value
+            self._entries[full_key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, *namespaces: str):
+        """Namespace(ler)in sürümünü artırır; eski kayıtlar ve saklı ETag'ler geçersiz olur"""
+        with self._lock:
+            for namespace in namespaces:
+                self._versions[namespace] = self._versions.get(namespace, 0) + 1
+            stale = [k for k in self._entries if k[0] in namespaces]
+            for k in stale:
+                del self._entries[k]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            for namespace in self._versions:
+                self._versions[namespace] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "maxEntries": self.max_entries,
+                "ttlSeconds": self.ttl_seconds,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hitRatio": round(self._hits / total, 3) if total else 0.0,
+                "versions": dict(self._versions)
+            }
+
+
+catalog_cache = CatalogCache(
+    max_entries=CacheConfig.CATALOG_MAX_ENTRIES,
+    ttl_seconds=CacheConfig.CATALOG_TTL_SECONDS
+)
+
+# Yönetici özeti: kısa ömürlü, yazmalarda geçersiz kılınmaz (TTL yeterli)
+summary_cache = CatalogCache(max_entries=8, ttl_seconds=CacheConfig.SUMMARY_TTL_SECONDS)
@@ -1,25 +1,42 @@
 """CATEGORY_SERVICE.PY - Kategori Servisi"""
 from typing import List, Optional
 from repositories.category_repository import CategoryRepository
+from repositories.factory import repository_for
 from entities.category import Category
+from services.cache import catalog_cache
+from services.search_index import search_index
 
 class CategoryService:
     def __init__(self):
-        self.repo = CategoryRepository()
+        self.repo = repository_for(CategoryRepository)
     
     def get_all(self) -> List[Category]:
-        return self.repo.get_all()
+        return catalog_cache.get_or_load('categories', 'all', self.repo.get_all)
     
     def get_by_id(self, category_id: int) -> Optional[Category]:
-        return self.repo.get_by_id(category_id)
+        return catalog_cache.get_or_load('categories', ('id', category_id), lambda: self.repo.get_by_id(category_id))
     
     def create(self, name: str) -> Optional[Category]:
-        return self.repo.add(name)
+        category = self.repo.add(name)
+        if category:
+            search_index.set_category(category.Id, category.Name)
+            catalog_cache.invalidate('categories')
+        return category
     
     def update(self, category_id: int, name: str) -> bool:
-        return self.repo.update(category_id, name)
+        updated = self.repo.update(category_id, name)
+        if updated:
+            search_index.set_category(category_id, name)
+            # Kitap listesi kategori adını içerdiği için kitaplar da geçersiz olur
+            catalog_cache.invalidate('categories', 'books')
+        return updated
     
     def delete(self, category_id: int) -> bool:
-        return self.repo.delete(category_id)
+        deleted = self.repo.delete(category_id)
+        if deleted:
+            search_index.remove_category(category_id)
+            # ON DELETE CASCADE ile bağlı kitaplar da silinir
+            catalog_cache.invalidate('categories', 'books')
+        return deleted
 
 category_service = CategoryService()
@@ -0,0 +1,230 @@
+"""
+EVENT_HUB.PY - Canlı Değişiklik Olayları (Server-Sent Events)
+
+BorrowService ve PenaltyService yazma işleminden sonra küçük delta olayları
+yayınlar; GET /api/events bunları text/event-stream olarak iletir:
+
+    book.availability   {"id", "available", "stockNumber"}       herkese
+    loan.created        işlem (BorrowTransaction.to_dict)         sahibine ve yöneticiye
+    loan.returned       işlem
+    loan.deleted        {"id", "userId", "bookId"}
+    penalty.created     ceza (Penalty.to_dict)
+    penalty.paid        {"id", "userId", "amount"}
+    penalty.cancelled   {"id", "userId", "amount"}
+    reset               {} - istemci listeleri yeniden yüklemeli
+
+Dağıtım: olay yayınlanırken bir kez SSE çerçevesine yazılır ve halka tampona
+(sıra numarasıyla) eklenir. Abone başına kuyruk veya thread yoktur; abone
+sadece son okuduğu sıra numarasını tutar ve ortak uyandırma Event'ini bekler.
+Bekleyenleri uyandırmak abone sayısıyla orantılıdır; bunu istek thread'i
+değil süreç başına tek dağıtıcı thread yapar (yayın O(1)); art arda gelen
+olaylar tek uyandırmada birlikte okunur. Yavaş abone belleği şişirmez:
+tamponun gerisinde kalırsa (HISTORY olaydan fazlasını kaçırdıysa) reset alır.
+
+Olay Id'si "<epoch>-<sıra>"dır; EventSource yeniden bağlanırken Last-Event-ID
+ile kaldığı yerden devam eder. epoch süreç başına rastgeledir: süreç yeniden
+başladıysa eski Id tanınmaz ve istemci reset alır.
+
+Bekleme threading.Event iledir. Thread'li sunucularda (Flask geliştirme
+sunucusu, gunicorn gthread) her açık akış bir istek thread'i tutar; bu
+yüzden EventsConfig.MAX_SUBSCRIBERS varsayılanı worker thread sayısının
+altındadır ve dolunca yeni akış 503 alır (istemci listeleri eskisi gibi
+yeniler). Binlerce abone için greenlet'li bir worker gerekir (gevent
+kurulu olmalı, gunicorn -k gevent ile monkey patch); o durumda sınır
+yükseltilebilir, hub kodu değişmez.
+
+Not: Olaylar süreç içidir. Birden fazla worker sürecinde abone sadece bağlı
+olduğu sürecin yazmalarını görür (overdue_scheduler ile aynı sınır).
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from config import EventsConfig
+
+RESET = 'reset'
+
+
+class Subscription:
+    """
+    Tek abone (WSGI yanıt gövdesi): son okunan sıra numarası ve hedef kitle.
+    close() sunucu tarafından bağlantı kapanınca çağrılır ve yeri bırakır.
+    """
+    __slots__ = ('hub', 'user_id', 'admin', 'position', 'started', 'closed')
+
+    def __init__(self, hub: 'EventHub', user_id: Optional[int], admin: bool, position: Optional[int]):
+        self.hub = hub
+        self.user_id = user_id
+        self.admin = admin
+        self.position = position        # None: kaldığı yerden devam edilemez (reset gönderilir)
+        self.started = False
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if self.closed:
+            raise StopIteration
+        if not self.started:
+            # İlk parça hemen gider: başlıklar yazılır, EventSource 'open' olur
+            self.started = True
+            return f"retry: {self.hub.retry_ms}\n: bağlandı\n\n"
+        return self.hub.next_frames(self)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.hub.release()
+
+
+class EventHub:
+    """
+    Args:
+        history: Halka tamponda tutulan son olay sayısı
+        heartbeat_seconds: Olay yokken yorum satırı gönderme aralığı
+        retry_ms: İstemciye bildirilen yeniden bağlanma aralığı
+        max_subscribers: Aynı anda açık akış sınırı
+    """
+
+    def __init__(self, history: int = EventsConfig.HISTORY,
+                 heartbeat_seconds: float = EventsConfig.HEARTBEAT_SECONDS,
+                 retry_ms: int = EventsConfig.RETRY_MS,
+                 max_subscribers: int = EventsConfig.MAX_SUBSCRIBERS):
+        self.heartbeat_seconds = heartbeat_seconds
+        self.retry_ms = retry_ms
+        self.max_subscribers = max_subscribers
+        self.epoch = os.urandom(4).hex()
+        self._lock = threading.Lock()
+        self._events = deque(maxlen=history)    # (sıra, UserId veya None, çerçeve)
+        self._seq = 0
+        self._subscribers = 0
+        self._wakeup = threading.Event()        # aboneler bekler; her dağıtımda yenisiyle değişir
+        self._pending = threading.Event()       # dağıtıcıya: yeni olay var
+        self._thread = None
+        self.published = 0
+        self.resets = 0
+        self.rejected = 0
+
+    # ---- Yayın ----
+
+    def active(self) -> bool:
+        """Abone var mı? Yoksa servisler olay için veritabanına gitmez"""
+        return self._subscribers > 0
+
+    def publish(self, event_type: str, data: dict, user_id: Optional[int] = None):
+        """
+        Olayı bir kez serileştirip tampona ekler.
+
+        Args:
+            user_id: Olayın sahibi; verilirse sadece o üye ve yöneticiler alır
+        """
+        payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._seq += 1
+            self._events.append((self._seq, user_id,
+                                 f"id: {self.epoch}-{self._seq}\nevent: {event_type}\ndata: {payload}\n\n"))
+            self.published += 1
+        self._ensure_started()
+        self._pending.set()
+
+    def _ensure_started(self):
+        """Dağıtıcı thread'i (süreç başına bir kez) ilk yayında başlatır"""
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._dispatch, name='event-hub', daemon=True)
+                self._thread.start()
+
+    def _dispatch(self):
+        while True:
+            self._pending.wait()
+            self._pending.clear()
+            # Yeni Event kilit altında konur: bundan sonra bekleyen abone sıradaki yayını bekler
+            with self._lock:
+                wakeup, self._wakeup = self._wakeup, threading.Event()
+            wakeup.set()
+
+    # ---- Abonelik ----
+
+    def subscribe(self, user_id: Optional[int] = None, admin: bool = False,
+                  last_event_id: Optional[str] = None) -> Optional[Subscription]:
+        """
+        Yeni akış. last_event_id verilirse ondan sonraki olaylar da gönderilir.
+
+        Returns:
+            Subscription veya sınır doluysa None
+        """
+        with self._lock:
+            if self._subscribers >= self.max_subscribers:
+                self.rejected += 1
+                return None
+            self._subscribers += 1
+            return Subscription(self, user_id, admin, self._position(last_event_id))
+
+    def release(self):
+        with self._lock:
+            self._subscribers -= 1
+
+    def _position(self, last_event_id: Optional[str]) -> Optional[int]:
+        """Last-Event-ID -> kaldığı sıra numarası; devam edilemiyorsa None (kilit altında)"""
+        if not last_event_id:
+            return self._seq
+        epoch, _, seq = last_event_id.partition('-')
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        oldest = self._events[0][0] if self._events else self._seq + 1
+        return seq if oldest - 1 <= seq <= self._seq else None
+
+    def next_frames(self, subscription: Subscription) -> str:
+        """
+        Abonenin yeni olayları (hedef kitleye göre süzülmüş, tek parça) veya
+        heartbeat_seconds boyunca olay yoksa yorum satırı. Bekler.
+        """
+        deadline = time.monotonic() + self.heartbeat_seconds
+        while True:
+            with self._lock:
+                position = subscription.position
+                wakeup = self._wakeup if position is not None and position == self._seq else None
+            if wakeup is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return ": ping\n\n"
+                wakeup.wait(remaining)
+                continue
+            with self._lock:
+                if position is None or position < self._events[0][0] - 1:
+                    subscription.position = self._seq
+                    self.resets += 1
+                    return f"id: {self.epoch}-{self._seq}\nevent: {RESET}\ndata: {{}}\n\n"
+                # Yeni olaylar tamponun sonundadır: sondan geriye, okunan sıraya kadar
+                fresh = []
+                for seq, user_id, frame in reversed(self._events):
+                    if seq <= position:
+                        break
+                    fresh.append((user_id, frame))
+                subscription.position = self._seq
+            frames = [frame for user_id, frame in reversed(fresh)
+                      if user_id is None or subscription.admin or user_id == subscription.user_id]
+            if frames:
+                return ''.join(frames)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": self._subscribers,
+                "maxSubscribers": self.max_subscribers,
+                "published": self.published,
+                "buffered": len(self._events),
+                "lastEventId": f"{self.epoch}-{self._seq}",
+                "resets": self.resets,
+                "rejected": self.rejected
+            }
+
+
+event_hub = EventHub()
@@ -0,0 +1,346 @@
+"""
+IMPORT_SERVICE.PY - Toplu Katalog İçe Aktarma
+
+CSV, JSON dizisi veya NDJSON dosyası akış olarak okunur; dosyanın
+tamamı belleğe alınmaz. Kayıtlar parçalar (chunk) halinde işlenir:
+
+1. Alanlar doğrulanır (zorunlu alanlar, sayılar, SQL Injection kontrolü)
+2. Yazar ve kategori adları bellekteki ad -> ID haritasından çözülür;
+   haritada olmayanlar parça başına tek sorguda toplu oluşturulur
+3. Kitaplar fast_executemany ile parça başına tek transaction'da eklenir
+4. Arama indeksi yüklüyse yeni kitaplar sonunda indekse eklenir
+
+Beklenen alanlar (büyük/küçük harf duyarsız):
+    title, authorName (veya author), categoryName (veya category),
+    stockNumber (veya stock), yearOfPublication (veya year)
+authorName yerine authorId, categoryName yerine categoryId de verilebilir.
+"""
+import csv
+import io
+import json
+import time
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from repositories.author_repository import AuthorRepository
+from repositories.base_repository import BaseRepository
+from repositories.book_repository import BookRepository
+from repositories.category_repository import CategoryRepository
+from repositories.unit_of_work import UnitOfWork
+from repositories.factory import repository_for
+from services.cache import catalog_cache
+from services.search_index import search_index
+from services.search_service import search_service
+
+FORMATS = ('csv', 'json', 'ndjson')
+
+# Kayıt alanı -> kabul edilen başlık adları (küçük harf)
+FIELD_ALIASES = {
+    'title': ('title',),
+    'authorName': ('authorname', 'author'),
+    'authorId': ('authorid',),
+    'categoryName': ('categoryname', 'category'),
+    'categoryId': ('categoryid',),
+    'stockNumber': ('stocknumber', 'stock'),
+    'yearOfPublication': ('yearofpublication', 'year'),
+}
+TEXT_FIELDS = ('title', 'authorName', 'categoryName')
+TITLE_MAX_LENGTH = 200
+NAME_MAX_LENGTH = 50
+
+
+class ImportFormatError(ValueError):
+    """Dosya biçimi okunamadı (satır hatası değil, tüm içe aktarma durur)"""
+
+
+class ImportReport:
+    """İçe aktarma sonucu"""
+
+    MAX_ERRORS = 1000   # Rapora yazılacak en fazla satır hatası
+
+    def __init__(self):
+        self.total = 0
+        self.inserted = 0
+        self.failed = 0
+        self.created_authors = 0
+        self.created_categories = 0
+        self.errors: List[dict] = []
+        self.aborted: Optional[str] = None
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def add_error(self, row: int, message: str, field: Optional[str] = None):
+        self.failed += 1
+        if len(self.errors) < self.MAX_ERRORS:
+            error = {"row": row, "error": message}
+            if field:
+                error["field"] = field
+            self.errors.append(error)
+
+    def finish(self) -> 'ImportReport':
+        self.elapsed = time.perf_counter() - self.started
+        return self
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "createdAuthors": self.created_authors,
+            "createdCategories": self.created_categories,
+            "seconds": round(self.elapsed, 3),
+            "rowsPerSecond": round(self.total / self.elapsed, 1) if self.elapsed else 0.0,
+            "errors": self.errors,
+            "errorsTruncated": self.failed > len(self.errors),
+            "aborted": self.aborted
+        }
+
+
+def detect_format(filename: str = '', content_type: str = '') -> Optional[str]:
+    """Dosya uzantısı veya Content-Type'tan biçimi bulur"""
+    name = (filename or '').lower()
+    ctype = (content_type or '').split(';')[0].strip().lower()
+    if name.endswith(('.ndjson', '.jsonl')) or ctype in ('application/x-ndjson', 'application/jsonl'):
+        return 'ndjson'
+    if name.endswith('.json') or ctype == 'application/json':
+        return 'json'
+    if name.endswith('.csv') or ctype in ('text/csv', 'application/csv'):
+        return 'csv'
+    return None
+
+
+def _name_key(name: str) -> str:
+    """Ad eşleştirme anahtarı: boşluklar sadeleştirilir, harf duyarsız"""
+    return ' '.join(name.split()).casefold()
+
+
+def _split_author(full_name: str) -> Tuple[str, str]:
+    """"Ad Soyad" -> (Ad, Soyad); son kelime soyad kabul edilir"""
+    parts = full_name.split()
+    if len(parts) == 1:
+        return parts[0], ''
+    return ' '.join(parts[:-1]), parts[-1]
+
+
+class ImportService:
+    CHUNK_SIZE = 1000
+
+    def __init__(self):
+        self.book_repo = repository_for(BookRepository)
+        self.author_repo = repository_for(AuthorRepository)
+        self.category_repo = repository_for(CategoryRepository)
+
+    # ---------- Okuma ----------
+
+    def iter_records(self, stream, fmt: str) -> Iterator[dict]:
+        """
+        Binary dosya akışından kayıtları sırayla üretir.
+
+        Raises:
+            ImportFormatError: Biçim desteklenmiyorsa veya dosya bozuksa
+        """
+        if fmt not in FORMATS:
+            raise ImportFormatError(f"Desteklenmeyen biçim: {fmt} (csv, json, ndjson)")
+        text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+        if fmt == 'csv':
+            return self._iter_csv(text)
+        if fmt == 'ndjson':
+            return self._iter_ndjson(text)
+        return self._iter_json_array(text)
+
+    @staticmethod
+    def _iter_csv(text) -> Iterator[dict]:
+        header = text.readline()
+        if not header.strip():
+            return
+        # Excel (Türkçe bölge ayarı) ';' ile kaydeder
+        delimiter = ';' if header.count(';') > header.count(',') else ','
+        yield from csv.DictReader(chain([header], text), delimiter=delimiter)
+
+    @staticmethod
+    def _iter_ndjson(text) -> Iterator[dict]:
+        for line_no, line in enumerate(text, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                raise ImportFormatError(f"{line_no}. satır geçerli JSON değil: {e}")
+            yield record
+
+    @staticmethod
+    def _iter_json_array(text, read_size: int = 64 * 1024) -> Iterator[dict]:
+        """JSON dizisini parça parça okuyarak elemanlarını üretir"""
+        decoder = json.JSONDecoder()
+        buffer = text.read(read_size).lstrip()
+        if not buffer.startswith('['):
+            raise ImportFormatError("JSON dosyası bir dizi ([...]) olmalı")
+        pos = 1
+        eof = False
+        while True:
+            # Eleman aralarındaki boşluk ve virgülleri atla
+            while True:
+                while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                    pos += 1
+                if pos < len(buffer) or eof:
+                    break
+                buffer, pos = text.read(read_size), 0
+                eof = not buffer
+            if pos >= len(buffer):
+                raise ImportFormatError("JSON dizisi kapanmadan dosya bitti")
+            if buffer[pos] == ']':
+                return
+            try:
+                record, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                more = '' if eof else text.read(read_size)
+                if not more:
+                    raise ImportFormatError("JSON dosyası bozuk")
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+            yield record
+            pos = end   # Tampon sadece yeni okuma yapılırken kısaltılır
+
+    # ---------- İçe aktarma ----------
+
+    def import_stream(self, stream, fmt: str, chunk_size: Optional[int] = None) -> ImportReport:
+        """Dosya akışını içe aktarır, raporu döndürür"""
+        return self.import_records(self.iter_records(stream, fmt), chunk_size)
+
+    def import_records(self, records: Iterable, chunk_size: Optional[int] = None) -> ImportReport:
+        """
+        Kayıtları parça parça içe aktarır.
+        Satır hataları rapora yazılır ve içe aktarma devam eder; dosya biçimi
+        bozulursa o ana kadar okunanlar eklenir ve rapor "aborted" ile döner.
+        """
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        report = ImportReport()
+        authors = {_name_key(f"{a.Name} {a.LastName}"): a.Id for a in self.author_repo.get_all()}
+        categories = {_name_key(c.Name): c.Id for c in self.category_repo.get_all()}
+        indexed_up_to = search_index.max_book_id
+
+        chunk = []
+        try:
+            try:
+                for row_no, record in enumerate(records, 1):
+                    report.total += 1
+                    chunk.append((row_no, record))
+                    if len(chunk) >= chunk_size:
+                        self._import_chunk(chunk, authors, categories, report)
+                        chunk = []
+            except ImportFormatError as e:
+                # Dosyanın bozuk kısmından önce okunan kayıtlar yine de eklenir
+                report.aborted = str(e)
+            if chunk:
+                self._import_chunk(chunk, authors, categories, report)
+        finally:
+            if report.inserted or report.created_authors or report.created_categories:
+                catalog_cache.invalidate('books', 'authors', 'categories')
+            if report.inserted:
+                search_service.sync_new_books(indexed_up_to)
+        return report.finish()
+
+    def _import_chunk(self, chunk: List[Tuple[int, dict]], authors: Dict[str, int],
+                      categories: Dict[str, int], report: ImportReport):
+        rows = []
+        for row_no, record in chunk:
+            row = self._parse_record(row_no, record, report)
+            if row:
+                rows.append(row)
+
+        # SQL Injection kontrolü: parçadaki tüm metin alanları tek geçişte
+        rejected = {}
+        for error in BaseRepository.validate_records([r[1] for r in rows], TEXT_FIELDS):
+            rejected.setdefault(error.index, error)
+        if rejected:
+            for index, error in rejected.items():
+                report.add_error(rows[index][0], error.reason, error.field)
+            rows = [row for i, row in enumerate(rows) if i not in rejected]
+
+        new_authors = {}
+        new_categories = {}
+        for _, fields in rows:
+            name = fields.get('authorName')
+            if name and _name_key(name) not in authors:
+                new_authors.setdefault(_name_key(name), _split_author(name))
+            name = fields.get('categoryName')
+            if name and _name_key(name) not in categories:
+                new_categories.setdefault(_name_key(name), ' '.join(name.split()))
+
+        with UnitOfWork() as uow:
+            # Eksik yazar/kategoriler parça başına tek sorguda oluşturulur
+            for author in self.author_repo.bulk_add(list(new_authors.values()), uow=uow):
+                authors[_name_key(f"{author.Name} {author.LastName}")] = author.Id
+                report.created_authors += 1
+            for category in self.category_repo.bulk_add(list(new_categories.values()), uow=uow):
+                categories[_name_key(category.Name)] = category.Id
+                report.created_categories += 1
+
+            book_rows = []
+            for row_no, fields in rows:
+                author_id = fields.get('authorId') or authors.get(_name_key(fields.get('authorName') or ''))
+                category_id = fields.get('categoryId') or categories.get(_name_key(fields.get('categoryName') or ''))
+                if not author_id:
+                    report.add_error(row_no, "Yazar oluşturulamadı", 'authorName')
+                elif not category_id:
+                    report.add_error(row_no, "Kategori oluşturulamadı", 'categoryName')
+                else:
+                    book_rows.append((row_no, fields['title'], author_id, category_id,
+                                      fields['stockNumber'], fields['yearOfPublication']))
+
+            errors = self.book_repo.bulk_add(book_rows, uow=uow)
+            for row_no, message in errors:
+                report.add_error(row_no, message)
+            report.inserted += len(book_rows) - len(errors)
+
+    @staticmethod
+    def _parse_record(row_no: int, record, report: ImportReport) -> Optional[Tuple[int, dict]]:
+        """Kaydı doğrulayıp normalleştirir; hatalıysa rapora yazar ve None döner"""
+        if not isinstance(record, dict):
+            report.add_error(row_no, "Kayıt bir nesne olmalı")
+            return None
+        lowered = {str(k).strip().lower(): v for k, v in record.items() if k is not None}
+        fields = {}
+        for field, aliases in FIELD_ALIASES.items():
+            value = next((lowered[a] for a in aliases if lowered.get(a) not in (None, '')), None)
+            fields[field] = value.strip() if isinstance(value, str) else value
+
+        title = fields['title']
+        if not title or not isinstance(title, str):
+            report.add_error(row_no, "Kitap adı gerekli", 'title')
+            return None
+        if len(title) > TITLE_MAX_LENGTH:
+            report.add_error(row_no, f"Kitap adı en fazla {TITLE_MAX_LENGTH} karakter olabilir", 'title')
+            return None
+
+        for field, default in (('authorId', None), ('categoryId', None),
+                               ('stockNumber', 1), ('yearOfPublication', None)):
+            value = fields[field]
+            if value is None:
+                fields[field] = default
+                continue
+            try:
+                fields[field] = int(value)
+            except (TypeError, ValueError):
+                report.add_error(row_no, "Sayı olmalı", field)
+                return None
+            if fields[field] < 0 or (field.endswith('Id') and fields[field] == 0):
+                report.add_error(row_no, "Geçersiz değer", field)
+                return None
+
+        for name_field, id_field, label in (('authorName', 'authorId', "Yazar"),
+                                            ('categoryName', 'categoryId', "Kategori")):
+            name = fields[name_field]
+            if fields[id_field]:
+                continue
+            if not name or not isinstance(name, str):
+                report.add_error(row_no, f"{label} gerekli", name_field)
+                return None
+            longest = max(len(part) for part in _split_author(name)) if name_field == 'authorName' else len(name)
+            if longest > NAME_MAX_LENGTH:
+                report.add_error(row_no, f"{label} adı en fazla {NAME_MAX_LENGTH} karakter olabilir", name_field)
+                return None
+        return row_no, fields
+
+
+import_service = ImportService()
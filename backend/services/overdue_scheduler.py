@@ -0,0 +1,271 @@
+"""
+OVERDUE_SCHEDULER.PY - Gecikme Zamanlayıcısı
+
+Açık (iade edilmemiş) ödünçler son iade tarihine (ReturnDate) göre bir
+min-heap'te tutulur. Arka plan thread'i en yakın tarihe kadar uyur; süresi
+dolan ödünçleri gecikmiş kümesine taşır ve gecikme olayı yayar. Böylece
+BorrowTransactions taranmadan:
+
+- /api/admin/overdue gecikmiş ödünçleri bellekten döndürür
+- is_overdue(user_id) O(1)'dir (kullanıcı -> gecikmiş işlem Id'leri)
+
+Açık ödünçler ilk istekte bir kez yüklenir (filtreli OpenLoans index'i);
+ödünç alma / iade / silme zamanlayıcıyı doğrudan günceller. Birden fazla
+worker sürecinde her süreç kendi zamanlayıcısını çalıştırır, diğer
+süreçlerin yazmaları en geç RESYNC_SECONDS içinde görünür.
+
+Heap'ten silme tembeldir: iade edilen ödünç _open'dan çıkarılır, heap
+kaydı tepeye geldiğinde atlanır; heap çok şişerse yeniden kurulur.
+Tarihler veritabanındaki gibi (sunucu yerel saati, GETDATE()) karşılaştırılır.
+"""
+import heapq
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable, Iterable, List, Optional
+
+from config import OverdueConfig
+from entities.borrow_transaction import BorrowTransaction
+from repositories.transaction_repository import TransactionRepository
+from repositories.factory import repository_for
+
+logger = logging.getLogger(__name__)
+
+
+class OverdueScheduler:
+    """
+    Args:
+        loader: Açık ödünçleri parça parça döndüren fonksiyon
+                (varsayılan: TransactionRepository.iter_open)
+        resync_seconds: Açık ödünçlerin veritabanından yeniden yüklenme aralığı
+        event_history: Bellekte tutulan son olay sayısı
+    """
+
+    RETRY_SECONDS = 30              # Yükleme hatasında tekrar deneme aralığı
+
+    def __init__(self, loader: Optional[Callable[[], Iterable[List[BorrowTransaction]]]] = None,
+                 resync_seconds: float = OverdueConfig.RESYNC_SECONDS,
+                 event_history: int = OverdueConfig.EVENT_HISTORY):
+        self._loader = loader or (lambda: repository_for(TransactionRepository).iter_open())
+        self.resync_seconds = resync_seconds
+        self._cond = threading.Condition(threading.Lock())
+        self._heap = []             # (ReturnDate, Id)
+        self._open = {}             # Id -> henüz gecikmemiş ödünç
+        self._overdue = {}          # Id -> gecikmiş ödünç
+        self._overdue_users = {}    # UserId -> gecikmiş işlem Id'leri
+        self._journal = None        # Yükleme sürerken gelen değişiklikler
+        self._listeners = []
+        self._events = deque(maxlen=event_history)
+        self._loaded = threading.Event()
+        self._loaded_at = None
+        self._next_resync = 0.0
+        self._thread = None
+        self._stopping = False
+        self.emitted = 0
+
+    # ---- Yaşam döngüsü ----
+
+    def ensure_started(self):
+        """Arka plan thread'ini (süreç başına bir kez) başlatır; ilk iş açık ödünçleri yüklemektir"""
+        if self._thread is not None:
+            return
+        with self._cond:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name='overdue-scheduler', daemon=True)
+                self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def wait_loaded(self, timeout: float = 5.0) -> bool:
+        return self._loaded.wait(timeout)
+
+    def subscribe(self, listener: Callable[[dict], None]):
+        """Gecikme olaylarını dinler; listener zamanlayıcı thread'inde, kilit dışında çağrılır"""
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[dict], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # ---- Yazma (ödünç / iade / silme) ----
+
+    def add(self, tx: Optional[BorrowTransaction]):
+        """Yeni (veya güncellenen) açık ödünç"""
+        if tx is None or tx.RealReturnDate is not None or tx.ReturnDate is None:
+            return
+        with self._cond:
+            if self._journal is not None:
+                self._journal.append((tx.Id, tx))
+            if self._loaded_at is None:
+                return
+            self._insert(tx)
+            if self._heap[0][1] == tx.Id:
+                self._cond.notify()
+
+    def remove(self, tx_id: int):
+        """İade edilen veya silinen ödünç"""
+        with self._cond:
+            if self._journal is not None:
+                self._journal.append((tx_id, None))
+            if self._loaded_at is not None:
+                self._discard(tx_id)
+
+    # ---- Okuma ----
+
+    def is_overdue(self, user_id: int) -> bool:
+        return bool(self._overdue_users.get(user_id))
+
+    def overdue_loans(self, limit: int = 100, user_id: Optional[int] = None) -> List[dict]:
+        """Gecikmiş ödünçler, en eski son tarih önce"""
+        now = datetime.now()
+        with self._cond:
+            if user_id is None:
+                loans = list(self._overdue.values())
+            else:
+                loans = [self._overdue[tx_id] for tx_id in self._overdue_users.get(user_id, ())]
+        loans = heapq.nsmallest(limit, loans, key=lambda tx: (tx.ReturnDate, tx.Id))
+        return [self._loan_dict(tx, now) for tx in loans]
+
+    def recent_events(self, limit: int = 50) -> List[dict]:
+        events = list(self._events)
+        return events[::-1][:limit]
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "loaded": self._loaded_at is not None,
+                "running": self._thread is not None and self._thread.is_alive(),
+                "openLoans": len(self._open),
+                "overdueLoans": len(self._overdue),
+                "overdueUsers": len(self._overdue_users),
+                "heapSize": len(self._heap),
+                "emitted": self.emitted,
+                "loadedAt": datetime.fromtimestamp(self._loaded_at).strftime("%Y-%m-%d %H:%M:%S")
+                            if self._loaded_at else None,
+                "nextDue": self._heap[0][0].strftime("%Y-%m-%d %H:%M:%S") if self._heap else None
+            }
+
+    # ---- İç işler (kilit altında) ----
+
+    def _insert(self, tx: BorrowTransaction):
+        self._discard(tx.Id)
+        self._open[tx.Id] = tx
+        heapq.heappush(self._heap, (tx.ReturnDate, tx.Id))
+
+    def _discard(self, tx_id: int):
+        self._open.pop(tx_id, None)
+        tx = self._overdue.pop(tx_id, None)
+        if tx is not None:
+            ids = self._overdue_users[tx.UserId]
+            ids.discard(tx_id)
+            if not ids:
+                del self._overdue_users[tx.UserId]
+        # Tembel silme: iade edilenlerin heap kayıtları birikince yeniden kur
+        if len(self._heap) > 2 * len(self._open) + 64:
+            self._heap = [(t.ReturnDate, t.Id) for t in self._open.values()]
+            heapq.heapify(self._heap)
+
+    def _mark_overdue(self, tx: BorrowTransaction):
+        self._overdue[tx.Id] = tx
+        self._overdue_users.setdefault(tx.UserId, set()).add(tx.Id)
+
+    def _pop_due(self, now: datetime) -> List[BorrowTransaction]:
+        fired = []
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            due, tx_id = heapq.heappop(heap)
+            tx = self._open.get(tx_id)
+            if tx is None or tx.ReturnDate != due:
+                continue  # iade edilmiş veya tarihi değişmiş
+            del self._open[tx_id]
+            self._mark_overdue(tx)
+            fired.append(tx)
+        return fired
+
+    def _wait_seconds(self, now: datetime) -> float:
+        wait = max(0.0, self._next_resync - time.time())
+        if self._heap:
+            wait = min(wait, max(0.0, (self._heap[0][0] - now).total_seconds()))
+        return wait
+
+    # ---- Thread ----
+
+    def _run(self):
+        while not self._stopping:
+            if time.time() >= self._next_resync:
+                self._load()
+            with self._cond:
+                if self._stopping:
+                    return
+                now = datetime.now()
+                fired = self._pop_due(now)
+                if not fired:
+                    self._cond.wait(self._wait_seconds(now))
+            self._emit(fired, now)
+
+    def _load(self):
+        """Açık ödünçleri (yeniden) yükler; okuma sırasında gelen yazmalar sonra uygulanır"""
+        with self._cond:
+            self._journal = []
+        try:
+            loans = [tx for chunk in self._loader() for tx in chunk]
+        except Exception as e:
+            logger.error("[OverdueScheduler._load] HATA: %s", e)
+            with self._cond:
+                self._journal = None
+            self._next_resync = time.time() + min(self.RETRY_SECONDS, self.resync_seconds)
+            return
+
+        now = datetime.now()
+        with self._cond:
+            previous_open = self._open
+            self._open, self._overdue, self._overdue_users = {}, {}, {}
+            fired = []
+            for tx in loans:
+                if tx.ReturnDate <= now:
+                    self._mark_overdue(tx)
+                    # Bu süreçte bekleyen ödünç yükleme arasında gecikmişse olay kaçmasın
+                    if tx.Id in previous_open:
+                        fired.append(tx)
+                else:
+                    self._open[tx.Id] = tx
+            self._heap = [(tx.ReturnDate, tx.Id) for tx in self._open.values()]
+            heapq.heapify(self._heap)
+            self._loaded_at = time.time()
+            for tx_id, tx in self._journal:
+                if tx is None:
+                    self._discard(tx_id)
+                else:
+                    self._insert(tx)
+            self._journal = None
+        self._next_resync = time.time() + self.resync_seconds
+        self._loaded.set()
+        self._emit(fired, now)
+
+    def _emit(self, fired: List[BorrowTransaction], now: datetime):
+        for tx in fired:
+            event = {"type": "overdue", **self._loan_dict(tx, now),
+                     "detectedAt": now.strftime("%Y-%m-%d %H:%M:%S")}
+            self._events.append(event)
+            self.emitted += 1
+            for listener in list(self._listeners):
+                try:
+                    listener(event)
+                except Exception as e:
+                    logger.error("[OverdueScheduler._emit] HATA: %s", e)
+
+    @staticmethod
+    def _loan_dict(tx: BorrowTransaction, now: datetime) -> dict:
+        return {**tx.to_dict(), "overdueMinutes": max(0, int((now - tx.ReturnDate).total_seconds() // 60))}
+
+
+overdue_scheduler = OverdueScheduler()
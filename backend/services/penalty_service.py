@@ -1,18 +1,30 @@
 """
 PENALTY_SERVICE.PY - Ceza Servisi
 Cezalar TRIGGER tarafından otomatik oluşturulur!
+Ödeme / iptal kayıtları ve üye bakiyesi trg_PenaltyLedger tarafından tutulur.
+Oluşan, ödenen ve silinen cezalar canlı akışa (services/event_hub.py) yayınlanır.
 """
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 from repositories.penalty_repository import PenaltyRepository
+from repositories.factory import repository_for
 from entities.penalty import Penalty
+from entities.penalty_ledger_entry import PenaltyLedgerEntry
+from entities.borrow_transaction import BorrowTransaction
+from services.event_hub import event_hub
 
 class PenaltyService:
     def __init__(self):
-        self.repo = PenaltyRepository()
+        self.repo = repository_for(PenaltyRepository)
     
     def get_all_penalties(self) -> List[Penalty]:
         return self.repo.get_all()
     
+    def iter_all_penalties(self, raw: bool = False) -> Iterator[list]:
+        return self.repo.iter_all(raw=raw)
+    
+    def get_penalties_page(self, limit: int, after: Optional[tuple] = None) -> List[Penalty]:
+        return self.repo.get_page(limit, after)
+    
     def get_penalty_by_id(self, penalty_id: int) -> Optional[Penalty]:
         return self.repo.get_by_id(penalty_id)
     
@@ -21,15 +33,48 @@ class PenaltyService:
     
     def pay_penalty(self, penalty_id: int, user_id: int) -> Tuple[bool, str]:
         """Ceza ödeme - sp_PayPenalty kullanır"""
-        return self.repo.pay_penalty_sp(penalty_id, user_id)
+        penalty = self.repo.get_by_id(penalty_id) if event_hub.active() else None
+        success, message = self.repo.pay_penalty_sp(penalty_id, user_id)
+        if success and penalty:
+            event_hub.publish('penalty.paid', {"id": penalty_id, "userId": user_id, "amount": float(penalty.Amount)},
+                              user_id=user_id)
+        return success, message
     
     def delete_penalty(self, penalty_id: int) -> bool:
-        return self.repo.delete(penalty_id)
+        penalty = self.repo.get_by_id(penalty_id) if event_hub.active() else None
+        deleted = self.repo.delete(penalty_id)
+        if deleted and penalty:
+            event_hub.publish('penalty.cancelled', {"id": penalty_id, "userId": penalty.UserId,
+                                                    "amount": float(penalty.Amount)}, user_id=penalty.UserId)
+        return deleted
+    
+    def publish_created(self, transactions: List[Optional[BorrowTransaction]]):
+        """
+        Gecikmeli iadelerde trigger'ın yazdığı cezaları yayınlar (BorrowService
+        çağırır). Üye başına tek okuma: ödenmemiş cezalar, işlem Id'sine göre.
+        """
+        if not event_hub.active():
+            return
+        late = {}
+        for tx in transactions:
+            if tx and tx.RealReturnDate and tx.ReturnDate and tx.RealReturnDate > tx.ReturnDate:
+                late.setdefault(tx.UserId, set()).add(tx.Id)
+        for user_id, tx_ids in late.items():
+            for penalty in self.repo.get_by_user_id(user_id):
+                if penalty.BorrowTransactionsId in tx_ids:
+                    event_hub.publish('penalty.created', penalty.to_dict(), user_id=user_id)
     
     def get_total_penalty_amount(self) -> float:
         return self.repo.get_total_amount()
     
     def get_user_total_penalty(self, user_id: int) -> float:
         return self.repo.get_user_total_amount(user_id)
+    
+    def get_user_balance(self, user_id: int) -> Tuple[float, int]:
+        return self.repo.get_balance(user_id)
+    
+    def get_ledger_page(self, limit: int, after: Optional[tuple] = None,
+                        user_id: Optional[int] = None) -> List[PenaltyLedgerEntry]:
+        return self.repo.get_ledger_page(limit, after, user_id)
 
 penalty_service = PenaltyService()
@@ -0,0 +1,492 @@
+"""
+SEARCH_INDEX.PY - Katalog Arama İndeksi (Bellek İçi, Ters İndeks)
+
+Kitap adı, yazar adı ve kategori üzerinde tam metin arama.
+
+- Türkçe katlama: "İ"/"I" önce Türkçe kurala göre küçültülür, sonra
+  aksanlar atılır (ç->c, ğ->g, ı->i, ö->o, ş->s, ü->u, â->a ...).
+  "IŞIK", "ışık" ve "isik" aynı terime düşer.
+- Sıralama BM25: kitap adı terim sıklığı ve uzunluğu ile, yazar/kategori
+  eşleşmesi ağırlıklı IDF ile puanlanır. Sorgudaki tüm terimler eşleşmelidir.
+- Her terimin kitapları ayrıca (tf, ad uzunluğu) gruplarında tutulur; bir
+  gruptaki kitapların puanı aynıdır. Arama en seyrek terimin gruplarını
+  (çok terimlide diğer terimlerin aynı uzunluktaki gruplarıyla eşleyip)
+  puan üst sınırı sırasıyla gezer ve ilk sonuçlar kesinleşince durur;
+  sık kelimede bile tüm listeyi puanlamaz. Bu yüzden toplam eşleşme
+  sayısı hesaplanmaz (sayfalama offset ile, "daha fazla var mı" kadar).
+- Yazar ve kategori adları kitap başına değil, yazar/kategori başına
+  indekslenir: yazar adı değişince sadece o yazarın terimleri güncellenir.
+- İndeks ilk aramada bir kez yüklenir (services/search_service.py), sonra
+  Book/Author/Category servislerindeki yazmalarla artımlı güncellenir.
+- Çok sonuçlu (pahalı) sorgular küçük bir LRU'da tutulur, her yazmada boşaltılır.
+
+Not: İndeks süreç içidir. Birden fazla worker'da başka bir süreçteki yazma
+bu süreçte görünmez (import sonrası yeni kitaplar sync ile eklenir).
+"""
+import bisect
+import heapq
+import math
+import re
+import sys
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from entities.book import Book
+
+_TR_UPPER = str.maketrans({'İ': 'i', 'I': 'ı'})
+_TR_FOLD = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+_TOKEN = re.compile(r'\w+')
+_EMPTY: Dict[int, int] = {}
+
+
+def fold(text: str) -> str:
+    """Türkçe küçük harf + aksansız hale getirir"""
+    text = text.translate(_TR_UPPER).lower().translate(_TR_FOLD)
+    if not text.isascii():
+        text = ''.join(c for c in unicodedata.normalize('NFKD', text) if not unicodedata.combining(c))
+    return text
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Metni katlanmış terimlere böler"""
+    if not text:
+        return []
+    return [sys.intern(t) for t in _TOKEN.findall(fold(text))]
+
+
+class _NameField:
+    """Yazar/kategori adları: terim -> sahip Id'leri, sahip -> sıralı kitap Id'leri"""
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.terms: Dict[str, Set[int]] = {}
+        self.names: Dict[int, Tuple[str, ...]] = {}
+        self.books: Dict[int, List[int]] = {}
+
+    def set_name(self, owner_id: int, name: Optional[str]):
+        terms = tuple(dict.fromkeys(tokenize(name)))
+        if self.names.get(owner_id) == terms:
+            return
+        self._drop_terms(owner_id)
+        self.names[owner_id] = terms
+        for term in terms:
+            self.terms.setdefault(term, set()).add(owner_id)
+
+    def remove(self, owner_id: int) -> List[int]:
+        """Sahibi siler, bağlı kitap Id'lerini döndürür"""
+        self._drop_terms(owner_id)
+        self.names.pop(owner_id, None)
+        return self.books.pop(owner_id, [])
+
+    def add_book(self, owner_id: int, book_id: int):
+        ids = self.books.setdefault(owner_id, [])
+        # Yeni kitapların Id'si artan: çoğunlukla sona eklenir
+        if not ids or ids[-1] < book_id:
+            ids.append(book_id)
+        else:
+            bisect.insort(ids, book_id)
+
+    def remove_book(self, owner_id: int, book_id: int):
+        ids = self.books.get(owner_id)
+        if ids:
+            i = bisect.bisect_left(ids, book_id)
+            if i < len(ids) and ids[i] == book_id:
+                del ids[i]
+
+    def _drop_terms(self, owner_id: int):
+        for term in self.names.get(owner_id, ()):
+            owners = self.terms.get(term)
+            if owners is not None:
+                owners.discard(owner_id)
+                if not owners:
+                    del self.terms[term]
+
+    def owners(self, term: str) -> Set[int]:
+        return self.terms.get(term, set())
+
+    def book_count(self, owners: Set[int]) -> int:
+        return sum(len(self.books.get(o, ())) for o in owners)
+
+
+class SearchIndex:
+    """
+    Kitap kataloğu için ters indeks.
+    Tüm metotlar thread-safe; yüklenmeden önce gelen kitap yazmaları
+    yok sayılır (yükleme veritabanından güncel hali okur).
+    """
+
+    K1 = 1.2
+    B = 0.75
+    AUTHOR_WEIGHT = 0.8
+    CATEGORY_WEIGHT = 0.3
+    HEAVY_WORK = 5000
+    HEAVY_CACHE_SIZE = 256
+
+    def __init__(self):
+        self.loaded = False
+        self.max_book_id = 0
+        self._lock = threading.RLock()
+        self._books: Dict[int, Tuple[int, int, Tuple[str, ...]]] = {}
+        self._title: Dict[str, Dict[int, int]] = {}
+        self._impacts: Dict[str, Dict[Tuple[int, int], Set[int]]] = {}
+        self._title_len_total = 0
+        self._authors = _NameField(self.AUTHOR_WEIGHT)
+        self._categories = _NameField(self.CATEGORY_WEIGHT)
+        self._heavy: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    # ---------- Yükleme ----------
+
+    def load(self, book_chunks: Iterable[List[Book]]):
+        """Kitapları parça parça indeksler (ilk yükleme). Hata olursa indeks boş kalır."""
+        with self._lock:
+            self._clear_books()
+            try:
+                for chunk in book_chunks:
+                    for book in chunk:
+                        self._upsert(book)
+            except Exception:
+                self._clear_books()
+                raise
+            self.loaded = True
+
+    def _clear_books(self):
+        self.loaded = False
+        self.max_book_id = 0
+        self._books.clear()
+        self._title.clear()
+        self._impacts.clear()
+        self._title_len_total = 0
+        for field in (self._authors, self._categories):
+            field.books.clear()
+        self._heavy.clear()
+
+    # ---------- Artımlı güncelleme ----------
+
+    def upsert_book(self, book: Book):
+        """Kitabı ekler veya günceller (yazar/kategori adı verilmişse onları da)"""
+        with self._lock:
+            if self.loaded:
+                self._upsert(book)
+                self._heavy.clear()
+            else:
+                self._set_names(book)
+
+    def remove_book(self, book_id: int):
+        with self._lock:
+            self._remove(book_id)
+            self._heavy.clear()
+
+    def set_author(self, author_id: int, name: str):
+        with self._lock:
+            self._authors.set_name(author_id, name)
+            self._heavy.clear()
+
+    def remove_author(self, author_id: int):
+        """Yazarı ve kitaplarını siler (ON DELETE CASCADE ile aynı)"""
+        with self._lock:
+            for book_id in self._authors.remove(author_id):
+                self._remove(book_id)
+            self._heavy.clear()
+
+    def set_category(self, category_id: int, name: str):
+        with self._lock:
+            self._categories.set_name(category_id, name)
+            self._heavy.clear()
+
+    def remove_category(self, category_id: int):
+        """Kategoriyi ve kitaplarını siler (ON DELETE CASCADE ile aynı)"""
+        with self._lock:
+            for book_id in self._categories.remove(category_id):
+                self._remove(book_id)
+            self._heavy.clear()
+
+    def _set_names(self, book: Book):
+        if book.AuthorName:
+            self._authors.set_name(book.AuthorId, book.AuthorName)
+        if book.CategoryName:
+            self._categories.set_name(book.CategoryId, book.CategoryName)
+
+    def _upsert(self, book: Book):
+        self._remove(book.Id)
+        self._set_names(book)
+        terms = tuple(tokenize(book.Title))
+        self._books[book.Id] = (book.AuthorId, book.CategoryId, terms)
+        self._title_len_total += len(terms)
+        for term, tf in Counter(terms).items():
+            postings = self._title.get(term)
+            if postings is None:
+                postings = self._title[term] = {}
+                self._impacts[term] = {}
+            postings[book.Id] = tf
+            self._impacts[term].setdefault((tf, len(terms)), set()).add(book.Id)
+        self._authors.add_book(book.AuthorId, book.Id)
+        self._categories.add_book(book.CategoryId, book.Id)
+        if book.Id > self.max_book_id:
+            self.max_book_id = book.Id
+
+    def _remove(self, book_id: int):
+        entry = self._books.pop(book_id, None)
+        if entry is None:
+            return
+        author_id, category_id, terms = entry
+        self._title_len_total -= len(terms)
+        for term in set(terms):
+            postings = self._title.get(term)
+            if postings is None:
+                continue
+            tf = postings.pop(book_id, None)
+            if not postings:
+                del self._title[term]
+                del self._impacts[term]
+            elif tf is not None:
+                group = self._impacts[term].get((tf, len(terms)))
+                if group is not None:
+                    group.discard(book_id)
+                    if not group:
+                        del self._impacts[term][(tf, len(terms))]
+        self._authors.remove_book(author_id, book_id)
+        self._categories.remove_book(category_id, book_id)
+
+    # ---------- Arama ----------
+
+    def _idf(self, df: int) -> float:
+        n = len(self._books)
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def _plan(self, term: str) -> tuple:
+        """Terim için: (tahmini df, terim, postingler, yazarlar, kategoriler, idf, yazar puanı, kategori puanı)"""
+        postings = self._title.get(term, _EMPTY)
+        authors = self._authors.owners(term)
+        categories = self._categories.owners(term)
+        author_df = self._authors.book_count(authors)
+        category_df = self._categories.book_count(categories)
+        return (len(postings) + author_df + category_df, term, postings, authors, categories,
+                self._idf(len(postings)),
+                self._authors.weight * self._idf(author_df) if authors else 0.0,
+                self._categories.weight * self._idf(category_df) if categories else 0.0)
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> List[Tuple[int, float]]:
+        """
+        Sorgudaki tüm terimleri içeren kitapları BM25 puanına göre sıralar
+        (eşit puanlılarda küçük Id önce).
+
+        Returns:
+            List[Tuple[int, float]]: [(kitap_id, puan), ...]
+        """
+        terms = tuple(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        key = (terms, limit, offset)
+        with self._lock:
+            cached = self._heavy.get(key)
+            if cached is not None:
+                self._heavy.move_to_end(key)
+                return cached
+            if not self._books:
+                return []
+            plans = sorted((self._plan(term) for term in terms), key=lambda p: p[0])
+            if not plans[0][0]:
+                return []
+            hits, work = self._top(plans, offset + limit)
+            result = hits[offset:]
+            if work >= self.HEAVY_WORK:
+                self._heavy[key] = result
+                while len(self._heavy) > self.HEAVY_CACHE_SIZE:
+                    self._heavy.popitem(last=False)
+            return result
+
+    def _top(self, plans: List[tuple], need: int) -> Tuple[List[Tuple[int, float]], int]:
+        """
+        En seyrek terimin kitaplarını puan üst sınırı sırasıyla gezer, diğer
+        terimleri kitap başına kontrol eder. need kadar sonuç bulunup kalan
+        kaynakların üst sınırı en kötü sonucu geçemiyorsa durur.
+
+        Kaynaklar (tür):
+        0: tüm terimleri adında geçen, yazar/kategori eşleşmesi olmayanlar;
+           her terimden aynı uzunlukta bir (tf, uzunluk) grubu, tf'ler toplamı
+           uzunluğu aşmaz. Bu kitapların puanı aynıdır: sınır kesindir
+        1: ilk terimin grubundan yazarı herhangi bir terimle eşleşenler
+        2: ilk terimin grubundan sadece kategorisi eşleşenler
+        3: adında geçmeyen, yazarı eşleşen; 4: adında ve yazarında geçmeyen,
+           kategorisi eşleşen (sıralı listelerin tembel birleşimi)
+
+        Yazar puanı sadece yazarı eşleşen az sayıdaki kitabın sınırına
+        eklenir; 1 ve 2'de diğer terimlerin ad puanı sınırı aynı uzunlukta,
+        adda kalan kelime sayısına sığan en büyük tf'den gelir. Adaylar küme
+        kesişimiyle (C'de, küçük kümeden) bulunur, sadece kalanlar puanlanır.
+
+        Returns:
+            Tuple[List, int]: (sıralı sonuçlar, gezilen kitap sayısı)
+        """
+        k1, b = self.K1, self.B
+        base = k1 * (1 - b)
+        norm = k1 * b / (self._title_len_total / len(self._books) or 1)
+        books = self._books
+
+        def title_weight(idf, tf, length):
+            return idf * tf * (k1 + 1) / (tf + base + norm * length)
+
+        # Diğer terimler: uzunluk -> [(tf, kitaplar)] (tf artan; ağırlık tf ile artar)
+        others = []
+        rest = 0.0          # Uzunluğu bilinmeyen kitap için diğer terimlerin en yüksek katkısı
+        for _, term, _, _, _, idf, author_score, category_score in plans[1:]:
+            by_length = {}
+            for (tf, length), ids in self._impacts.get(term, {}).items():
+                by_length.setdefault(length, []).append((tf, ids))
+            for groups in by_length.values():
+                groups.sort(key=lambda g: g[0])
+            others.append((by_length, idf, author_score, category_score))
+            rest += max((title_weight(idf, groups[-1][0], length) for length, groups in by_length.items()),
+                        default=0.0)
+            rest += author_score + category_score
+
+        def title_rest(tf, length, by_author, by_category):
+            """Adında ilk terim tf kez geçen kitapta diğer terimlerin üst sınırı; eşleşemiyorsa None"""
+            room = length - tf
+            total = 0.0
+            for by_length, idf, author_score, category_score in others:
+                extra = (author_score if by_author else 0.0) + (category_score if by_category else 0.0)
+                fit = [other_tf for other_tf, _ in by_length.get(length, ()) if other_tf <= room]
+                if fit:
+                    total += title_weight(idf, fit[-1], length) + extra
+                elif extra:
+                    total += extra
+                else:
+                    return None
+            return total
+
+        def combinations(tf, length):
+            """Diğer terimlerin aynı uzunluktaki grupları: [(ad puanı, gruplar)]"""
+            combos = [(0.0, tf, ())]
+            for by_length, idf, _, _ in others:
+                combos = [(score + title_weight(idf, other_tf, length), used + other_tf, groups + (ids,))
+                          for score, used, groups in combos
+                          for other_tf, ids in by_length.get(length, ())
+                          if used + other_tf <= length]
+            return [(score, groups) for score, _, groups in combos]
+
+        _, term, postings, authors, categories, idf, author_score, category_score = plans[0]
+        bonus = author_score + category_score
+        # Herhangi bir terimle eşleşen yazar / kategoriler
+        owner_authors = set().union(*(p[3] for p in plans))
+        owner_categories = set().union(*(p[4] for p in plans))
+        owned = {1: [self._authors, owner_authors, 0, None], 2: [self._categories, owner_categories, 1, None]}
+
+        def matching(ids, kind):
+            """ids içinden yazarı (1) / kategorisi (2) eşleşen kitaplar"""
+            field, owner_ids, position, owner_books = owned[kind]
+            if owner_books is None:
+                if len(ids) * 4 < field.book_count(owner_ids):
+                    # Küçük grup: kitap başına kontrol, eşleşen kitapların kümesi kurulmaz
+                    return {book_id for book_id in ids if books[book_id][position] in owner_ids}
+                owner_books = owned[kind][3] = set()
+                for owner_id in owner_ids:
+                    owner_books.update(field.books.get(owner_id, ()))
+            return ids & owner_books
+
+        sources = []
+        for (tf, length), ids in self._impacts.get(term, {}).items():
+            weight = title_weight(idf, tf, length)
+            for score, groups in combinations(tf, length):
+                sources.append((weight + score, (ids,) + groups, 0))
+            for kind, extra, by_author, by_category in ((1, bonus, True, True),
+                                                        (2, category_score, False, True)):
+                if kind == 1 and not owner_authors or kind == 2 and not owner_categories:
+                    continue
+                other = title_rest(tf, length, by_author, by_category)
+                if other is not None:
+                    sources.append((weight + extra + other, ids, kind))
+        # Yazar/kategori kitap listeleri zaten sıralı ve ayrık: tembel birleştirme,
+        # erken durulursa listelerin tamamı gezilmez
+        if authors:
+            sources.append((bonus + rest, heapq.merge(*(self._authors.books.get(a, ()) for a in authors)), 3))
+        if categories:
+            sources.append((category_score + rest,
+                            heapq.merge(*(self._categories.books.get(c, ()) for c in categories)), 4))
+        sources.sort(key=lambda s: s[0], reverse=True)
+
+        # Sadece kitap adında geçen diğer terimler: puanlamadan önce hızlı eleme
+        required = [p[2] for p in plans[1:] if not p[3] and not p[4]]
+
+        heap = []
+        work = 0
+        for bound, ids, kind in sources:
+            if len(heap) == need and bound < heap[0][0] - 1e-9:
+                break
+            if kind == 0:
+                groups = sorted(ids, key=len)
+                work += len(groups[0])
+                candidates = groups[0]
+                for group in groups[1:]:
+                    candidates = candidates & group
+                for owner_kind in (1, 2):
+                    if candidates and owned[owner_kind][1]:
+                        candidates = candidates - matching(candidates, owner_kind)
+                ids = sorted(candidates)
+            elif kind < 3:
+                work += len(ids)
+                # Önce eşleşen yazar/kategori kitapları: grup yerine küçük küme gezilir
+                candidates = matching(ids, kind)
+                if kind == 2 and candidates and owner_authors:
+                    candidates = candidates - matching(candidates, 1)
+                for term_postings in required:
+                    candidates = term_postings.keys() & candidates
+                ids = sorted(candidates)
+            for book_id in ids:
+                # Kalan kitaplar en fazla bound alır ve Id'leri daha büyük: en kötüyü geçemez
+                if len(heap) == need and bound <= heap[0][0] + 1e-9 and -book_id < heap[0][1]:
+                    break
+                if kind >= 3:
+                    work += 1
+                    # Her kitap tek kaynaktan puanlanır
+                    if book_id in postings:
+                        continue
+                    if kind == 4 and books[book_id][0] in authors:
+                        continue
+                    missing = False
+                    for term_postings in required:
+                        if book_id not in term_postings:
+                            missing = True
+                            break
+                    if missing:
+                        continue
+                author_id, category_id, title_terms = books[book_id]
+                score = 0.0
+                for _, _, term_postings, term_authors, term_categories, term_idf, a_score, c_score in plans:
+                    matched = False
+                    tf = term_postings.get(book_id)
+                    if tf:
+                        score += title_weight(term_idf, tf, len(title_terms))
+                        matched = True
+                    if author_id in term_authors:
+                        score += a_score
+                        matched = True
+                    if category_id in term_categories:
+                        score += c_score
+                        matched = True
+                    if not matched:
+                        break
+                else:
+                    item = (score, -book_id)
+                    if len(heap) < need:
+                        heapq.heappush(heap, item)
+                    elif item > heap[0]:
+                        heapq.heapreplace(heap, item)
+        hits = [(-neg_id, round(score, 4)) for score, neg_id in sorted(heap, reverse=True)]
+        return hits, work
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "loaded": self.loaded,
+                "books": len(self._books),
+                "titleTerms": len(self._title),
+                "authors": len(self._authors.names),
+                "categories": len(self._categories.names),
+                "cachedQueries": len(self._heavy)
+            }
+
+
+search_index = SearchIndex()
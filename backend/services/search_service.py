@@ -0,0 +1,67 @@
+"""SEARCH_SERVICE.PY - Katalog Arama Servisi"""
+import threading
+
+from repositories.book_repository import BookRepository
+from repositories.factory import repository_for
+from services.search_index import search_index
+
+class SearchService:
+    DEFAULT_LIMIT = 20
+    MAX_LIMIT = 100
+    SYNC_PAGE = 1000
+
+    def __init__(self):
+        self.repo = repository_for(BookRepository)
+        self._load_lock = threading.Lock()
+
+    def ensure_loaded(self):
+        """İndeksi ilk kullanımda veritabanından bir kez yükler"""
+        if search_index.loaded:
+            return
+        with self._load_lock:
+            if not search_index.loaded:
+                search_index.load(self.repo.iter_all())
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT, offset: int = 0) -> dict:
+        """
+        Sıralı arama sonucu; kitap bilgileri (stok dahil) tek sorguda güncel okunur.
+
+        Returns:
+            dict: {"items": [kitap + score], "nextOffset": sonraki sayfa veya None}
+        """
+        self.ensure_loaded()
+        limit = max(1, min(limit, self.MAX_LIMIT))
+        offset = max(0, offset)
+        # Bir fazlası istenir: sonraki sayfa var mı
+        hits = search_index.search(query, limit + 1, offset)
+        has_more = len(hits) > limit
+        hits = hits[:limit]
+        books = {b.Id: b for b in self.repo.get_by_ids([book_id for book_id, _ in hits])}
+        items = []
+        for book_id, score in hits:
+            book = books.get(book_id)
+            if book:
+                items.append({**book.to_dict(), "score": score})
+        return {"items": items, "nextOffset": offset + limit if has_more else None}
+
+    def index_book(self, book_id: int):
+        """Kitabı (yazar/kategori adlarıyla) veritabanından okuyup indekse yazar"""
+        book = self.repo.get_by_id(book_id)
+        if book:
+            search_index.upsert_book(book)
+        else:
+            search_index.remove_book(book_id)
+
+    def sync_new_books(self, after_id: int):
+        """after_id'den büyük Id'li kitapları indekse ekler (toplu içe aktarma sonrası)"""
+        if not search_index.loaded:
+            return
+        while True:
+            books = self.repo.get_page(self.SYNC_PAGE, (after_id,))
+            for book in books:
+                search_index.upsert_book(book)
+            if len(books) < self.SYNC_PAGE:
+                return
+            after_id = books[-1].Id
+
+search_service = SearchService()
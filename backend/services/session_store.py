@@ -0,0 +1,212 @@
+"""
+SESSION_STORE.PY - Oturum (Token) Deposu
+
+AuthService token -> kullanıcı eşlemesini bu arayüz üzerinden tutar.
+
+- MemorySessionStore: Tek süreç için. Kayıtlar bitiş zamanına göre sıralı
+  tutulur (OrderedDict); süresi dolanlar baştan silinir, tarama tüm
+  tabloyu dolaşmaz.
+- SqliteSessionStore: Birden fazla worker süreci (pre-fork sunucu) için.
+  Aynı makinedeki tüm süreçler WAL modunda tek SQLite dosyasını paylaşır;
+  her süreç (ve thread) kendi bağlantısını açar.
+
+Her iki depoda da arama O(1)'dir; süresi dolmuş token aramada
+geçersiz sayılır ve silinir, toplu temizlik belirli aralıklarla yapılır.
+"""
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Optional
+
+from config import SessionConfig
+
+
+class SessionStore(ABC):
+    """
+    Oturum deposu arayüzü.
+
+    Args:
+        ttl_seconds: Oturum ömrü
+        sliding: True ise kullanılan oturumun süresi yenilenir
+                 (ömrünün yarısı dolduktan sonraki ilk aramada)
+        sweep_interval: Süresi dolan kayıtların toplu temizlenme aralığı (saniye)
+    """
+
+    def __init__(self, ttl_seconds: float, sliding: bool = True, sweep_interval: float = 60):
+        self.ttl_seconds = ttl_seconds
+        self.sliding = sliding
+        self.sweep_interval = sweep_interval
+        self._next_sweep = time.time() + sweep_interval
+
+    @abstractmethod
+    def create(self, token: str, user_id: int) -> None:
+        """Token'ı kullanıcıya bağlar (ömür ttl_seconds)"""
+
+    @abstractmethod
+    def get(self, token: str) -> Optional[int]:
+        """Token geçerliyse kullanıcı ID'si, değilse None"""
+
+    @abstractmethod
+    def delete(self, token: str) -> bool:
+        """Token'ı siler; vardıysa True"""
+
+    @abstractmethod
+    def sweep(self) -> int:
+        """Süresi dolan oturumları siler, silinen sayısını döndürür"""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Kayıtlı oturum sayısı"""
+
+    def _maybe_sweep(self, now: float):
+        if now >= self._next_sweep:
+            self._next_sweep = now + self.sweep_interval
+            self.sweep()
+
+
+class MemorySessionStore(SessionStore):
+    """Süreç içi depo: token -> (user_id, bitiş), bitiş sırasına göre"""
+
+    def __init__(self, ttl_seconds: float, sliding: bool = True, sweep_interval: float = 60):
+        super().__init__(ttl_seconds, sliding, sweep_interval)
+        self._sessions: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create(self, token: str, user_id: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._sessions[token] = (user_id, now + self.ttl_seconds)
+            self._sessions.move_to_end(token)
+        self._maybe_sweep(now)
+
+    def get(self, token: str) -> Optional[int]:
+        entry = self._sessions.get(token)
+        if entry is None:
+            return None
+        now = time.time()
+        user_id, expires_at = entry
+        if expires_at <= now:
+            with self._lock:
+                self._sessions.pop(token, None)
+            return None
+        # Süre ömrünün yarısı dolunca yenilenir; çoğu arama kilitsiz biter.
+        # Yeni bitiş (now + ttl) her zaman en geç bitiştir: sona taşımak sırayı korur
+        if self.sliding and expires_at - now < self.ttl_seconds / 2:
+            with self._lock:
+                if token in self._sessions:
+                    self._sessions[token] = (user_id, now + self.ttl_seconds)
+                    self._sessions.move_to_end(token)
+        return user_id
+
+    def delete(self, token: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(token, None) is not None
+
+    def sweep(self) -> int:
+        now = time.time()
+        removed = 0
+        sessions = self._sessions
+        with self._lock:
+            # Kayıtlar bitiş sırasında: ilk geçerli kayıtta durulur
+            while sessions:
+                token, (_, expires_at) = next(iter(sessions.items()))
+                if expires_at > now:
+                    break
+                del sessions[token]
+                removed += 1
+        return removed
+
+    def count(self) -> int:
+        return len(self._sessions)
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    Süreçler arası paylaşılan depo (SQLite, WAL modu).
+    Bağlantılar süreç + thread başınadır; fork sonrası yeniden açılır.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, sliding: bool = True, sweep_interval: float = 60):
+        super().__init__(ttl_seconds, sliding, sweep_interval)
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS Sessions (
+                Token TEXT PRIMARY KEY,
+                UserId INTEGER NOT NULL,
+                ExpiresAt REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS IX_Sessions_ExpiresAt ON Sessions (ExpiresAt)")
+
+    def _connection(self) -> sqlite3.Connection:
+        local = self._local
+        pid = os.getpid()
+        if getattr(local, 'pid', None) != pid:
+            # isolation_level=None: her ifade kendi içinde commit edilir
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            local.conn = conn
+            local.pid = pid
+        return local.conn
+
+    def create(self, token: str, user_id: int) -> None:
+        now = time.time()
+        self._connection().execute(
+            "INSERT OR REPLACE INTO Sessions (Token, UserId, ExpiresAt) VALUES (?, ?, ?)",
+            (token, user_id, now + self.ttl_seconds)
+        )
+        self._maybe_sweep(now)
+
+    def get(self, token: str) -> Optional[int]:
+        conn = self._connection()
+        row = conn.execute("SELECT UserId, ExpiresAt FROM Sessions WHERE Token = ?", (token,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        user_id, expires_at = row
+        if expires_at <= now:
+            conn.execute("DELETE FROM Sessions WHERE Token = ? AND ExpiresAt <= ?", (token, now))
+            return None
+        # Kayıt her aramada değil, ömrünün yarısı dolunca yenilenir (yazma sayısı düşük kalır)
+        if self.sliding and expires_at - now < self.ttl_seconds / 2:
+            conn.execute("UPDATE Sessions SET ExpiresAt = ? WHERE Token = ?", (now + self.ttl_seconds, token))
+        return user_id
+
+    def delete(self, token: str) -> bool:
+        return self._connection().execute("DELETE FROM Sessions WHERE Token = ?", (token,)).rowcount > 0
+
+    def sweep(self) -> int:
+        return self._connection().execute("DELETE FROM Sessions WHERE ExpiresAt <= ?", (time.time(),)).rowcount
+
+    def count(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM Sessions").fetchone()[0]
+
+
+def create_session_store(ttl_seconds: Optional[float] = None, sliding: Optional[bool] = None,
+                         sqlite_path: Optional[str] = None) -> SessionStore:
+    """
+    SessionConfig.BACKEND'e göre depo oluşturur. Verilmeyen ayarlar
+    SessionConfig'ten alınır (akış biletleri ayrı dosya ve kısa ömürle açılır).
+    """
+    ttl_seconds = SessionConfig.TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    sliding = SessionConfig.SLIDING if sliding is None else sliding
+    if SessionConfig.BACKEND == 'sqlite':
+        return SqliteSessionStore(
+            sqlite_path or SessionConfig.SQLITE_PATH,
+            ttl_seconds=ttl_seconds,
+            sliding=sliding,
+            sweep_interval=SessionConfig.SWEEP_INTERVAL
+        )
+    if SessionConfig.BACKEND == 'memory':
+        return MemorySessionStore(
+            ttl_seconds=ttl_seconds,
+            sliding=sliding,
+            sweep_interval=SessionConfig.SWEEP_INTERVAL
+        )
+    raise ValueError(f"Bilinmeyen oturum deposu: {SessionConfig.BACKEND}")
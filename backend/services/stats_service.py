@@ -1,55 +1,53 @@
 """STATS_SERVICE.PY - İstatistik Servisi"""
-from config import DatabaseConfig
+from typing import Optional
 from repositories.penalty_repository import PenaltyRepository
+from repositories.stats_repository import StatsRepository
 from repositories.transaction_repository import TransactionRepository
+from repositories.factory import repository_for
+from services.cache import summary_cache
 
 class StatsService:
+    DASHBOARD_RECENT = 5
+    DASHBOARD_RECENT_MAX = 50
+    
     def __init__(self):
-        self.penalty_repo = PenaltyRepository()
-        self.tx_repo = TransactionRepository()
+        self.penalty_repo = repository_for(PenaltyRepository)
+        self.tx_repo = repository_for(TransactionRepository)
+        self.stats_repo = repository_for(StatsRepository)
+    
+    def get_admin_summary(self) -> dict:
+        """Yönetici panosu sayıları - tek sorgu, kısa süreli önbellekli"""
+        summary = summary_cache.get_or_load('summary', 'admin', self.stats_repo.get_summary)
+        return summary or dict(StatsRepository.EMPTY_SUMMARY)
     
     def get_admin_stats(self) -> dict:
-        conn = None
-        try:
-            conn = DatabaseConfig.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("SELECT COUNT(*) FROM Books")
-            total_books = cursor.fetchone()[0] or 0
-            
-            cursor.execute("SELECT COUNT(*) FROM Users")
-            total_users = cursor.fetchone()[0] or 0
-            
-            cursor.execute("SELECT COUNT(*) FROM BorrowTransactions WHERE RealReturnDate IS NULL")
-            active_borrows = cursor.fetchone()[0] or 0
-            
-            total_penalties = self.penalty_repo.get_total_amount()
-            
-            return {
-                "totalBooks": total_books,
-                "totalUsers": total_users,
-                "activeBorrows": active_borrows,
-                "totalPenalties": total_penalties
-            }
-        except Exception as e:
-            print(f"[StatsService.get_admin_stats] HATA: {e}")
-            return {"totalBooks": 0, "totalUsers": 0, "activeBorrows": 0, "totalPenalties": 0}
-        finally:
-            if conn: conn.close()
+        summary = self.get_admin_summary()
+        return {
+            "totalBooks": summary["books"],
+            "totalUsers": summary["users"],
+            "activeBorrows": summary["activeLoans"],
+            "totalPenalties": summary["outstandingPenalties"]
+        }
+    
+    def get_user_dashboard(self, user_id: int, recent: int = DASHBOARD_RECENT) -> Optional[dict]:
+        """Üye panosu - tek sorgu; hata durumunda None"""
+        recent = max(0, min(recent, self.DASHBOARD_RECENT_MAX))
+        dashboard = self.stats_repo.get_user_dashboard(user_id, recent)
+        if dashboard is None:
+            return None
+        next_due = dashboard["nextDueDate"]
+        dashboard["nextDueDate"] = next_due.strftime("%Y-%m-%d %H:%M:%S") if next_due else None
+        dashboard["recentTransactions"] = [t.to_dict() for t in dashboard["recentTransactions"]]
+        return dashboard
     
     def get_user_stats(self, user_id: int) -> dict:
-        try:
-            active_borrows = self.tx_repo.count_active_by_user(user_id)
-            transactions = self.tx_repo.get_by_user_id(user_id)
-            total_penalties = self.penalty_repo.get_user_total_amount(user_id)
-            
-            return {
-                "activeBorrows": active_borrows,
-                "totalTransactions": len(transactions),
-                "totalPenalties": total_penalties
-            }
-        except Exception as e:
-            print(f"[StatsService.get_user_stats] HATA: {e}")
+        dashboard = self.stats_repo.get_user_dashboard(user_id, 0)
+        if dashboard is None:
             return {"activeBorrows": 0, "totalTransactions": 0, "totalPenalties": 0}
+        return {
+            "activeBorrows": dashboard["activeLoans"],
+            "totalTransactions": dashboard["totalLoans"],
+            "totalPenalties": dashboard["outstandingPenalties"]
+        }
 
 stats_service = StatsService()
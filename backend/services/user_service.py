@@ -1,16 +1,24 @@
 """USER_SERVICE.PY - Kullanıcı Servisi"""
 import hashlib
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from repositories.user_repository import UserRepository
+from repositories.factory import repository_for
 from entities.user import User
+from services.cache import catalog_cache
 
 class UserService:
     def __init__(self):
-        self.repo = UserRepository()
+        self.repo = repository_for(UserRepository)
     
     def get_all(self) -> List[User]:
         return self.repo.get_all()
     
+    def iter_all(self, raw: bool = False) -> Iterator[list]:
+        return self.repo.iter_all(raw=raw)
+    
+    def get_page(self, limit: int, after: Optional[tuple] = None) -> List[User]:
+        return self.repo.get_page(limit, after)
+    
     def get_by_id(self, user_id: int) -> Optional[User]:
         return self.repo.get_by_id(user_id)
     
@@ -22,6 +30,10 @@ class UserService:
         return self.repo.update(user_id, fullname, email, role)
     
     def delete(self, user_id: int) -> bool:
-        return self.repo.delete(user_id)
+        deleted = self.repo.delete(user_id)
+        if deleted:
+            # Açık ödünç kayıtları cascade ile silinir, stok değişir
+            catalog_cache.invalidate('books')
+        return deleted
 
 user_service = UserService()
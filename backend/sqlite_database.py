@@ -0,0 +1,113 @@
+"""
+SQLITE_DATABASE.PY - SQLite Depolama Sürücüsü Bağlantısı
+
+DatabaseConfig.BACKEND = 'sqlite' iken havuzdaki fiziksel bağlantılar
+buradan açılır. Şema (db_setup_sqlite.sql) dosya ilk açıldığında bir kez
+kurulur; tablolar, index'ler, trigger'lar ve örnek veriler SQL Server
+şemasının (db_setup.sql) karşılığıdır.
+
+- DATETIME sütunları Python datetime olarak okunur/yazılır
+  (pyodbc ile aynı tipler; repository kodu değişmez)
+- Bağlantılar pyodbc'deki gibi `autocommit` özelliği taşır; havuz salt
+  okunur bağlantıları autocommit verir
+- GETDATE() fonksiyonu tanımlıdır (sunucu yerel saati)
+- WAL modu: okuyucular yazıcıyı beklemez; yazıcılar busy_timeout kadar bekler
+- Şema kurulduktan sonra bekleyen migration'lar (migrations/sqlite) uygulanır
+"""
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+SCHEMA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'db_setup_sqlite.sql')
+SCHEMA_VERSION = 1
+BUSY_TIMEOUT_MS = 5000
+
+_init_lock = threading.Lock()
+_initialized = set()
+
+
+def _format_datetime(value: datetime) -> str:
+    return value.isoformat(' ', 'microseconds')
+
+
+def _parse_datetime(value: bytes) -> datetime:
+    return datetime.fromisoformat(value.decode())
+
+
+sqlite3.register_adapter(datetime, _format_datetime)
+sqlite3.register_converter('DATETIME', _parse_datetime)
+
+
+class SqliteConnection(sqlite3.Connection):
+    """pyodbc bağlantısıyla aynı autocommit arayüzü"""
+
+    @property
+    def autocommit(self) -> bool:
+        return self.isolation_level is None
+
+    @autocommit.setter
+    def autocommit(self, value: bool):
+        self.isolation_level = None if value else 'DEFERRED'
+
+
+def connect(path: str, upgrade: bool = True) -> SqliteConnection:
+    """
+    Yeni bağlantı açar; şema yoksa önce kurulur.
+
+    Args:
+        upgrade: Bekleyen migration'lar da uygulansın (migrate.py status ve
+                 index raporu başlangıç şemasını görmek için False verir)
+    """
+    conn = sqlite3.connect(
+        path, factory=SqliteConnection, check_same_thread=False,
+        detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES
+    )
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.create_function('GETDATE', 0, lambda: _format_datetime(datetime.now()))
+    if path not in _initialized:
+        initialize(conn, path, upgrade)
+    return conn
+
+
+def initialize(conn: sqlite3.Connection, path: str, upgrade: bool = True):
+    """
+    Şemayı (sürüm PRAGMA user_version'da) dosya başına bir kez kurar.
+    Kurulum BEGIN IMMEDIATE içinde yapılır: aynı dosyayı aynı anda açan
+    worker süreçlerinden sadece biri kurar. Migration'lar da kendi
+    BEGIN IMMEDIATE transaction'larında uygulanır (migrate.upgrade).
+    """
+    with _init_lock:
+        if path in _initialized:
+            return
+        conn.execute("PRAGMA journal_mode = WAL")
+        isolation_level, conn.isolation_level = conn.isolation_level, None
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+                    with open(SCHEMA_PATH, encoding='utf-8') as f:
+                        for statement in split_statements(f.read()):
+                            conn.execute(statement)
+                    conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            if upgrade:
+                import migrate
+                migrate.upgrade(conn, migrate.SQLITE)
+        finally:
+            conn.isolation_level = isolation_level
+        _initialized.add(path)
+
+
+def split_statements(script: str):
+    """Script'i tam ifadelere böler (trigger gövdelerindeki ';' dahil)"""
+    buffer = ''
+    for line in script.splitlines(keepends=True):
+        buffer += line
+        if sqlite3.complete_statement(buffer):
+            yield buffer
+            buffer = ''
@@ -0,0 +1,169 @@
+"""
+STATIC_ASSETS.PY - Frontend Dosyaları (Parmak İzli, Önceden Sıkıştırılmış)
+
+Uygulama açılırken StaticConfig.SOURCE_DIR bir kez işlenir, sonuç bellekte tutulur:
+- styles.css, app.js ... içerik hash'li adla sunulur (/assets/app.<hash>.js);
+  Cache-Control: immutable, tarayıcı bir yıl boyunca tekrar istemez
+- index.html'deki referanslar hash'li adlara çevrilir; index.html her
+  ziyarette ETag ile doğrulanır (değişmediyse 304, gövde gitmez)
+- Her dosyanın gzip ve brotli (paket kuruluysa) varyantı açılışta en
+  yüksek seviyede bir kez üretilir; istekte Accept-Encoding'e göre seçilir
+
+İstek başına iş: sözlükten okuma ve başlıklar (disk, hash, sıkıştırma yok).
+Python worker'larını tamamen devre dışı bırakmak için aynı çıktı diske
+yazılıp önündeki sunucuya verilebilir:
+
+    python static_assets.py dist/
+
+    # nginx
+    location /assets/ { root dist; gzip_static on; brotli_static on;
+                        add_header Cache-Control "public, max-age=31536000, immutable"; }
+    location = /      { root dist; try_files /index.html =404; gzip_static on; brotli_static on;
+                        add_header Cache-Control "no-cache"; etag on; }
+"""
+import argparse
+import copy
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import sys
+from typing import Dict, Optional
+
+from flask import Response, request
+
+from config import StaticConfig
+
+try:
+    import brotli
+except ImportError:     # isteğe bağlı: yoksa sadece gzip varyantı
+    brotli = None
+
+INDEX = 'index.html'
+MIMETYPES = {'.html': 'text/html', '.css': 'text/css', '.js': 'text/javascript'}
+
+
+class Asset:
+    """Tek dosyanın gövdesi, sıkıştırılmış varyantları ve başlıkları"""
+    __slots__ = ('body', 'variants', 'digest', 'mimetype', 'cache_control')
+
+    def __init__(self, body: bytes, mimetype: str, cache_control: str):
+        self.body = body
+        self.digest = hashlib.sha256(body).hexdigest()[:12]
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        # Sıra tercih sırasıdır: istemci ikisini de kabul ediyorsa br
+        self.variants = {'br': brotli.compress(body, quality=StaticConfig.BROTLI_QUALITY)} if brotli else {}
+        self.variants['gzip'] = gzip.compress(body, StaticConfig.GZIP_LEVEL, mtime=0)
+
+    def with_cache_control(self, cache_control: str) -> 'Asset':
+        """Aynı gövde ve varyantlar (yeniden sıkıştırmadan), farklı Cache-Control"""
+        asset = copy.copy(self)
+        asset.cache_control = cache_control
+        return asset
+
+    def response(self) -> Response:
+        encoding = request.accept_encodings.best_match(tuple(self.variants))
+        # Kodlama başına ayrı ETag: aynı etiket farklı baytlar için kullanılmaz
+        tag = f"{self.digest}-{encoding}" if encoding else self.digest
+        if request.if_none_match.contains(tag):
+            response = Response(status=304)
+        else:
+            response = Response(self.variants[encoding] if encoding else self.body, mimetype=self.mimetype)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+        response.set_etag(tag)
+        response.headers['Cache-Control'] = self.cache_control
+        response.vary.add('Accept-Encoding')
+        return response
+
+
+def _mimetype(name: str) -> str:
+    ext = os.path.splitext(name)[1]
+    return MIMETYPES.get(ext) or mimetypes.guess_type(name)[0] or 'application/octet-stream'
+
+
+class AssetStore:
+    """
+    Args:
+        source_dir: index.html ve yanındaki css / js dosyaları
+        url_prefix: Hash'li dosyaların URL öneki
+    """
+
+    def __init__(self, source_dir: str, url_prefix: str = StaticConfig.URL_PREFIX):
+        self.source_dir = source_dir
+        self.url_prefix = url_prefix.rstrip('/')
+        self.assets: Dict[str, Asset] = {}      # URL yolu -> Asset
+        self.fingerprints: Dict[str, str] = {}  # dosya adı -> hash'li URL
+        if os.path.isdir(source_dir):
+            self._build()
+
+    def _build(self):
+        immutable = f"public, max-age={StaticConfig.MAX_AGE}, immutable"
+        names = sorted(name for name in os.listdir(self.source_dir)
+                       if name != INDEX and os.path.isfile(os.path.join(self.source_dir, name)))
+        for name in names:
+            with open(os.path.join(self.source_dir, name), 'rb') as f:
+                body = f.read()
+            asset = Asset(body, _mimetype(name), immutable)
+            stem, ext = os.path.splitext(name)
+            url = f"{self.url_prefix}/{stem}.{asset.digest}{ext}"
+            self.assets[url] = asset
+            self.fingerprints[name] = url
+            # Eski index.html'ler için: hash'siz ad, her seferinde doğrulanır
+            self.assets[f"/{name}"] = asset.with_cache_control('no-cache')
+
+        index_path = os.path.join(self.source_dir, INDEX)
+        if os.path.isfile(index_path):
+            with open(index_path, encoding='utf-8') as f:
+                html = f.read()
+            self.assets['/'] = Asset(self.rewrite(html).encode('utf-8'), 'text/html', 'no-cache')
+
+    def rewrite(self, html: str) -> str:
+        """href="app.js?v=4" -> href="/assets/app.<hash>.js" (sorgu metni atılır)"""
+        if not self.fingerprints:
+            return html
+        pattern = re.compile(r'(\b(?:href|src)=")(?:\./)?(' +
+                             '|'.join(re.escape(name) for name in self.fingerprints) + r')(?:\?[^"]*)?"')
+        return pattern.sub(lambda m: f'{m.group(1)}{self.fingerprints[m.group(2)]}"', html)
+
+    def get(self, path: str) -> Optional[Asset]:
+        return self.assets.get(path)
+
+    def write(self, output_dir: str) -> int:
+        """Hash'li dosyaları ve .gz / .br varyantlarını diske yazar (önündeki sunucu için)"""
+        count = 0
+        for url, asset in self.assets.items():
+            if url != '/' and not url.startswith(self.url_prefix + '/'):
+                continue
+            path = os.path.join(output_dir, INDEX if url == '/' else url.lstrip('/'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            for suffix, data in (('', asset.body), ('.gz', asset.variants['gzip']),
+                                 ('.br', asset.variants.get('br'))):
+                if data is not None:
+                    with open(path + suffix, 'wb') as f:
+                        f.write(data)
+                    count += 1
+        return count
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Frontend dosyalarını hash'li adlar ve .gz / .br varyantlarıyla yazar")
+    parser.add_argument('output', help="Çıktı dizini")
+    parser.add_argument('--source', default=StaticConfig.SOURCE_DIR, help="Kaynak dizin (varsayılan: StaticConfig.SOURCE_DIR)")
+    args = parser.parse_args(argv)
+
+    store = AssetStore(args.source)
+    if '/' not in store.assets:
+        print(f"❌ {os.path.join(args.source, INDEX)} bulunamadı")
+        return 1
+    count = store.write(args.output)
+    print(f"📦 {count} dosya yazıldı: {args.output}")
+    for name, url in store.fingerprints.items():
+        print(f"   {name} -> {url}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
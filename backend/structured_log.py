@@ -0,0 +1,124 @@
+"""
+STRUCTURED_LOG.PY - Arka Planda Yazılan, Seviyeli ve Yapılandırılmış Loglama
+
+İstek thread'i log kaydını sadece sınırlı bir kuyruğa bırakır
+(QueueHandler); stdout/stderr'e yazma ayrı bir thread'de (QueueListener)
+yapılır. Çıktı pipe'a gidip yavaşladığında worker'lar beklemez: kuyruk
+doluysa kayıt atılır ve `dropped` sayacı artar.
+
+- Seviyeler: LogConfig.LEVEL altındaki çağrılar isEnabledFor kontrolünde
+  biter (kayıt oluşturulmaz, mesaj biçimlenmez)
+- Yapılandırılmış alanlar: extra={...} ile verilen alanlar (repository,
+  method, rows, duration_ms, ...) metin çıktısında key=value, JSON
+  çıktısında ayrı anahtar olarak yazılır
+- Örnekleme: sık tekrarlanan mesajlar için sampled(key, n) her n
+  kayıttan birini geçirir; geçen kayda sample=n alanı eklenir
+"""
+import atexit
+import itertools
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+
+from config import LogConfig
+
+_STANDARD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class StructuredFormatter(logging.Formatter):
+    """Standart LogRecord alanları dışındaki (extra) alanları mesajın sonuna ekler"""
+
+    def __init__(self, json_output: bool = False):
+        super().__init__('%(asctime)s %(levelname)s %(name)s %(message)s')
+        self.json_output = json_output
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {key: value for key, value in vars(record).items() if key not in _STANDARD_ATTRS}
+        if self.json_output:
+            return json.dumps({
+                "time": self.formatTime(record),
+                "level": record.levelname,
+                "logger": record.name,
+                "message": record.getMessage(),
+                **fields
+            }, ensure_ascii=False, default=str)
+        line = super().format(record)
+        if fields:
+            line += ' | ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Kuyruk doluysa beklemek yerine kaydı atar"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_lock = threading.Lock()
+_handler = None
+_listener = None
+_counters = {}
+
+
+def configure(level: str = None, json_output: bool = None, stream=None):
+    """
+    Kök logger'a kuyruk handler'ı bağlar ve yazıcı thread'i başlatır (süreç başına bir kez).
+
+    Args:
+        level: 'DEBUG' / 'INFO' / 'WARNING' / 'ERROR' (varsayılan LogConfig.LEVEL)
+        json_output: Satır başına bir JSON nesnesi (varsayılan LogConfig.JSON)
+        stream: Çıktı akışı (varsayılan stderr)
+    """
+    global _handler, _listener
+    with _lock:
+        root = logging.getLogger()
+        root.setLevel(level or LogConfig.LEVEL)
+        if _handler is not None:
+            return
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(StructuredFormatter(LogConfig.JSON if json_output is None else json_output))
+        _handler = _DroppingQueueHandler(queue.Queue(LogConfig.QUEUE_SIZE))
+        _listener = logging.handlers.QueueListener(_handler.queue, output, respect_handler_level=True)
+        root.addHandler(_handler)
+        _listener.start()
+        atexit.register(shutdown)
+
+
+def shutdown():
+    """Kuyrukta kalan kayıtları yazar ve yazıcı thread'i durdurur"""
+    global _handler, _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            logging.getLogger().removeHandler(_handler)
+        _handler = _listener = None
+
+
+def sampled(key, n: int) -> bool:
+    """`key` için her n çağrıdan birinde (ilki dahil) True; kilitsiz (itertools.count atomiktir)"""
+    if n <= 1:
+        return True
+    counter = _counters.get(key)
+    if counter is None:
+        counter = _counters.setdefault(key, itertools.count())
+    return next(counter) % n == 0
+
+
+def stats() -> dict:
+    return {
+        "configured": _handler is not None,
+        "level": logging.getLevelName(logging.getLogger().getEffectiveLevel()),
+        "queued": _handler.queue.qsize() if _handler else 0,
+        "dropped": _handler.dropped if _handler else 0
+    }
@@ -29,73 +29,62 @@ AS
 BEGIN
    SET NOCOUNT ON;
     
-    -- Değişkenleri tanımla
-    DECLARE @TransactionId INT;         -- İşlem ID'si
-    DECLARE @ReturnDate DATETIME;        -- Planlanan son iade tarihi
-    DECLARE @RealReturnDate DATETIME;    -- Gerçek iade tarihi (yeni değer)
-    DECLARE @OldRealReturnDate DATETIME; -- Gerçek iade tarihi (eski değer)
-    DECLARE @DelayMinutes INT;           -- Gecikme süresi (dakika)
-    DECLARE @PenaltyAmount DECIMAL(10,2); -- Ceza tutarı (TL)
-  
+    -- İade tarihine dokunmayan UPDATE'lerde yapılacak iş yok
+    IF NOT UPDATE(RealReturnDate) RETURN;
+    
+    DECLARE @PenaltyCount INT;           -- Oluşturulan ceza sayısı
+    
+    /*
+    INSERTED ve DELETED tabloları UPDATE'in etkilediği TÜM satırları içerir
+    - Değişkenlere okumak sadece bir satırı görür: çok satırlı
+      UPDATE'lerde cezalar kaybolurdu
+    - Bu yüzden cezalar tek INSERT...SELECT ile yazılır (set-based)
+    - Koşul: eski RealReturnDate NULL, yeni değer dolu ve son tarihten sonra
+    - Gecikme en az 1 dakika sayılır
+    */
+    INSERT INTO Penalties (
+        BorrowTransactionsId, 
+        NumberOfDay, 
+        Amount, 
+        CreatedDate
+    )
     SELECT 
-        @TransactionId = i.Id,
-        @ReturnDate = i.ReturnDate,
-        @RealReturnDate = i.RealReturnDate
-    FROM INSERTED i;
+        i.Id, 
+        m.DelayMinutes, 
+        m.DelayMinutes * 5.0, 
+        GETDATE()
+    FROM INSERTED i
+    INNER JOIN DELETED d ON i.Id = d.Id
+    CROSS APPLY (
+        SELECT IIF(DATEDIFF(MINUTE, i.ReturnDate, i.RealReturnDate) < 1, 1,
+                   DATEDIFF(MINUTE, i.ReturnDate, i.RealReturnDate)) AS DelayMinutes
+    ) m
+    WHERE d.RealReturnDate IS NULL 
+      AND i.RealReturnDate IS NOT NULL 
+      AND i.RealReturnDate > i.ReturnDate;
+    
+    SET @PenaltyCount = @@ROWCOUNT;
     
     /*
-    DELETED tablosundan eski değeri al
-    - UPDATE öncesi değerler burada
-    - Karşılaştırma için kullanıyoruz
+    İade edilen kitapların ödünç sayacını (Books.ActiveLoans) düş
+    - sp_BorrowBook sayacı artırır; müsait stok = StockNumber - ActiveLoans
+    - Çok satırlı UPDATE'lerde kitap başına iade sayısı kadar düşer
     */
-    SELECT @OldRealReturnDate = d.RealReturnDate
-    FROM DELETED d;
+    UPDATE b
+    SET b.ActiveLoans = b.ActiveLoans - r.ReturnedCount
+    FROM Books b
+    INNER JOIN (
+        SELECT i.BookId, COUNT(*) AS ReturnedCount
+        FROM INSERTED i
+        INNER JOIN DELETED d ON i.Id = d.Id
+        WHERE d.RealReturnDate IS NULL AND i.RealReturnDate IS NOT NULL
+        GROUP BY i.BookId
+    ) r ON b.Id = r.BookId;
     
     -- Debug çıktıları (SSMS'de Messages sekmesinde görünür)
     PRINT '========================================';
     PRINT 'TRIGGER ÇALIŞTI: trg_CalculatePenalty';
-    PRINT '========================================';
-    PRINT 'İşlem ID: ' + CAST(@TransactionId AS VARCHAR);
-    PRINT 'Eski RealReturnDate: ' + ISNULL(CAST(@OldRealReturnDate AS VARCHAR), 'NULL');
-    PRINT 'Yeni RealReturnDate: ' + ISNULL(CAST(@RealReturnDate AS VARCHAR), 'NULL');
-    PRINT 'Planlanan ReturnDate: ' + CAST(@ReturnDate AS VARCHAR);
-   
-    IF @OldRealReturnDate IS NULL 
-       AND @RealReturnDate IS NOT NULL 
-       AND @RealReturnDate > @ReturnDate
-    BEGIN
-        PRINT '----------------------------------------';
-        PRINT 'GECİKME TESPİT EDİLDİ!';
-        
-      
-        SET @DelayMinutes = DATEDIFF(MINUTE, @ReturnDate, @RealReturnDate);
-        
-        SET @PenaltyAmount = @DelayMinutes * 5.0;
-        
-        PRINT 'Gecikme Süresi: ' + CAST(@DelayMinutes AS VARCHAR) + ' dakika';
-        PRINT 'Ceza Tutarı: ' + CAST(@PenaltyAmount AS VARCHAR) + ' TL';
-        
-        INSERT INTO Penalties (
-            BorrowTransactionsId, 
-            NumberOfDay, 
-            Amount, 
-            CreatedDate
-        )
-        VALUES (
-            @TransactionId, 
-            @DelayMinutes, 
-            @PenaltyAmount, 
-            GETDATE()
-        );
-        
-        PRINT 'CEZA KAYDI OLUŞTURULDU!';
-        PRINT '----------------------------------------';
-    END
-    ELSE
-    BEGIN
-        PRINT 'Gecikme yok veya zaten iade edilmiş.';
-    END
-    
+    PRINT 'Oluşturulan ceza kaydı: ' + CAST(@PenaltyCount AS VARCHAR);
     PRINT '========================================';
 END
 GO
@@ -125,160 +114,116 @@ GO
 
 -- Procedure'ı oluştur
 CREATE PROCEDURE sp_BorrowBook
-    @BookId INT,                      -- Ödünç alınacak kitap
-    @UserId INT,                      -- Ödünç alan kullanıcı
-    @LoanDurationMinutes INT = 1      -- Ödünç süresi (varsayılan 1 dakika - test için)
+    @BookId INT,                            -- Ödünç alınacak kitap
+    @UserId INT,                            -- Ödünç alan kullanıcı
+    @LoanDurationMinutes INT = 1,           -- Ödünç süresi (varsayılan 1 dakika - test için)
+    @NewTransactionId INT OUTPUT,           -- Yeni işlem ID'si (başarısızsa 0)
+    @ErrorMessage NVARCHAR(500) OUTPUT      -- Hata mesajı (başarılıysa boş)
 AS
 BEGIN
     SET NOCOUNT ON;
+    SET XACT_ABORT ON;
     
     -- Değişkenler
-    DECLARE @StockNumber INT;         -- Toplam stok sayısı
-    DECLARE @BorrowedCount INT;       -- Ödünçte olan sayısı
-    DECLARE @Available INT;           -- Müsait stok
-    DECLARE @AlreadyBorrowed INT;     -- Kullanıcı aynı kitabı almış mı
-    DECLARE @HasPenalty INT;          -- Ödenmemiş ceza var mı
+    DECLARE @AvailableStock INT;      -- Müsait stok (StockNumber - ActiveLoans)
+    DECLARE @BorrowDate DATETIME;     -- Ödünç tarihi
     DECLARE @ReturnDate DATETIME;     -- Son iade tarihi
-    DECLARE @NewTransactionId INT;    -- Yeni işlem ID'si
-    
-    PRINT '========================================';
-    PRINT 'sp_BorrowBook ÇALIŞIYOR';
-    PRINT 'BookId: ' + CAST(@BookId AS VARCHAR);
-    PRINT 'UserId: ' + CAST(@UserId AS VARCHAR);
-    PRINT '========================================';
-    
-    /*
-    KONTROL 1: Kitap var mı?
-    - Books tablosunda ID ile arama yapılır
-    - Bulunamazsa @StockNumber NULL kalır
-    */
-    SELECT @StockNumber = StockNumber 
-    FROM Books 
-    WHERE Id = @BookId;
-    
-    IF @StockNumber IS NULL
-    BEGIN
-        PRINT 'HATA: Kitap bulunamadı!';
-        -- Sonuç döndür: Başarısız
-        SELECT 0 AS Success, 
-               'Kitap bulunamadı' AS Message, 
-               NULL AS TransactionId;
-        RETURN; -- Procedure'dan çık
-    END
-    
-    PRINT 'Kitap bulundu. Toplam stok: ' + CAST(@StockNumber AS VARCHAR);
-    
-    /*
-    KONTROL 2: Stokta kitap var mı?
-    - Ödünçte olan kitapları say (RealReturnDate IS NULL = iade edilmemiş)
-    - Müsait = Toplam - Ödünçte olan
-    */
-    SELECT @BorrowedCount = COUNT(*) 
-    FROM BorrowTransactions 
-    WHERE BookId = @BookId 
-      AND RealReturnDate IS NULL;  -- İade edilmemiş olanlar
-    
-    SET @Available = @StockNumber - @BorrowedCount;
-    
-    PRINT 'Ödünçte olan: ' + CAST(@BorrowedCount AS VARCHAR);
-    PRINT 'Müsait stok: ' + CAST(@Available AS VARCHAR);
-    
-    IF @Available <= 0
-    BEGIN
-        PRINT 'HATA: Kitap stokta yok!';
-        SELECT 0 AS Success, 
-               'Kitap stokta yok' AS Message, 
-               NULL AS TransactionId;
-        RETURN;
-    END
-    
-    /*
-    KONTROL 3: Kullanıcı aynı kitabı zaten almış mı?
-    - Aynı kullanıcı aynı kitabı birden fazla kez alamaz
-    - İade etmeden yeni ödünç yapamaz
-    */
-    SELECT @AlreadyBorrowed = COUNT(*) 
-    FROM BorrowTransactions 
-    WHERE BookId = @BookId 
-      AND UserId = @UserId 
-      AND RealReturnDate IS NULL;  -- Henüz iade etmemiş
-    
-    IF @AlreadyBorrowed > 0
-    BEGIN
-        PRINT 'HATA: Kullanıcı bu kitabı zaten almış!';
-        SELECT 0 AS Success, 
-               'Bu kitabı zaten ödünç aldınız' AS Message, 
-               NULL AS TransactionId;
-        RETURN;
-    END
-    
-    /*
-    KONTROL 4: Ödenmemiş ceza var mı?
-    - Cezası olan kullanıcı yeni kitap alamaz
-    - Önce cezasını ödemeli
-    */
-    SELECT @HasPenalty = COUNT(*) 
-    FROM Penalties p
-    INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
-    WHERE bt.UserId = @UserId;
-    
-    IF @HasPenalty > 0
-    BEGIN
-        PRINT 'HATA: Kullanıcının ödenmemiş cezası var!';
-        SELECT 0 AS Success, 
-               'Ödenmemiş cezanız var. Önce cezayı ödeyin.' AS Message, 
-               NULL AS TransactionId;
-        RETURN;
-    END
-    
-    /*
-    TÜM KONTROLLER GEÇTİ - ÖDÜNÇ KAYDI OLUŞTUR
-    
-    DATEADD fonksiyonu:
-    - Tarihe belirtilen miktarda zaman ekler
-    - DATEADD(birim, miktar, tarih)
-    - Örnek: DATEADD(MINUTE, 1, GETDATE()) = Şu andan 1 dakika sonra
-    
-    GETDATE():
-    - Şu anki tarih ve saati döndürür
-    - SQL Server'ın sistem saatini kullanır
-    */
-    SET @ReturnDate = DATEADD(MINUTE, @LoanDurationMinutes, GETDATE());
-    
-    PRINT 'Ödünç tarihi: ' + CONVERT(VARCHAR, GETDATE(), 120);
-    PRINT 'Son iade tarihi: ' + CONVERT(VARCHAR, @ReturnDate, 120);
-    
-    -- BorrowTransactions tablosuna kayıt ekle
-    INSERT INTO BorrowTransactions (
-        BookId, 
-        UserId, 
-        BorrowDate, 
-        ReturnDate, 
-        RealReturnDate
-    )
-    VALUES (
-        @BookId, 
-        @UserId, 
-        GETDATE(),        -- Şu an
-        @ReturnDate,      -- Son iade tarihi
-        NULL              -- Henüz iade edilmedi
-    );
+    DECLARE @HasActiveBorrow INT;     -- Kullanıcı aynı kitabı almış mı
+    DECLARE @HasUnpaidPenalty INT;    -- Ödenmemiş ceza var mı
     
-    /*
-    SCOPE_IDENTITY():
-    - Son INSERT işleminde oluşturulan IDENTITY değerini döndürür
-    - Sadece mevcut scope'taki (bu procedure) değeri döndürür
-    - @@IDENTITY'den daha güvenli (trigger'lardan etkilenmez)
-    */
-    SET @NewTransactionId = SCOPE_IDENTITY();
-    
-    PRINT 'BAŞARILI! Yeni işlem ID: ' + CAST(@NewTransactionId AS VARCHAR);
-    PRINT '========================================';
+    SET @NewTransactionId = 0;
+    SET @ErrorMessage = '';
+    SET @BorrowDate = GETDATE();
+    SET @ReturnDate = DATEADD(MINUTE, @LoanDurationMinutes, @BorrowDate);
     
-    -- Başarılı sonuç döndür
-    SELECT 1 AS Success, 
-           'Kitap ödünç alındı. Son iade: ' + CONVERT(VARCHAR, @ReturnDate, 120) AS Message, 
-           @NewTransactionId AS TransactionId;
+    BEGIN TRY
+        BEGIN TRANSACTION;
+        
+        /*
+        KONTROL 1-2: Kitap var mı, stokta var mı?
+        - Books.ActiveLoans ödünçteki kopya sayacıdır, geçmiş tablosu taranmaz
+        - UPDLOCK: aynı kitaba eşzamanlı ödünç istekleri sıraya girer,
+          son kopya iki kişiye verilmez
+        - Kitap bulunamazsa @AvailableStock NULL kalır
+        */
+        SELECT @AvailableStock = StockNumber - ActiveLoans
+        FROM Books WITH (UPDLOCK, ROWLOCK)
+        WHERE Id = @BookId;
+        
+        IF @AvailableStock IS NULL
+        BEGIN
+            SET @ErrorMessage = 'Kitap bulunamadı';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        IF @AvailableStock <= 0
+        BEGIN
+            SET @ErrorMessage = 'Kitap stokta yok';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        /*
+        KONTROL 3: Kullanıcı aynı kitabı zaten almış mı?
+        - İade etmeden aynı kitabı tekrar alamaz
+        */
+        SELECT @HasActiveBorrow = COUNT(*) 
+        FROM BorrowTransactions 
+        WHERE UserId = @UserId AND BookId = @BookId AND RealReturnDate IS NULL;
+        
+        IF @HasActiveBorrow > 0
+        BEGIN
+            SET @ErrorMessage = 'Bu kitabı zaten ödünç almışsınız';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        /*
+        KONTROL 4: Ödenmemiş ceza var mı?
+        - Cezası olan kullanıcı önce cezasını ödemeli
+        */
+        SELECT @HasUnpaidPenalty = COUNT(*) 
+        FROM Penalties p
+        INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
+        WHERE bt.UserId = @UserId;
+        
+        IF @HasUnpaidPenalty > 0
+        BEGIN
+            SET @ErrorMessage = 'Ödenmemiş cezanız var. Önce cezanızı ödeyin.';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        /*
+        TÜM KONTROLLER GEÇTİ - ÖDÜNÇ KAYDI OLUŞTUR
+        - SCOPE_IDENTITY(): bu procedure'daki son INSERT'in IDENTITY değeri
+          (@@IDENTITY'den güvenli, trigger'lardan etkilenmez)
+        - Ödünç sayacı aynı transaction içinde artırılır
+        */
+        INSERT INTO BorrowTransactions (BookId, UserId, BorrowDate, ReturnDate)
+        VALUES (@BookId, @UserId, @BorrowDate, @ReturnDate);
+        
+        SET @NewTransactionId = SCOPE_IDENTITY();
+        
+        UPDATE Books SET ActiveLoans = ActiveLoans + 1 WHERE Id = @BookId;
+        
+        COMMIT TRANSACTION;
+        
+        -- Oluşan işlemi JOIN'li olarak döndür (uygulama tekrar sorgulamasın)
+        SELECT bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
+               ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
+        FROM BorrowTransactions bt
+        LEFT JOIN Books b ON bt.BookId = b.Id
+        LEFT JOIN Users u ON bt.UserId = u.Id
+        WHERE bt.Id = @NewTransactionId;
+        
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+        SET @ErrorMessage = ERROR_MESSAGE();
+    END CATCH
 END
 GO
 
@@ -307,8 +252,8 @@ Kontroller:
 Önemli:
     - Bu procedure RealReturnDate'i günceller
     - UPDATE işlemi trg_CalculatePenalty trigger'ını tetikler
-    - Trigger otomatik olarak gecikme cezasını hesaplar
-    - Procedure, trigger çalıştıktan sonra ceza tutarını kontrol eder
+    - Trigger otomatik olarak gecikme cezasını hesaplar ve ödünç sayacını düşer
+    - Sonuç @Success / @Message ile, güncellenen işlem JOIN'li satır olarak döner
 ================================================================================
 */
 
@@ -322,109 +267,106 @@ GO
 
 -- Procedure'ı oluştur
 CREATE PROCEDURE sp_ReturnBook
-    @TransactionId INT,   -- İade edilecek işlem
-    @UserId INT           -- İade eden kullanıcı
+    @TransactionId INT,                     -- İade edilecek işlem
+    @UserId INT,                            -- İade eden kullanıcı
+    @Success BIT OUTPUT,                    -- 1: iade edildi
+    @Message NVARCHAR(500) OUTPUT           -- Sonuç / hata mesajı
 AS
 BEGIN
     SET NOCOUNT ON;
+    SET XACT_ABORT ON;
     
-    DECLARE @OwnerUserId INT;         -- İşlemin sahibi
-    DECLARE @RealReturnDate DATETIME; -- Mevcut iade tarihi
-    DECLARE @PenaltyAmount DECIMAL(10,2); -- Oluşan ceza
-    
-    PRINT '========================================';
-    PRINT 'sp_ReturnBook ÇALIŞIYOR';
-    PRINT 'TransactionId: ' + CAST(@TransactionId AS VARCHAR);
-    PRINT 'UserId: ' + CAST(@UserId AS VARCHAR);
-    PRINT '========================================';
-    
-    /*
-    KONTROL 1: İşlem var mı ve kime ait?
-    */
-    SELECT @OwnerUserId = UserId, 
-           @RealReturnDate = RealReturnDate
-    FROM BorrowTransactions 
-    WHERE Id = @TransactionId;
-    
-    IF @OwnerUserId IS NULL
-    BEGIN
-        PRINT 'HATA: İşlem bulunamadı!';
-        SELECT 0 AS Success, 
-               'İşlem bulunamadı' AS Message, 
-               NULL AS PenaltyAmount;
-        RETURN;
-    END
-    
-    /*
-    KONTROL 2: Kullanıcı kontrolü
-    - Sadece kendi ödünç aldığı kitabı iade edebilir
-    */
-    IF @OwnerUserId != @UserId
-    BEGIN
-        PRINT 'HATA: Bu işlem kullanıcıya ait değil!';
-        SELECT 0 AS Success, 
-               'Bu işlem size ait değil' AS Message, 
-               NULL AS PenaltyAmount;
-        RETURN;
-    END
-    
-    /*
-    KONTROL 3: Zaten iade edilmiş mi?
-    - RealReturnDate NULL değilse zaten iade edilmiş
-    */
-    IF @RealReturnDate IS NOT NULL
-    BEGIN
-        PRINT 'HATA: Kitap zaten iade edilmiş!';
-        SELECT 0 AS Success, 
-               'Bu kitap zaten iade edilmiş' AS Message, 
-               NULL AS PenaltyAmount;
-        RETURN;
-    END
-    
-    /*
-    İADE İŞLEMİ
-    - RealReturnDate'i şu anki tarih/saat ile güncelle
-    - Bu UPDATE işlemi trg_CalculatePenalty TRIGGER'ını tetikler!
-    - Trigger, gecikme varsa otomatik olarak Penalties tablosuna kayıt ekler
-    */
-    PRINT 'İade işlemi yapılıyor...';
-    PRINT 'Gerçek iade tarihi: ' + CONVERT(VARCHAR, GETDATE(), 120);
-    
-    UPDATE BorrowTransactions 
-    SET RealReturnDate = GETDATE()
-    WHERE Id = @TransactionId;
-    
-    PRINT 'UPDATE tamamlandı. Trigger çalışmış olmalı.';
+    DECLARE @ActualUserId INT;              -- İşlemin sahibi
+    DECLARE @RealReturnDate DATETIME;       -- Mevcut iade tarihi
+    DECLARE @ReturnDate DATETIME;           -- Son iade tarihi
+    DECLARE @BookTitle NVARCHAR(200);       -- Mesaj için kitap adı
+    DECLARE @DelayMinutes INT;              -- Gecikme süresi
     
-    /*
-    CEZA KONTROLÜ
-    - Trigger çalıştıktan sonra Penalties tablosunu kontrol et
-    - Eğer bu işlem için ceza kaydı varsa, tutarını al
-    */
-    SELECT @PenaltyAmount = Amount 
-    FROM Penalties 
-    WHERE BorrowTransactionsId = @TransactionId;
+    SET @Success = 0;
+    SET @Message = '';
     
-    -- Sonucu döndür
-    IF @PenaltyAmount IS NOT NULL AND @PenaltyAmount > 0
-    BEGIN
-        PRINT 'UYARI: Gecikme cezası oluştu!';
-        PRINT 'Ceza tutarı: ' + CAST(@PenaltyAmount AS VARCHAR) + ' TL';
+    BEGIN TRY
+        /*
+        KONTROL 1: İşlem var mı ve kime ait?
+        */
+        SELECT 
+            @ActualUserId = bt.UserId,
+            @RealReturnDate = bt.RealReturnDate,
+            @ReturnDate = bt.ReturnDate,
+            @BookTitle = b.Title
+        FROM BorrowTransactions bt
+        INNER JOIN Books b ON bt.BookId = b.Id
+        WHERE bt.Id = @TransactionId;
         
-        SELECT 1 AS Success, 
-               'Kitap iade edildi. Gecikme cezası: ' + CAST(@PenaltyAmount AS VARCHAR) + ' TL' AS Message, 
-               @PenaltyAmount AS PenaltyAmount;
-    END
-    ELSE
-    BEGIN
-        PRINT 'Zamanında iade edildi, ceza yok.';
+        IF @ActualUserId IS NULL
+        BEGIN
+            SET @Message = 'İşlem bulunamadı';
+            RETURN;
+        END
         
-        SELECT 1 AS Success, 
-               'Kitap başarıyla iade edildi' AS Message, 
-               0 AS PenaltyAmount;
-    END
-    
-    PRINT '========================================';
+        /*
+        KONTROL 2: Kullanıcı kontrolü
+        - Sadece kendi ödünç aldığı kitabı iade edebilir
+        */
+        IF @ActualUserId <> @UserId
+        BEGIN
+            SET @Message = 'Bu işlem size ait değil';
+            RETURN;
+        END
+        
+        /*
+        KONTROL 3: Zaten iade edilmiş mi?
+        */
+        IF @RealReturnDate IS NOT NULL
+        BEGIN
+            SET @Message = 'Kitap zaten iade edilmiş';
+            RETURN;
+        END
+        
+        /*
+        İADE İŞLEMİ
+        - Bu UPDATE trg_CalculatePenalty TRIGGER'ını tetikler: gecikme
+          varsa ceza yazılır ve kitabın ödünç sayacı (ActiveLoans) düşer
+        */
+        UPDATE BorrowTransactions 
+        SET RealReturnDate = GETDATE()
+        WHERE Id = @TransactionId;
+        
+        /*
+        MESAJ
+        - Gecikme trigger ile aynı kuralla hesaplanır (en az 1 dakika)
+        */
+        DECLARE @NewRealReturnDate DATETIME;
+        SELECT @NewRealReturnDate = RealReturnDate FROM BorrowTransactions WHERE Id = @TransactionId;
+        
+        IF @NewRealReturnDate > @ReturnDate
+        BEGIN
+            SET @DelayMinutes = DATEDIFF(MINUTE, @ReturnDate, @NewRealReturnDate);
+            IF @DelayMinutes < 1 SET @DelayMinutes = 1;
+            
+            SET @Message = '''' + @BookTitle + ''' iade edildi. ' + 
+                          CAST(@DelayMinutes AS VARCHAR) + ' dakika gecikme için ' + 
+                          CAST(@DelayMinutes * 5 AS VARCHAR) + ' TL ceza kesildi!';
+        END
+        ELSE
+        BEGIN
+            SET @Message = '''' + @BookTitle + ''' başarıyla iade edildi. Teşekkürler!';
+        END
+        
+        -- Güncellenen işlemi JOIN'li olarak döndür (uygulama tekrar sorgulamasın)
+        SELECT bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
+               ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
+        FROM BorrowTransactions bt
+        LEFT JOIN Books b ON bt.BookId = b.Id
+        LEFT JOIN Users u ON bt.UserId = u.Id
+        WHERE bt.Id = @TransactionId;
+        
+        SET @Success = 1;
+        
+    END TRY
+    BEGIN CATCH
+        SET @Message = ERROR_MESSAGE();
+    END CATCH
 END
 GO
 
@@ -551,15 +493,19 @@ trg_CalculatePenalty
 
 STORED PROCEDURES:
 ------------------
-sp_BorrowBook(@BookId, @UserId, @LoanDurationMinutes)
+sp_BorrowBook(@BookId, @UserId, @LoanDurationMinutes, @NewTransactionId OUT, @ErrorMessage OUT)
     - Kitap ödünç alma
-    - Stok, mükerrer ödünç, ceza kontrolleri
-    - BorrowTransactions'a kayıt ekler
+    - Stok (ActiveLoans, UPDLOCK), mükerrer ödünç, ceza kontrolleri
+    - BorrowTransactions'a kayıt ekler, oluşan işlemi döndürür
 
-sp_ReturnBook(@TransactionId, @UserId)
+sp_ReturnBook(@TransactionId, @UserId, @Success OUT, @Message OUT)
     - Kitap iade
     - RealReturnDate günceller
-    - Trigger'ı tetikler
+    - Trigger'ı tetikler, güncellenen işlemi döndürür
+
+sp_ReturnBooks(@TransactionIds, @UserId = NULL)
+    - Toplu iade (TransactionIdList TVP)
+    - Tek UPDATE, işlem başına sonuç satırı
 
 sp_PayPenalty(@PenaltyId, @UserId)
     - Ceza ödeme
@@ -579,7 +525,14 @@ SQL BİLEŞENLERİ:
 - trg_CalculatePenalty: Otomatik ceza hesaplama (TRIGGER)
 - sp_BorrowBook: Kitap ödünç alma (PROCEDURE)
 - sp_ReturnBook: Kitap iade etme (PROCEDURE)
+- sp_ReturnBooks: Toplu iade etme, TransactionIdList TVP (PROCEDURE)
 - sp_PayPenalty: Ceza ödeme (PROCEDURE)
+
+MIGRATION'LAR:
+Bu script şemanın başlangıç sürümüdür. Kurulumdan sonra (ve canlı
+veritabanını güncellerken) backend/ dizininden:
+    python migrate.py up
+migrations/sqlserver/ altındaki bekleyen sürümleri uygular.
 =============================================================================
 */
 
@@ -631,6 +584,8 @@ CREATE TABLE Books (
     CategoryId INT NOT NULL,
     StockNumber INT NOT NULL DEFAULT 1,
     YearOfpublication INT,
+    ActiveLoans INT NOT NULL DEFAULT 0,  -- Ödünçteki adet (sp_BorrowBook / trigger'lar günceller)
+    CONSTRAINT CK_Books_ActiveLoans CHECK (ActiveLoans >= 0),
     CONSTRAINT FK_Books_Authors FOREIGN KEY (AuthorId) REFERENCES Authors(Id) ON DELETE CASCADE,
     CONSTRAINT FK_Books_Categories FOREIGN KEY (CategoryId) REFERENCES Categories(Id) ON DELETE CASCADE
 );
@@ -648,6 +603,27 @@ CREATE TABLE BorrowTransactions (
 );
 GO
 
+-- Açık ödünçler (iade edilmemiş) için filtreli index:
+-- stok ve "aynı kitabı zaten almış mı" kontrolleri index lookup olur,
+-- gecikmiş ödünç sayımı (ReturnDate < GETDATE()) sadece bu index'i tarar
+CREATE NONCLUSTERED INDEX IX_BorrowTransactions_OpenLoans
+ON BorrowTransactions (BookId, UserId)
+INCLUDE (ReturnDate)
+WHERE RealReturnDate IS NULL;
+GO
+
+-- İşlem listesi keyset sayfalaması: ORDER BY BorrowDate DESC, Id DESC
+CREATE NONCLUSTERED INDEX IX_BorrowTransactions_BorrowDate
+ON BorrowTransactions (BorrowDate DESC, Id DESC);
+GO
+
+-- Üye panosu / işlem geçmişi: kullanıcının işlemleri seek ile okunur,
+-- sayaçlar ve son işlemler ana tabloya dönmeden bu index'ten gelir
+CREATE NONCLUSTERED INDEX IX_BorrowTransactions_User
+ON BorrowTransactions (UserId, BorrowDate DESC, Id DESC)
+INCLUDE (BookId, ReturnDate, RealReturnDate);
+GO
+
 CREATE TABLE Penalties (
     Id INT PRIMARY KEY IDENTITY(1,1),
     BorrowTransactionsId INT NOT NULL,
@@ -658,6 +634,12 @@ CREATE TABLE Penalties (
 );
 GO
 
+-- Kullanıcının ceza toplamı: işlemden cezaya JOIN index seek olur
+CREATE NONCLUSTERED INDEX IX_Penalties_BorrowTransaction
+ON Penalties (BorrowTransactionsId)
+INCLUDE (Amount);
+GO
+
 -- =============================================
 -- TRIGGER: trg_CalculatePenalty
 -- İade yapıldığında otomatik ceza hesaplar
@@ -669,37 +651,60 @@ AS
 BEGIN
     SET NOCOUNT ON;
     
-    DECLARE @TransactionId INT;
-    DECLARE @ReturnDate DATETIME;
-    DECLARE @RealReturnDate DATETIME;
-    DECLARE @OldRealReturnDate DATETIME;
-    DECLARE @DelayMinutes INT;
-    DECLARE @PenaltyAmount DECIMAL(10,2);
+    -- İade tarihine dokunmayan UPDATE'lerde yapılacak iş yok
+    IF NOT UPDATE(RealReturnDate) RETURN;
+    
     DECLARE @PenaltyPerMinute DECIMAL(10,2) = 5.00; -- 5 TL/dakika
     
-    SELECT 
-        @TransactionId = i.Id,
-        @ReturnDate = i.ReturnDate,
-        @RealReturnDate = i.RealReturnDate,
-        @OldRealReturnDate = d.RealReturnDate
+    -- RealReturnDate NULL'dan değere geçen (iade edilen) ve gecikmiş HER satır
+    -- için bir ceza: tek INSERT...SELECT, çok satırlı UPDATE'lerde ceza kaybolmaz
+    INSERT INTO Penalties (BorrowTransactionsId, NumberOfDay, Amount, CreatedDate)
+    SELECT i.Id, m.DelayMinutes, m.DelayMinutes * @PenaltyPerMinute, GETDATE()
     FROM inserted i
-    INNER JOIN deleted d ON i.Id = d.Id;
+    INNER JOIN deleted d ON i.Id = d.Id
+    CROSS APPLY (
+        SELECT IIF(DATEDIFF(MINUTE, i.ReturnDate, i.RealReturnDate) < 1, 1,
+                   DATEDIFF(MINUTE, i.ReturnDate, i.RealReturnDate)) AS DelayMinutes
+    ) m
+    WHERE d.RealReturnDate IS NULL
+      AND i.RealReturnDate IS NOT NULL
+      AND i.RealReturnDate > i.ReturnDate;
     
-    -- RealReturnDate NULL'dan değere geçtiyse (iade yapılıyor)
-    IF @OldRealReturnDate IS NULL AND @RealReturnDate IS NOT NULL
-    BEGIN
-        -- Gecikme var mı?
-        IF @RealReturnDate > @ReturnDate
-        BEGIN
-            SET @DelayMinutes = DATEDIFF(MINUTE, @ReturnDate, @RealReturnDate);
-            IF @DelayMinutes < 1 SET @DelayMinutes = 1;
-            
-            SET @PenaltyAmount = @DelayMinutes * @PenaltyPerMinute;
-            
-            INSERT INTO Penalties (BorrowTransactionsId, NumberOfDay, Amount, CreatedDate)
-            VALUES (@TransactionId, @DelayMinutes, @PenaltyAmount, GETDATE());
-        END
-    END
+    -- İade edilen kitapların ödünç sayacını düş (çok satırlı UPDATE'lerde de doğru)
+    UPDATE b
+    SET b.ActiveLoans = b.ActiveLoans - r.ReturnedCount
+    FROM Books b
+    INNER JOIN (
+        SELECT i.BookId, COUNT(*) AS ReturnedCount
+        FROM inserted i
+        INNER JOIN deleted d ON i.Id = d.Id
+        WHERE d.RealReturnDate IS NULL AND i.RealReturnDate IS NOT NULL
+        GROUP BY i.BookId
+    ) r ON b.Id = r.BookId;
+END;
+GO
+
+-- =============================================
+-- TRIGGER: trg_ReleaseActiveLoans
+-- Açık ödünç kaydı silinirse (kullanıcı silme cascade'i dahil)
+-- kitabın ödünç sayacını düşer
+-- =============================================
+CREATE TRIGGER trg_ReleaseActiveLoans
+ON BorrowTransactions
+AFTER DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    UPDATE b
+    SET b.ActiveLoans = b.ActiveLoans - r.OpenCount
+    FROM Books b
+    INNER JOIN (
+        SELECT BookId, COUNT(*) AS OpenCount
+        FROM deleted
+        WHERE RealReturnDate IS NULL
+        GROUP BY BookId
+    ) r ON b.Id = r.BookId;
 END;
 GO
 
@@ -732,21 +737,19 @@ BEGIN
     BEGIN TRY
         BEGIN TRANSACTION;
         
-        -- Kitap var mı?
-        IF NOT EXISTS (SELECT 1 FROM Books WHERE Id = @BookId)
+        -- Kitap var mı, stokta var mı? (ActiveLoans sayacı - geçmiş tablosu taranmaz)
+        -- UPDLOCK: aynı kitaba eşzamanlı ödünç istekleri sıraya girer
+        SELECT @AvailableStock = StockNumber - ActiveLoans
+        FROM Books WITH (UPDLOCK, ROWLOCK)
+        WHERE Id = @BookId;
+        
+        IF @AvailableStock IS NULL
         BEGIN
             SET @ErrorMessage = 'Kitap bulunamadı';
             ROLLBACK TRANSACTION;
             RETURN;
         END
         
-        -- Stokta var mı?
-        SELECT @AvailableStock = b.StockNumber - ISNULL((
-            SELECT COUNT(*) FROM BorrowTransactions bt 
-            WHERE bt.BookId = b.Id AND bt.RealReturnDate IS NULL
-        ), 0)
-        FROM Books b WHERE b.Id = @BookId;
-        
         IF @AvailableStock <= 0
         BEGIN
             SET @ErrorMessage = 'Kitap stokta yok';
@@ -779,14 +782,24 @@ BEGIN
             RETURN;
         END
         
-        -- İşlemi kaydet
+        -- İşlemi kaydet ve ödünç sayacını artır
         INSERT INTO BorrowTransactions (BookId, UserId, BorrowDate, ReturnDate)
         VALUES (@BookId, @UserId, @BorrowDate, @ReturnDate);
         
         SET @NewTransactionId = SCOPE_IDENTITY();
         
+        UPDATE Books SET ActiveLoans = ActiveLoans + 1 WHERE Id = @BookId;
+
         COMMIT TRANSACTION;
-        
+
+        -- Oluşan işlemi JOIN'li olarak döndür (uygulama tekrar sorgulamasın)
+        SELECT bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
+               ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
+        FROM BorrowTransactions bt
+        LEFT JOIN Books b ON bt.BookId = b.Id
+        LEFT JOIN Users u ON bt.UserId = u.Id
+        WHERE bt.Id = @NewTransactionId;
+
     END TRY
     BEGIN CATCH
         IF @@TRANCOUNT > 0
@@ -869,7 +882,15 @@ BEGIN
         BEGIN
             SET @Message = '''' + @BookTitle + ''' başarıyla iade edildi. Teşekkürler!';
         END
-        
+
+        -- Güncellenen işlemi JOIN'li olarak döndür (uygulama tekrar sorgulamasın)
+        SELECT bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
+               ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
+        FROM BorrowTransactions bt
+        LEFT JOIN Books b ON bt.BookId = b.Id
+        LEFT JOIN Users u ON bt.UserId = u.Id
+        WHERE bt.Id = @TransactionId;
+
         SET @Success = 1;
         
     END TRY
@@ -879,6 +900,66 @@ BEGIN
 END;
 GO
 
+-- =============================================
+-- TABLE TYPE: TransactionIdList
+-- Toplu işlemler için işlem Id listesi (table-valued parameter)
+-- =============================================
+CREATE TYPE dbo.TransactionIdList AS TABLE (
+    TransactionId INT NOT NULL PRIMARY KEY
+);
+GO
+
+-- =============================================
+-- STORED PROCEDURE: sp_ReturnBooks
+-- Toplu iade: uygun işlemler tek UPDATE ile iade edilir, cezaları
+-- trigger set-based yazar. Her Id için bir sonuç satırı döner.
+-- @UserId NULL ise (yönetici) sahiplik kontrolü yapılmaz.
+-- =============================================
+CREATE PROCEDURE sp_ReturnBooks
+    @TransactionIds dbo.TransactionIdList READONLY,
+    @UserId INT = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    
+    DECLARE @Returned TABLE (Id INT PRIMARY KEY);
+    
+    -- İade işlemi (Trigger cezaları hesaplayacak)
+    UPDATE bt
+    SET bt.RealReturnDate = GETDATE()
+    OUTPUT inserted.Id INTO @Returned (Id)
+    FROM BorrowTransactions bt
+    INNER JOIN @TransactionIds t ON bt.Id = t.TransactionId
+    WHERE bt.RealReturnDate IS NULL
+      AND (@UserId IS NULL OR bt.UserId = @UserId);
+    
+    -- İşlem başına sonuç: sp_ReturnBook ile aynı kontroller ve mesajlar
+    SELECT t.TransactionId,
+           CAST(IIF(r.Id IS NULL, 0, 1) AS BIT) AS Success,
+           CASE
+               WHEN r.Id IS NOT NULL AND p.Id IS NOT NULL
+                   THEN '''' + b.Title + ''' iade edildi. ' +
+                        CAST(p.NumberOfDay AS VARCHAR) + ' dakika gecikme için ' +
+                        CAST(CAST(p.Amount AS INT) AS VARCHAR) + ' TL ceza kesildi!'
+               WHEN r.Id IS NOT NULL THEN '''' + b.Title + ''' başarıyla iade edildi. Teşekkürler!'
+               WHEN bt.Id IS NULL THEN 'İşlem bulunamadı'
+               WHEN bt.UserId <> @UserId THEN 'Bu işlem size ait değil'
+               ELSE 'Kitap zaten iade edilmiş'
+           END AS Message,
+           ISNULL(p.Amount, 0) AS PenaltyAmount,
+           bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
+           ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
+    FROM @TransactionIds t
+    LEFT JOIN @Returned r ON r.Id = t.TransactionId
+    LEFT JOIN BorrowTransactions bt ON bt.Id = t.TransactionId
+    LEFT JOIN Books b ON bt.BookId = b.Id
+    LEFT JOIN Users u ON bt.UserId = u.Id
+    LEFT JOIN Penalties p ON p.BorrowTransactionsId = r.Id
+    ORDER BY t.TransactionId;
+END;
+GO
+
 -- =============================================
 -- STORED PROCEDURE: sp_PayPenalty
 -- Ceza ödeme
@@ -0,0 +1,167 @@
+/*
+=============================================================================
+DB_SETUP_SQLITE.SQL - SQLITE VERİTABANI + TRIGGER
+=============================================================================
+
+db_setup.sql (SQL Server) şemasının SQLite karşılığı. DatabaseConfig.BACKEND
+= 'sqlite' iken backend/sqlite_database.py dosya ilk açıldığında bu script'i
+bir kez çalıştırır; ardından migrations/sqlite/ altındaki bekleyen
+sürümler uygulanır (backend/migrate.py).
+
+- Tablolar, index'ler ve örnek veriler aynıdır
+- trg_CalculatePenalty ve trg_ReleaseActiveLoans SQLite trigger'ı olarak
+  (FOR EACH ROW, çok satırlı UPDATE / DELETE'te her satır için çalışır)
+- sp_BorrowBook / sp_ReturnBook / sp_ReturnBooks / sp_PayPenalty
+  repositories/sqlite/ içinde Python olarak (aynı kontroller ve mesajlar)
+
+Tarihler 'YYYY-MM-DD HH:MM:SS.ffffff' metni olarak saklanır (sunucu yerel
+saati). DATEDIFF(MINUTE, a, b) karşılığı: dakika sınırı sayısı
+(strftime('%s') / 60 farkı).
+
+CEZA SİSTEMİ:
+- İade süresi: 1 dakika
+- Gecikme cezası: 5 TL / dakika
+=============================================================================
+*/
+
+-- =============================================
+-- TABLOLAR
+-- =============================================
+
+CREATE TABLE Users (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    FullName NVARCHAR(100) NOT NULL,
+    Email NVARCHAR(100) NOT NULL UNIQUE,
+    PasswordHash NVARCHAR(256) NOT NULL,
+    Role NVARCHAR(20) NOT NULL DEFAULT 'user'
+);
+
+CREATE TABLE Authors (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name NVARCHAR(50) NOT NULL,
+    LastName NVARCHAR(50) NOT NULL,
+    Country NVARCHAR(50)
+);
+
+CREATE TABLE Categories (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Name NVARCHAR(50) NOT NULL
+);
+
+CREATE TABLE Books (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    Title NVARCHAR(200) NOT NULL,
+    AuthorId INT NOT NULL,
+    CategoryId INT NOT NULL,
+    StockNumber INT NOT NULL DEFAULT 1,
+    YearOfpublication INT,
+    ActiveLoans INT NOT NULL DEFAULT 0,  -- Ödünçteki adet (sp_BorrowBook / trigger'lar günceller)
+    CONSTRAINT CK_Books_ActiveLoans CHECK (ActiveLoans >= 0),
+    CONSTRAINT FK_Books_Authors FOREIGN KEY (AuthorId) REFERENCES Authors(Id) ON DELETE CASCADE,
+    CONSTRAINT FK_Books_Categories FOREIGN KEY (CategoryId) REFERENCES Categories(Id) ON DELETE CASCADE
+);
+
+CREATE TABLE BorrowTransactions (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    BookId INT NOT NULL,
+    UserId INT NOT NULL,
+    BorrowDate DATETIME NOT NULL,
+    ReturnDate DATETIME NOT NULL,
+    RealReturnDate DATETIME NULL,
+    CONSTRAINT FK_BorrowTransactions_Books FOREIGN KEY (BookId) REFERENCES Books(Id) ON DELETE CASCADE,
+    CONSTRAINT FK_BorrowTransactions_Users FOREIGN KEY (UserId) REFERENCES Users(Id) ON DELETE CASCADE
+);
+
+-- Açık ödünçler (iade edilmemiş) için kısmi index
+CREATE INDEX IX_BorrowTransactions_OpenLoans
+ON BorrowTransactions (BookId, UserId, ReturnDate)
+WHERE RealReturnDate IS NULL;
+
+-- İşlem listesi keyset sayfalaması: ORDER BY BorrowDate DESC, Id DESC
+CREATE INDEX IX_BorrowTransactions_BorrowDate
+ON BorrowTransactions (BorrowDate DESC, Id DESC);
+
+-- Üye panosu / işlem geçmişi
+CREATE INDEX IX_BorrowTransactions_User
+ON BorrowTransactions (UserId, BorrowDate DESC, Id DESC);
+
+CREATE TABLE Penalties (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    BorrowTransactionsId INT NOT NULL,
+    NumberOfDay INT NOT NULL,
+    Amount DECIMAL(10,2) NOT NULL,
+    CreatedDate DATETIME DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')),
+    CONSTRAINT FK_Penalties_BorrowTransactions FOREIGN KEY (BorrowTransactionsId) REFERENCES BorrowTransactions(Id) ON DELETE CASCADE
+);
+
+CREATE INDEX IX_Penalties_BorrowTransaction
+ON Penalties (BorrowTransactionsId, Amount);
+
+-- =============================================
+-- TRIGGER: trg_CalculatePenalty
+-- İade yapıldığında (RealReturnDate NULL'dan değere geçince)
+-- gecikme varsa ceza yazar ve kitabın ödünç sayacını düşer
+-- =============================================
+CREATE TRIGGER trg_CalculatePenalty
+AFTER UPDATE OF RealReturnDate ON BorrowTransactions
+FOR EACH ROW
+WHEN OLD.RealReturnDate IS NULL AND NEW.RealReturnDate IS NOT NULL
+BEGIN
+    INSERT INTO Penalties (BorrowTransactionsId, NumberOfDay, Amount, CreatedDate)
+    SELECT NEW.Id, m.DelayMinutes, m.DelayMinutes * 5.00,
+           strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+    FROM (
+        SELECT MAX(1, CAST(strftime('%s', NEW.RealReturnDate) AS INTEGER) / 60
+                    - CAST(strftime('%s', NEW.ReturnDate) AS INTEGER) / 60) AS DelayMinutes
+    ) m
+    WHERE NEW.RealReturnDate > NEW.ReturnDate;
+
+    UPDATE Books SET ActiveLoans = ActiveLoans - 1 WHERE Id = NEW.BookId;
+END;
+
+-- =============================================
+-- TRIGGER: trg_ReleaseActiveLoans
+-- Açık ödünç kaydı silinirse (kullanıcı silme cascade'i dahil)
+-- kitabın ödünç sayacını düşer
+-- =============================================
+CREATE TRIGGER trg_ReleaseActiveLoans
+AFTER DELETE ON BorrowTransactions
+FOR EACH ROW
+WHEN OLD.RealReturnDate IS NULL
+BEGIN
+    UPDATE Books SET ActiveLoans = ActiveLoans - 1 WHERE Id = OLD.BookId;
+END;
+
+-- =============================================
+-- ÖRNEK VERİLER
+-- =============================================
+
+-- Admin (şifre: 123456)
+INSERT INTO Users (FullName, Email, PasswordHash, Role) VALUES
+('Admin Kullanıcı', 'admin@kutuphane.com', '8d969eef6ecad3c29a3a629280e686cf0c3f5d5a86aff3ca12020c923adc6c92', 'admin');
+
+-- Test kullanıcısı (şifre: 123456)
+INSERT INTO Users (FullName, Email, PasswordHash, Role) VALUES
+('Test Kullanıcı', 'test@test.com', '8d969eef6ecad3c29a3a629280e686cf0c3f5d5a86aff3ca12020c923adc6c92', 'user');
+
+-- Yazarlar
+INSERT INTO Authors (Name, LastName, Country) VALUES
+('Fyodor', 'Dostoyevski', 'Rusya'),
+('Lev', 'Tolstoy', 'Rusya'),
+('Orhan', 'Pamuk', 'Türkiye'),
+('Sabahattin', 'Ali', 'Türkiye'),
+('Gabriel Garcia', 'Marquez', 'Kolombiya');
+
+-- Kategoriler
+INSERT INTO Categories (Name) VALUES
+('Roman'), ('Bilim Kurgu'), ('Tarih'), ('Felsefe'), ('Şiir');
+
+-- Kitaplar
+INSERT INTO Books (Title, AuthorId, CategoryId, StockNumber, YearOfpublication) VALUES
+('Suç ve Ceza', 1, 1, 3, 1866),
+('Savaş ve Barış', 2, 1, 2, 1869),
+('Masumiyet Müzesi', 3, 1, 4, 2008),
+('Kürk Mantolu Madonna', 4, 1, 5, 1943),
+('Yüzyıllık Yalnızlık', 5, 1, 3, 1967),
+('Karamazov Kardeşler', 1, 1, 2, 1880),
+('Anna Karenina', 2, 1, 3, 1877);
@@ -7,6 +7,14 @@ let currentUser = JSON.parse(localStorage.getItem('user') || 'null');
 let editType = '';
 let editId = 0;
 
+// Canlı akış (/api/events): bağlıyken işlem sonrası listeler yeniden indirilmez
+let liveEvents = null;
+let liveConnected = false;
+let liveLastEventId = '';
+let liveRetryTimer = null;
+let liveGeneration = 0;
+const bookCache = new Map();
+
 // Sayfa yüklendiğinde
 document.addEventListener('DOMContentLoaded', () => {
     console.log('Sayfa yüklendi');
@@ -26,6 +34,11 @@ document.addEventListener('DOMContentLoaded', () => {
     if (registerForm) {
         registerForm.addEventListener('submit', handleRegister);
     }
+    
+    const bookSearch = document.getElementById('bookSearch');
+    if (bookSearch) {
+        bookSearch.addEventListener('input', onBookSearch);
+    }
 });
 
 // Tab değiştirme
@@ -138,6 +151,8 @@ async function handleRegister(e) {
 
 // Çıkış işlemi
 function logout() {
+    stopLiveEvents();
+    liveLastEventId = '';
     localStorage.removeItem('token');
     localStorage.removeItem('user');
     token = null;
@@ -187,6 +202,7 @@ function showMainPage() {
         if (userPanel) userPanel.classList.remove('hidden');
         loadUserData();
     }
+    startLiveEvents();
 }
 
 // ==================== ADMIN FONKSİYONLARI ====================
@@ -208,27 +224,24 @@ async function loadAdminData() {
 
 async function loadAdminStats() {
     try {
-        const [booksRes, authorsRes, categoriesRes, usersRes] = await Promise.all([
-            fetch(`${API_URL}/books`),
-            fetch(`${API_URL}/authors`),
-            fetch(`${API_URL}/categories`),
-            fetch(`${API_URL}/users`)
-        ]);
-        
-        const books = await booksRes.json();
-        const authors = await authorsRes.json();
-        const categories = await categoriesRes.json();
-        const users = await usersRes.json();
-        
-        const statBooks = document.getElementById('adminStatBooks');
-        const statAuthors = document.getElementById('adminStatAuthors');
-        const statCategories = document.getElementById('adminStatCategories');
-        const statUsers = document.getElementById('adminStatUsers');
-        
-        if (statBooks) statBooks.textContent = Array.isArray(books) ? books.length : 0;
-        if (statAuthors) statAuthors.textContent = Array.isArray(authors) ? authors.length : 0;
-        if (statCategories) statCategories.textContent = Array.isArray(categories) ? categories.length : 0;
-        if (statUsers) statUsers.textContent = Array.isArray(users) ? users.length : 0;
+        // Tüm sayılar tek istekte (tek SQL sorgusu) gelir
+        const response = await fetch(`${API_URL}/admin/summary`);
+        const summary = await response.json();
+        if (!response.ok) throw new Error(summary.error || 'Özet alınamadı');
+        
+        const stats = {
+            adminStatBooks: summary.books,
+            adminStatAuthors: summary.authors,
+            adminStatCategories: summary.categories,
+            adminStatUsers: summary.users,
+            adminStatActiveLoans: summary.activeLoans,
+            adminStatOverdue: summary.overdueLoans,
+            adminStatPenalties: (summary.outstandingPenalties || 0) + ' TL'
+        };
+        for (const [id, value] of Object.entries(stats)) {
+            const el = document.getElementById(id);
+            if (el) el.textContent = value;
+        }
     } catch (error) {
         console.error('Admin stats yüklenemedi:', error);
     }
@@ -439,26 +452,31 @@ async function loadAdminBooks() {
         
         const tbody = document.querySelector('#adminBooksTable tbody');
         if (tbody && Array.isArray(books)) {
-            tbody.innerHTML = books.map(b => `
-                <tr>
-                    <td>${b.id}</td>
-                    <td>${b.title}</td>
-                    <td>${b.authorName || ''}</td>
-                    <td>${b.categoryName || ''}</td>
-                    <td>${b.available} / ${b.stockNumber}</td>
-                    <td>${b.yearOfPublication || ''}</td>
-                    <td>
-                        <button class="btn btn-small btn-primary" onclick="editBook(${b.id}, '${b.title.replace(/'/g, "\\'")}', ${b.authorId}, ${b.categoryId}, ${b.stockNumber}, ${b.yearOfPublication || 2024})">Düzenle</button>
-                        <button class="btn btn-small btn-danger" onclick="deleteBook(${b.id})">Sil</button>
-                    </td>
-                </tr>
-            `).join('');
+            books.forEach(b => bookCache.set(b.id, b));
+            tbody.innerHTML = books.map(adminBookRow).join('');
         }
     } catch (error) {
         console.error('Kitaplar yüklenemedi:', error);
     }
 }
 
+function adminBookRow(b) {
+    return `
+        <tr data-id="${b.id}">
+            <td>${b.id}</td>
+            <td>${b.title}</td>
+            <td>${b.authorName || ''}</td>
+            <td>${b.categoryName || ''}</td>
+            <td>${b.available} / ${b.stockNumber}</td>
+            <td>${b.yearOfPublication || ''}</td>
+            <td>
+                <button class="btn btn-small btn-primary" onclick="editBook(${b.id}, '${b.title.replace(/'/g, "\\'")}', ${b.authorId}, ${b.categoryId}, ${b.stockNumber}, ${b.yearOfPublication || 2024})">Düzenle</button>
+                <button class="btn btn-small btn-danger" onclick="deleteBook(${b.id})">Sil</button>
+            </td>
+        </tr>
+    `;
+}
+
 async function addBook() {
     const title = document.getElementById('bookTitle').value;
     const authorId = document.getElementById('bookAuthorId').value;
@@ -572,26 +590,30 @@ async function loadAllTransactions() {
             return;
         }
         
-        tbody.innerHTML = transactions.map(tx => `
-            <tr>
-                <td>${tx.id}</td>
-                <td>${tx.userName || ''}</td>
-                <td>${tx.bookTitle || ''}</td>
-                <td>${tx.borrowDate || ''}</td>
-                <td>${tx.returnDate || ''}</td>
-                <td>${tx.realReturnDate || '-'}</td>
-                <td>
-                    <span class="badge ${tx.state === 'İade Edildi' ? 'badge-success' : 'badge-warning'}">
-                        ${tx.state || 'Bilinmiyor'}
-                    </span>
-                </td>
-            </tr>
-        `).join('');
+        tbody.innerHTML = transactions.map(adminTransactionRow).join('');
     } catch (error) {
         console.error('İşlemler yüklenemedi:', error);
     }
 }
 
+function adminTransactionRow(tx) {
+    return `
+        <tr data-id="${tx.id}">
+            <td>${tx.id}</td>
+            <td>${tx.userName || ''}</td>
+            <td>${tx.bookTitle || ''}</td>
+            <td>${tx.borrowDate || ''}</td>
+            <td>${tx.returnDate || ''}</td>
+            <td>${tx.realReturnDate || '-'}</td>
+            <td>
+                <span class="badge ${tx.state === 'İade Edildi' ? 'badge-success' : 'badge-warning'}">
+                    ${tx.state || 'Bilinmiyor'}
+                </span>
+            </td>
+        </tr>
+    `;
+}
+
 // TÜM CEZALAR (Admin)
 async function loadAllPenalties() {
     try {
@@ -607,19 +629,23 @@ async function loadAllPenalties() {
             return;
         }
         
-        tbody.innerHTML = penalties.map(p => `
-            <tr>
-                <td>${p.id}</td>
-                <td>${p.userName || ''}</td>
-                <td>${p.numberOfDay || 0} dakika</td>
-                <td><strong>${p.amount || 0} TL</strong></td>
-            </tr>
-        `).join('');
+        tbody.innerHTML = penalties.map(adminPenaltyRow).join('');
     } catch (error) {
         console.error('Cezalar yüklenemedi:', error);
     }
 }
 
+function adminPenaltyRow(p) {
+    return `
+        <tr data-id="${p.id}" data-tx-id="${p.borrowTransactionsId}">
+            <td>${p.id}</td>
+            <td>${p.userName || ''}</td>
+            <td>${p.numberOfDay || 0} dakika</td>
+            <td><strong>${p.amount || 0} TL</strong></td>
+        </tr>
+    `;
+}
+
 // MODAL KAYDET
 async function saveEdit() {
     let url = '';
@@ -687,7 +713,8 @@ async function loadUserData() {
 
 async function loadStats() {
     try {
-        const statsRes = await fetch(`${API_URL}/my/stats`, {
+        // Tek istek: sayılar ve katalogdaki kitap sayısı (tüm kitap listesi indirilmez)
+        const statsRes = await fetch(`${API_URL}/my/dashboard?recent=0`, {
             headers: { 'Authorization': `Bearer ${token}` }
         });
         const stats = await statsRes.json();
@@ -697,57 +724,83 @@ async function loadStats() {
         const statPenalties = document.getElementById('statPenalties');
         const statBooks = document.getElementById('statBooks');
         
-        if (statBorrows) statBorrows.textContent = stats.activeBorrows || 0;
-        if (statPenalties) statPenalties.textContent = (stats.totalPenalties || 0) + ' TL';
-        
-        const booksRes = await fetch(`${API_URL}/books`);
-        const books = await booksRes.json();
-        if (statBooks) statBooks.textContent = Array.isArray(books) ? books.length : 0;
+        if (statBorrows) statBorrows.textContent = stats.activeLoans || 0;
+        if (statPenalties) statPenalties.textContent = (stats.outstandingPenalties || 0) + ' TL';
+        if (statBooks) statBooks.textContent = stats.catalogBooks || 0;
     } catch (error) {
         console.error('Stats yüklenemedi:', error);
     }
 }
 
+// Kitap arama: yazmayı bırakınca sunucudaki indekste aranır
+let bookSearchTimer = null;
+
+function onBookSearch(event) {
+    clearTimeout(bookSearchTimer);
+    const query = event.target.value.trim();
+    bookSearchTimer = setTimeout(() => query ? searchBooks(query) : loadBooks(), 250);
+}
+
+async function searchBooks(query) {
+    try {
+        const response = await fetch(`${API_URL}/books/search?q=${encodeURIComponent(query)}&limit=50`);
+        const result = await response.json();
+        // Bu arada kutudaki metin değiştiyse eski sonucu gösterme
+        if (document.getElementById('bookSearch')?.value.trim() !== query) return;
+        renderBooks(result.items || []);
+    } catch (error) {
+        console.error('Arama yapılamadı:', error);
+    }
+}
+
 async function loadBooks() {
     try {
         const response = await fetch(`${API_URL}/books`);
         const books = await response.json();
         console.log('Kitaplar:', books);
-        
-        const tbody = document.querySelector('#booksTable tbody');
-        if (!tbody) {
-            console.error('#booksTable tbody bulunamadı!');
-            return;
-        }
-        
-        if (!Array.isArray(books) || books.length === 0) {
-            tbody.innerHTML = '<tr><td colspan="5" class="text-center">Kitap yok</td></tr>';
-            return;
-        }
-        
-        tbody.innerHTML = books.map(book => `
-            <tr>
-                <td>${book.title}</td>
-                <td>${book.authorName || ''}</td>
-                <td>${book.categoryName || ''}</td>
-                <td>
-                    <span class="badge ${book.available > 0 ? 'badge-success' : 'badge-danger'}">
-                        ${book.available} / ${book.stockNumber}
-                    </span>
-                </td>
-                <td>
-                    ${book.available > 0 
-                        ? `<button class="btn btn-secondary btn-small" onclick="borrowBook(${book.id})">Ödünç Al</button>`
-                        : '<span class="badge badge-danger">Stokta Yok</span>'
-                    }
-                </td>
-            </tr>
-        `).join('');
+        renderBooks(books);
     } catch (error) {
         console.error('Kitaplar yüklenemedi:', error);
     }
 }
 
+function renderBooks(books) {
+    const tbody = document.querySelector('#booksTable tbody');
+    if (!tbody) {
+        console.error('#booksTable tbody bulunamadı!');
+        return;
+    }
+    
+    if (!Array.isArray(books) || books.length === 0) {
+        tbody.innerHTML = '<tr><td colspan="5" class="text-center">Kitap yok</td></tr>';
+        return;
+    }
+    
+    books.forEach(book => bookCache.set(book.id, book));
+    tbody.innerHTML = books.map(bookRow).join('');
+}
+
+function bookRow(book) {
+    return `
+        <tr data-id="${book.id}">
+            <td>${book.title}</td>
+            <td>${book.authorName || ''}</td>
+            <td>${book.categoryName || ''}</td>
+            <td>
+                <span class="badge ${book.available > 0 ? 'badge-success' : 'badge-danger'}">
+                    ${book.available} / ${book.stockNumber}
+                </span>
+            </td>
+            <td>
+                ${book.available > 0 
+                    ? `<button class="btn btn-secondary btn-small" onclick="borrowBook(${book.id})">Ödünç Al</button>`
+                    : '<span class="badge badge-danger">Stokta Yok</span>'
+                }
+            </td>
+        </tr>
+    `;
+}
+
 async function borrowBook(bookId) {
     try {
         const response = await fetch(`${API_URL}/borrow`, {
@@ -764,9 +817,12 @@ async function borrowBook(bookId) {
         
         if (data.success) {
             showMessage('mainMessage', '✓ ' + data.message, 'success');
-            loadBooks();
-            loadMyTransactions();
-            loadStats();
+            // Canlı akış bağlıysa satırlar olaylarla güncellenir
+            if (!liveConnected) {
+                loadBooks();
+                loadMyTransactions();
+                loadStats();
+            }
         } else {
             showMessage('mainMessage', '✗ ' + (data.error || 'Hata'), 'error');
         }
@@ -794,30 +850,34 @@ async function loadMyTransactions() {
             return;
         }
         
-        tbody.innerHTML = transactions.map(tx => `
-            <tr>
-                <td>${tx.bookTitle || ''}</td>
-                <td>${tx.borrowDate || ''}</td>
-                <td>${tx.returnDate || ''}</td>
-                <td>${tx.realReturnDate || '-'}</td>
-                <td>
-                    <span class="badge ${tx.state === 'İade Edildi' ? 'badge-success' : 'badge-warning'}">
-                        ${tx.state || 'Bilinmiyor'}
-                    </span>
-                </td>
-                <td>
-                    ${tx.state !== 'İade Edildi' 
-                        ? `<button class="btn btn-primary btn-small" onclick="returnBook(${tx.id})">İade Et</button>`
-                        : '-'
-                    }
-                </td>
-            </tr>
-        `).join('');
+        tbody.innerHTML = transactions.map(myTransactionRow).join('');
     } catch (error) {
         console.error('İşlemler yüklenemedi:', error);
     }
 }
 
+function myTransactionRow(tx) {
+    return `
+        <tr data-id="${tx.id}">
+            <td>${tx.bookTitle || ''}</td>
+            <td>${tx.borrowDate || ''}</td>
+            <td>${tx.returnDate || ''}</td>
+            <td>${tx.realReturnDate || '-'}</td>
+            <td>
+                <span class="badge ${tx.state === 'İade Edildi' ? 'badge-success' : 'badge-warning'}">
+                    ${tx.state || 'Bilinmiyor'}
+                </span>
+            </td>
+            <td>
+                ${tx.state !== 'İade Edildi' 
+                    ? `<button class="btn btn-primary btn-small" onclick="returnBook(${tx.id})">İade Et</button>`
+                    : '-'
+                }
+            </td>
+        </tr>
+    `;
+}
+
 async function returnBook(txId) {
     try {
         const response = await fetch(`${API_URL}/my/transactions/${txId}/return`, {
@@ -833,10 +893,12 @@ async function returnBook(txId) {
             const icon = data.message.includes('ceza') ? '⚠️' : '✓';
             showMessage('mainMessage', icon + ' ' + data.message, msgType);
             
-            loadBooks();
-            loadMyTransactions();
-            loadMyPenalties();
-            loadStats();
+            if (!liveConnected) {
+                loadBooks();
+                loadMyTransactions();
+                loadMyPenalties();
+                loadStats();
+            }
         } else {
             showMessage('mainMessage', '✗ ' + (data.error || 'Hata'), 'error');
         }
@@ -864,20 +926,24 @@ async function loadMyPenalties() {
             return;
         }
         
-        tbody.innerHTML = penalties.map(p => `
-            <tr>
-                <td>${p.numberOfDay || 0} dakika gecikme</td>
-                <td><strong>${p.amount || 0} TL</strong></td>
-                <td>
-                    <button class="btn btn-secondary btn-small" onclick="payPenalty(${p.id})">Öde</button>
-                </td>
-            </tr>
-        `).join('');
+        tbody.innerHTML = penalties.map(myPenaltyRow).join('');
     } catch (error) {
         console.error('Cezalar yüklenemedi:', error);
     }
 }
 
+function myPenaltyRow(p) {
+    return `
+        <tr data-id="${p.id}" data-tx-id="${p.borrowTransactionsId}">
+            <td>${p.numberOfDay || 0} dakika gecikme</td>
+            <td><strong>${p.amount || 0} TL</strong></td>
+            <td>
+                <button class="btn btn-secondary btn-small" onclick="payPenalty(${p.id})">Öde</button>
+            </td>
+        </tr>
+    `;
+}
+
 async function payPenalty(penaltyId) {
     try {
         const response = await fetch(`${API_URL}/my/penalties/${penaltyId}/pay`, {
@@ -890,8 +956,10 @@ async function payPenalty(penaltyId) {
         
         if (data.success) {
             showMessage('mainMessage', '✓ ' + data.message, 'success');
-            loadMyPenalties();
-            loadStats();
+            if (!liveConnected) {
+                loadMyPenalties();
+                loadStats();
+            }
         } else {
             showMessage('mainMessage', '✗ ' + (data.error || 'Hata'), 'error');
         }
@@ -900,6 +968,171 @@ async function payPenalty(penaltyId) {
     }
 }
 
+// ==================== CANLI GÜNCELLEMELER (SSE) ====================
+// /api/events delta olayları satırları yerinde günceller (data-id ile bulunur).
+// Oturum token'ı URL'ye yazılmaz: her bağlantı için tek kullanımlık akış bileti
+// alınır (POST /api/events/ticket). Bilet tekrar kullanılamadığından kopan akışı
+// tarayıcı değil bu kod yeni biletle açar; son olay Id'si lastEventId ile
+// gönderilir, sunucu devam edemezse 'reset' gönderir, listeler yeniden yüklenir.
+
+async function startLiveEvents() {
+    stopLiveEvents();
+    if (!token || typeof EventSource === 'undefined') return;
+    const generation = liveGeneration;
+    
+    let ticket;
+    try {
+        const response = await fetch(`${API_URL}/events/ticket`, {
+            method: 'POST',
+            headers: { 'Authorization': `Bearer ${token}` }
+        });
+        if (!response.ok) return;   // Oturum geçersiz: işlemler eskisi gibi listeleri yeniler
+        ticket = (await response.json()).ticket;
+    } catch (error) {
+        scheduleLiveReconnect(generation);
+        return;
+    }
+    if (generation !== liveGeneration) return;   // Bu arada çıkış yapıldı veya yeniden başlatıldı
+    
+    const params = new URLSearchParams({ ticket });
+    if (liveLastEventId) params.set('lastEventId', liveLastEventId);
+    const source = new EventSource(`${API_URL}/events?${params}`);
+    liveEvents = source;
+    source.onopen = () => { liveConnected = true; };
+    source.onerror = () => {
+        // Kapasite dolu (503) veya bağlantı koptu: bilet harcandı, yenisiyle tekrar denenir
+        liveConnected = false;
+        source.close();
+        if (liveEvents === source) {
+            liveEvents = null;
+            scheduleLiveReconnect(generation);
+        }
+    };
+    
+    const handlers = {
+        'book.availability': onBookAvailability,
+        'loan.created': tx => onLoanChanged(tx, true),
+        'loan.returned': tx => onLoanChanged(tx, false),
+        'loan.deleted': onLoanDeleted,
+        'penalty.created': onPenaltyCreated,
+        'penalty.paid': p => onPenaltyRemoved(p.id),
+        'penalty.cancelled': p => onPenaltyRemoved(p.id),
+        'reset': onLiveReset
+    };
+    for (const [type, handler] of Object.entries(handlers)) {
+        source.addEventListener(type, event => {
+            liveLastEventId = event.lastEventId || liveLastEventId;
+            handler(JSON.parse(event.data));
+        });
+    }
+}
+
+function scheduleLiveReconnect(generation) {
+    if (generation !== liveGeneration || liveRetryTimer) return;
+    liveRetryTimer = setTimeout(() => {
+        liveRetryTimer = null;
+        if (generation === liveGeneration) startLiveEvents();
+    }, 3000);
+}
+
+function stopLiveEvents() {
+    liveGeneration++;
+    if (liveRetryTimer) clearTimeout(liveRetryTimer);
+    liveRetryTimer = null;
+    if (liveEvents) liveEvents.close();
+    liveEvents = null;
+    liveConnected = false;
+}
+
+function isAdmin() {
+    return currentUser && currentUser.role === 'admin';
+}
+
+// Satırı data-id ile bulup değiştirir; yoksa insert ise tablonun başına ekler
+function upsertRow(tableId, id, html, insert) {
+    const tbody = document.querySelector(`#${tableId} tbody`);
+    if (!tbody) return;
+    const row = tbody.querySelector(`tr[data-id="${id}"]`);
+    if (row) {
+        row.outerHTML = html;
+    } else if (insert) {
+        tbody.querySelectorAll('tr:not([data-id])').forEach(r => r.remove());  // "Henüz işlem yok" satırı
+        tbody.insertAdjacentHTML('afterbegin', html);
+    }
+}
+
+function removeRows(tableId, selector, emptyHtml) {
+    const tbody = document.querySelector(`#${tableId} tbody`);
+    if (!tbody) return;
+    tbody.querySelectorAll(selector).forEach(r => r.remove());
+    if (!tbody.querySelector('tr')) tbody.innerHTML = emptyHtml;
+}
+
+// Özet sayılar tek küçük istekle; art arda gelen olaylar tek istekte birleşir
+let statsRefreshTimer = null;
+
+function scheduleStatsRefresh() {
+    clearTimeout(statsRefreshTimer);
+    statsRefreshTimer = setTimeout(() => isAdmin() ? loadAdminStats() : loadStats(), 300);
+}
+
+function onBookAvailability(change) {
+    const book = bookCache.get(change.id);
+    if (!book) return;  // listede gösterilmeyen kitap
+    book.available = change.available;
+    book.stockNumber = change.stockNumber;
+    upsertRow('booksTable', book.id, bookRow(book), false);
+    upsertRow('adminBooksTable', book.id, adminBookRow(book), false);
+}
+
+function onLoanChanged(tx, created) {
+    if (isAdmin()) {
+        upsertRow('allTransactionsTable', tx.id, adminTransactionRow(tx), created);
+    } else {
+        upsertRow('myTransactionsTable', tx.id, myTransactionRow(tx), created);
+    }
+    scheduleStatsRefresh();
+}
+
+function onLoanDeleted(change) {
+    removeRows('allTransactionsTable', `tr[data-id="${change.id}"]`,
+               '<tr><td colspan="7" class="text-center">Henüz işlem yok</td></tr>');
+    removeRows('myTransactionsTable', `tr[data-id="${change.id}"]`,
+               '<tr><td colspan="6" class="text-center">Henüz işlem yok</td></tr>');
+    // İşlemin cezaları da silinir
+    removeRows('allPenaltiesTable', `tr[data-tx-id="${change.id}"]`,
+               '<tr><td colspan="4" class="text-center">Ceza yok</td></tr>');
+    removeRows('myPenaltiesTable', `tr[data-tx-id="${change.id}"]`,
+               '<tr><td colspan="3" class="text-center">Cezanız yok 🎉</td></tr>');
+    scheduleStatsRefresh();
+}
+
+function onPenaltyCreated(p) {
+    if (isAdmin()) {
+        upsertRow('allPenaltiesTable', p.id, adminPenaltyRow(p), true);
+    } else {
+        upsertRow('myPenaltiesTable', p.id, myPenaltyRow(p), true);
+    }
+    scheduleStatsRefresh();
+}
+
+function onPenaltyRemoved(id) {
+    removeRows('allPenaltiesTable', `tr[data-id="${id}"]`,
+               '<tr><td colspan="4" class="text-center">Ceza yok</td></tr>');
+    removeRows('myPenaltiesTable', `tr[data-id="${id}"]`,
+               '<tr><td colspan="3" class="text-center">Cezanız yok 🎉</td></tr>');
+    scheduleStatsRefresh();
+}
+
+function onLiveReset() {
+    // Kaçırılan olaylar bilinmiyor: bir kez tam yükleme
+    if (isAdmin()) {
+        loadAdminData();
+    } else {
+        loadUserData();
+    }
+}
+
 // Mesaj gösterme
 function showMessage(elementId, message, type) {
     const el = document.getElementById(elementId);
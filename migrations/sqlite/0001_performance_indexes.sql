@@ -0,0 +1,29 @@
+/*
+=============================================================================
+0001_PERFORMANCE_INDEXES - Sık çalışan sorgular için index paketi (SQLite)
+=============================================================================
+
+migrations/sqlserver/0001_performance_indexes.sql'in karşılığı. SQLite'ta
+INCLUDE yoktur; kısmi index'ler sadece açık (iade edilmemiş) satırları
+içerir ve WHERE ... RealReturnDate IS NULL sorgularında kullanılır.
+=============================================================================
+*/
+
+-- Kullanıcının açık ödünç sayısı: index'ten sayılır, tabloya dönülmez
+CREATE INDEX IF NOT EXISTS IX_BorrowTransactions_UserOpen
+ON BorrowTransactions (UserId)
+WHERE RealReturnDate IS NULL;
+
+-- Gecikme zamanlayıcısı (ORDER BY ReturnDate, Id) ve gecikmiş sayımı
+CREATE INDEX IF NOT EXISTS IX_BorrowTransactions_Overdue
+ON BorrowTransactions (ReturnDate, Id)
+WHERE RealReturnDate IS NULL;
+
+-- Kitap silme cascade'i ve kitabın ödünç geçmişi
+CREATE INDEX IF NOT EXISTS IX_BorrowTransactions_Book
+ON BorrowTransactions (BookId, RealReturnDate);
+
+-- Yazar / kategori silme cascade'i
+CREATE INDEX IF NOT EXISTS IX_Books_Author ON Books (AuthorId);
+
+CREATE INDEX IF NOT EXISTS IX_Books_Category ON Books (CategoryId);
@@ -0,0 +1,118 @@
+/*
+=============================================================================
+0002_PENALTY_LEDGER - Ceza defteri ve üye başına ceza bakiyesi (SQLite)
+=============================================================================
+
+migrations/sqlserver/0002_penalty_ledger.sql'in karşılığı. trg_PenaltyLedger
+SQLite'ta üç FOR EACH ROW trigger'ıdır (charge / payment / cancel).
+sp_PayPenalty ve sp_BorrowBook'un Python karşılıkları repositories/sqlite
+içindedir.
+=============================================================================
+*/
+
+ALTER TABLE Penalties ADD COLUMN PaidDate DATETIME NULL;
+
+CREATE TABLE PenaltyLedger (
+    Id INTEGER PRIMARY KEY AUTOINCREMENT,
+    UserId INT NOT NULL,
+    PenaltyId INT NOT NULL,
+    EntryType NVARCHAR(10) NOT NULL,
+    Amount DECIMAL(10,2) NOT NULL,
+    CreatedDate DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')),
+    CONSTRAINT CK_PenaltyLedger_EntryType CHECK (EntryType IN ('charge', 'payment', 'cancel'))
+);
+
+CREATE INDEX IX_PenaltyLedger_User ON PenaltyLedger (UserId, Id DESC);
+
+CREATE INDEX IX_PenaltyLedger_Penalty ON PenaltyLedger (PenaltyId, EntryType, UserId);
+
+CREATE TABLE UserPenaltyBalances (
+    UserId INTEGER PRIMARY KEY,
+    Balance DECIMAL(12,2) NOT NULL DEFAULT 0,
+    UnpaidCount INT NOT NULL DEFAULT 0,
+    UpdatedDate DATETIME NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')),
+    CONSTRAINT FK_UserPenaltyBalances_Users FOREIGN KEY (UserId) REFERENCES Users(Id) ON DELETE CASCADE
+);
+
+CREATE INDEX IX_Penalties_Unpaid ON Penalties (Id DESC) WHERE PaidDate IS NULL;
+
+-- Mevcut cezalar: charge kayıtları ve bakiyeler
+INSERT INTO PenaltyLedger (UserId, PenaltyId, EntryType, Amount, CreatedDate)
+SELECT bt.UserId, p.Id, 'charge', p.Amount,
+       COALESCE(p.CreatedDate, strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime'))
+FROM Penalties p
+INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
+ORDER BY p.Id;
+
+INSERT INTO UserPenaltyBalances (UserId, Balance, UnpaidCount, UpdatedDate)
+SELECT UserId, ROUND(SUM(Amount), 2), COUNT(*), strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+FROM PenaltyLedger
+GROUP BY UserId;
+
+-- Yeni ceza: sahibi ödünç kaydından
+CREATE TRIGGER trg_PenaltyLedger_Charge
+AFTER INSERT ON Penalties
+FOR EACH ROW
+WHEN NEW.PaidDate IS NULL
+BEGIN
+    INSERT INTO PenaltyLedger (UserId, PenaltyId, EntryType, Amount, CreatedDate)
+    SELECT UserId, NEW.Id, 'charge', NEW.Amount, strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+    FROM BorrowTransactions WHERE Id = NEW.BorrowTransactionsId;
+
+    INSERT OR IGNORE INTO UserPenaltyBalances (UserId, Balance, UnpaidCount, UpdatedDate)
+    SELECT UserId, 0, 0, strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+    FROM BorrowTransactions WHERE Id = NEW.BorrowTransactionsId;
+
+    UPDATE UserPenaltyBalances
+    SET Balance = ROUND(Balance + NEW.Amount, 2),
+        UnpaidCount = UnpaidCount + 1,
+        UpdatedDate = strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+    WHERE UserId = (SELECT UserId FROM BorrowTransactions WHERE Id = NEW.BorrowTransactionsId);
+END;
+
+-- Ödeme (PaidDate NULL -> değer): sahibi charge kaydından
+CREATE TRIGGER trg_PenaltyLedger_Payment
+AFTER UPDATE OF PaidDate ON Penalties
+FOR EACH ROW
+WHEN OLD.PaidDate IS NULL AND NEW.PaidDate IS NOT NULL
+BEGIN
+    INSERT INTO PenaltyLedger (UserId, PenaltyId, EntryType, Amount, CreatedDate)
+    SELECT UserId, OLD.Id, 'payment', -OLD.Amount, strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+    FROM PenaltyLedger WHERE PenaltyId = OLD.Id AND EntryType = 'charge';
+
+    UPDATE UserPenaltyBalances
+    SET Balance = ROUND(Balance - OLD.Amount, 2),
+        UnpaidCount = UnpaidCount - 1,
+        UpdatedDate = strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+    WHERE UserId = (SELECT UserId FROM PenaltyLedger WHERE PenaltyId = OLD.Id AND EntryType = 'charge');
+END;
+
+-- Ödenmemiş cezanın silinmesi (admin silme, cascade)
+CREATE TRIGGER trg_PenaltyLedger_Cancel
+AFTER DELETE ON Penalties
+FOR EACH ROW
+WHEN OLD.PaidDate IS NULL
+BEGIN
+    INSERT INTO PenaltyLedger (UserId, PenaltyId, EntryType, Amount, CreatedDate)
+    SELECT UserId, OLD.Id, 'cancel', -OLD.Amount, strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+    FROM PenaltyLedger WHERE PenaltyId = OLD.Id AND EntryType = 'charge';
+
+    UPDATE UserPenaltyBalances
+    SET Balance = ROUND(Balance - OLD.Amount, 2),
+        UnpaidCount = UnpaidCount - 1,
+        UpdatedDate = strftime('%Y-%m-%d %H:%M:%f', 'now', 'localtime')
+    WHERE UserId = (SELECT UserId FROM PenaltyLedger WHERE PenaltyId = OLD.Id AND EntryType = 'charge');
+END;
+
+-- Defter kayıtları değiştirilemez / silinemez
+CREATE TRIGGER trg_PenaltyLedger_NoUpdate
+BEFORE UPDATE ON PenaltyLedger
+BEGIN
+    SELECT RAISE(ABORT, 'Ceza defteri kayıtları değiştirilemez');
+END;
+
+CREATE TRIGGER trg_PenaltyLedger_NoDelete
+BEFORE DELETE ON PenaltyLedger
+BEGIN
+    SELECT RAISE(ABORT, 'Ceza defteri kayıtları değiştirilemez');
+END;
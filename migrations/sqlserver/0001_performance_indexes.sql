@@ -0,0 +1,78 @@
+/*
+=============================================================================
+0001_PERFORMANCE_INDEXES - Sık çalışan sorgular için index paketi
+=============================================================================
+
+db_setup.sql'in eski sürümleriyle kurulmuş veritabanlarında sadece birincil
+anahtarlar vardır; güncel db_setup.sql'in index'leri de burada yoksa
+oluşturulur (IF NOT EXISTS), ardından yeni index'ler eklenir.
+
+Etkisi (python -m benchmarks.index_report):
+- Açık ödünç sayısı, ödenmemiş ceza kontrolü, ceza toplamı, üye geçmişi:
+  kullanıcının satırlarına seek (tablo taraması yerine)
+- Gecikme zamanlayıcısı / özet ekranı: açık ödünçler son iade tarihine göre
+  sıralı okunur, gecikmiş sayımı aralık seek'i olur
+- Kitap / yazar / kategori silme: cascade edilen satırlar seek ile bulunur
+=============================================================================
+*/
+
+-- sp_BorrowBook: stok ve "aynı kitabı zaten almış mı" kontrolleri
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_BorrowTransactions_OpenLoans'
+               AND object_id = OBJECT_ID('dbo.BorrowTransactions'))
+    CREATE NONCLUSTERED INDEX IX_BorrowTransactions_OpenLoans
+    ON BorrowTransactions (BookId, UserId)
+    INCLUDE (ReturnDate)
+    WHERE RealReturnDate IS NULL;
+GO
+
+-- İşlem listesi keyset sayfalaması: ORDER BY BorrowDate DESC, Id DESC
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_BorrowTransactions_BorrowDate'
+               AND object_id = OBJECT_ID('dbo.BorrowTransactions'))
+    CREATE NONCLUSTERED INDEX IX_BorrowTransactions_BorrowDate
+    ON BorrowTransactions (BorrowDate DESC, Id DESC);
+GO
+
+-- Üye panosu / işlem geçmişi / ceza JOIN'lerinin kullanıcı tarafı
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_BorrowTransactions_User'
+               AND object_id = OBJECT_ID('dbo.BorrowTransactions'))
+    CREATE NONCLUSTERED INDEX IX_BorrowTransactions_User
+    ON BorrowTransactions (UserId, BorrowDate DESC, Id DESC)
+    INCLUDE (BookId, ReturnDate, RealReturnDate);
+GO
+
+-- Kullanıcının ceza toplamı / sayısı: işlemden cezaya JOIN seek olur
+IF NOT EXISTS (SELECT 1 FROM sys.indexes WHERE name = 'IX_Penalties_BorrowTransaction'
+               AND object_id = OBJECT_ID('dbo.Penalties'))
+    CREATE NONCLUSTERED INDEX IX_Penalties_BorrowTransaction
+    ON Penalties (BorrowTransactionsId)
+    INCLUDE (Amount);
+GO
+
+-- Kullanıcının açık ödünçleri (TRANSACTIONS_ACTIVE_COUNT): sadece açık
+-- satırlar taranır, iade edilmiş geçmiş index'te yer almaz
+CREATE NONCLUSTERED INDEX IX_BorrowTransactions_UserOpen
+ON BorrowTransactions (UserId)
+INCLUDE (ReturnDate)
+WHERE RealReturnDate IS NULL;
+GO
+
+-- Gecikme zamanlayıcısı (ORDER BY ReturnDate, Id) ve özet ekranındaki
+-- gecikmiş sayımı (ReturnDate < GETDATE()): sıralama / tarama yok
+CREATE NONCLUSTERED INDEX IX_BorrowTransactions_Overdue
+ON BorrowTransactions (ReturnDate, Id)
+INCLUDE (BookId, UserId, BorrowDate)
+WHERE RealReturnDate IS NULL;
+GO
+
+-- Kitap silme cascade'i ve kitabın ödünç geçmişi (filtreli OpenLoans
+-- index'i iade edilmiş satırları içermez)
+CREATE NONCLUSTERED INDEX IX_BorrowTransactions_Book
+ON BorrowTransactions (BookId, RealReturnDate);
+GO
+
+-- Yazar / kategori silme cascade'i
+CREATE NONCLUSTERED INDEX IX_Books_Author ON Books (AuthorId);
+GO
+
+CREATE NONCLUSTERED INDEX IX_Books_Category ON Books (CategoryId);
+GO
@@ -0,0 +1,373 @@
+/*
+=============================================================================
+0002_ACTIVE_LOANS - Ödünç sayacı ve toplu iade (eski db_setup.sql şemaları)
+=============================================================================
+
+db_setup.sql'in eski sürümleriyle kurulmuş veritabanlarını uygulamanın
+beklediği şemaya getirir; güncel db_setup.sql ile kurulmuşlarda aynı
+tanımları yeniden yazar (her adım tekrar çalıştırılabilir):
+
+- Books.ActiveLoans: kitabın açık ödünç sayısı. Stok kontrolü ve liste
+  sorguları (StockNumber - ActiveLoans) geçmiş tablosunu taramaz. Sütun
+  yoksa eklenir ve açık ödünçlerden yeniden hesaplanır
+- trg_CalculatePenalty: çok satırlı iadelerde de her satıra ceza yazar ve
+  sayacı düşer; trg_ReleaseActiveLoans: açık ödünç silinince sayacı düşer
+- sp_BorrowBook / sp_ReturnBook: sayaç ve UPDLOCK ile stok kontrolü, oluşan
+  işlemi JOIN'li satır olarak döndürür
+- dbo.TransactionIdList ve sp_ReturnBooks: toplu iade (POST /api/transactions/return-batch)
+
+Sayaç yeniden hesaplanırken eski sp_BorrowBook çalışırsa sayaç kayabilir:
+uygulama durdurulmuşken çalıştırın. Ceza defteri (0003) sp_BorrowBook'u
+bu sürümün üzerine yeniden yazar.
+=============================================================================
+*/
+
+IF COL_LENGTH('dbo.Books', 'ActiveLoans') IS NULL
+    ALTER TABLE Books ADD ActiveLoans INT NOT NULL DEFAULT 0;
+GO
+
+-- Sayaç açık ödünçlerden kurulur (sütun zaten varsa da düzeltilmiş olur)
+UPDATE b
+SET b.ActiveLoans = ISNULL(o.OpenCount, 0)
+FROM Books b
+LEFT JOIN (
+    SELECT BookId, COUNT(*) AS OpenCount
+    FROM BorrowTransactions
+    WHERE RealReturnDate IS NULL
+    GROUP BY BookId
+) o ON b.Id = o.BookId;
+GO
+
+IF NOT EXISTS (SELECT 1 FROM sys.check_constraints WHERE name = 'CK_Books_ActiveLoans'
+               AND parent_object_id = OBJECT_ID('dbo.Books'))
+    ALTER TABLE Books ADD CONSTRAINT CK_Books_ActiveLoans CHECK (ActiveLoans >= 0);
+GO
+
+-- =============================================
+-- TRIGGER: trg_CalculatePenalty
+-- İade yapıldığında otomatik ceza hesaplar
+-- =============================================
+ALTER TRIGGER trg_CalculatePenalty
+ON BorrowTransactions
+AFTER UPDATE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    -- İade tarihine dokunmayan UPDATE'lerde yapılacak iş yok
+    IF NOT UPDATE(RealReturnDate) RETURN;
+    
+    DECLARE @PenaltyPerMinute DECIMAL(10,2) = 5.00; -- 5 TL/dakika
+    
+    -- RealReturnDate NULL'dan değere geçen (iade edilen) ve gecikmiş HER satır
+    -- için bir ceza: tek INSERT...SELECT, çok satırlı UPDATE'lerde ceza kaybolmaz
+    INSERT INTO Penalties (BorrowTransactionsId, NumberOfDay, Amount, CreatedDate)
+    SELECT i.Id, m.DelayMinutes, m.DelayMinutes * @PenaltyPerMinute, GETDATE()
+    FROM inserted i
+    INNER JOIN deleted d ON i.Id = d.Id
+    CROSS APPLY (
+        SELECT IIF(DATEDIFF(MINUTE, i.ReturnDate, i.RealReturnDate) < 1, 1,
+                   DATEDIFF(MINUTE, i.ReturnDate, i.RealReturnDate)) AS DelayMinutes
+    ) m
+    WHERE d.RealReturnDate IS NULL
+      AND i.RealReturnDate IS NOT NULL
+      AND i.RealReturnDate > i.ReturnDate;
+    
+    -- İade edilen kitapların ödünç sayacını düş (çok satırlı UPDATE'lerde de doğru)
+    UPDATE b
+    SET b.ActiveLoans = b.ActiveLoans - r.ReturnedCount
+    FROM Books b
+    INNER JOIN (
+        SELECT i.BookId, COUNT(*) AS ReturnedCount
+        FROM inserted i
+        INNER JOIN deleted d ON i.Id = d.Id
+        WHERE d.RealReturnDate IS NULL AND i.RealReturnDate IS NOT NULL
+        GROUP BY i.BookId
+    ) r ON b.Id = r.BookId;
+END;
+GO
+
+-- =============================================
+-- TRIGGER: trg_ReleaseActiveLoans
+-- Açık ödünç kaydı silinirse (kullanıcı silme cascade'i dahil)
+-- kitabın ödünç sayacını düşer
+-- =============================================
+IF OBJECT_ID('dbo.trg_ReleaseActiveLoans', 'TR') IS NULL
+    EXEC('CREATE TRIGGER trg_ReleaseActiveLoans ON BorrowTransactions AFTER DELETE AS RETURN');
+GO
+
+ALTER TRIGGER trg_ReleaseActiveLoans
+ON BorrowTransactions
+AFTER DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+    
+    UPDATE b
+    SET b.ActiveLoans = b.ActiveLoans - r.OpenCount
+    FROM Books b
+    INNER JOIN (
+        SELECT BookId, COUNT(*) AS OpenCount
+        FROM deleted
+        WHERE RealReturnDate IS NULL
+        GROUP BY BookId
+    ) r ON b.Id = r.BookId;
+END;
+GO
+
+-- =============================================
+-- STORED PROCEDURE: sp_BorrowBook
+-- Kitap ödünç alma
+-- =============================================
+ALTER PROCEDURE sp_BorrowBook
+    @BookId INT,
+    @UserId INT,
+    @LoanDurationMinutes INT = 1,
+    @NewTransactionId INT OUTPUT,
+    @ErrorMessage NVARCHAR(500) OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    
+    DECLARE @AvailableStock INT;
+    DECLARE @BorrowDate DATETIME;
+    DECLARE @ReturnDate DATETIME;
+    DECLARE @HasActiveBorrow INT;
+    DECLARE @HasUnpaidPenalty INT;
+    
+    SET @NewTransactionId = 0;
+    SET @ErrorMessage = '';
+    SET @BorrowDate = GETDATE();
+    SET @ReturnDate = DATEADD(MINUTE, @LoanDurationMinutes, @BorrowDate);
+    
+    BEGIN TRY
+        BEGIN TRANSACTION;
+        
+        -- Kitap var mı, stokta var mı? (ActiveLoans sayacı - geçmiş tablosu taranmaz)
+        -- UPDLOCK: aynı kitaba eşzamanlı ödünç istekleri sıraya girer
+        SELECT @AvailableStock = StockNumber - ActiveLoans
+        FROM Books WITH (UPDLOCK, ROWLOCK)
+        WHERE Id = @BookId;
+        
+        IF @AvailableStock IS NULL
+        BEGIN
+            SET @ErrorMessage = 'Kitap bulunamadı';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        IF @AvailableStock <= 0
+        BEGIN
+            SET @ErrorMessage = 'Kitap stokta yok';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        -- Aynı kitabı zaten almış mı?
+        SELECT @HasActiveBorrow = COUNT(*) 
+        FROM BorrowTransactions 
+        WHERE UserId = @UserId AND BookId = @BookId AND RealReturnDate IS NULL;
+        
+        IF @HasActiveBorrow > 0
+        BEGIN
+            SET @ErrorMessage = 'Bu kitabı zaten ödünç almışsınız';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        -- Ödenmemiş ceza var mı?
+        SELECT @HasUnpaidPenalty = COUNT(*) 
+        FROM Penalties p
+        INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
+        WHERE bt.UserId = @UserId;
+        
+        IF @HasUnpaidPenalty > 0
+        BEGIN
+            SET @ErrorMessage = 'Ödenmemiş cezanız var. Önce cezanızı ödeyin.';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        -- İşlemi kaydet ve ödünç sayacını artır
+        INSERT INTO BorrowTransactions (BookId, UserId, BorrowDate, ReturnDate)
+        VALUES (@BookId, @UserId, @BorrowDate, @ReturnDate);
+        
+        SET @NewTransactionId = SCOPE_IDENTITY();
+        
+        UPDATE Books SET ActiveLoans = ActiveLoans + 1 WHERE Id = @BookId;
+
+        COMMIT TRANSACTION;
+
+        -- Oluşan işlemi JOIN'li olarak döndür (uygulama tekrar sorgulamasın)
+        SELECT bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
+               ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
+        FROM BorrowTransactions bt
+        LEFT JOIN Books b ON bt.BookId = b.Id
+        LEFT JOIN Users u ON bt.UserId = u.Id
+        WHERE bt.Id = @NewTransactionId;
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+        SET @ErrorMessage = ERROR_MESSAGE();
+    END CATCH
+END;
+GO
+
+-- =============================================
+-- STORED PROCEDURE: sp_ReturnBook
+-- Kitap iade etme
+-- =============================================
+ALTER PROCEDURE sp_ReturnBook
+    @TransactionId INT,
+    @UserId INT,
+    @Success BIT OUTPUT,
+    @Message NVARCHAR(500) OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    
+    DECLARE @ActualUserId INT;
+    DECLARE @RealReturnDate DATETIME;
+    DECLARE @ReturnDate DATETIME;
+    DECLARE @BookTitle NVARCHAR(200);
+    DECLARE @DelayMinutes INT;
+    
+    SET @Success = 0;
+    SET @Message = '';
+    
+    BEGIN TRY
+        SELECT 
+            @ActualUserId = bt.UserId,
+            @RealReturnDate = bt.RealReturnDate,
+            @ReturnDate = bt.ReturnDate,
+            @BookTitle = b.Title
+        FROM BorrowTransactions bt
+        INNER JOIN Books b ON bt.BookId = b.Id
+        WHERE bt.Id = @TransactionId;
+        
+        IF @ActualUserId IS NULL
+        BEGIN
+            SET @Message = 'İşlem bulunamadı';
+            RETURN;
+        END
+        
+        IF @ActualUserId <> @UserId
+        BEGIN
+            SET @Message = 'Bu işlem size ait değil';
+            RETURN;
+        END
+        
+        IF @RealReturnDate IS NOT NULL
+        BEGIN
+            SET @Message = 'Kitap zaten iade edilmiş';
+            RETURN;
+        END
+        
+        -- İade işlemi (Trigger ceza hesaplayacak)
+        UPDATE BorrowTransactions 
+        SET RealReturnDate = GETDATE()
+        WHERE Id = @TransactionId;
+        
+        -- Mesaj oluştur
+        DECLARE @NewRealReturnDate DATETIME;
+        SELECT @NewRealReturnDate = RealReturnDate FROM BorrowTransactions WHERE Id = @TransactionId;
+        
+        IF @NewRealReturnDate > @ReturnDate
+        BEGIN
+            SET @DelayMinutes = DATEDIFF(MINUTE, @ReturnDate, @NewRealReturnDate);
+            IF @DelayMinutes < 1 SET @DelayMinutes = 1;
+            
+            SET @Message = '''' + @BookTitle + ''' iade edildi. ' + 
+                          CAST(@DelayMinutes AS VARCHAR) + ' dakika gecikme için ' + 
+                          CAST(@DelayMinutes * 5 AS VARCHAR) + ' TL ceza kesildi!';
+        END
+        ELSE
+        BEGIN
+            SET @Message = '''' + @BookTitle + ''' başarıyla iade edildi. Teşekkürler!';
+        END
+
+        -- Güncellenen işlemi JOIN'li olarak döndür (uygulama tekrar sorgulamasın)
+        SELECT bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
+               ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
+        FROM BorrowTransactions bt
+        LEFT JOIN Books b ON bt.BookId = b.Id
+        LEFT JOIN Users u ON bt.UserId = u.Id
+        WHERE bt.Id = @TransactionId;
+
+        SET @Success = 1;
+        
+    END TRY
+    BEGIN CATCH
+        SET @Message = ERROR_MESSAGE();
+    END CATCH
+END;
+GO
+
+-- =============================================
+-- TABLE TYPE: TransactionIdList
+-- Toplu işlemler için işlem Id listesi (table-valued parameter)
+-- =============================================
+IF TYPE_ID('dbo.TransactionIdList') IS NULL
+    CREATE TYPE dbo.TransactionIdList AS TABLE (
+        TransactionId INT NOT NULL PRIMARY KEY
+    );
+GO
+
+-- =============================================
+-- STORED PROCEDURE: sp_ReturnBooks
+-- Toplu iade: uygun işlemler tek UPDATE ile iade edilir, cezaları
+-- trigger set-based yazar. Her Id için bir sonuç satırı döner.
+-- @UserId NULL ise (yönetici) sahiplik kontrolü yapılmaz.
+-- =============================================
+IF OBJECT_ID('dbo.sp_ReturnBooks', 'P') IS NULL
+    EXEC('CREATE PROCEDURE sp_ReturnBooks AS RETURN');
+GO
+
+ALTER PROCEDURE sp_ReturnBooks
+    @TransactionIds dbo.TransactionIdList READONLY,
+    @UserId INT = NULL
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    
+    DECLARE @Returned TABLE (Id INT PRIMARY KEY);
+    
+    -- İade işlemi (Trigger cezaları hesaplayacak)
+    UPDATE bt
+    SET bt.RealReturnDate = GETDATE()
+    OUTPUT inserted.Id INTO @Returned (Id)
+    FROM BorrowTransactions bt
+    INNER JOIN @TransactionIds t ON bt.Id = t.TransactionId
+    WHERE bt.RealReturnDate IS NULL
+      AND (@UserId IS NULL OR bt.UserId = @UserId);
+    
+    -- İşlem başına sonuç: sp_ReturnBook ile aynı kontroller ve mesajlar
+    SELECT t.TransactionId,
+           CAST(IIF(r.Id IS NULL, 0, 1) AS BIT) AS Success,
+           CASE
+               WHEN r.Id IS NOT NULL AND p.Id IS NOT NULL
+                   THEN '''' + b.Title + ''' iade edildi. ' +
+                        CAST(p.NumberOfDay AS VARCHAR) + ' dakika gecikme için ' +
+                        CAST(CAST(p.Amount AS INT) AS VARCHAR) + ' TL ceza kesildi!'
+               WHEN r.Id IS NOT NULL THEN '''' + b.Title + ''' başarıyla iade edildi. Teşekkürler!'
+               WHEN bt.Id IS NULL THEN 'İşlem bulunamadı'
+               WHEN bt.UserId <> @UserId THEN 'Bu işlem size ait değil'
+               ELSE 'Kitap zaten iade edilmiş'
+           END AS Message,
+           ISNULL(p.Amount, 0) AS PenaltyAmount,
+           bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
+           ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
+    FROM @TransactionIds t
+    LEFT JOIN @Returned r ON r.Id = t.TransactionId
+    LEFT JOIN BorrowTransactions bt ON bt.Id = t.TransactionId
+    LEFT JOIN Books b ON bt.BookId = b.Id
+    LEFT JOIN Users u ON bt.UserId = u.Id
+    LEFT JOIN Penalties p ON p.BorrowTransactionsId = r.Id
+    ORDER BY t.TransactionId;
+END;
+GO
@@ -0,0 +1,304 @@
+/*
+=============================================================================
+0003_PENALTY_LEDGER - Ceza defteri ve üye başına ceza bakiyesi
+=============================================================================
+
+Ödenen ceza artık silinmez (Penalties.PaidDate yazılır). Penalties'e her
+dokunuş trg_PenaltyLedger ile aynı transaction'da iki tabloya yansır:
+
+- PenaltyLedger: değişmez kayıtlar (UPDATE / DELETE reddedilir)
+    charge   +tutar   ceza yazıldı (trg_CalculatePenalty / admin ekleme)
+    payment  -tutar   ceza ödendi (sp_PayPenalty)
+    cancel   -tutar   ödenmemiş ceza silindi (admin silme, cascade)
+  Kullanıcı silinse de kayıtları raporlama için kalır (Users'a FK yok)
+- UserPenaltyBalances: kullanıcı başına bakiye ve ödenmemiş ceza sayısı
+  (SUM(PenaltyLedger.Amount) ile aynı). Bakiye, "ödenmemiş cezası var mı"
+  kontrolü (sp_BorrowBook) ve üye panosu tek satır okumadır
+
+Mevcut cezaların hepsi ödenmemiştir (ödenenler silinmişti): her biri için
+charge kaydı yazılır ve bakiyeler bunlardan kurulur.
+=============================================================================
+*/
+
+ALTER TABLE Penalties ADD PaidDate DATETIME NULL;
+GO
+
+CREATE TABLE PenaltyLedger (
+    Id INT PRIMARY KEY IDENTITY(1,1),
+    UserId INT NOT NULL,
+    PenaltyId INT NOT NULL,
+    EntryType NVARCHAR(10) NOT NULL,
+    Amount DECIMAL(10,2) NOT NULL,
+    CreatedDate DATETIME NOT NULL DEFAULT GETDATE(),
+    CONSTRAINT CK_PenaltyLedger_EntryType CHECK (EntryType IN ('charge', 'payment', 'cancel'))
+);
+GO
+
+-- Üyenin defteri (keyset: Id DESC) ve ödeme / iptalde cezanın sahibi
+CREATE NONCLUSTERED INDEX IX_PenaltyLedger_User ON PenaltyLedger (UserId, Id DESC);
+GO
+
+CREATE NONCLUSTERED INDEX IX_PenaltyLedger_Penalty ON PenaltyLedger (PenaltyId) INCLUDE (UserId, EntryType);
+GO
+
+CREATE TABLE UserPenaltyBalances (
+    UserId INT PRIMARY KEY,
+    Balance DECIMAL(12,2) NOT NULL DEFAULT 0,
+    UnpaidCount INT NOT NULL DEFAULT 0,
+    UpdatedDate DATETIME NOT NULL DEFAULT GETDATE(),
+    CONSTRAINT FK_UserPenaltyBalances_Users FOREIGN KEY (UserId) REFERENCES Users(Id) ON DELETE CASCADE
+);
+GO
+
+-- Ödenmemiş ceza listeleri (admin / üye) sadece bu satırları okur
+CREATE NONCLUSTERED INDEX IX_Penalties_Unpaid
+ON Penalties (Id DESC)
+INCLUDE (BorrowTransactionsId, NumberOfDay, Amount)
+WHERE PaidDate IS NULL;
+GO
+
+-- Mevcut cezalar: charge kayıtları ve bakiyeler
+INSERT INTO PenaltyLedger (UserId, PenaltyId, EntryType, Amount, CreatedDate)
+SELECT bt.UserId, p.Id, 'charge', p.Amount, ISNULL(p.CreatedDate, GETDATE())
+FROM Penalties p
+INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
+ORDER BY p.Id;
+
+INSERT INTO UserPenaltyBalances (UserId, Balance, UnpaidCount, UpdatedDate)
+SELECT UserId, SUM(Amount), COUNT(*), GETDATE()
+FROM PenaltyLedger
+GROUP BY UserId;
+GO
+
+-- =============================================
+-- TRIGGER: trg_PenaltyLedger
+-- Penalties INSERT / ödeme (PaidDate NULL -> değer) / DELETE -> defter
+-- kaydı ve bakiye (set-based: çok satırlı değişikliklerde de doğru)
+-- =============================================
+CREATE TRIGGER trg_PenaltyLedger
+ON Penalties
+AFTER INSERT, UPDATE, DELETE
+AS
+BEGIN
+    SET NOCOUNT ON;
+
+    DECLARE @Entries TABLE (UserId INT, PenaltyId INT, EntryType NVARCHAR(10), Amount DECIMAL(10,2));
+
+    -- Yeni ceza: sahibi ödünç kaydından
+    INSERT INTO @Entries (UserId, PenaltyId, EntryType, Amount)
+    SELECT bt.UserId, i.Id, 'charge', i.Amount
+    FROM inserted i
+    INNER JOIN BorrowTransactions bt ON i.BorrowTransactionsId = bt.Id
+    WHERE i.PaidDate IS NULL
+      AND NOT EXISTS (SELECT 1 FROM deleted d WHERE d.Id = i.Id);
+
+    -- Ödeme ve iptal: sahibi charge kaydından (ödünç kaydı cascade'le silinmiş olabilir)
+    INSERT INTO @Entries (UserId, PenaltyId, EntryType, Amount)
+    SELECT l.UserId, d.Id, IIF(i.Id IS NULL, 'cancel', 'payment'), -d.Amount
+    FROM deleted d
+    LEFT JOIN inserted i ON i.Id = d.Id
+    INNER JOIN PenaltyLedger l ON l.PenaltyId = d.Id AND l.EntryType = 'charge'
+    WHERE d.PaidDate IS NULL
+      AND (i.Id IS NULL OR i.PaidDate IS NOT NULL);
+
+    IF NOT EXISTS (SELECT 1 FROM @Entries) RETURN;
+
+    INSERT INTO PenaltyLedger (UserId, PenaltyId, EntryType, Amount, CreatedDate)
+    SELECT UserId, PenaltyId, EntryType, Amount, GETDATE()
+    FROM @Entries
+    ORDER BY PenaltyId;
+
+    -- Bakiye satırı yoksa önce sıfırla açılır (UPDLOCK, HOLDLOCK: eşzamanlı
+    -- ilk cezalardan biri bekler, ardından satırı bulup günceller).
+    -- Silinmiş kullanıcının bakiyesi açılmaz.
+    INSERT INTO UserPenaltyBalances (UserId, Balance, UnpaidCount, UpdatedDate)
+    SELECT DISTINCT e.UserId, 0, 0, GETDATE()
+    FROM @Entries e
+    WHERE EXISTS (SELECT 1 FROM Users u WHERE u.Id = e.UserId)
+      AND NOT EXISTS (SELECT 1 FROM UserPenaltyBalances b WITH (UPDLOCK, HOLDLOCK) WHERE b.UserId = e.UserId);
+
+    UPDATE b
+    SET b.Balance = b.Balance + e.Delta,
+        b.UnpaidCount = b.UnpaidCount + e.CountDelta,
+        b.UpdatedDate = GETDATE()
+    FROM UserPenaltyBalances b
+    INNER JOIN (
+        SELECT UserId, SUM(Amount) AS Delta,
+               SUM(IIF(EntryType = 'charge', 1, -1)) AS CountDelta
+        FROM @Entries
+        GROUP BY UserId
+    ) e ON b.UserId = e.UserId;
+END;
+GO
+
+-- =============================================
+-- TRIGGER: trg_PenaltyLedgerImmutable
+-- Defter kayıtları değiştirilemez / silinemez
+-- =============================================
+CREATE TRIGGER trg_PenaltyLedgerImmutable
+ON PenaltyLedger
+INSTEAD OF UPDATE, DELETE
+AS
+BEGIN
+    THROW 50001, 'Ceza defteri kayıtları değiştirilemez', 1;
+END;
+GO
+
+-- =============================================
+-- STORED PROCEDURE: sp_BorrowBook
+-- Kitap ödünç alma
+-- =============================================
+ALTER PROCEDURE sp_BorrowBook
+    @BookId INT,
+    @UserId INT,
+    @LoanDurationMinutes INT = 1,
+    @NewTransactionId INT OUTPUT,
+    @ErrorMessage NVARCHAR(500) OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    
+    DECLARE @AvailableStock INT;
+    DECLARE @BorrowDate DATETIME;
+    DECLARE @ReturnDate DATETIME;
+    DECLARE @HasActiveBorrow INT;
+    DECLARE @HasUnpaidPenalty INT = 0;
+    
+    SET @NewTransactionId = 0;
+    SET @ErrorMessage = '';
+    SET @BorrowDate = GETDATE();
+    SET @ReturnDate = DATEADD(MINUTE, @LoanDurationMinutes, @BorrowDate);
+    
+    BEGIN TRY
+        BEGIN TRANSACTION;
+        
+        -- Kitap var mı, stokta var mı? (ActiveLoans sayacı - geçmiş tablosu taranmaz)
+        -- UPDLOCK: aynı kitaba eşzamanlı ödünç istekleri sıraya girer
+        SELECT @AvailableStock = StockNumber - ActiveLoans
+        FROM Books WITH (UPDLOCK, ROWLOCK)
+        WHERE Id = @BookId;
+        
+        IF @AvailableStock IS NULL
+        BEGIN
+            SET @ErrorMessage = 'Kitap bulunamadı';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        IF @AvailableStock <= 0
+        BEGIN
+            SET @ErrorMessage = 'Kitap stokta yok';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        -- Aynı kitabı zaten almış mı?
+        SELECT @HasActiveBorrow = COUNT(*) 
+        FROM BorrowTransactions 
+        WHERE UserId = @UserId AND BookId = @BookId AND RealReturnDate IS NULL;
+        
+        IF @HasActiveBorrow > 0
+        BEGIN
+            SET @ErrorMessage = 'Bu kitabı zaten ödünç almışsınız';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        -- Ödenmemiş ceza var mı? (bakiye satırı: tek satır okuma, JOIN / toplama yok)
+        SELECT @HasUnpaidPenalty = UnpaidCount
+        FROM UserPenaltyBalances
+        WHERE UserId = @UserId;
+        
+        IF @HasUnpaidPenalty > 0
+        BEGIN
+            SET @ErrorMessage = 'Ödenmemiş cezanız var. Önce cezanızı ödeyin.';
+            ROLLBACK TRANSACTION;
+            RETURN;
+        END
+        
+        -- İşlemi kaydet ve ödünç sayacını artır
+        INSERT INTO BorrowTransactions (BookId, UserId, BorrowDate, ReturnDate)
+        VALUES (@BookId, @UserId, @BorrowDate, @ReturnDate);
+        
+        SET @NewTransactionId = SCOPE_IDENTITY();
+        
+        UPDATE Books SET ActiveLoans = ActiveLoans + 1 WHERE Id = @BookId;
+
+        COMMIT TRANSACTION;
+
+        -- Oluşan işlemi JOIN'li olarak döndür (uygulama tekrar sorgulamasın)
+        SELECT bt.Id, bt.BookId, bt.UserId, bt.BorrowDate, bt.ReturnDate, bt.RealReturnDate,
+               ISNULL(b.Title, '') AS BookTitle, ISNULL(u.FullName, '') AS UserName
+        FROM BorrowTransactions bt
+        LEFT JOIN Books b ON bt.BookId = b.Id
+        LEFT JOIN Users u ON bt.UserId = u.Id
+        WHERE bt.Id = @NewTransactionId;
+
+    END TRY
+    BEGIN CATCH
+        IF @@TRANCOUNT > 0
+            ROLLBACK TRANSACTION;
+        SET @ErrorMessage = ERROR_MESSAGE();
+    END CATCH
+END;
+GO
+
+-- =============================================
+-- STORED PROCEDURE: sp_PayPenalty
+-- Ceza silinmez, PaidDate yazılır (trigger ödeme kaydını ve bakiyeyi yazar)
+-- =============================================
+ALTER PROCEDURE sp_PayPenalty
+    @PenaltyId INT,
+    @UserId INT,
+    @Success BIT OUTPUT,
+    @Message NVARCHAR(500) OUTPUT
+AS
+BEGIN
+    SET NOCOUNT ON;
+    SET XACT_ABORT ON;
+    
+    DECLARE @Amount DECIMAL(10,2);
+    DECLARE @ActualUserId INT;
+    DECLARE @PaidDate DATETIME;
+    
+    SET @Success = 0;
+    SET @Message = '';
+    
+    BEGIN TRANSACTION;
+    
+    -- UPDLOCK: aynı cezayı eşzamanlı iki ödeme isteğinden biri bekler
+    SELECT @Amount = p.Amount, @ActualUserId = bt.UserId, @PaidDate = p.PaidDate
+    FROM Penalties p WITH (UPDLOCK, ROWLOCK)
+    INNER JOIN BorrowTransactions bt ON p.BorrowTransactionsId = bt.Id
+    WHERE p.Id = @PenaltyId;
+    
+    IF @Amount IS NULL
+    BEGIN
+        SET @Message = 'Ceza bulunamadı';
+        ROLLBACK TRANSACTION;
+        RETURN;
+    END
+    
+    IF @ActualUserId <> @UserId
+    BEGIN
+        SET @Message = 'Bu ceza size ait değil';
+        ROLLBACK TRANSACTION;
+        RETURN;
+    END
+    
+    IF @PaidDate IS NOT NULL
+    BEGIN
+        SET @Message = 'Ceza zaten ödenmiş';
+        ROLLBACK TRANSACTION;
+        RETURN;
+    END
+    
+    UPDATE Penalties SET PaidDate = GETDATE() WHERE Id = @PenaltyId;
+    
+    COMMIT TRANSACTION;
+    
+    SET @Success = 1;
+    SET @Message = CAST(@Amount AS VARCHAR) + ' TL ceza başarıyla ödendi';
+END;
+GO